@@ -9,7 +9,8 @@ from starknet_py.hash.selector import get_selector_from_name
 from starknet_py.net.client_models import Call
 
 from app.config import settings
-from app.utils.rpc import with_rpc_fallback
+from app.utils.block_cache import get_read_cache
+from app.utils.rpc import get_rpc_health_stats, with_rpc_fallback
 import logging
 
 logger = logging.getLogger(__name__)
@@ -119,3 +120,21 @@ async def update_strategy_router_risk_engine():
     except Exception as e:
         logger.error(f"❌ Failed to update StrategyRouter: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update StrategyRouter: {str(e)}")
+
+
+@router.get("/rpc-health")
+async def rpc_health():
+    """
+    Per-endpoint RPC health: rolling p50/p99 latency, error rate, circuit
+    breaker state and the order the scheduler currently routes calls in.
+    """
+    return get_rpc_health_stats()
+
+
+@router.get("/read-cache")
+async def read_cache_stats():
+    """
+    Block-aware view-call cache: current head, entries, and hit/miss counters
+    (reads bypassed while the head is unknown are counted separately).
+    """
+    return get_read_cache().stats()
@@ -1,34 +1,66 @@
 """Analytics endpoints - Historical data and trends"""
 
-from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import desc
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
 import uuid
 import logging
 
-from app.database import get_db
-from app.db.session import get_db as get_sync_db
-from app.models import User, RiskHistory, AllocationHistory, ProofJob, ProofStatus
+from app.db.session import get_db
+from app.models import User, RiskHistory, AllocationHistory, ProofJob, ProofJobSummary, ProofStatus
 from app.api.routes.auth import get_current_user
-from app.services.performance_service import PerformanceService
+from app.services.performance_service import TIMELINE_RESOLUTIONS, PerformanceService, as_naive_utc
+from app.services.proof_blob_store import get_proof_blob_store
+from app.utils.pagination import keyset_page, next_page
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Scalar columns read by the history/summary endpoints (never the proof blob)
+_HISTORY_COLUMNS = (
+    ProofJob.id,
+    ProofJob.created_at,
+    ProofJob.metrics,
+    ProofJob.jediswap_pct,
+    ProofJob.ekubo_pct,
+    ProofJob.jediswap_risk,
+    ProofJob.ekubo_risk,
+    ProofJob.proof_hash,
+    ProofJob.status,
+    ProofJob.tx_hash,
+    ProofJob.decision_id,
+    ProofJob.fact_hash,
+    ProofJob.l2_fact_hash,
+    ProofJob.l2_verified_at,
+    ProofJob.l2_block_number,
+    ProofJob.l1_settlement_enabled,
+    ProofJob.atlantic_query_id,
+    ProofJob.l1_fact_hash,
+    ProofJob.l1_verified_at,
+    ProofJob.l1_block_number,
+    ProofJob.network,
+    ProofJob.proof_source,
+    ProofJob.error,
+    ProofJob.submitted_at,
+    ProofJob.verified_at,
+)
+
 
 @router.get("/risk-history")
 async def get_risk_history(
+    response: Response,
     protocol: str = Query(None),
     days: int = Query(7, ge=1, le=90),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get historical risk scores for user."""
+    """Get historical risk scores for user, newest first (keyset-paginated)."""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     query = select(RiskHistory).where(
@@ -39,10 +71,10 @@ async def get_risk_history(
     if protocol:
         query = query.where(RiskHistory.protocol == protocol)
     
-    query = query.order_by(desc(RiskHistory.created_at))
+    query = keyset_page(query, RiskHistory.created_at, RiskHistory.id, cursor, limit)
     
     result = await db.execute(query)
-    histories = result.scalars().all()
+    histories = next_page(result.scalars().all(), limit, response)
     
     return [
         {
@@ -58,20 +90,24 @@ async def get_risk_history(
 
 @router.get("/allocation-history")
 async def get_allocation_history(
+    response: Response,
     days: int = Query(7, ge=1, le=90),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get historical allocation snapshots."""
+    """Get historical allocation snapshots, newest first (keyset-paginated)."""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     query = select(AllocationHistory).where(
         (AllocationHistory.user_id == current_user.id) &
         (AllocationHistory.created_at >= cutoff_date)
-    ).order_by(desc(AllocationHistory.created_at))
+    )
+    query = keyset_page(query, AllocationHistory.created_at, AllocationHistory.id, cursor, limit)
     
     result = await db.execute(query)
-    histories = result.scalars().all()
+    histories = next_page(result.scalars().all(), limit, response)
     
     return [
         {
@@ -128,12 +164,17 @@ async def get_dashboard_stats(
 
 @router.get("/rebalance-history")
 async def get_rebalance_history(
+    response: Response,
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_sync_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    status: Optional[ProofStatus] = Query(None),
+    network: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get recent rebalance history with proof verification status.
     
+    Newest first; the next page's cursor is returned in X-Next-Cursor.
     Returns list of rebalances with:
     - Allocation percentages
     - Proof hash and status
@@ -141,9 +182,14 @@ async def get_rebalance_history(
     - Timestamp
     """
     # Query proof jobs ordered by creation time (most recent first)
-    proof_jobs = db.query(ProofJob).order_by(
-        desc(ProofJob.created_at)
-    ).limit(limit).all()
+    query = select(*_HISTORY_COLUMNS)
+    if status:
+        query = query.filter(ProofJob.status == status)
+    if network:
+        query = query.filter(ProofJob.network == network)
+    query = keyset_page(query, ProofJob.created_at, ProofJob.id, cursor, limit)
+    result = await db.execute(query)
+    proof_jobs = next_page(result.all(), limit, response)
     
     return [
         {
@@ -195,20 +241,32 @@ async def get_rebalance_history(
 
 @router.get("/proof-summary")
 async def get_proof_summary(
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict:
     """
     Lightweight summary of proof verification state for dashboards.
+    
+    Counts come from the proof_job_summary rollup (one row per network and
+    status), so this stays a constant-size read however many jobs exist.
     """
-    total = db.query(ProofJob).count()
-    l2_verified = db.query(ProofJob).filter(ProofJob.l2_verified_at.isnot(None)).count()
-    l1_verified = db.query(ProofJob).filter(ProofJob.l1_verified_at.isnot(None)).count()
-    failed = db.query(ProofJob).filter(ProofJob.status == ProofStatus.FAILED).count()
-    pending = db.query(ProofJob).filter(
-        ProofJob.status.notin_([ProofStatus.VERIFIED, ProofStatus.FAILED])
-    ).count()
+    rollup = (await db.execute(select(ProofJobSummary))).scalars().all()
+    total = sum(row.job_count for row in rollup)
+    l2_verified = sum(row.l2_verified_count for row in rollup)
+    l1_verified = sum(row.l1_verified_count for row in rollup)
+    failed = sum(row.job_count for row in rollup if row.status == ProofStatus.FAILED.value)
+    pending = sum(
+        row.job_count for row in rollup
+        if row.status not in (ProofStatus.VERIFIED.value, ProofStatus.FAILED.value)
+    )
+    by_status: Dict[str, int] = {}
+    by_network: Dict[str, int] = {}
+    for row in rollup:
+        by_status[row.status] = by_status.get(row.status, 0) + row.job_count
+        by_network[row.network] = by_network.get(row.network, 0) + row.job_count
 
-    latest = db.query(ProofJob).order_by(desc(ProofJob.created_at)).first()
+    latest = (await db.execute(
+        select(*_HISTORY_COLUMNS).order_by(desc(ProofJob.created_at)).limit(1)
+    )).first()
     latest_info = None
     if latest:
         latest_info = {
@@ -234,19 +292,52 @@ async def get_proof_summary(
         "l1_verified": l1_verified,
         "pending": pending,
         "failed": failed,
+        "by_status": by_status,
+        "by_network": by_network,
         "latest": latest_info,
     }
 
 
+def _parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None to serve the whole body (no header, or a multi-range request);
+    raises 416 if the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
 @router.get("/proof/{proof_job_id}/download")
 async def download_proof(
     proof_job_id: str,
-    db: Session = Depends(get_sync_db)
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download proof binary data for a specific proof job
     
     Returns the STARK proof binary file for verification or archival purposes.
+    Streams from the proof blob store and honours single ``Range: bytes=``
+    requests (206 Partial Content) so large proofs can be fetched in parts.
     """
     
     try:
@@ -254,43 +345,63 @@ async def download_proof(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid proof job ID format")
     
-    job = db.query(ProofJob).filter(ProofJob.id == job_uuid).first()
+    job = (await db.execute(
+        select(ProofJob.proof_hash, ProofJob.status, ProofJob.proof_blob_key, ProofJob.proof_size_bytes)
+        .where(ProofJob.id == job_uuid)
+    )).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Proof job not found")
     
-    if not job.proof_data:
-        raise HTTPException(status_code=404, detail="Proof data not available for this job")
+    store = get_proof_blob_store()
+    if job.proof_blob_key and store.exists(job.proof_blob_key):
+        size = job.proof_size_bytes or store.size(job.proof_blob_key) or 0
+        body = lambda start, end: store.iter_range(job.proof_blob_key, start, end)
+    else:
+        # Rows written before the blob store keep the proof inline
+        legacy = await db.scalar(select(ProofJob.proof_data).where(ProofJob.id == job_uuid))
+        if not legacy:
+            raise HTTPException(status_code=404, detail="Proof data not available for this job")
+        size = len(legacy)
+        body = lambda start, end: iter([legacy[start:end + 1]])
+    
+    headers = {
+        "Content-Disposition": f'attachment; filename="proof_{job.proof_hash[:16]}.bin"',
+        "X-Proof-Hash": job.proof_hash,
+        "X-Proof-Status": job.status.value if hasattr(job.status, 'value') else str(job.status),
+        "Accept-Ranges": "bytes",
+    }
+    byte_range = _parse_range(range_header, size)
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
     
-    return Response(
-        content=job.proof_data,
+    return StreamingResponse(
+        body(start, end),
+        status_code=status_code,
         media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f'attachment; filename="proof_{job.proof_hash[:16]}.bin"',
-            "X-Proof-Hash": job.proof_hash,
-            "X-Proof-Status": job.status.value if hasattr(job.status, 'value') else str(job.status),
-        }
+        headers=headers,
     )
 
 
 @router.get("/proof-performance")
 async def get_proof_performance(
-    limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get proof generation performance metrics
     
-    Returns statistics about proof generation times, sizes, and success rates.
+    Returns statistics about proof generation times, sizes, and success rates
+    across all proof jobs, read from the proof_job_summary rollup.
     """
-    from sqlalchemy import func
-    
-    # Get recent proof jobs
-    proof_jobs = db.query(ProofJob).order_by(
-        desc(ProofJob.created_at)
-    ).limit(limit).all()
+    rollup = (await db.execute(select(ProofJobSummary))).scalars().all()
+    total = sum(row.job_count for row in rollup)
     
-    if not proof_jobs:
+    if not total:
         return {
             "total": 0,
             "average_generation_time": 0,
@@ -299,37 +410,27 @@ async def get_proof_performance(
             "verified_percentage": 0
         }
     
-    # Calculate metrics
-    generation_times = []
-    proof_sizes = []
-    verified_count = 0
+    gen_count = sum(row.generation_time_count for row in rollup)
+    gen_sum = sum(row.generation_time_sum for row in rollup)
+    size_count = sum(row.proof_size_count for row in rollup)
+    size_sum = sum(row.proof_size_sum for row in rollup)
+    gen_mins = [row.generation_time_min for row in rollup if row.generation_time_min is not None]
+    gen_maxes = [row.generation_time_max for row in rollup if row.generation_time_max is not None]
+    verified_count = sum(row.job_count for row in rollup if row.status == ProofStatus.VERIFIED.value)
     
-    for job in proof_jobs:
-        if job.metrics:
-            gen_time = job.metrics.get("proof_generation_time_seconds")
-            if gen_time:
-                generation_times.append(gen_time)
-            
-            proof_size = job.metrics.get("proof_data_size_bytes")
-            if proof_size:
-                proof_sizes.append(proof_size)
-        
-        if job.status.value == "verified" if hasattr(job.status, 'value') else str(job.status) == "verified":
-            verified_count += 1
-    
-    avg_gen_time = sum(generation_times) / len(generation_times) if generation_times else 0
-    avg_proof_size = sum(proof_sizes) / len(proof_sizes) if proof_sizes else 0
-    verified_percentage = (verified_count / len(proof_jobs)) * 100 if proof_jobs else 0
+    avg_gen_time = gen_sum / gen_count if gen_count else 0
+    avg_proof_size = size_sum / size_count if size_count else 0
+    verified_percentage = (verified_count / total) * 100
     
     return {
-        "total": len(proof_jobs),
+        "total": total,
         "average_generation_time_seconds": round(avg_gen_time, 2),
         "average_proof_size_bytes": int(avg_proof_size),
         "average_proof_size_kb": round(avg_proof_size / 1024, 2),
         "verified_count": verified_count,
         "verified_percentage": round(verified_percentage, 1),
-        "min_generation_time": round(min(generation_times), 2) if generation_times else 0,
-        "max_generation_time": round(max(generation_times), 2) if generation_times else 0,
+        "min_generation_time": round(min(gen_mins), 2) if gen_mins else 0,
+        "max_generation_time": round(max(gen_maxes), 2) if gen_maxes else 0,
     }
 
 
@@ -373,18 +474,40 @@ async def get_protocol_apys(force_refresh: bool = Query(False, description="Forc
 @router.get("/performance/real")
 async def get_real_performance(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_sync_db)
+    start: Optional[datetime] = Query(None, description="Window start (ISO 8601, UTC); overrides days"),
+    end: Optional[datetime] = Query(None, description="Window end (ISO 8601, UTC); defaults to now"),
+    resolution: str = Query("auto", description="auto, raw, hour or day"),
+    max_points: Optional[int] = Query(None, ge=1, le=5000, description="Timeline size cap (default PERFORMANCE_TIMELINE_MAX_POINTS)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Return real performance from executed rebalances (no demo mode).
-    Source of truth: ProofJob records with tx_hash present.
+    Source of truth: ProofJob records with tx_hash present, read through the
+    hourly/daily performance rollups. The timeline is downsampled to at most
+    ``max_points`` entries.
     """
-    service = PerformanceService(db)
-    portfolio = service.calculate_portfolio_performance(days=days)
-    timeline = service.get_performance_timeline(days=days)
+    if resolution not in TIMELINE_RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(TIMELINE_RESOLUTIONS)}")
+    start = as_naive_utc(start) if start else None
+    end = as_naive_utc(end) if end else None
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    def _read(session):
+        service = PerformanceService(session)
+        portfolio = service.calculate_portfolio_performance(days=days, start=start, end=end)
+        timeline = service.get_performance_timeline(
+            days=days, start=start, end=end, resolution=resolution, max_points=max_points
+        )
+        return portfolio, timeline
+
+    # PerformanceService is sync; run it on the async session's connection
+    portfolio, timeline = await db.run_sync(_read)
     return {
         "portfolio": portfolio,
         "timeline": timeline,
-        "period_days": days,
+        "period_days": portfolio.get("period_days", days),
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
         "source": "proof_jobs"
     }
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 
-from app.database import get_db
+from app.db.session import get_db
 from app.models import User
 from app.config import settings
 
@@ -8,7 +8,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, Dict
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.models import ProofStatus
@@ -63,7 +63,7 @@ class DemoProofResponse(BaseModel):
 @router.post("/generate-proof", response_model=DemoProofResponse, tags=["Demo"])
 async def generate_demo_proof(
     request: DemoProofRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate a STARK proof for demo purposes
@@ -133,7 +133,7 @@ async def generate_demo_proof(
             logger.info("📝 Constraint signature stored in proof job metrics")
         
         if proof_job.metrics:
-            db.commit()
+            await db.commit()
 
         generation_time = time.time() - start_time
         proof_hash = proof_job.proof_hash or proof_job.fact_hash or "0x0"
@@ -241,9 +241,9 @@ async def generate_demo_proof(
                 # The router.update_allocation() call rebalances existing TVL
                 try:
                     # Import here to avoid circular dependency
-                    from app.api.routes.risk_engine import orchestrate_allocation
+                    from app.api.routes.risk_engine import _run_orchestration
                     
-                    orchestration_response = await orchestrate_allocation(
+                    orchestration_response = await _run_orchestration(
                         request=orchestration_request,
                         db=db
                     )
@@ -289,7 +289,13 @@ async def generate_demo_proof(
         
         logger.info("✅ Demo proof response generated: %s", proof_hash[:32] if proof_hash else "none")
         return response
-        
+
+    except HTTPException as e:
+        if e.status_code == 503:
+            # Prover backpressure: let the client retry instead of reporting a failure
+            raise
+        logger.error(f"❌ Demo proof generation failed: {e.detail}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Proof generation failed: {str(e)}")
     except Exception as e:
         logger.error(f"❌ Demo proof generation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Proof generation failed: {str(e)}")
@@ -115,7 +115,7 @@ async def get_mist_commitment(commitment_hash: str):
             )
             return await contract.functions["get_mist_commitment"].call(commitment)
 
-        result, _ = await with_rpc_fallback(_call, urls=get_rpc_urls())
+        result, _ = await with_rpc_fallback(_call, urls=get_rpc_urls(), hedge=True)
         user, amount, revealed = result
         return {
             "commitment_hash": commitment_hash,
@@ -122,8 +122,7 @@ async def get_model_history():
     service = get_model_registry_service()
     versions = await service.get_model_history()
     entries: List[ModelRegistryEntry] = []
-    for version in versions:
-        entry_raw = await service.get_model_version(int(version))
+    for entry_raw in await service.get_model_versions([int(v) for v in versions]):
         if entry_raw:
             entries.append(_format_entry(entry_raw, registry_address=settings.MODEL_REGISTRY_ADDRESS))
     return ModelHistoryResponse(
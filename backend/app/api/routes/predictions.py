@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import desc
 
-from app.database import get_db
+from app.db.session import get_db
 from app.models import User, Prediction
 from app.api.routes.auth import get_current_user
 
@@ -3,13 +3,19 @@ Proof generation API endpoints (Stone-only, strict verification)
 """
 import logging
 import time
-from fastapi import APIRouter, HTTPException
+from typing import Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.zkml_service import get_zkml_service
 from app.services.risk_model import calculate_risk_score
 from app.api.routes.risk_engine import _stone_integrity_fact_for_metrics
 from app.services.integrity_service import get_integrity_service
+from app.utils.async_subprocess import ProverBusyError
+from app.db.session import get_db
+from app.models import ProofJobAcceptedResponse
+from app.workers.prover_worker import JOB_KIND_PROOF, accepted_response, enqueue_proof_job
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -42,8 +48,17 @@ class ProofGenerateResponse(BaseModel):
     verified: bool
 
 
-@router.post("/generate", response_model=ProofGenerateResponse, tags=["Proofs"])
-async def generate_proof(request: ProofGenerateRequest):
+@router.post(
+    "/generate",
+    response_model=Union[ProofGenerateResponse, ProofJobAcceptedResponse],
+    tags=["Proofs"],
+)
+async def generate_proof(
+    request: ProofGenerateRequest,
+    response: Response,
+    wait: bool = Query(False, description="Prove inline instead of queueing a prover job"),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Generate STARK proof for risk scoring using Stone prover (strict, no mocks)
     
@@ -55,7 +70,16 @@ async def generate_proof(request: ProofGenerateRequest):
     
     **Strict Mode**: This endpoint requires successful Stone proof generation and
     Integrity verification. No mock fallbacks are allowed.
+
+    By default the proof is queued on the prover worker pool and the call returns
+    202 with a proof job id (poll /verification/verification-status/{id}).
+    Pass ``wait=true`` for the inline response.
     """
+    if not wait:
+        proof_job = await enqueue_proof_job(db, JOB_KIND_PROOF, request.dict())
+        response.status_code = 202
+        return await accepted_response(proof_job, db)
+
     logger.info("Received proof generation request (Stone-only, strict)")
     logger.info(f"Jediswap metrics: {request.jediswap_metrics.dict()}")
     logger.info(f"Ekubo metrics: {request.ekubo_metrics.dict()}")
@@ -76,6 +100,12 @@ async def generate_proof(request: ProofGenerateRequest):
                 request.jediswap_metrics.dict(),
                 request.ekubo_metrics.dict(),
             )
+        except ProverBusyError as e:
+            raise HTTPException(
+                status_code=503,
+                detail={"error": "Prover busy", "message": str(e)},
+                headers={"Retry-After": "30"},
+            ) from e
         except Exception as e:
             logger.error(f"Stone proof generation failed: {e}", exc_info=True)
             raise HTTPException(
@@ -4,45 +4,67 @@ Risk Engine API endpoints for on-chain risk calculations
 import asyncio
 import time
 import tempfile
-import subprocess
 import shutil
 import os
 import json
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Union
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel, Field
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starknet_py.contract import Contract
 from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.account.account import Account
 from starknet_py.net.signer.stark_curve_signer import KeyPair
-from starknet_py.net.client_models import ResourceBounds, ResourceBoundsMapping, SierraContractClass
+from starknet_py.net.client_models import ResourceBounds, ResourceBoundsMapping
 from starknet_py.net.models import StarknetChainId
 from app.config import get_settings
 from app.db.session import get_db
-from app.models import ProofJob, ProofStatus
+from app.models import ProofJob, ProofStatus, ProofJobAcceptedResponse
 from app.services.risk_model import calculate_risk_score as calc_risk_score
 from app.services.zkml_service import get_zkml_service
 from app.services.zkml_proof_service import ZkmlProofService, ZkmlProofConfig
-from app.services.stone_prover_service import StoneProverService
-from app.services.proof_loader import serialize_stone_proof
+from app.services.stone_prover_service import (
+    STONE_BASE_PARAMS_FILE,
+    STONE_PROVER_CONFIG_FILE,
+    StoneProverService,
+)
+from app.services.proof_blob_store import get_proof_blob_store
+from app.services.proof_cache import get_proof_cache, proof_cache_key
+from app.services.cairo_compile_cache import (
+    RISK_BATCH_PROGRAM_CAIRO0,
+    RISK_PROGRAM_CAIRO0,
+    get_cairo_compile_cache,
+)
+from app.services.risk_batch import BatchCommitment, decision_inputs, parse_program_output
+from app.services.proof_loader import serialize_stone_proof_async
 from app.workers.sharp_worker import submit_proof_to_sharp
 from app.services.integrity_service import get_integrity_service
 from app.services.atlantic_service import get_atlantic_service
 from app.services.model_service import get_model_service, get_model_params
 from app.workers.atlantic_worker import enqueue_atlantic_status_check
+from app.workers.prover_worker import JOB_KIND_ORCHESTRATE, accepted_response, enqueue_proof_job
 from app.services.protocol_metrics_service import get_protocol_metrics_service
 from app.services.market_data_service import get_market_data_service
-from app.utils.rpc import with_rpc_fallback, get_rpc_urls, is_retryable_rpc_error
+from app.services.class_metadata_cache import get_class_metadata_cache
+from app.utils.block_cache import get_read_cache
+from app.utils.rpc import (
+    contract_read,
+    get_rpc_client,
+    get_rpc_urls,
+    is_retryable_rpc_error,
+    with_rpc_fallback,
+)
+from app.utils.async_subprocess import ProverBusyError, get_proof_limiter, run_subprocess
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 settings = get_settings()
 _RISK_ENGINE_ABI = None
-_RISK_ENGINE_ONCHAIN_INPUTS: Optional[int] = None
+_RISK_ENGINE_ONCHAIN_INPUTS: Optional[tuple[int, int]] = None  # (class_hash, input count)
 
 # Manual resource bounds to avoid estimate_fee (which uses unsupported block tags on some RPCs).
 # L1 data gas price increased to handle current network conditions
@@ -81,27 +103,21 @@ async def _get_risk_engine_contract(client: FullNodeClient) -> Contract:
 async def _get_risk_engine_onchain_inputs(client: FullNodeClient) -> Optional[int]:
     """Detect on-chain RiskEngine signature (legacy 2 inputs vs proof-gated v4 vs v4 with on-chain agent)."""
     global _RISK_ENGINE_ONCHAIN_INPUTS
-    if _RISK_ENGINE_ONCHAIN_INPUTS is not None:
-        return _RISK_ENGINE_ONCHAIN_INPUTS
 
     try:
-        contract_class = await client.get_class_at(
-            contract_address=int(settings.RISK_ENGINE_ADDRESS, 16),
-            block_number="latest",
-        )
-        abi = contract_class.abi
-        if isinstance(abi, str):
-            abi = json.loads(abi)
-        for item in abi or []:
-            if item.get("type") == "function" and item.get("name") == "propose_and_execute_allocation":
-                input_count = len(item.get("inputs", []))
-                _RISK_ENGINE_ONCHAIN_INPUTS = input_count
-                logger.info(f"📋 RiskEngine ABI detected: {input_count} inputs for propose_and_execute_allocation")
-                # Log detailed ABI info for debugging
-                inputs = item.get("inputs", [])
-                for idx, inp in enumerate(inputs):
-                    logger.info(f"   Input {idx}: {inp.get('name', 'unnamed')} ({inp.get('type', 'unknown')})")
-                return _RISK_ENGINE_ONCHAIN_INPUTS
+        # ABI comes from the class-hash keyed metadata cache; re-read only after an upgrade
+        meta = await get_class_metadata_cache().get(client, int(settings.RISK_ENGINE_ADDRESS, 16))
+        if _RISK_ENGINE_ONCHAIN_INPUTS is not None and _RISK_ENGINE_ONCHAIN_INPUTS[0] == meta.class_hash:
+            return _RISK_ENGINE_ONCHAIN_INPUTS[1]
+        inputs = meta.function_inputs("propose_and_execute_allocation")
+        if inputs is not None:
+            input_count = len(inputs)
+            _RISK_ENGINE_ONCHAIN_INPUTS = (meta.class_hash, input_count)
+            logger.info(f"📋 RiskEngine ABI detected: {input_count} inputs for propose_and_execute_allocation")
+            # Log detailed ABI info for debugging
+            for idx, inp in enumerate(inputs):
+                logger.info(f"   Input {idx}: {inp.get('name', 'unnamed')} ({inp.get('type', 'unknown')})")
+            return input_count
     except Exception as err:
         logger.warning("⚠️ Could not inspect on-chain RiskEngine ABI; defaulting to v4 with on-chain agent calldata. %s", err)
 
@@ -207,24 +223,6 @@ def _resolve_cairo1_compile_bin() -> str:
     )
 
 
-def _resolve_cairo0_compile_bin() -> str:
-    candidates = [
-        os.environ.get("CAIRO_COMPILE_BIN"),
-        "cairo-compile",
-    ]
-    for candidate in candidates:
-        if not candidate:
-            continue
-        if Path(candidate).is_absolute():
-            if Path(candidate).exists():
-                return candidate
-        else:
-            resolved = shutil.which(candidate)
-            if resolved:
-                return resolved
-    raise FileNotFoundError("cairo-compile binary not found in PATH.")
-
-
 def _resolve_cairo0_run_bin() -> str:
     candidates = [
         os.environ.get("CAIRO_RUN_BIN"),
@@ -246,11 +244,95 @@ def _resolve_cairo0_run_bin() -> str:
 async def _stone_integrity_fact_for_metrics(
     jediswap_metrics: dict,
     ekubo_metrics: dict,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
 ) -> tuple[Optional[int], Optional[str], Optional[str], Optional[str]]:
     """
     Generate a Stone proof for the Cairo1 risk example and register it with Integrity.
-    Returns (fact_hash_int, proof_json_path, output_dir).
+    Returns (fact_hash_int, proof_json_path, output_dir, proof_hash).
+
+    The CPU-bound stages (trace generation, Stone, serialization) hold a proof
+    limiter slot; registration is network-bound and runs after the slot is released.
+    Raises ProverBusyError when the limiter queue is full.
+
+    ``progress`` (optional) is called with the stage name as the pipeline advances
+    (tracing, proving, serializing, registering); the prover queue uses it to
+    report job progress.
+
+    Registered proofs are memoised in the content-addressed proof cache: a
+    repeat of the same metrics under the same program and verifier config
+    returns the stored fact without re-proving or re-registering.
     """
+    integrity = get_integrity_service()
+    cache = get_proof_cache()
+    if cache is None:
+        return await _prove_and_register_metrics(jediswap_metrics, ekubo_metrics, integrity, progress)
+
+    cache_key = proof_cache_key(
+        _risk_program_path(),
+        decision_inputs(jediswap_metrics, ekubo_metrics),
+        prover_files=(STONE_BASE_PARAMS_FILE, STONE_PROVER_CONFIG_FILE),
+        verifier_address=integrity.verifier_address,
+    )
+    # Identical concurrent requests wait here and then hit the entry the first one stored.
+    async with cache.lock(cache_key):
+        cached = cache.get(cache_key)
+        if cached:
+            logger.info(f"♻️  Proof cache hit {cache_key[:16]} (fact {hex(cached.fact_hash)})")
+            return cached.fact_hash, str(cached.proof_path), str(cached.entry_dir), cached.proof_hash
+
+        fact_hash_int, proof_path, output_dir, proof_hash, calldata = await _prove_and_register_metrics(
+            jediswap_metrics, ekubo_metrics, integrity, progress, return_calldata=True
+        )
+        if fact_hash_int:
+            cache.put(cache_key, Path(proof_path), calldata, fact_hash_int, proof_hash)
+        return fact_hash_int, proof_path, output_dir, proof_hash
+
+
+async def _prove_and_register_metrics(
+    jediswap_metrics: dict,
+    ekubo_metrics: dict,
+    integrity,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+    return_calldata: bool = False,
+):
+    """Uncached prove (inside a limiter slot) + Integrity registration."""
+    async with get_proof_limiter().slot():
+        calldata, proof_output_file, output_dir, proof_hash = await _prove_metrics_with_stone(
+            jediswap_metrics,
+            ekubo_metrics,
+            progress=progress,
+        )
+
+    if progress:
+        await progress("registering")
+    try:
+        fact_hash_int, _, _ = await integrity.register_calldata_and_get_fact(calldata)
+    except RuntimeError as e:
+        # Re-raise with better context - this will be caught by caller
+        raise RuntimeError(f"Stone proof registration failed: {str(e)}") from e
+    result = (fact_hash_int, str(proof_output_file), str(output_dir), proof_hash)
+    return (*result, calldata) if return_calldata else result
+
+
+def _risk_program_path() -> Path:
+    """Cairo source proven for the active memory-verification mode."""
+    repo_root = Path(__file__).resolve().parents[4]
+    if settings.INTEGRITY_MEMORY_VERIFICATION == "cairo1":
+        return repo_root / "verification" / "risk_example.cairo"
+    return repo_root / "verification" / "risk_example_cairo0.cairo"
+
+
+async def _prove_metrics_with_stone(
+    jediswap_metrics: dict,
+    ekubo_metrics: dict,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> tuple[list[int], Path, Path, Optional[str]]:
+    """
+    Run trace generation + Stone prover + proof_serializer for one metric pair.
+    Returns (integrity_calldata, proof_json_path, output_dir, proof_hash).
+    """
+    if progress:
+        await progress("tracing")
     repo_root = Path(__file__).resolve().parents[4]
     output_dir = Path(tempfile.mkdtemp(prefix="risk_stone_"))
     trace_file = output_dir / "risk_trace.bin"
@@ -304,24 +386,17 @@ async def _stone_integrity_fact_for_metrics(
 
         # Use configurable timeout (increased for recursive layout)
         cairo_timeout = getattr(settings, "INTEGRITY_CAIRO_TIMEOUT", 300)
-        proc = subprocess.run(
+        proc = await run_subprocess(
             cmd,
-            capture_output=True,
-            text=True,
             timeout=cairo_timeout,
-            check=True,
             cwd=str(repo_root / "cairo-vm" / "cairo1-run"),
         )
         if proc.stdout:
             logger.info("cairo1-run output: %s", proc.stdout.strip().splitlines()[-1])
     else:
-        cairo_compile = _resolve_cairo0_compile_bin()
         cairo_run = _resolve_cairo0_run_bin()
-        cairo_program = repo_root / "verification" / "risk_example_cairo0.cairo"
-        if not cairo_program.exists():
-            raise FileNotFoundError(f"risk_example_cairo0.cairo not found at {cairo_program}")
-
-        compiled_program = output_dir / "risk_compiled.json"
+        # Compiled once per source/compiler version (warmed at startup)
+        compiled_program = await get_cairo_compile_cache().get_compiled(RISK_PROGRAM_CAIRO0)
         program_input = {
             "jedi_utilization": jediswap_metrics["utilization"],
             "jedi_volatility": jediswap_metrics["volatility"],
@@ -337,21 +412,6 @@ async def _stone_integrity_fact_for_metrics(
         program_input_file = output_dir / "risk_program_input.json"
         program_input_file.write_text(json.dumps(program_input))
 
-        compile_cmd = [
-            cairo_compile,
-            str(cairo_program),
-            "--output",
-            str(compiled_program),
-            "--proof_mode",
-        ]
-        subprocess.run(
-            compile_cmd,
-            capture_output=True,
-            text=True,
-            timeout=120,
-            check=True,
-        )
-
         run_cmd = [
             cairo_run,
             "--program",
@@ -373,12 +433,9 @@ async def _stone_integrity_fact_for_metrics(
         ]
         # Use configurable timeout (increased for recursive layout)
         cairo_timeout = getattr(settings, "INTEGRITY_CAIRO_TIMEOUT", 300)
-        proc = subprocess.run(
+        proc = await run_subprocess(
             run_cmd,
-            capture_output=True,
-            text=True,
             timeout=cairo_timeout,
-            check=True,
         )
         if proc.stdout:
             logger.info("cairo-run output: %s", proc.stdout.strip().splitlines()[-1])
@@ -386,6 +443,25 @@ async def _stone_integrity_fact_for_metrics(
         # Note: We cannot remove ecdsa segment from public input here because Stone prover
         # requires it to match the trace. We'll remove it from the proof JSON after Stone generates it.
 
+    calldata, proof_hash = await _prove_trace_with_stone(
+        public_input_file,
+        private_input_file,
+        proof_output_file,
+        progress=progress,
+    )
+    return calldata, proof_output_file, output_dir, proof_hash
+
+
+async def _prove_trace_with_stone(
+    public_input_file: Path,
+    private_input_file: Path,
+    proof_output_file: Path,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> tuple[list[int], Optional[str]]:
+    """
+    Run Stone + proof_serializer on an existing Cairo trace.
+    Returns (integrity_calldata, proof_hash).
+    """
     # HARD LOG: Dump active settings at proof generation start
     logger.info("=" * 80)
     logger.info("🔍 PROOF GENERATION - ACTIVE SETTINGS")
@@ -397,9 +473,10 @@ async def _stone_integrity_fact_for_metrics(
     logger.info(f"INTEGRITY_CAIRO_TIMEOUT: {getattr(settings, 'INTEGRITY_CAIRO_TIMEOUT', 300)}s")
     logger.info("=" * 80)
     
+    if progress:
+        await progress("proving")
     stone = StoneProverService()
-    # Use configurable timeout for Stone prover (increased for recursive layout)
-    stone_timeout = getattr(settings, "INTEGRITY_CAIRO_TIMEOUT", 300)
+    stone_timeout = settings.INTEGRITY_STONE_TIMEOUT
     stone_result = await stone.generate_proof(
         private_input_file=str(private_input_file),
         public_input_file=str(public_input_file),
@@ -490,11 +567,17 @@ async def _stone_integrity_fact_for_metrics(
         logger.info(f"✅ Verifier config match: proof layout='{proof_layout}' matches expected='{expected_layout}'")
         logger.info(f"   (stone_version={expected_stone_version}, hasher={expected_hasher}, memory={expected_memory_verification} will be in calldata)")
 
+    if progress:
+        await progress("serializing")
     serializer_bin = Path(
         settings.INTEGRITY_PROOF_SERIALIZER_BIN
         or "/opt/obsqra.starknet/integrity/target/release/proof_serializer"
     )
-    calldata_body = serialize_stone_proof(proof_output_file, serializer_bin)
+    calldata_body = await serialize_stone_proof_async(
+        proof_output_file,
+        serializer_bin,
+        timeout=settings.INTEGRITY_SERIALIZER_TIMEOUT,
+    )
     calldata = [
         _string_to_felt(settings.INTEGRITY_LAYOUT),  # Use config layout instead of hardcoded "small"
         _string_to_felt(settings.INTEGRITY_HASHER),
@@ -502,14 +585,93 @@ async def _stone_integrity_fact_for_metrics(
         _string_to_felt(settings.INTEGRITY_MEMORY_VERIFICATION),
         *calldata_body,
     ]
+    return calldata, stone_result.proof_hash
+
 
+async def _stone_integrity_fact_for_batch(
+    metric_pairs: list[tuple[dict, dict]],
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> tuple[Optional[int], str, str, Optional[str], BatchCommitment]:
+    """
+    Prove K allocation decisions with one Stone proof and register one fact.
+    Returns (fact_hash_int, proof_json_path, output_dir, proof_hash, commitment).
+
+    The batch program commits to every decision with a Pedersen Merkle root in
+    its public output; ``commitment.inclusion(i)`` gives decision i's path to it.
+    Only the cairo0 risk program supports batching.
+    """
+    if settings.INTEGRITY_MEMORY_VERIFICATION == "cairo1":
+        raise RuntimeError("Batched proving requires the cairo0 risk program (memory_verification != cairo1)")
+
+    async with get_proof_limiter().slot():
+        calldata, proof_output_file, output_dir, proof_hash, commitment = await _prove_batch_with_stone(
+            metric_pairs,
+            progress=progress,
+        )
+
+    if progress:
+        await progress("registering")
     integrity = get_integrity_service()
     try:
         fact_hash_int, _, _ = await integrity.register_calldata_and_get_fact(calldata)
     except RuntimeError as e:
-        # Re-raise with better context - this will be caught by caller
-        raise RuntimeError(f"Stone proof registration failed: {str(e)}") from e
-    return fact_hash_int, str(proof_output_file), str(output_dir), stone_result.proof_hash
+        raise RuntimeError(f"Stone batch proof registration failed: {str(e)}") from e
+    return fact_hash_int, str(proof_output_file), str(output_dir), proof_hash, commitment
+
+
+async def _prove_batch_with_stone(
+    metric_pairs: list[tuple[dict, dict]],
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> tuple[list[int], Path, Path, Optional[str], BatchCommitment]:
+    """
+    Trace the batch risk program over all metric pairs, then run Stone + serializer.
+    Returns (integrity_calldata, proof_json_path, output_dir, proof_hash, commitment).
+    """
+    if progress:
+        await progress("tracing")
+    output_dir = Path(tempfile.mkdtemp(prefix="risk_batch_stone_"))
+    trace_file = output_dir / "risk_trace.bin"
+    memory_file = output_dir / "risk_memory.bin"
+    public_input_file = output_dir / "risk_public.json"
+    private_input_file = output_dir / "risk_private.json"
+    proof_output_file = output_dir / "risk_proof.json"
+
+    inputs = [decision_inputs(jediswap, ekubo) for jediswap, ekubo in metric_pairs]
+    program_input_file = output_dir / "risk_program_input.json"
+    program_input_file.write_text(json.dumps({"decisions": inputs}))
+
+    cairo_run = _resolve_cairo0_run_bin()
+    compiled_program = await get_cairo_compile_cache().get_compiled(RISK_BATCH_PROGRAM_CAIRO0)
+    run_cmd = [
+        cairo_run,
+        "--program",
+        str(compiled_program),
+        "--layout",
+        settings.INTEGRITY_LAYOUT,
+        "--proof_mode",
+        "--program_input",
+        str(program_input_file),
+        "--trace_file",
+        str(trace_file),
+        "--memory_file",
+        str(memory_file),
+        "--air_public_input",
+        str(public_input_file),
+        "--air_private_input",
+        str(private_input_file),
+        "--print_output",
+    ]
+    proc = await run_subprocess(run_cmd, timeout=settings.INTEGRITY_CAIRO_TIMEOUT)
+    commitment = BatchCommitment.from_program_output(parse_program_output(proc.stdout), inputs)
+    logger.info(f"🧮 Batch trace: {len(inputs)} decisions, root {hex(commitment.root)}")
+
+    calldata, proof_hash = await _prove_trace_with_stone(
+        public_input_file,
+        private_input_file,
+        proof_output_file,
+        progress=progress,
+    )
+    return calldata, proof_output_file, output_dir, proof_hash, commitment
 
 
 def _build_integrity_error_report(
@@ -562,15 +724,7 @@ async def _init_backend_account(
         key_pair=key_pair,
         chain=network_chain,
     )
-    try:
-        contract_class = await client.get_class_at(
-            contract_address=account.address,
-            block_number="latest",
-        )
-        account._cairo_version = 1 if isinstance(contract_class, SierraContractClass) else 0
-    except Exception as err:
-        account._cairo_version = 1
-        logger.warning("⚠️ Could not resolve account Cairo version; defaulting to Cairo 1: %s", err)
+    account._cairo_version = await get_class_metadata_cache().cairo_version(client, account.address)
     return account
 
 
@@ -822,19 +976,32 @@ class ExecuteRequest(BaseModel):
 
 async def _create_proof_job(
     request: OrchestrationRequest,
-    db: Session,
+    db: AsyncSession,
     snapshot: Optional[dict] = None,
     extra_metrics: Optional[dict] = None,
+    proof_job: Optional[ProofJob] = None,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
 ) -> tuple[ProofJob, dict, dict, Optional[str]]:
     """
     Generate Stone proof + verify via Integrity + store ProofJob.
     Returns (proof_job, zkml_jedi, zkml_ekubo, verification_error).
+
+    When ``proof_job`` is given (a queued job claimed by a prover worker) it is
+    filled in place instead of inserting a new row.
     """
     proof_start_time = time.time()
-    stone_fact, stone_proof_path, stone_dir, stone_hash = await _stone_integrity_fact_for_metrics(
-        request.jediswap_metrics.dict(),
-        request.ekubo_metrics.dict(),
-    )
+    try:
+        stone_fact, stone_proof_path, stone_dir, stone_hash = await _stone_integrity_fact_for_metrics(
+            request.jediswap_metrics.dict(),
+            request.ekubo_metrics.dict(),
+            progress=progress,
+        )
+    except ProverBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Prover busy", "message": str(e)},
+            headers={"Retry-After": "30"},
+        ) from e
     proof_generation_time = time.time() - proof_start_time
 
     if not stone_fact:
@@ -874,6 +1041,46 @@ async def _create_proof_job(
         }
         raise HTTPException(status_code=400, detail=error_report)
 
+    proof_job, zkml_jedi, zkml_ekubo = await _store_proof_job(
+        request,
+        db,
+        proof_job=proof_job,
+        fact_hash=fact_hash,
+        proof_hash=proof_hash,
+        proof_bytes=proof_bytes,
+        proof_generation_time=proof_generation_time,
+        stone_proof_path=stone_proof_path,
+        stone_dir=stone_dir,
+        stone_hash=stone_hash,
+        l2_verified_at=l2_verified_at,
+        verification_error=verification_error,
+        snapshot=snapshot,
+        extra_metrics=extra_metrics,
+    )
+    return proof_job, zkml_jedi, zkml_ekubo, verification_error
+
+
+async def _store_proof_job(
+    request: OrchestrationRequest,
+    db: AsyncSession,
+    *,
+    proof_job: Optional[ProofJob],
+    fact_hash: str,
+    proof_hash: Optional[str],
+    proof_bytes: Optional[bytes],
+    proof_generation_time: float,
+    stone_proof_path: Optional[str],
+    stone_dir: Optional[str],
+    stone_hash: Optional[str],
+    l2_verified_at: Optional[datetime],
+    verification_error: Optional[str],
+    snapshot: Optional[dict] = None,
+    extra_metrics: Optional[dict] = None,
+) -> tuple[ProofJob, dict, dict]:
+    """Insert (or fill in place) the VERIFIED ProofJob row for one decision."""
+    integrity = get_integrity_service()
+    proof_size_bytes = len(proof_bytes) if proof_bytes else 0
+
     # Compute deterministic risk scores for display
     jediswap_risk, jediswap_components = calc_risk_score(request.jediswap_metrics.dict())
     ekubo_risk, ekubo_components = calc_risk_score(request.ekubo_metrics.dict())
@@ -929,7 +1136,7 @@ async def _create_proof_job(
     if extra_metrics:
         metrics_payload.update(extra_metrics)
 
-    proof_job = ProofJob(
+    job_fields = dict(
         proof_hash=proof_hash or fact_hash,
         status=ProofStatus.VERIFIED,
         fact_hash=fact_hash,
@@ -938,16 +1145,105 @@ async def _create_proof_job(
         proof_source="stone_prover",
         network=settings.STARKNET_NETWORK,
         metrics=metrics_payload,
-        proof_data=proof_bytes,
+        proof_blob_key=get_proof_blob_store().put(proof_bytes) if proof_bytes else None,
+        proof_size_bytes=proof_size_bytes or None,
         error=verification_error,
         jediswap_risk=jediswap_risk,
         ekubo_risk=ekubo_risk,
     )
-    db.add(proof_job)
-    db.commit()
-    db.refresh(proof_job)
+    if proof_job is None:
+        proof_job = ProofJob(**job_fields)
+        db.add(proof_job)
+    else:
+        # Keep queue metadata (job kind + original request) alongside the proof metrics
+        job_fields["metrics"] = {**(proof_job.metrics or {}), **metrics_payload}
+        for field, value in job_fields.items():
+            setattr(proof_job, field, value)
+    await db.commit()
+    await db.refresh(proof_job)
+
+    return proof_job, zkml_jedi, zkml_ekubo
+
+
+async def _create_batch_proof_jobs(
+    requests: list[OrchestrationRequest],
+    db: AsyncSession,
+    proof_jobs: list[ProofJob],
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> list[ProofJob]:
+    """
+    Prove and register a batch of queued proof jobs with one Stone proof.
 
-    return proof_job, zkml_jedi, zkml_ekubo, verification_error
+    Every job gets the shared fact hash plus ``metrics["batch"]``: its index,
+    the batch Merkle root and the inclusion path of its decision leaf.
+    """
+    proof_start_time = time.time()
+    try:
+        stone_fact, stone_proof_path, stone_dir, stone_hash, commitment = await _stone_integrity_fact_for_batch(
+            [(r.jediswap_metrics.dict(), r.ekubo_metrics.dict()) for r in requests],
+            progress=progress,
+        )
+    except ProverBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Prover busy", "message": str(e)},
+            headers={"Retry-After": "30"},
+        ) from e
+    proof_generation_time = time.time() - proof_start_time
+
+    if not stone_fact:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Stone batch proof registration failed",
+                "message": "No fact hash returned from Integrity registration.",
+                "strict_mode": True,
+            },
+        )
+
+    fact_hash = hex(stone_fact)
+    proof_bytes = Path(stone_proof_path).read_bytes()
+    proof_hash = stone_hash
+    if not proof_hash:
+        import hashlib
+        proof_hash = f"0x{hashlib.sha256(proof_bytes).hexdigest()}"
+
+    integrity = get_integrity_service()
+    l2_verified = await integrity.verify_proof_on_l2(fact_hash, is_mocked=False)
+    if not l2_verified:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "stage": "integrity_verification",
+                "reason": "stone_verification_failed",
+                "fact_hash": fact_hash,
+                "verification_error": "Integrity verification failed (strict mode - real FactRegistry only)",
+                "integrity_registry_address": hex(integrity.verifier_address),
+            },
+        )
+    l2_verified_at = datetime.utcnow()
+
+    stored = []
+    for index, (request, proof_job) in enumerate(zip(requests, proof_jobs)):
+        proof_job, _, _ = await _store_proof_job(
+            request,
+            db,
+            proof_job=proof_job,
+            fact_hash=fact_hash,
+            proof_hash=proof_hash,
+            proof_bytes=proof_bytes,
+            # Amortized: the batch shares one Stone run
+            proof_generation_time=proof_generation_time / len(requests),
+            stone_proof_path=stone_proof_path,
+            stone_dir=stone_dir,
+            stone_hash=stone_hash,
+            l2_verified_at=l2_verified_at,
+            verification_error=None,
+            extra_metrics={"batch": commitment.inclusion(index)},
+        )
+        stored.append(proof_job)
+    logger.info(f"✅ Batch of {len(stored)} proof jobs registered under fact {fact_hash}")
+    return stored
 
 
 async def _compute_allocation_preview(
@@ -958,12 +1254,14 @@ async def _compute_allocation_preview(
     Compute allocation preview using on-chain formulas (read-only).
     Returns (jediswap_pct, ekubo_pct, jediswap_apy, ekubo_apy).
     """
-    rpc_client = FullNodeClient(node_url=settings.STARKNET_RPC_URL)
+    rpc_client = get_rpc_client(settings.STARKNET_RPC_URL)
     contract = await _get_risk_engine_contract(rpc_client)
 
-    # Read on-chain APYs (stored values)
-    jediswap_apy_result = await contract.functions["query_jediswap_apy"].call(block_number="latest")
-    ekubo_apy_result = await contract.functions["query_ekubo_apy"].call(block_number="latest")
+    # Read on-chain APYs (stored values) in one JSON-RPC batch, cached per block
+    jediswap_apy_result, ekubo_apy_result = await get_read_cache().read_contract([
+        contract_read(contract, "query_jediswap_apy"),
+        contract_read(contract, "query_ekubo_apy"),
+    ])
     jediswap_apy = int(jediswap_apy_result[0]) if jediswap_apy_result else 0
     ekubo_apy = int(ekubo_apy_result[0]) if ekubo_apy_result else 0
 
@@ -985,10 +1283,16 @@ async def _compute_allocation_preview(
     return jediswap_pct, ekubo_pct, jediswap_apy, ekubo_apy
 
 
-@router.post("/orchestrate-allocation", response_model=OrchestrationResponse, tags=["Risk Engine"])
+@router.post(
+    "/orchestrate-allocation",
+    response_model=Union[OrchestrationResponse, ProofJobAcceptedResponse],
+    tags=["Risk Engine"],
+)
 async def orchestrate_allocation(
     request: OrchestrationRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    wait: bool = Query(False, description="Prove and execute inline instead of queueing a prover job"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     🤖 AI-Driven Orchestration: Backend executes verified allocation decision
@@ -1001,9 +1305,29 @@ async def orchestrate_allocation(
     
     The backend signs and submits the transaction using its authorized account.
     This enables fully automated AI execution without user wallet interaction.
+
+    By default the work is queued on the prover worker pool and the call returns
+    202 with a proof job id; poll /verification/verification-status/{id}.
+    Pass ``wait=true`` to block until the decision is executed.
+    """
+    if wait:
+        return await _run_orchestration(request, db)
+
+    proof_job = await enqueue_proof_job(db, JOB_KIND_ORCHESTRATE, request.dict())
+    response.status_code = 202
+    return await accepted_response(proof_job, db)
+
+
+async def _run_orchestration(
+    request: OrchestrationRequest,
+    db: AsyncSession,
+    proof_job: Optional[ProofJob] = None,
+    progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> OrchestrationResponse:
+    """
+    Prove + execute one allocation decision (inline, or for a claimed queue job).
     """
     try:
-        proof_job = None
         logger.info(f"🤖 AI Orchestration Starting...")
         logger.info(f"📊 JediSwap metrics: util={request.jediswap_metrics.utilization}, "
                    f"vol={request.jediswap_metrics.volatility}, liq={request.jediswap_metrics.liquidity}, "
@@ -1018,8 +1342,12 @@ async def orchestrate_allocation(
             request=request,
             db=db,
             snapshot=None,
+            proof_job=proof_job,
+            progress=progress,
         )
         logger.info("✅ Stone proof registered (job: %s, fact: %s)", proof_job.id, proof_job.fact_hash)
+        if progress:
+            await progress("executing")
 
         # Expected on-chain risk scores (deterministic model)
         expected_jediswap_score, _ = calc_risk_score(request.jediswap_metrics.dict())
@@ -1113,7 +1441,7 @@ async def orchestrate_allocation(
         
         rpc_urls = get_rpc_urls()
         abi_probe_url = rpc_urls[0] if rpc_urls else settings.STARKNET_RPC_URL
-        abi_client = FullNodeClient(node_url=abi_probe_url)
+        abi_client = get_rpc_client(abi_probe_url)
         onchain_inputs = await _get_risk_engine_onchain_inputs(abi_client)
         # v4 with on-chain agent has 9 ABI inputs (2 structs + 5 proof params + 2 new params)
         # Proof-gated v4 has 7 ABI inputs (2 structs + 5 proof params)
@@ -1246,6 +1574,7 @@ async def orchestrate_allocation(
         invoke_result, submit_rpc = await with_rpc_fallback(
             _submit_with_client_v3, urls=preferred_rpc_urls
         )
+        get_read_cache().note_write(call.to_addr)
         
         tx_hash = hex(invoke_result.transaction_hash)
         logger.info(f"📤 Transaction submitted: {tx_hash}")
@@ -1253,8 +1582,8 @@ async def orchestrate_allocation(
         # Update proof job with transaction hash
         proof_job.tx_hash = tx_hash
         proof_job.status = ProofStatus.SUBMITTED
-        db.commit()
-        db.refresh(proof_job)
+        await db.commit()
+        await db.refresh(proof_job)
         
         logger.info(f"⏳ Waiting for acceptance...")
 
@@ -1281,8 +1610,8 @@ async def orchestrate_allocation(
         # Set verified_at if Integrity verification succeeded
         if proof_job.status == ProofStatus.VERIFIED and not proof_job.verified_at:
             proof_job.verified_at = datetime.utcnow()
-        db.commit()
-        db.refresh(proof_job)
+        await db.commit()
+        await db.refresh(proof_job)
         
         # Optional L1 settlement (Atlantic) disabled for Stone-only path.
         logger.info("⏭️ Skipping Atlantic submission (Stone-only proof path).")
@@ -1322,8 +1651,8 @@ async def orchestrate_allocation(
                 proof_job.ekubo_pct = int(decision_data['ekubo_pct'])
                 proof_job.jediswap_risk = int(decision_data['jediswap_risk'])
                 proof_job.ekubo_risk = int(decision_data['ekubo_risk'])
-                db.commit()
-                db.refresh(proof_job)
+                await db.commit()
+                await db.refresh(proof_job)
                 
                 return OrchestrationResponse(
                     decision_id=int(decision_data['decision_id']),
@@ -1357,7 +1686,7 @@ async def orchestrate_allocation(
             if 'proof_job' in locals() and proof_job:
                 proof_job.status = ProofStatus.FAILED
                 proof_job.error = str(e.detail) if hasattr(e, "detail") else str(e)
-                db.commit()
+                await db.commit()
         except Exception:
             pass
         raise e
@@ -1367,7 +1696,7 @@ async def orchestrate_allocation(
             if 'proof_job' in locals() and proof_job:
                 proof_job.status = ProofStatus.FAILED
                 proof_job.error = str(e)
-                db.commit()
+                await db.commit()
         except Exception:
             pass
         raise HTTPException(
@@ -1379,7 +1708,7 @@ async def orchestrate_allocation(
 @router.post("/propose-allocation", response_model=ProposalResponse, tags=["Risk Engine"])
 async def propose_allocation(
     request: OrchestrationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate proof + allocation preview without executing on-chain.
@@ -1406,8 +1735,8 @@ async def propose_allocation(
             "jediswap_pct": jediswap_pct,
             "ekubo_pct": ekubo_pct,
         }
-        db.commit()
-        db.refresh(proof_job)
+        await db.commit()
+        await db.refresh(proof_job)
 
         can_execute = (proof_job.status == ProofStatus.VERIFIED)
         # NOTE: ALLOW_UNVERIFIED_EXECUTION bypass is deprecated.
@@ -1439,7 +1768,7 @@ async def propose_allocation(
             if proof_job:
                 proof_job.status = ProofStatus.FAILED
                 proof_job.error = str(e.detail) if hasattr(e, "detail") else str(e)
-                db.commit()
+                await db.commit()
         except Exception:
             pass
         raise e
@@ -1449,14 +1778,14 @@ async def propose_allocation(
             if proof_job:
                 proof_job.status = ProofStatus.FAILED
                 proof_job.error = str(e)
-                db.commit()
+                await db.commit()
         except Exception:
             pass
         raise HTTPException(status_code=500, detail=f"Proposal failed: {str(e)}")
 
 
 @router.post("/propose-from-market", response_model=ProposalResponse, tags=["Risk Engine"])
-async def propose_from_market(db: Session = Depends(get_db)):
+async def propose_from_market(db: AsyncSession = Depends(get_db)):
     """
     Generate proof + allocation preview using read-only mainnet-derived proxy metrics.
     """
@@ -1515,8 +1844,8 @@ async def propose_from_market(db: Session = Depends(get_db)):
         "jediswap_pct": jediswap_pct,
         "ekubo_pct": ekubo_pct,
     }
-    db.commit()
-    db.refresh(proof_job)
+    await db.commit()
+    await db.refresh(proof_job)
 
     can_execute = (proof_job.status == ProofStatus.VERIFIED)
     # STRICT MODE: No bypass allowed
@@ -1556,13 +1885,16 @@ async def propose_from_market(db: Session = Depends(get_db)):
 @router.post("/execute-allocation", response_model=OrchestrationResponse, tags=["Risk Engine"])
 async def execute_allocation(
     request: ExecuteRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Execute a previously proposed allocation once proof is verified.
     """
     try:
-        proof_job = db.query(ProofJob).filter(ProofJob.id == request.proof_job_id).first()
+        try:
+            proof_job = await db.get(ProofJob, uuid.UUID(request.proof_job_id))
+        except ValueError:
+            proof_job = None
         if not proof_job:
             raise HTTPException(status_code=404, detail="Proposal not found")
 
@@ -1586,6 +1918,19 @@ async def execute_allocation(
 
         # Build orchestration request from stored metrics
         metrics = proof_job.metrics or {}
+        if metrics.get("batch"):
+            # A batched job's fact covers the whole batch program, not this
+            # decision alone, and the RiskEngine gate cannot check the
+            # inclusion path against the batch root
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "Batched proof not executable",
+                    "message": "This proof job was proven in a batch; its fact is not the single-decision fact the RiskEngine verifies. Submit the allocation via /orchestrate-allocation instead.",
+                    "proof_job_id": str(proof_job.id),
+                    "batch_root": metrics["batch"].get("root"),
+                }
+            )
         jediswap_metrics = metrics.get("jediswap", {})
         ekubo_metrics = metrics.get("ekubo", {})
 
@@ -1639,7 +1984,7 @@ async def execute_allocation(
         # Detect ABI to determine if we need proof params and on-chain agent params
         rpc_urls = get_rpc_urls()
         abi_probe_url = rpc_urls[0] if rpc_urls else settings.STARKNET_RPC_URL
-        abi_client = FullNodeClient(node_url=abi_probe_url)
+        abi_client = get_rpc_client(abi_probe_url)
         onchain_inputs = await _get_risk_engine_onchain_inputs(abi_client)
         expects_proof_args = (onchain_inputs is None) or (onchain_inputs >= 7)
         expects_onchain_agent = (onchain_inputs is None) or (onchain_inputs >= 9)
@@ -1735,14 +2080,15 @@ async def execute_allocation(
         invoke_result, submit_rpc = await with_rpc_fallback(
             _submit_with_client_v3, urls=rpc_urls
         )
+        get_read_cache().note_write(call.to_addr)
 
         tx_hash = hex(invoke_result.transaction_hash)
         proof_job.tx_hash = tx_hash
         if proof_job.status != ProofStatus.VERIFIED:
             proof_job.status = ProofStatus.SUBMITTED
         proof_job.submitted_at = datetime.utcnow()
-        db.commit()
-        db.refresh(proof_job)
+        await db.commit()
+        await db.refresh(proof_job)
 
         wait_urls = [submit_rpc] + [url for url in rpc_urls if url != submit_rpc]
         receipt = await _wait_for_receipt_raw(
@@ -1783,8 +2129,8 @@ async def execute_allocation(
         proof_job.ekubo_pct = int(decision_data['ekubo_pct'])
         proof_job.jediswap_risk = int(decision_data['jediswap_risk'])
         proof_job.ekubo_risk = int(decision_data['ekubo_risk'])
-        db.commit()
-        db.refresh(proof_job)
+        await db.commit()
+        await db.refresh(proof_job)
 
         return OrchestrationResponse(
             decision_id=int(decision_data['decision_id']),
@@ -1818,7 +2164,7 @@ async def execute_allocation(
 
 
 @router.post("/orchestrate-from-market", response_model=OrchestrationResponse, tags=["Risk Engine"])
-async def orchestrate_from_market(db: Session = Depends(get_db)):
+async def orchestrate_from_market(db: AsyncSession = Depends(get_db)):
     """
     Orchestrate allocation using read-only mainnet-derived proxy metrics.
     This avoids fake testnet inputs while keeping execution optional.
@@ -1843,7 +2189,7 @@ async def orchestrate_from_market(db: Session = Depends(get_db)):
         }),
     )
 
-    return await orchestrate_allocation(request, db)
+    return await _run_orchestration(request, db)
 
 
 async def _canonical_integrity_pipeline(
@@ -1873,13 +2219,8 @@ async def _canonical_integrity_pipeline(
     
     try:
         # Step 1: Compile Cairo0 program (canonical Integrity approach)
-        cairo_program = repo_root / "verification" / "risk_example_cairo0.cairo"
-        if not cairo_program.exists():
-            raise FileNotFoundError(f"risk_example_cairo0.cairo not found at {cairo_program}")
-        
         logger.info("Step 1: Compiling Cairo0 program (canonical Integrity approach)...")
-        compiled_program = output_dir / "risk_compiled.json"
-        cairo_compile = _resolve_cairo0_compile_bin()
+        compiled_program = await get_cairo_compile_cache().get_compiled(RISK_PROGRAM_CAIRO0)
         
         program_input = {
             "jedi_utilization": jediswap_metrics["utilization"],
@@ -1895,24 +2236,7 @@ async def _canonical_integrity_pipeline(
         }
         program_input_file = output_dir / "risk_program_input.json"
         program_input_file.write_text(json.dumps(program_input))
-        
-        compile_cmd = [
-            cairo_compile,
-            str(cairo_program),
-            "--output",
-            str(compiled_program),
-            "--proof_mode",
-        ]
-        
-        logger.debug(f"Compile command: {' '.join(compile_cmd[:3])} ...")
-        subprocess.run(
-            compile_cmd,
-            capture_output=True,
-            text=True,
-            timeout=120,
-            check=True,
-        )
-        logger.info("✅ Compilation complete")
+        logger.info(f"✅ Compiled program ready: {compiled_program.name}")
         
         # Step 2: Run Cairo0 program to generate traces
         logger.info("Step 2: Running Cairo0 program to generate traces...")
@@ -1944,12 +2268,9 @@ async def _canonical_integrity_pipeline(
         
         logger.debug(f"Run command: {' '.join(run_cmd[:4])} ...")
         cairo_timeout = getattr(settings, "INTEGRITY_CAIRO_TIMEOUT", 300)
-        proc = subprocess.run(
+        proc = await run_subprocess(
             run_cmd,
-            capture_output=True,
-            text=True,
             timeout=cairo_timeout,
-            check=True,
         )
         if proc.stdout:
             logger.info(f"cairo-run output: {proc.stdout.strip().splitlines()[-1]}")
@@ -2024,13 +2345,9 @@ async def _canonical_integrity_pipeline(
         
         logger.info("Step 4: Running Stone prover with canonical parameters...")
         logger.debug(f"Command: {' '.join(prover_cmd[:3])} ...")
-        stone_timeout = getattr(settings, "INTEGRITY_CAIRO_TIMEOUT", 300)
-        proc = subprocess.run(
+        proc = await run_subprocess(
             prover_cmd,
-            capture_output=True,
-            text=True,
-            timeout=stone_timeout,
-            check=True,
+            timeout=settings.INTEGRITY_STONE_TIMEOUT,
         )
         logger.info("✅ Stone proof generation complete")
         
@@ -2070,7 +2387,11 @@ async def _canonical_integrity_pipeline(
             settings.INTEGRITY_PROOF_SERIALIZER_BIN
             or "/opt/obsqra.starknet/integrity/target/release/proof_serializer"
         )
-        calldata_body = serialize_stone_proof(proof_output_file, serializer_bin)
+        calldata_body = await serialize_stone_proof_async(
+            proof_output_file,
+            serializer_bin,
+            timeout=settings.INTEGRITY_SERIALIZER_TIMEOUT,
+        )
         calldata = [
             _string_to_felt(settings.INTEGRITY_LAYOUT),
             _string_to_felt(settings.INTEGRITY_HASHER),
@@ -1,14 +1,16 @@
 """Transaction tracking endpoints"""
 
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.db.session import get_db
 from app.models import User, Transaction
 from app.api.routes.auth import get_current_user
+from app.utils.pagination import keyset_page, next_page
 
 router = APIRouter()
 
@@ -44,16 +46,18 @@ async def create_transaction(
 
 @router.get("/")
 async def list_transactions(
+    response: Response,
     tx_type: str = Query(None),
     status: str = Query(None),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List user transactions."""
+    """List user transactions, newest first (keyset-paginated)."""
     query = select(Transaction).where(
         Transaction.user_id == current_user.id
-    ).order_by(desc(Transaction.created_at))
+    )
     
     if tx_type:
         query = query.where(Transaction.tx_type == tx_type)
@@ -61,10 +65,10 @@ async def list_transactions(
     if status:
         query = query.where(Transaction.status == status)
     
-    query = query.limit(limit)
+    query = keyset_page(query, Transaction.created_at, Transaction.id, cursor, limit)
     
     result = await db.execute(query)
-    transactions = result.scalars().all()
+    transactions = next_page(result.scalars().all(), limit, response)
     
     return [
         {
@@ -2,14 +2,19 @@
 Verification Status Endpoint
 Check if proofs are verified in FactRegistry
 """
+import logging
+import uuid
+from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.models import ProofJob
 from app.services.integrity_service import get_integrity_service
+from app.workers.prover_worker import queue_position
 from pydantic import BaseModel
 from typing import Optional
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -19,12 +24,20 @@ class VerificationStatusResponse(BaseModel):
     verified: bool
     verified_at: Optional[str]
     fact_registry_address: str
+    # Prover queue progress
+    status: Optional[str] = None
+    stage: Optional[str] = None
+    queue_position: Optional[int] = None
+    attempts: Optional[int] = None
+    elapsed_seconds: Optional[float] = None
+    error: Optional[str] = None
+    batch: Optional[dict] = None  # index/root/leaf/path when proven in a batch
 
 
 @router.get("/verification-status/{proof_job_id}", response_model=VerificationStatusResponse)
 async def get_verification_status(
     proof_job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Check verification status of a proof
@@ -33,12 +46,19 @@ async def get_verification_status(
     - Whether proof is verified in FactRegistry
     - Fact hash if verified
     - Verification timestamp
+    - Prover queue progress (status, stage, queue position) for queued jobs
     """
     # Get proof job
-    proof_job = db.query(ProofJob).filter(ProofJob.id == proof_job_id).first()
+    try:
+        proof_job = await db.get(ProofJob, uuid.UUID(proof_job_id))
+    except ValueError:
+        proof_job = None
     
     if not proof_job:
         raise HTTPException(status_code=404, detail="Proof job not found")
+    position = await queue_position(db, proof_job)
+    # Hand the connection back to the pool before the on-chain check
+    await db.commit()
     
     # Get fact hash
     fact_hash = proof_job.l2_fact_hash or proof_job.fact_hash
@@ -56,19 +76,27 @@ async def get_verification_status(
     # Get FactRegistry address
     fact_registry = hex(integrity.verifier_address)
     
+    started = proof_job.started_at or proof_job.created_at
     return VerificationStatusResponse(
         proof_job_id=str(proof_job.id),
         fact_hash=fact_hash,
         verified=verified,
         verified_at=proof_job.l2_verified_at.isoformat() if proof_job.l2_verified_at else None,
-        fact_registry_address=fact_registry
+        fact_registry_address=fact_registry,
+        status=proof_job.status.value if hasattr(proof_job.status, 'value') else str(proof_job.status),
+        stage=proof_job.stage,
+        queue_position=position,
+        attempts=proof_job.attempts,
+        elapsed_seconds=(datetime.utcnow() - started).total_seconds() if started else None,
+        error=proof_job.error,
+        batch=(proof_job.metrics or {}).get("batch"),
     )
 
 
 @router.get("/verify-fact-hash/{fact_hash}")
 async def verify_fact_hash_onchain(
     fact_hash: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Check if a fact hash is verified on-chain in FactRegistry
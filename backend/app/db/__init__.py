@@ -1,6 +1,6 @@
 """Database package"""
 from app.db.base_class import Base
-from app.db.session import get_db, SessionLocal, engine
+from app.db.session import get_db, AsyncSessionLocal, engine
 
-__all__ = ["Base", "get_db", "SessionLocal", "engine"]
+__all__ = ["Base", "get_db", "AsyncSessionLocal", "engine"]
 
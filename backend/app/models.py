@@ -1,8 +1,8 @@
 """SQLAlchemy Models for Obsqra"""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, ForeignKey, Text, Index
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 
 
@@ -48,6 +48,11 @@ class RiskHistory(Base):
     # Relationships
     user = relationship("User", back_populates="risk_histories")
 
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_risk_history_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
 
 class AllocationHistory(Base):
     """Historical allocation snapshots."""
@@ -66,6 +71,11 @@ class AllocationHistory(Base):
     # Relationships
     user = relationship("User", back_populates="allocation_histories")
 
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_allocation_history_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
 
 class Transaction(Base):
     """User transaction log."""
@@ -85,6 +95,11 @@ class Transaction(Base):
     # Relationships
     user = relationship("User", back_populates="transactions")
 
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_transactions_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
 
 class Prediction(Base):
     """ML predictions and optimizations."""
@@ -127,8 +142,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, String, DateTime, JSON, LargeBinary, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID as PostgreSQL_UUID
+from sqlalchemy import Column, String, DateTime, JSON, LargeBinary, BigInteger, Uuid, Enum as SQLEnum
 from pydantic import BaseModel
 
 
@@ -150,7 +164,7 @@ class ProofJob(Base):
     """
     __tablename__ = "proof_jobs"
 
-    id = Column(PostgreSQL_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)  # native UUID on PostgreSQL
     tx_hash = Column(String, nullable=True, index=True)
     proof_hash = Column(String, nullable=False, index=True)
     sharp_job_id = Column(String, nullable=True, index=True)
@@ -179,13 +193,24 @@ class ProofJob(Base):
     )
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     submitted_at = Column(DateTime, nullable=True)
     verified_at = Column(DateTime, nullable=True)
+
+    # Prover queue bookkeeping (see app/workers/prover_worker.py)
+    stage = Column(String, nullable=True, index=True)  # queued, tracing, proving, serializing, registering, executing, done
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
     
     # Data
     metrics = Column(JSON, nullable=False)  # Input protocol metrics
-    proof_data = Column(LargeBinary, nullable=True)  # Binary STARK proof
+    # Binary STARK proof lives in the proof blob store (app/services/proof_blob_store.py);
+    # proof_data only holds rows written before migration 007 and is never loaded implicitly
+    proof_blob_key = Column(String, nullable=True, index=True)  # SHA-256 of the proof bytes
+    proof_size_bytes = Column(Integer, nullable=True)
+    proof_data = deferred(Column(LargeBinary, nullable=True))
     error = Column(String, nullable=True)
     
     # Allocation decision results (from on-chain execution)
@@ -194,10 +219,62 @@ class ProofJob(Base):
     jediswap_risk = Column(Integer, nullable=True, default=0)
     ekubo_risk = Column(Integer, nullable=True, default=0)
     
+    __table_args__ = (
+        # /rebalance-history keyset pages, optionally filtered by status or network
+        Index("ix_proof_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_proof_jobs_network_created_at", "network", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<ProofJob {self.id} status={self.status}>"
 
 
+class ProofJobSummary(Base):
+    """
+    Rollup of proof_jobs per (network, status), kept in step with every
+    ProofJob flush (see app/services/proof_summary.py).
+    """
+    __tablename__ = "proof_job_summary"
+
+    network = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)  # ProofStatus value
+    job_count = Column(BigInteger, nullable=False, default=0)
+    l2_verified_count = Column(BigInteger, nullable=False, default=0)
+    l1_verified_count = Column(BigInteger, nullable=False, default=0)
+
+    # metrics["proof_generation_time_seconds"]
+    generation_time_count = Column(BigInteger, nullable=False, default=0)
+    generation_time_sum = Column(Float, nullable=False, default=0.0)
+    generation_time_min = Column(Float, nullable=True)
+    generation_time_max = Column(Float, nullable=True)
+
+    # proof_size_bytes, or metrics["proof_data_size_bytes"] for older rows
+    proof_size_count = Column(BigInteger, nullable=False, default=0)
+    proof_size_sum = Column(BigInteger, nullable=False, default=0)
+    proof_size_min = Column(BigInteger, nullable=True)
+    proof_size_max = Column(BigInteger, nullable=True)
+
+
+class PerformanceRollup(Base):
+    """
+    Executed rebalances (proof_jobs with a tx_hash) aggregated per closed
+    hour or day, written by app/workers/performance_compactor.py.
+
+    Sums rather than averages are stored so buckets combine exactly.
+    """
+    __tablename__ = "performance_rollups"
+
+    granularity = Column(String, primary_key=True)  # "hour" or "day"
+    bucket_start = Column(DateTime, primary_key=True)  # UTC, truncated to the granularity
+    rebalance_count = Column(BigInteger, nullable=False, default=0)
+    verified_count = Column(BigInteger, nullable=False, default=0)
+    jediswap_pct_sum = Column(BigInteger, nullable=False, default=0)  # basis points
+    ekubo_pct_sum = Column(BigInteger, nullable=False, default=0)  # basis points
+    jediswap_risk_sum = Column(BigInteger, nullable=False, default=0)
+    ekubo_risk_sum = Column(BigInteger, nullable=False, default=0)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 # Pydantic schemas for API
 
 class ProofMetrics(BaseModel):
@@ -236,6 +313,16 @@ class ProofJobResponse(BaseModel):
         from_attributes = True
 
 
+class ProofJobAcceptedResponse(BaseModel):
+    """Returned (HTTP 202) when a proof request is queued for the prover worker pool"""
+    proof_job_id: str
+    status: ProofStatus
+    stage: Optional[str]
+    queue_position: Optional[int]
+    status_url: str
+    message: str
+
+
 class ProofStatsResponse(BaseModel):
     """Proof statistics"""
     generating: int
@@ -9,10 +9,13 @@ from dataclasses import dataclass
 from enum import Enum
 import asyncio
 import logging
-import httpx
 from functools import lru_cache
 
+from starknet_py.net.client_models import Call
+
 from app.config import settings
+from app.utils.block_cache import get_read_cache
+from app.utils.rpc import RpcCallError, batch_call, get_rpc_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +119,6 @@ class AgentOrchestratorService:
         self.contract_address: str = ""
         self.rpc_url: str = ""
         self._initialized = False
-        self._client: Optional[httpx.AsyncClient] = None
     
     async def initialize(self) -> bool:
         """Initialize the service"""
@@ -128,9 +130,6 @@ class AgentOrchestratorService:
             self.rpc_url = getattr(settings, 'STARKNET_RPC_URL', 
                 "https://starknet-sepolia.g.alchemy.com/v2/EvhYN6geLrdvbYHVRgPJ7")
             
-            # Create HTTP client
-            self._client = httpx.AsyncClient(timeout=30.0)
-            
             # Mark as initialized
             self._initialized = True
             
@@ -149,10 +148,7 @@ class AgentOrchestratorService:
             await self.initialize()
     
     async def _rpc_call(self, method: str, params: Dict) -> Any:
-        """Make a JSON-RPC call to Starknet"""
-        if not self._client:
-            self._client = httpx.AsyncClient(timeout=30.0)
-        
+        """Make a JSON-RPC call to Starknet (pooled keep-alive client)"""
         payload = {
             "jsonrpc": "2.0",
             "method": method,
@@ -160,7 +156,7 @@ class AgentOrchestratorService:
             "id": 1
         }
         
-        response = await self._client.post(self.rpc_url, json=payload)
+        response = await get_rpc_http_client().post(self.rpc_url, json=payload)
         data = response.json()
         
         if "error" in data:
@@ -170,9 +166,6 @@ class AgentOrchestratorService:
     
     async def _call_contract_internal(self, selector: str, calldata: List[str] = None) -> List[str]:
         """Call a contract function (internal, no init check)"""
-        if not self._client:
-            self._client = httpx.AsyncClient(timeout=30.0)
-        
         params = {
             "request": {
                 "contract_address": self.contract_address,
@@ -236,16 +229,29 @@ class AgentOrchestratorService:
         await self.ensure_initialized()
         
         try:
-            # For now, return basic stats since we need proper selectors
-            version = await self.get_version()
+            # Version + all counters in one JSON-RPC batch round trip
+            names = ["get_version", "get_intent_count", "get_agent_count", "get_policy_count", "get_execution_count"]
+            contract = int(self.contract_address, 16)
+            results = await batch_call(
+                [Call(to_addr=contract, selector=int(SELECTORS[name], 16), calldata=[]) for name in names],
+                urls=[self.rpc_url],
+                return_exceptions=True,
+            )
+            values = {}
+            for name, result in zip(names, results):
+                if isinstance(result, RpcCallError) or not result:
+                    logger.debug(f"{name} unavailable: {result}")
+                    values[name] = 0
+                else:
+                    values[name] = result[0]
             
             return {
                 "contract_address": self.contract_address,
-                "version": version,
-                "intent_count": 0,
-                "agent_count": 0,
-                "policy_count": 0,
-                "execution_count": 0,
+                "version": self._felt_to_string(values["get_version"]) if values["get_version"] else "unknown",
+                "intent_count": values["get_intent_count"],
+                "agent_count": values["get_agent_count"],
+                "policy_count": values["get_policy_count"],
+                "execution_count": values["get_execution_count"],
                 "status": "operational"
             }
         except Exception as e:
@@ -258,13 +264,19 @@ class AgentOrchestratorService:
     
     async def is_registered_agent(self, agent_address: str) -> bool:
         """Check if an address is a registered agent"""
+        await self.ensure_initialized()
         try:
-            result = await self._call_contract(
-                SELECTORS["is_registered_agent"],
-                [agent_address]
+            # Cached per block at the polled head (dashboards re-check on every render)
+            (result,) = await get_read_cache().read(
+                [Call(
+                    to_addr=int(self.contract_address, 16),
+                    selector=int(SELECTORS["is_registered_agent"], 16),
+                    calldata=[int(agent_address, 16)],
+                )],
+                urls=[self.rpc_url],
             )
-            if result:
-                return int(result[0], 16) == 1
+            if result and not isinstance(result, RpcCallError):
+                return result[0] == 1
         except:
             pass
         return False
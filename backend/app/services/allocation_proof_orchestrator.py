@@ -189,7 +189,7 @@ async def allocation_proposal_create(
     )
     
     db.add(allocation)
-    db.commit()
+    await db.commit()
     
     return {
         "allocation_id": allocation_id,
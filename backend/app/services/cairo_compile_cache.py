@@ -0,0 +1,141 @@
+"""
+Compile-once cache for Cairo0 programs used in proof generation.
+
+The cairo0 proof path used to run ``cairo-compile --proof_mode`` for every
+proof, into a fresh temp dir. The compiled program only changes when the
+source or the compiler changes, so artifacts are stored under a key of
+sha256(source) + compiler version and reused by every later proof. The
+source hash is re-checked on each lookup, so editing the ``.cairo`` file
+invalidates the artifact without a restart. The cache is warmed at startup
+so the first proof does not pay for compilation either.
+
+Layout: ``<CAIRO_COMPILE_CACHE_DIR>/<program stem>-<key[:16]>.json``
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from app.config import get_settings
+from app.utils.async_subprocess import run_subprocess
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cairo_build"
+
+# Programs compiled ahead of time by warm()
+RISK_PROGRAM_CAIRO0 = _REPO_ROOT / "verification" / "risk_example_cairo0.cairo"
+RISK_BATCH_PROGRAM_CAIRO0 = _REPO_ROOT / "verification" / "risk_batch_cairo0.cairo"
+
+
+def resolve_cairo0_compile_bin() -> str:
+    candidates = [
+        os.environ.get("CAIRO_COMPILE_BIN"),
+        "cairo-compile",
+    ]
+    for candidate in candidates:
+        if not candidate:
+            continue
+        if Path(candidate).is_absolute():
+            if Path(candidate).exists():
+                return candidate
+        else:
+            resolved = shutil.which(candidate)
+            if resolved:
+                return resolved
+    raise FileNotFoundError("cairo-compile binary not found in PATH.")
+
+
+class CairoCompileCache:
+    """Compiled-artifact cache keyed by source hash and compiler version."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._compiler_versions: Dict[str, str] = {}
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+    async def _compiler_version(self, compiler: str) -> str:
+        version = self._compiler_versions.get(compiler)
+        if version is None:
+            try:
+                proc = await run_subprocess([compiler, "--version"], timeout=30, check=False)
+                version = (proc.stdout or proc.stderr).strip() or "unknown"
+            except Exception as e:  # noqa: BLE001 - fall back to binary identity
+                logger.warning("Could not read %s version: %s", compiler, e)
+                version = "unknown"
+            stat = Path(compiler).stat()
+            # Binary size/mtime catch in-place upgrades that keep the version string
+            version = f"{version}|{stat.st_size}|{int(stat.st_mtime)}"
+            self._compiler_versions[compiler] = version
+        return version
+
+    async def _key(self, source: Path, compiler: str) -> str:
+        digest = hashlib.sha256(source.read_bytes())
+        digest.update(b"\0")
+        digest.update((await self._compiler_version(compiler)).encode())
+        digest.update(b"\0--proof_mode")
+        return digest.hexdigest()
+
+    async def get_compiled(self, source: Path) -> Path:
+        """
+        Return the compiled ``--proof_mode`` JSON for ``source``, compiling on a miss.
+
+        Raises FileNotFoundError if the source or compiler is missing and
+        subprocess errors from cairo-compile on a failed compile.
+        """
+        source = Path(source)
+        if not source.exists():
+            raise FileNotFoundError(f"{source.name} not found at {source}")
+        compiler = resolve_cairo0_compile_bin()
+        key = await self._key(source, compiler)
+        artifact = self.root / f"{source.stem}-{key[:16]}.json"
+        if artifact.exists():
+            return artifact
+
+        lock = self._locks.setdefault(artifact, asyncio.Lock())
+        async with lock:
+            if artifact.exists():
+                return artifact
+            staging = artifact.with_suffix(f".tmp{os.getpid()}")
+            await run_subprocess(
+                [compiler, str(source), "--output", str(staging), "--proof_mode"],
+                timeout=settings.INTEGRITY_COMPILE_TIMEOUT,
+            )
+            os.replace(staging, artifact)
+            self._prune(source.stem, keep=artifact)
+            logger.info(f"✅ Compiled {source.name} -> {artifact.name}")
+        return artifact
+
+    def _prune(self, stem: str, keep: Path) -> None:
+        """Drop artifacts for previous versions of the same program."""
+        for old in self.root.glob(f"{stem}-*.json"):
+            if old != keep:
+                old.unlink(missing_ok=True)
+
+    async def warm(self, sources: Iterable[Path] = (RISK_PROGRAM_CAIRO0, RISK_BATCH_PROGRAM_CAIRO0)) -> None:
+        """Compile the proof programs ahead of the first request. Never raises."""
+        for source in sources:
+            try:
+                await self.get_compiled(source)
+            except Exception as e:  # noqa: BLE001 - proving may be disabled in this env
+                logger.info(f"ℹ️ Cairo compile cache not warmed for {Path(source).name}: {e}")
+
+
+_compile_cache: Optional[CairoCompileCache] = None
+
+
+def get_cairo_compile_cache() -> CairoCompileCache:
+    """Get the singleton compiled-program cache."""
+    global _compile_cache
+    if _compile_cache is None:
+        root = Path(settings.CAIRO_COMPILE_CACHE_DIR) if settings.CAIRO_COMPILE_CACHE_DIR else _DEFAULT_CACHE_DIR
+        _compile_cache = CairoCompileCache(root)
+    return _compile_cache
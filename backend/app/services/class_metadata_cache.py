@@ -0,0 +1,144 @@
+"""
+Class/ABI metadata cache keyed by class hash.
+
+Write paths used to call ``get_class_at`` on the backend wallet before every
+transaction (just to learn its Cairo version), and the RiskEngine signature
+check fetched the whole contract class to count ABI inputs. A class is
+immutable for a given class hash, so its metadata (Cairo version + ABI) is
+stored once per hash on disk and in memory. Only the cheap
+``get_class_hash_at`` lookup is repeated, and even that is memoized per
+address for CLASS_HASH_REFRESH_SEC; an upgraded contract gets a new class
+hash and so picks up fresh metadata automatically.
+
+Layout: ``<CLASS_METADATA_CACHE_DIR>/<class_hash hex>.json``
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starknet_py.net.client_models import SierraContractClass
+from starknet_py.net.full_node_client import FullNodeClient
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "class_cache"
+
+
+@dataclass
+class ClassMetadata:
+    class_hash: int
+    cairo_version: int  # 1 for Sierra classes, 0 for legacy Cairo0 classes
+    abi: list
+
+    def function_inputs(self, name: str) -> Optional[list]:
+        """ABI inputs of the named top-level function, or None if absent."""
+        for item in self.abi:
+            if item.get("type") == "function" and item.get("name") == name:
+                return item.get("inputs", [])
+        return None
+
+
+def _normalize_abi(abi) -> list:
+    if isinstance(abi, str):
+        abi = json.loads(abi)
+    if not isinstance(abi, list):
+        return []
+    return [entry for entry in abi if isinstance(entry, dict)]
+
+
+class ClassMetadataCache:
+    """Disk-backed class metadata keyed by class hash, with memoized address lookups."""
+
+    def __init__(self, root: Path, refresh_sec: float):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.refresh_sec = refresh_sec
+        self._by_hash: Dict[int, ClassMetadata] = {}
+        self._class_hash_at: Dict[int, Tuple[int, float]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def _path(self, class_hash: int) -> Path:
+        return self.root / f"{class_hash:#066x}.json"
+
+    def _load(self, class_hash: int) -> Optional[ClassMetadata]:
+        path = self._path(class_hash)
+        if not path.exists():
+            return None
+        try:
+            meta = ClassMetadata(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Discarding unreadable class metadata %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+        return meta if meta.class_hash == class_hash else None
+
+    def _store(self, meta: ClassMetadata) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(asdict(meta), f)
+        os.replace(tmp, self._path(meta.class_hash))
+
+    async def class_hash_at(self, client: FullNodeClient, address: int) -> int:
+        cached = self._class_hash_at.get(address)
+        if cached and time.monotonic() - cached[1] < self.refresh_sec:
+            return cached[0]
+        class_hash = await client.get_class_hash_at(contract_address=address, block_number="latest")
+        if cached and cached[0] != class_hash:
+            logger.info(f"🔄 Class hash changed for {hex(address)}: {hex(cached[0])} -> {hex(class_hash)}")
+        self._class_hash_at[address] = (class_hash, time.monotonic())
+        return class_hash
+
+    async def get(self, client: FullNodeClient, address: int) -> ClassMetadata:
+        """Metadata for the class currently deployed at ``address``."""
+        class_hash = await self.class_hash_at(client, address)
+        meta = self._by_hash.get(class_hash)
+        if meta is not None:
+            return meta
+        async with self._locks.setdefault(class_hash, asyncio.Lock()):
+            meta = self._by_hash.get(class_hash) or self._load(class_hash)
+            if meta is None:
+                contract_class = await client.get_class_by_hash(class_hash=class_hash)
+                meta = ClassMetadata(
+                    class_hash=class_hash,
+                    cairo_version=1 if isinstance(contract_class, SierraContractClass) else 0,
+                    abi=_normalize_abi(getattr(contract_class, "abi", None)),
+                )
+                self._store(meta)
+                logger.info(f"📦 Cached class metadata for {hex(class_hash)[:18]}... (cairo {meta.cairo_version})")
+            self._by_hash[class_hash] = meta
+        return meta
+
+    async def cairo_version(self, client: FullNodeClient, address: int, default: int = 1) -> int:
+        """Cairo version of the account/contract at ``address`` (``default`` if it can't be resolved)."""
+        try:
+            return (await self.get(client, address)).cairo_version
+        except Exception as err:
+            logger.warning("⚠️ Could not resolve account Cairo version; defaulting to Cairo %s: %s", default, err)
+            return default
+
+    def invalidate(self, address: int) -> None:
+        """Force the next lookup for ``address`` to re-read its class hash."""
+        self._class_hash_at.pop(address, None)
+
+
+_class_cache: Optional[ClassMetadataCache] = None
+
+
+def get_class_metadata_cache() -> ClassMetadataCache:
+    """Get the singleton class metadata cache."""
+    global _class_cache
+    if _class_cache is None:
+        root = Path(settings.CLASS_METADATA_CACHE_DIR) if settings.CLASS_METADATA_CACHE_DIR else _DEFAULT_CACHE_DIR
+        _class_cache = ClassMetadataCache(root, settings.CLASS_HASH_REFRESH_SEC)
+    return _class_cache
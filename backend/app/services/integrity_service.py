@@ -13,7 +13,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.net.client_models import Call, ResourceBounds, ResourceBoundsMapping, SierraContractClass
+from starknet_py.net.client_models import Call, ResourceBounds, ResourceBoundsMapping
 from starknet_py.contract import Contract
 from starknet_py.net.account.account import Account
 from starknet_py.net.signer.stark_curve_signer import KeyPair
@@ -21,7 +21,9 @@ from starknet_py.net.models import StarknetChainId
 from starknet_py.hash.selector import get_selector_from_name
 
 from app.config import get_settings
-from app.utils.rpc import get_rpc_urls, with_rpc_fallback
+from app.services.class_metadata_cache import get_class_metadata_cache
+from app.utils.block_cache import get_read_cache
+from app.utils.rpc import contract_read, get_rpc_client, get_rpc_urls, with_rpc_fallback
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -115,15 +117,7 @@ class IntegrityService:
             key_pair=key_pair,
             chain=self.chain_id,
         )
-        try:
-            contract_class = await client.get_class_at(
-                contract_address=account.address,
-                block_number="latest",
-            )
-            account._cairo_version = 1 if isinstance(contract_class, SierraContractClass) else 0
-        except Exception as err:
-            account._cairo_version = 1
-            logger.warning("⚠️ Could not resolve account Cairo version; defaulting to Cairo 1: %s", err)
+        account._cairo_version = await get_class_metadata_cache().cairo_version(client, account.address)
         return account
 
     @staticmethod
@@ -528,28 +522,29 @@ class IntegrityService:
             else:
                 fact_hash_int = fact_hash
             
-            async def _call(client: FullNodeClient, _rpc_url: str):
-                abi = _load_integrity_abi()
-                contract = Contract(
-                    address=self.verifier_address,
-                    abi=abi,
-                    provider=client,
-                )
-
-                if "get_all_verifications_for_fact_hash" not in contract.functions:
-                    logger.error("Integrity FactRegistry ABI missing get_all_verifications_for_fact_hash")
-                    return False
-
-                result = await contract.functions["get_all_verifications_for_fact_hash"].call(
-                    fact_hash_int,
-                    block_number="latest",
-                )
+            abi = _load_integrity_abi()
+            contract = Contract(
+                address=self.verifier_address,
+                abi=abi,
+                provider=get_rpc_client(self.rpc_urls[0] if self.rpc_urls else None),
+            )
+            if "get_all_verifications_for_fact_hash" not in contract.functions:
+                logger.error("Integrity FactRegistry ABI missing get_all_verifications_for_fact_hash")
+                return False
 
+            def _is_verified(result) -> bool:
                 # starknet_py returns tuples; normalize to a list-like object
                 verifications = result[0] if isinstance(result, tuple) and result else result
                 return bool(verifications) and len(verifications) > 0
 
-            is_valid, _ = await with_rpc_fallback(_call, urls=self.rpc_urls)
+            # Registered facts never disappear, so only positive answers are cached;
+            # a fact registered moments ago is re-read until it shows up.
+            (result,) = await get_read_cache().read_contract(
+                [contract_read(contract, "get_all_verifications_for_fact_hash", fact_hash_int)],
+                urls=self.rpc_urls,
+                cache_if=_is_verified,
+            )
+            is_valid = _is_verified(result)
             
             logger.info(
                 f"L2 verification result: {is_valid} for fact_hash {hex(fact_hash_int)[:16]}... "
@@ -590,7 +585,7 @@ class IntegrityService:
 
                 return None
 
-            result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls)
+            result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls, hedge=True)
             return result
         except Exception as e:
             logger.debug(f"Could not get verification hash: {e}")
@@ -91,6 +91,7 @@ class MarketDataService:
         (block_number, block_hash, timestamp), rpc_used = await with_rpc_fallback(
             _fetch_block,
             urls=self.rpc_urls,
+            hedge=True,
         )
         block_hash_hex = block_hash if isinstance(block_hash, str) else hex(block_hash)
 
@@ -14,10 +14,12 @@ from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.account.account import Account
 from starknet_py.net.signer.stark_curve_signer import KeyPair
 from starknet_py.net.models import StarknetChainId
-from starknet_py.net.client_models import ResourceBounds, ResourceBoundsMapping, SierraContractClass
+from starknet_py.net.client_models import ResourceBounds, ResourceBoundsMapping
 
 from app.config import get_settings
-from app.utils.rpc import get_rpc_urls, with_rpc_fallback
+from app.services.class_metadata_cache import get_class_metadata_cache
+from app.utils.block_cache import get_read_cache
+from app.utils.rpc import RpcCallError, batch_contract_calls, contract_read, get_rpc_client, get_rpc_urls, with_rpc_fallback
 from app.services.model_service import ModelService
 
 logger = logging.getLogger(__name__)
@@ -122,15 +124,7 @@ async def _init_backend_account(client: FullNodeClient, key_pair: KeyPair, chain
         key_pair=key_pair,
         chain=chain_id,
     )
-    try:
-        contract_class = await client.get_class_at(
-            contract_address=account.address,
-            block_number="latest",
-        )
-        account._cairo_version = 1 if isinstance(contract_class, SierraContractClass) else 0
-    except Exception as err:
-        account._cairo_version = 1
-        logger.warning("⚠️ Could not resolve account Cairo version; defaulting to Cairo 1: %s", err)
+    account._cairo_version = await get_class_metadata_cache().cairo_version(client, account.address)
     return account
 
 
@@ -153,12 +147,14 @@ class ModelRegistryService:
             provider=provider_override or client,
         )
 
-    async def get_current_model(self) -> Optional[dict]:
-        async def _call(client: FullNodeClient, _rpc_url: str):
-            contract = await self._get_contract(client)
-            return await contract.functions["get_current_model"].call(block_number="latest")
-
-        result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls)
+    async def get_current_model(self, block_number: int | str = "latest") -> Optional[dict]:
+        """Active model; cached per block (pass ``block_number`` to read a historical block)."""
+        contract = await self._get_contract(get_rpc_client(self.rpc_urls[0] if self.rpc_urls else None))
+        (result,) = await get_read_cache().read_contract(
+            [contract_read(contract, "get_current_model")],
+            block_number=block_number,
+            urls=self.rpc_urls,
+        )
         return _normalize_model_version(result)
 
     async def get_model_version(self, version_felt: int) -> Optional[dict]:
@@ -166,15 +162,34 @@ class ModelRegistryService:
             contract = await self._get_contract(client)
             return await contract.functions["get_model_version"].call(version_felt, block_number="latest")
 
-        result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls)
+        result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls, hedge=True)
         return _normalize_model_version(result)
 
+    async def get_model_versions(self, version_felts: list[int]) -> list[Optional[dict]]:
+        """Fetch several model versions in one JSON-RPC batch (same order as input)."""
+        if not version_felts:
+            return []
+        contract = await self._get_contract(get_rpc_client(self.rpc_urls[0] if self.rpc_urls else None))
+        results = await batch_contract_calls(
+            [contract_read(contract, "get_model_version", v) for v in version_felts],
+            urls=self.rpc_urls,
+            return_exceptions=True,
+        )
+        versions = []
+        for version_felt, result in zip(version_felts, results):
+            if isinstance(result, RpcCallError):
+                logger.warning("get_model_version(%s) failed: %s", version_felt, result)
+                versions.append(None)
+            else:
+                versions.append(_normalize_model_version(result))
+        return versions
+
     async def get_model_history(self) -> list[int]:
         async def _call(client: FullNodeClient, _rpc_url: str):
             contract = await self._get_contract(client)
             return await contract.functions["get_model_history"].call(block_number="latest")
 
-        result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls)
+        result, _ = await with_rpc_fallback(_call, urls=self.rpc_urls, hedge=True)
         # Result may be a list of felts or a tuple with one list.
         if isinstance(result, (list, tuple)) and len(result) == 1 and isinstance(result[0], list):
             return [int(v) for v in result[0]]
@@ -206,6 +221,7 @@ class ModelRegistryService:
             return invoke_result
 
         result, _ = await with_rpc_fallback(_invoke, urls=self.rpc_urls)
+        get_read_cache().note_write(self.registry_address)
         return int(result.hash)
 
     def get_local_model_info(self) -> dict:
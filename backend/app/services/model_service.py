@@ -29,9 +29,9 @@ async def get_model_params(version: int) -> dict[str, Any]:
     Returns dict with keys: w_utilization, w_volatility, w_liquidity_0..3, w_audit, w_age, age_cap_days, clamp_min, clamp_max.
     """
     from app.config import get_settings
-    from app.utils.rpc import get_rpc_urls, with_rpc_fallback
+    from app.utils.block_cache import get_read_cache
+    from app.utils.rpc import contract_read, get_rpc_client, get_rpc_urls
     from starknet_py.contract import Contract
-    from starknet_py.net.full_node_client import FullNodeClient
 
     settings = get_settings()
     if not getattr(settings, "PARAMETERIZED_MODEL_ENABLED", False):
@@ -39,40 +39,41 @@ async def get_model_params(version: int) -> dict[str, Any]:
 
     abi = _load_risk_engine_abi()
     rpc_urls = get_rpc_urls()
-    for url in rpc_urls:
-        try:
-            client = FullNodeClient(node_url=url)
-            contract = Contract(
-                address=int(settings.RISK_ENGINE_ADDRESS, 16),
-                abi=abi,
-                provider=client,
-            )
-            result = await contract.functions["get_model_params"].call(version)
-            # Result is a named tuple or tuple of 11 felt252s in order
-            if hasattr(result, "as_tuple"):
-                t = result.as_tuple()
-            elif isinstance(result, (list, tuple)):
-                t = tuple(result)
-            else:
-                t = (result,)
-            if len(t) >= 11:
-                return {
-                    "w_utilization": t[0],
-                    "w_volatility": t[1],
-                    "w_liquidity_0": t[2],
-                    "w_liquidity_1": t[3],
-                    "w_liquidity_2": t[4],
-                    "w_liquidity_3": t[5],
-                    "w_audit": t[6],
-                    "w_age": t[7],
-                    "age_cap_days": t[8],
-                    "clamp_min": t[9],
-                    "clamp_max": t[10],
-                }
-            return _default_model_params()
-        except Exception as e:
-            logger.warning("get_model_params RPC attempt failed: %s", e)
-            continue
+    try:
+        contract = Contract(
+            address=int(settings.RISK_ENGINE_ADDRESS, 16),
+            abi=abi,
+            provider=get_rpc_client(rpc_urls[0]),
+        )
+        # Served from the block-aware cache between blocks (fails over across rpc_urls)
+        (result,) = await get_read_cache().read_contract(
+            [contract_read(contract, "get_model_params", version)],
+            urls=rpc_urls,
+        )
+    except Exception as e:
+        logger.warning("get_model_params RPC call failed: %s", e)
+        return _default_model_params()
+    # Result is a named tuple or tuple of 11 felt252s in order
+    if hasattr(result, "as_tuple"):
+        t = result.as_tuple()
+    elif isinstance(result, (list, tuple)):
+        t = tuple(result)
+    else:
+        t = (result,)
+    if len(t) >= 11:
+        return {
+            "w_utilization": t[0],
+            "w_volatility": t[1],
+            "w_liquidity_0": t[2],
+            "w_liquidity_1": t[3],
+            "w_liquidity_2": t[4],
+            "w_liquidity_3": t[5],
+            "w_audit": t[6],
+            "w_age": t[7],
+            "age_cap_days": t[8],
+            "clamp_min": t[9],
+            "clamp_max": t[10],
+        }
     return _default_model_params()
 
 
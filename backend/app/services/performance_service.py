@@ -2,49 +2,130 @@
 Performance Tracking Service
 
 Calculates actual performance metrics from on-chain execution data.
+
+Window queries read the hourly/daily ``performance_rollups`` written by
+app/workers/performance_compactor.py for closed buckets, and aggregate raw
+proof_jobs rows (in SQL) only for the partial buckets at the edges of the
+window and for hours the compactor has not reached yet.
 """
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import math
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from app.models import ProofJob
+from sqlalchemy import case, func, desc, or_
+from app.config import get_settings
+from app.models import PerformanceRollup, ProofJob, ProofStatus
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+TIMELINE_RESOLUTIONS = ("auto", "raw", "hour", "day")
+ROLLUP_FIELDS = (
+    "rebalance_count",
+    "verified_count",
+    "jediswap_pct_sum",
+    "ekubo_pct_sum",
+    "jediswap_risk_sum",
+    "ekubo_risk_sum",
+)
+
+Range = Tuple[datetime, datetime]
+
+
+def floor_bucket(ts: datetime, granularity: str) -> datetime:
+    """Start of the hour/day bucket containing ``ts``."""
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_bucket(ts: datetime, granularity: str) -> datetime:
+    floor = floor_bucket(ts, granularity)
+    return floor if floor == ts else floor + GRANULARITIES[granularity]
+
+
+def bucket_expr(column, granularity: str, dialect: str):
+    """SQL expression truncating a timestamp column to its hour/day bucket."""
+    if dialect == "postgresql":
+        return func.date_trunc(granularity, column)
+    if dialect == "sqlite":
+        fmt = "%Y-%m-%d %H:00:00" if granularity == "hour" else "%Y-%m-%d 00:00:00"
+        return func.strftime(fmt, column)
+    raise NotImplementedError(f"Performance rollups are not supported on {dialect}")
+
+
+def as_datetime(value) -> datetime:
+    """Bucket value returned by bucket_expr (SQLite yields strings)."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def as_naive_utc(ts: datetime) -> datetime:
+    """proof_jobs timestamps are naive UTC; normalize client-supplied datetimes."""
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def executed_aggregates() -> tuple:
+    """SQL aggregates over executed proof_jobs, matching the rollup sum columns."""
+    verified = or_(ProofJob.status == ProofStatus.VERIFIED, ProofJob.verified_at.isnot(None))
+    return (
+        func.count().label("rebalance_count"),
+        func.coalesce(func.sum(case((verified, 1), else_=0)), 0).label("verified_count"),
+        func.coalesce(func.sum(ProofJob.jediswap_pct), 0).label("jediswap_pct_sum"),
+        func.coalesce(func.sum(ProofJob.ekubo_pct), 0).label("ekubo_pct_sum"),
+        func.coalesce(func.sum(ProofJob.jediswap_risk), 0).label("jediswap_risk_sum"),
+        func.coalesce(func.sum(ProofJob.ekubo_risk), 0).label("ekubo_risk_sum"),
+    )
+
+
+def empty_sums() -> Dict[str, int]:
+    return dict.fromkeys(ROLLUP_FIELDS, 0)
+
+
+def add_sums(into: Dict[str, int], row) -> Dict[str, int]:
+    """Add a rollup row / aggregate row / sums dict into ``into``."""
+    for field in ROLLUP_FIELDS:
+        value = row[field] if isinstance(row, dict) else getattr(row, field)
+        into[field] += int(value or 0)
+    return into
 
 
 class PerformanceService:
     """Service for calculating performance metrics from on-chain data"""
-    
+
     def __init__(self, db: Session):
         self.db = db
-    
+        self._covered_until: Optional[datetime] = None
+        self._covered_loaded = False
+
     def calculate_portfolio_performance(
         self,
         user_address: Optional[str] = None,
-        days: int = 30
+        days: int = 30,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> Dict:
         """
         Calculate portfolio performance metrics from executed transactions.
-        
+
         Args:
             user_address: Optional user address to filter by
-            days: Number of days to analyze
-        
+            days: Number of days to analyze (ending now) when no range is given
+            start: Optional window start (UTC)
+            end: Optional window end (UTC, defaults to now)
+
         Returns:
             Dictionary with performance metrics
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Get all executed rebalances (proof jobs with tx_hash)
-        query = self.db.query(ProofJob).filter(
-            ProofJob.created_at >= cutoff_date,
-            ProofJob.tx_hash.isnot(None)
-        ).order_by(desc(ProofJob.created_at))
-        
-        rebalances = query.all()
-        
-        if not rebalances:
+        explicit_range = start is not None or end is not None
+        start, end = self._window(days, start, end)
+        totals = self._window_sums(start, end)
+        total_rebalances = totals["rebalance_count"]
+
+        if not total_rebalances:
             return {
                 "total_rebalances": 0,
                 "total_yield_earned": 0.0,
@@ -56,45 +137,52 @@ class PerformanceService:
                     "worst_day": None,
                 }
             }
-        
-        # Calculate metrics
-        total_rebalances = len(rebalances)
-        
-        # Calculate average allocation
-        jediswap_total = sum(r.jediswap_pct or 0 for r in rebalances)
-        ekubo_total = sum(r.ekubo_pct or 0 for r in rebalances)
-        avg_jediswap = (jediswap_total / total_rebalances) / 100 if total_rebalances > 0 else 50.0
-        avg_ekubo = (ekubo_total / total_rebalances) / 100 if total_rebalances > 0 else 50.0
-        
-        # Get latest rebalance for current state
-        latest = rebalances[0] if rebalances else None
 
-        verified_count = sum(1 for r in rebalances if str(getattr(r, "status", "")).lower() == "verified")
-        
+        span_days = (end - start).total_seconds() / 86400
+        averages = _averages(totals)
+
+        # Latest rebalance for current state (index on created_at)
+        latest = self.db.query(
+            ProofJob.created_at,
+            ProofJob.tx_hash,
+            ProofJob.jediswap_pct,
+            ProofJob.ekubo_pct,
+        ).filter(
+            ProofJob.created_at >= start,
+            ProofJob.created_at < end,
+            ProofJob.tx_hash.isnot(None)
+        ).order_by(desc(ProofJob.created_at)).first()
+
+        verified_count = totals["verified_count"]
+
         return {
             "total_rebalances": total_rebalances,
-            "period_days": days,
+            "period_days": round(span_days, 2) if explicit_range else days,
             "average_allocation": {
-                "jediswap": round(avg_jediswap, 2),
-                "ekubo": round(avg_ekubo, 2),
+                "jediswap": averages["jediswap_pct"],
+                "ekubo": averages["ekubo_pct"],
+            },
+            "average_risk": {
+                "jediswap": averages["jediswap_risk"],
+                "ekubo": averages["ekubo_risk"],
             },
             "latest_rebalance": {
-                "timestamp": latest.created_at.isoformat() if latest else None,
-                "jediswap_pct": (latest.jediswap_pct / 100) if latest and latest.jediswap_pct else 0,
-                "ekubo_pct": (latest.ekubo_pct / 100) if latest and latest.ekubo_pct else 0,
-                "tx_hash": latest.tx_hash if latest else None,
+                "timestamp": latest.created_at.isoformat(),
+                "jediswap_pct": (latest.jediswap_pct / 100) if latest.jediswap_pct else 0,
+                "ekubo_pct": (latest.ekubo_pct / 100) if latest.ekubo_pct else 0,
+                "tx_hash": latest.tx_hash,
             } if latest else None,
             "rebalance_frequency": {
-                "per_day": round(total_rebalances / days, 2) if days > 0 else 0,
-                "per_week": round(total_rebalances / (days / 7), 2) if days > 0 else 0,
+                "per_day": round(total_rebalances / span_days, 2) if span_days > 0 else 0,
+                "per_week": round(total_rebalances / (span_days / 7), 2) if span_days > 0 else 0,
             },
             "proof_metrics": {
                 "total_proofs": total_rebalances,
                 "verified_count": verified_count,
-                "verified_percentage": round((verified_count / total_rebalances * 100) if total_rebalances > 0 else 0, 1),
+                "verified_percentage": round(verified_count / total_rebalances * 100, 1),
             }
         }
-    
+
     def calculate_yield_estimate(
         self,
         portfolio_value: float,
@@ -135,38 +223,91 @@ class PerformanceService:
             "annual_yield_estimate": round(portfolio_value * weighted_apy / 100, 2),
             "projection_days": days,
         }
-    
+
     def get_performance_timeline(
         self,
-        days: int = 30
+        days: int = 30,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        resolution: str = "auto",
+        max_points: Optional[int] = None,
     ) -> List[Dict]:
         """
-        Get performance timeline with rebalance history.
-        
+        Get performance timeline with rebalance history, newest first.
+
         Args:
-            days: Number of days to retrieve
-        
+            days: Number of days to retrieve (ending now) when no range is given
+            start: Optional window start (UTC)
+            end: Optional window end (UTC, defaults to now)
+            resolution: "raw" (one entry per rebalance), "hour", "day", or
+                "auto" (raw if the window has at most ``max_points``
+                rebalances, else the finest bucket that fits)
+            max_points: Upper bound on returned entries; buckets are merged
+                into wider ones (e.g. "3d") to stay under it
+
         Returns:
-            List of rebalance events with performance data
+            List of rebalance events or aggregated buckets with performance data
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        rebalances = self.db.query(ProofJob).filter(
-            ProofJob.created_at >= cutoff_date,
+        start, end = self._window(days, start, end)
+        max_points = max(1, max_points or settings.PERFORMANCE_TIMELINE_MAX_POINTS)
+
+        if resolution == "auto":
+            rebalances = self._window_sums(start, end)["rebalance_count"]
+            if rebalances <= max_points:
+                resolution = "raw"
+            elif (end - start) / GRANULARITIES["hour"] <= max_points:
+                resolution = "hour"
+            else:
+                resolution = "day"
+        if resolution == "raw":
+            return self._raw_timeline(start, end, max_points)
+
+        width = GRANULARITIES[resolution]
+        origin = floor_bucket(start, resolution)
+        step = max(1, math.ceil((end - origin) / width / max_points))
+
+        merged: Dict[datetime, Dict[str, int]] = {}
+        for bucket_start, sums in self._bucket_sums(start, end, resolution).items():
+            key = origin + ((bucket_start - origin) // (width * step)) * (width * step)
+            add_sums(merged.setdefault(key, empty_sums()), sums)
+
+        label = resolution if step == 1 else f"{step}{resolution[0]}"
+        return [
+            {
+                "timestamp": key.isoformat(),
+                "resolution": label,
+                "rebalances": sums["rebalance_count"],
+                "verified_count": sums["verified_count"],
+                **_averages(sums),
+            }
+            for key, sums in sorted(merged.items(), reverse=True)
+            if sums["rebalance_count"]
+        ]
+
+    def _raw_timeline(self, start: datetime, end: datetime, limit: int) -> List[Dict]:
+        rebalances = self.db.query(
+            ProofJob.created_at,
+            ProofJob.tx_hash,
+            ProofJob.proof_hash,
+            ProofJob.status,
+            ProofJob.verified_at,
+            ProofJob.jediswap_pct,
+            ProofJob.ekubo_pct,
+            ProofJob.jediswap_risk,
+            ProofJob.ekubo_risk,
+        ).filter(
+            ProofJob.created_at >= start,
+            ProofJob.created_at < end,
             ProofJob.tx_hash.isnot(None)
-        ).order_by(desc(ProofJob.created_at)).all()
-        
+        ).order_by(desc(ProofJob.created_at)).limit(limit).all()
+
         timeline = []
         for rebalance in rebalances:
-            verified = False
-            status_val = str(getattr(rebalance, "status", "")).lower()
-            if hasattr(rebalance, "verified_at") and rebalance.verified_at:
-                verified = True
-            elif status_val == "verified":
-                verified = True
+            verified = bool(rebalance.verified_at) or rebalance.status == ProofStatus.VERIFIED
 
             timeline.append({
                 "timestamp": rebalance.created_at.isoformat(),
+                "resolution": "raw",
                 "jediswap_pct": (rebalance.jediswap_pct / 100) if rebalance.jediswap_pct else 0,
                 "ekubo_pct": (rebalance.ekubo_pct / 100) if rebalance.ekubo_pct else 0,
                 "jediswap_risk": rebalance.jediswap_risk or 0,
@@ -176,5 +317,92 @@ class PerformanceService:
                 "proof_status": rebalance.status.value if hasattr(rebalance.status, 'value') else str(rebalance.status),
                 "verified": verified,
             })
-        
+
         return timeline
+
+    @staticmethod
+    def _window(days: int, start: Optional[datetime], end: Optional[datetime]) -> Range:
+        end = as_naive_utc(end) if end else datetime.utcnow()
+        start = as_naive_utc(start) if start else end - timedelta(days=days)
+        return start, end
+
+    def _window_sums(self, start: datetime, end: datetime) -> Dict[str, int]:
+        totals = empty_sums()
+        for sums in self._bucket_sums(start, end, "day").values():
+            add_sums(totals, sums)
+        return totals
+
+    def _bucket_sums(self, start: datetime, end: datetime, granularity: str) -> Dict[datetime, Dict[str, int]]:
+        """
+        Sums per ``granularity`` bucket over [start, end).
+
+        Closed, compacted buckets come from performance_rollups. Partial day
+        buckets are filled from hourly rollups, and whatever no rollup
+        covers (partial hours, hours not compacted yet) from raw rows.
+        """
+        buckets: Dict[datetime, Dict[str, int]] = {}
+        if start >= end:
+            return buckets
+
+        covered, uncovered = self._split(start, end, granularity)
+        if covered:
+            rows = self.db.query(PerformanceRollup).filter(
+                PerformanceRollup.granularity == granularity,
+                PerformanceRollup.bucket_start >= covered[0],
+                PerformanceRollup.bucket_start < covered[1],
+                PerformanceRollup.rebalance_count > 0,
+            ).all()
+            for row in rows:
+                buckets[row.bucket_start] = add_sums(empty_sums(), row)
+
+        for lo, hi in uncovered:
+            if granularity == "day":
+                parts = self._bucket_sums(lo, hi, "hour").items()
+            else:
+                parts = self._raw_bucket_sums(lo, hi, granularity).items()
+            for bucket_start, sums in parts:
+                add_sums(buckets.setdefault(floor_bucket(bucket_start, granularity), empty_sums()), sums)
+        return buckets
+
+    def _split(self, start: datetime, end: datetime, granularity: str) -> Tuple[Optional[Range], List[Range]]:
+        """Split [start, end) into whole compacted buckets and the ranges left over."""
+        covered_until = self._compacted_until()
+        lo = ceil_bucket(start, granularity)
+        hi = floor_bucket(min(end, covered_until), granularity) if covered_until else lo
+        if lo >= hi:
+            return None, [(start, end)]
+        uncovered = [(a, b) for a, b in ((start, lo), (hi, end)) if a < b]
+        return (lo, hi), uncovered
+
+    def _compacted_until(self) -> Optional[datetime]:
+        """End of the last hour the compactor has rolled up (None before its first pass)."""
+        if not self._covered_loaded:
+            latest = self.db.query(func.max(PerformanceRollup.bucket_start)).filter(
+                PerformanceRollup.granularity == "hour"
+            ).scalar()
+            self._covered_until = as_datetime(latest) + GRANULARITIES["hour"] if latest else None
+            self._covered_loaded = True
+        return self._covered_until
+
+    def _raw_bucket_sums(self, start: datetime, end: datetime, granularity: str) -> Dict[datetime, Dict[str, int]]:
+        bucket = bucket_expr(ProofJob.created_at, granularity, self.db.get_bind().dialect.name).label("bucket")
+        rows = self.db.query(bucket, *executed_aggregates()).filter(
+            ProofJob.created_at >= start,
+            ProofJob.created_at < end,
+            ProofJob.tx_hash.isnot(None)
+        ).group_by(bucket).all()
+        return {as_datetime(row.bucket): add_sums(empty_sums(), row) for row in rows}
+
+
+def _averages(sums: Dict[str, int]) -> Dict[str, float]:
+    """Per-rebalance averages (allocation in percent) of a sums dict."""
+    count = sums["rebalance_count"]
+    if not count:
+        return {"jediswap_pct": 0, "ekubo_pct": 0, "jediswap_risk": 0, "ekubo_risk": 0, "verified_ratio": 0}
+    return {
+        "jediswap_pct": round(sums["jediswap_pct_sum"] / count / 100, 2),
+        "ekubo_pct": round(sums["ekubo_pct_sum"] / count / 100, 2),
+        "jediswap_risk": round(sums["jediswap_risk_sum"] / count, 2),
+        "ekubo_risk": round(sums["ekubo_risk_sum"] / count, 2),
+        "verified_ratio": round(sums["verified_count"] / count, 4),
+    }
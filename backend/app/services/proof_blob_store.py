@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk store for STARK proof blobs.
+
+Stone proofs are several hundred KB. Keeping them in ``proof_jobs.proof_data``
+made every ``SELECT * FROM proof_jobs`` drag the blobs over the wire, so proof
+bytes now live on disk and the row only keeps ``proof_blob_key`` (the SHA-256
+of the uncompressed proof) and ``proof_size_bytes``.
+
+Layout on disk (sharded by key, zstd-compressed, written atomically)::
+
+    <PROOF_BLOB_DIR>/<key[:2]>/<key[2:4]>/<key>.zst
+
+Identical proofs map to the same file, so storing a proof twice is free.
+Reads stream the decompressed bytes in chunks and can start at an offset,
+which backs HTTP range requests on ``/analytics/proof/{id}/download``.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+import zstandard
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_DEFAULT_BLOB_DIR = Path(__file__).resolve().parents[2] / "data" / "proof_blobs"
+
+# Largest zstd frame header; enough to read the stored content size
+_ZSTD_MAX_HEADER = 18
+CHUNK_SIZE = 64 * 1024
+
+
+class ProofBlobStore:
+    """Sharded, zstd-compressed blobs keyed by the SHA-256 of their content."""
+
+    def __init__(self, root: Path, level: int = 10):
+        self.root = Path(root)
+        self.level = level
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / f"{key}.zst"
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` and return its key. A no-op if the blob is already stored."""
+        key = hashlib.sha256(data).hexdigest()
+        path = self.path(key)
+        if path.exists():
+            return key
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zstandard.ZstdCompressor(level=self.level, write_content_size=True).compress(data)
+        fd, staging = tempfile.mkstemp(prefix=f".{key[:8]}_", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(compressed)
+            # Same content, same bytes: if another worker won the race, replacing is harmless
+            os.replace(staging, path)
+        except BaseException:
+            Path(staging).unlink(missing_ok=True)
+            raise
+        logger.info("Stored proof blob %s (%d -> %d bytes)", key[:16], len(data), len(compressed))
+        return key
+
+    def size(self, key: str) -> Optional[int]:
+        """Uncompressed size from the zstd frame header (None if missing)."""
+        try:
+            with open(self.path(key), "rb") as fh:
+                size = zstandard.frame_content_size(fh.read(_ZSTD_MAX_HEADER))
+        except OSError:
+            return None
+        return size if size >= 0 else None
+
+    def get(self, key: str) -> bytes:
+        """Whole decompressed blob. Raises FileNotFoundError if missing."""
+        return b"".join(self.iter_range(key))
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Stream decompressed bytes ``start``..``end`` (inclusive; None = to the end).
+
+        Raises FileNotFoundError (on first iteration) if the blob is missing.
+        """
+        with open(self.path(key), "rb") as fh:
+            reader = zstandard.ZstdDecompressor().stream_reader(fh)
+            if start:
+                # Forward seek: decompresses and discards the prefix
+                reader.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = reader.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+
+_proof_blob_store: Optional[ProofBlobStore] = None
+
+
+def get_proof_blob_store() -> ProofBlobStore:
+    """Get the singleton proof blob store."""
+    global _proof_blob_store
+    if _proof_blob_store is None:
+        root = Path(settings.PROOF_BLOB_DIR) if settings.PROOF_BLOB_DIR else _DEFAULT_BLOB_DIR
+        _proof_blob_store = ProofBlobStore(root=root, level=settings.PROOF_BLOB_ZSTD_LEVEL)
+    return _proof_blob_store
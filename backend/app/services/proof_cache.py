@@ -0,0 +1,235 @@
+"""
+Content-addressed cache for Stone proofs registered with Integrity.
+
+A Stone proof for the risk program is fully determined by the program, the
+verifier config (layout / hasher / stone version / memory verification), the
+prover parameters (FRI + prover config) and the ten metric felts. The
+Integrity fact hash is derived from the same inputs, so once a fact is
+registered it never needs to be proven or registered again. Repeated
+`/demo/generate-proof` or `/orchestrate-from-market` calls inside one market
+snapshot therefore hit this cache and skip Stone and the on-chain transaction.
+
+Layout on disk (one directory per key, written atomically)::
+
+    <PROOF_CACHE_DIR>/<key[:2]>/<key>/proof.json
+                                     /calldata.txt
+                                     /meta.json
+
+Entries are touched on every hit; eviction drops least-recently-used entries
+once the total size or entry count exceeds the configured limits.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "proof_cache"
+
+
+@dataclass
+class CachedProof:
+    """A cache hit: registered fact plus the artifacts that produced it."""
+    key: str
+    fact_hash: int
+    proof_hash: Optional[str]
+    proof_path: Path
+    calldata_path: Path
+    entry_dir: Path
+
+
+def _file_digest(path: Path) -> str:
+    if not path.exists():
+        return "missing"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def proof_cache_key(
+    program_path: Path,
+    input_felts: Iterable[int],
+    prover_files: Iterable[Path] = (),
+    verifier_address: Optional[int] = None,
+) -> str:
+    """
+    Derive the cache key for one proof request.
+
+    Args:
+        program_path: Program artifact that is executed (compiled JSON or Cairo source).
+        input_felts: Program inputs in execution order.
+        prover_files: Prover parameter files (FRI params, prover config).
+        verifier_address: FactRegistry the fact is registered in.
+    """
+    material = {
+        "program": _file_digest(Path(program_path)),
+        "layout": settings.INTEGRITY_LAYOUT,
+        "hasher": settings.INTEGRITY_HASHER,
+        "stone_version": settings.INTEGRITY_STONE_VERSION,
+        "memory_verification": settings.INTEGRITY_MEMORY_VERIFICATION,
+        "prover": [_file_digest(Path(p)) for p in prover_files],
+        "inputs": [int(x) for x in input_felts],
+        "registry": hex(verifier_address) if verifier_address is not None else None,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ProofCache:
+    """Disk-backed LRU of registered Stone proofs keyed by `proof_cache_key`."""
+
+    def __init__(self, root: Path, max_bytes: int, max_entries: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Per-key lock so identical concurrent requests prove once and then hit."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def get(self, key: str) -> Optional[CachedProof]:
+        entry_dir = self._entry_dir(key)
+        meta_path = entry_dir / "meta.json"
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        proof_path = entry_dir / "proof.json"
+        if not proof_path.exists() or meta.get("fact_hash") is None:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        os.utime(entry_dir, (now, now))
+        self.hits += 1
+        return CachedProof(
+            key=key,
+            fact_hash=int(meta["fact_hash"], 16),
+            proof_hash=meta.get("proof_hash"),
+            proof_path=proof_path,
+            calldata_path=entry_dir / "calldata.txt",
+            entry_dir=entry_dir,
+        )
+
+    def put(
+        self,
+        key: str,
+        proof_json_path: Path,
+        calldata: List[int],
+        fact_hash: int,
+        proof_hash: Optional[str] = None,
+    ) -> Optional[CachedProof]:
+        """Store a registered proof. Never raises: a cache write failure is not a proof failure."""
+        entry_dir = self._entry_dir(key)
+        try:
+            entry_dir.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f".{key[:8]}_", dir=entry_dir.parent))
+            shutil.copyfile(proof_json_path, staging / "proof.json")
+            (staging / "calldata.txt").write_text(" ".join(str(x) for x in calldata))
+            (staging / "meta.json").write_text(json.dumps({
+                "fact_hash": hex(fact_hash),
+                "proof_hash": proof_hash,
+                "created_at": time.time(),
+            }))
+            try:
+                os.rename(staging, entry_dir)
+            except OSError:
+                # Another worker stored the same key first; keep theirs.
+                shutil.rmtree(staging, ignore_errors=True)
+        except OSError as e:
+            logger.warning("Proof cache write failed for %s: %s", key[:16], e)
+            return None
+
+        self._evict()
+        # Built from what was just written rather than via get(), which would count a hit
+        proof_path = entry_dir / "proof.json"
+        if not proof_path.exists():
+            return None  # evicted straight away (limits smaller than one entry)
+        return CachedProof(
+            key=key,
+            fact_hash=fact_hash,
+            proof_hash=proof_hash,
+            proof_path=proof_path,
+            calldata_path=entry_dir / "calldata.txt",
+            entry_dir=entry_dir,
+        )
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                entries.append((entry.stat().st_mtime, size, entry))
+        return entries
+
+    def _evict(self) -> None:
+        try:
+            entries = sorted(self._entries())
+        except OSError as e:
+            logger.warning("Proof cache scan failed: %s", e)
+            return
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            count -= 1
+            logger.info("Proof cache evicted %s", entry.name[:16])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "root": str(self.root),
+        }
+
+
+_proof_cache: Optional[ProofCache] = None
+
+
+def get_proof_cache() -> Optional[ProofCache]:
+    """Get the singleton proof cache, or None when PROOF_CACHE_ENABLED is off."""
+    global _proof_cache
+    if not settings.PROOF_CACHE_ENABLED:
+        return None
+    if _proof_cache is None:
+        root = Path(settings.PROOF_CACHE_DIR) if settings.PROOF_CACHE_DIR else _DEFAULT_CACHE_DIR
+        _proof_cache = ProofCache(
+            root=root,
+            max_bytes=settings.PROOF_CACHE_MAX_MB * 1024 * 1024,
+            max_entries=settings.PROOF_CACHE_MAX_ENTRIES,
+        )
+    return _proof_cache
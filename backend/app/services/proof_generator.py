@@ -104,7 +104,7 @@ class ProofGenerator:
                 age_days,
             )
 
-        result, _ = await with_rpc_fallback(_call)
+        result, _ = await with_rpc_fallback(_call, hedge=True)
         
         # Extract risk_score from contract result
         total_risk = int(result[0])
@@ -161,7 +161,7 @@ class ProofGenerator:
                 ekubo_apy,      # ekubo_apy
             )
 
-        result, _ = await with_rpc_fallback(_call)
+        result, _ = await with_rpc_fallback(_call, hedge=True)
         
         # Extract allocation percentages from contract result
         # Contract returns ((nostra_pct, zklend_pct, ekubo_pct),) - nested tuple
@@ -14,6 +14,8 @@ import subprocess
 from pathlib import Path
 from typing import List, Optional
 
+from app.utils.async_subprocess import run_subprocess
+
 
 def serialize_stone_proof(
     proof_json_path: Path,
@@ -52,7 +54,38 @@ def serialize_stone_proof(
         check=True,
     )
 
-    output = proc.stdout.decode().strip()
+    return _parse_serializer_output(proc.stdout.decode())
+
+
+async def serialize_stone_proof_async(
+    proof_json_path: Path,
+    serializer_bin: Path,
+    timeout: int = 30,
+) -> List[int]:
+    """
+    Non-blocking variant of `serialize_stone_proof` for use inside request handlers.
+
+    Same arguments, return value and exceptions; the serializer is run as an
+    asyncio subprocess and killed if the awaiting task is cancelled.
+    """
+    proof_json_path = Path(proof_json_path)
+    serializer_bin = Path(serializer_bin)
+
+    if not proof_json_path.exists():
+        raise FileNotFoundError(f"Proof JSON not found: {proof_json_path}")
+    if not serializer_bin.exists():
+        raise FileNotFoundError(f"proof_serializer binary not found: {serializer_bin}")
+
+    proc = await run_subprocess(
+        [str(serializer_bin)],
+        input=proof_json_path.read_bytes(),
+        timeout=timeout,
+    )
+    return _parse_serializer_output(proc.stdout)
+
+
+def _parse_serializer_output(output: str) -> List[int]:
+    output = output.strip()
     try:
         return [int(x) for x in output.split()] if output else []
     except Exception as exc:  # pragma: no cover - defensive parse guard
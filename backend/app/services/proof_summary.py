@@ -0,0 +1,218 @@
+"""
+Incrementally maintained rollup of proof_jobs for dashboards.
+
+``/analytics/proof-summary`` and ``/analytics/proof-performance`` used to
+COUNT / load proof_jobs on every poll. They now read ``proof_job_summary``
+(one row per network and status), which a flush listener keeps in step with
+ProofJob inserts, updates and deletes inside the same transaction:
+
+- ``before_flush`` diffs each new / changed / deleted ProofJob against its
+  previous state (status, network, L1/L2 verification, metrics, proof size);
+- ``after_flush`` applies the per-row deltas with one upsert per touched
+  summary row, so the rollup commits or rolls back with the job itself.
+
+Counts and sums are exact. Min/max only ever widen (a job leaving a bucket
+does not narrow it); ``rebuild_proof_summary`` recomputes everything from
+proof_jobs (used by migration 008 and for repairs after bulk SQL edits,
+which bypass the ORM and so the listener).
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, delete, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import ProofJob, ProofJobSummary, ProofStatus
+
+logger = logging.getLogger(__name__)
+
+# ProofJob attributes that feed the rollup
+_TRACKED = ("status", "network", "l2_verified_at", "l1_verified_at", "metrics", "proof_size_bytes")
+_COUNTERS = (
+    "job_count",
+    "l2_verified_count",
+    "l1_verified_count",
+    "generation_time_count",
+    "generation_time_sum",
+    "proof_size_count",
+    "proof_size_sum",
+)
+_EXTREMES = ("generation_time", "proof_size")
+_PENDING_KEY = "proof_summary_deltas"
+
+Key = tuple[str, str]  # (network, status)
+
+
+def _status_value(status: Any) -> str:
+    return status.value if hasattr(status, "value") else str(status or ProofStatus.GENERATING.value)
+
+
+def _contribution(values: Dict[str, Any]) -> tuple[Key, Dict[str, float], Dict[str, Optional[float]]]:
+    """Summary key, counter values and min/max candidates of one job state."""
+    metrics = values.get("metrics") or {}
+    gen_time = metrics.get("proof_generation_time_seconds")
+    size = values.get("proof_size_bytes") or metrics.get("proof_data_size_bytes")
+
+    counters = {
+        "job_count": 1,
+        "l2_verified_count": int(values.get("l2_verified_at") is not None),
+        "l1_verified_count": int(values.get("l1_verified_at") is not None),
+        "generation_time_count": int(bool(gen_time)),
+        "generation_time_sum": float(gen_time or 0),
+        "proof_size_count": int(bool(size)),
+        "proof_size_sum": int(size or 0),
+    }
+    extremes = {"generation_time": float(gen_time) if gen_time else None, "proof_size": int(size) if size else None}
+    key = (values.get("network") or "unknown", _status_value(values.get("status")))
+    return key, counters, extremes
+
+
+class _Deltas:
+    """Accumulated counter deltas and min/max candidates per summary key."""
+
+    def __init__(self):
+        self.counters: Dict[Key, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self.extremes: Dict[Key, Dict[str, list]] = defaultdict(lambda: {name: [] for name in _EXTREMES})
+
+    def add(self, values: Dict[str, Any], sign: int) -> None:
+        key, counters, extremes = _contribution(values)
+        for name, value in counters.items():
+            self.counters[key][name] += sign * value
+        if sign > 0:
+            for name, value in extremes.items():
+                if value is not None:
+                    self.extremes[key][name].append(value)
+
+    def __bool__(self) -> bool:
+        return bool(self.counters)
+
+
+def _current_values(job: ProofJob, pending: bool = False) -> Dict[str, Any]:
+    values = {attr: getattr(job, attr) for attr in _TRACKED}
+    if pending:
+        # Column defaults (status, network) are only applied by the INSERT
+        for attr, value in values.items():
+            default = ProofJob.__table__.c[attr].default
+            if value is None and default is not None and default.is_scalar:
+                values[attr] = default.arg
+    return values
+
+
+def _previous_values(job: ProofJob) -> Dict[str, Any]:
+    state = inspect(job)
+    values = {}
+    for attr in _TRACKED:
+        history = state.attrs[attr].history
+        if history.deleted:
+            values[attr] = history.deleted[0]
+        elif history.added:
+            values[attr] = None  # set for the first time
+        else:
+            values[attr] = getattr(job, attr)
+    return values
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    deltas = _Deltas()
+    for job in session.new:
+        if isinstance(job, ProofJob):
+            deltas.add(_current_values(job, pending=True), +1)
+    for job in session.dirty:
+        if isinstance(job, ProofJob) and session.is_modified(job):
+            previous, current = _previous_values(job), _current_values(job)
+            if previous != current:
+                deltas.add(previous, -1)
+                deltas.add(current, +1)
+    for job in session.deleted:
+        if isinstance(job, ProofJob):
+            deltas.add(_previous_values(job), -1)
+    # Replaces deltas left over from a flush that failed after this hook
+    session.info[_PENDING_KEY] = deltas
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if deltas:
+        connection = session.connection()
+        for key, counters in deltas.counters.items():
+            extremes = deltas.extremes[key]
+            if any(counters.values()) or any(extremes.values()):
+                _apply(connection, key, counters, extremes)
+
+
+def _apply(connection, key: Key, counters: Dict[str, float], extremes: Dict[str, list]) -> None:
+    """Add one key's deltas to its summary row (created on first use)."""
+    table = ProofJobSummary.__table__
+    network, status = key
+    bounds = {}
+    for name, candidates in extremes.items():
+        bounds[f"{name}_min"] = min(candidates) if candidates else None
+        bounds[f"{name}_max"] = max(candidates) if candidates else None
+
+    def _widen(column, value, lower: bool):
+        if value is None:
+            return column
+        better = value < column if lower else value > column
+        return case((column.is_(None), value), (better, value), else_=column)
+
+    widened = {
+        column: _widen(table.c[column], value, column.endswith("_min"))
+        for column, value in bounds.items()
+    }
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(network=network, status=status, **counters, **bounds)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.network, table.c.status],
+            set_={**{name: table.c[name] + value for name, value in counters.items()}, **widened},
+        )
+        connection.execute(stmt)
+        return
+
+    result = connection.execute(
+        update(table)
+        .where(table.c.network == network, table.c.status == status)
+        .values(**{name: table.c[name] + value for name, value in counters.items()}, **widened)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(network=network, status=status, **counters, **bounds))
+
+
+def _track_previous(target, value, oldvalue, initiator) -> None:
+    pass
+
+
+def register_proof_summary_listeners(session_factory) -> None:
+    """Keep proof_job_summary in step with flushes of sessions from ``session_factory``."""
+    if not event.contains(session_factory, "before_flush", _before_flush):
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_flush", _after_flush)
+    # Load the previous value on assignment even if the attribute was expired
+    # (e.g. after a commit), so the old summary bucket can be decremented
+    for attr in _TRACKED:
+        column = getattr(ProofJob, attr)
+        if not event.contains(column, "set", _track_previous):
+            event.listen(column, "set", _track_previous, active_history=True)
+
+
+def rebuild_proof_summary(connection) -> int:
+    """Recompute proof_job_summary from proof_jobs; returns the number of jobs scanned."""
+    jobs = ProofJob.__table__
+    rows = connection.execute(
+        select(*(jobs.c[attr] for attr in _TRACKED)).execution_options(yield_per=1000)
+    )
+    deltas = _Deltas()
+    scanned = 0
+    for row in rows:
+        deltas.add(dict(row._mapping), +1)
+        scanned += 1
+
+    connection.execute(delete(ProofJobSummary.__table__))
+    for key, counters in deltas.counters.items():
+        _apply(connection, key, counters, deltas.extremes[key])
+    logger.info("Rebuilt proof_job_summary from %d proof jobs (%d rows)", scanned, len(deltas.counters))
+    return scanned
@@ -0,0 +1,151 @@
+"""
+Commitment helpers for batched risk proofs.
+
+``verification/risk_batch_cairo0.cairo`` scores K metric pairs in one
+execution and outputs ``[K, merkle_root, jedi_0, ekubo_0, ...]``. One Stone
+proof / Integrity fact then covers all K decisions; each decision carries a
+Pedersen Merkle inclusion path against the proven root. These helpers mirror
+the Cairo hashing exactly (odd last node at a level is hashed with 0).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+from starknet_py.hash.utils import pedersen_hash
+
+CAIRO_PRIME = 2**251 + 17 * 2**192 + 1
+METRIC_FIELDS = ("utilization", "volatility", "liquidity", "audit_score", "age_days")
+# Inclusive bounds per metric (RiskMetricsRequest); age_days only has to pass
+# the program's is_le range check
+METRIC_BOUNDS = {
+    "utilization": (0, 10000),
+    "volatility": (0, 10000),
+    "liquidity": (0, 3),
+    "audit_score": (0, 100),
+    "age_days": (0, 2**128 - 1),
+}
+
+
+def _metric_inputs(metrics: dict) -> List[int]:
+    values = []
+    for name in METRIC_FIELDS:
+        value = metrics.get(name) if isinstance(metrics, dict) else None
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{name} must be an integer, got {value!r}")
+        low, high = METRIC_BOUNDS[name]
+        if not low <= value <= high:
+            raise ValueError(f"{name}={value} is outside [{low}, {high}]")
+        values.append(value)
+    return values
+
+
+def decision_inputs(jediswap_metrics: dict, ekubo_metrics: dict) -> List[int]:
+    """
+    The ten program inputs for one decision, in Cairo order.
+
+    Raises ValueError for a missing, non-integer or out-of-range metric, so a
+    bad decision can be dropped before it fails the whole batch trace.
+    """
+    return _metric_inputs(jediswap_metrics) + _metric_inputs(ekubo_metrics)
+
+
+def decision_leaf(inputs: Sequence[int], jedi_risk: int, ekubo_risk: int) -> int:
+    acc = 0
+    for value in [*inputs, jedi_risk, ekubo_risk]:
+        acc = pedersen_hash(acc, int(value))
+    return acc
+
+
+def merkle_levels(leaves: Sequence[int]) -> List[List[int]]:
+    """All tree levels, leaves first and root last."""
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        nodes = levels[-1]
+        parents = []
+        for i in range(0, len(nodes), 2):
+            right = nodes[i + 1] if i + 1 < len(nodes) else 0
+            parents.append(pedersen_hash(nodes[i], right))
+        levels.append(parents)
+    return levels
+
+
+def inclusion_path(levels: List[List[int]], index: int) -> List[int]:
+    """Sibling hashes from leaf to root for leaf ``index``."""
+    path = []
+    for nodes in levels[:-1]:
+        sibling = index ^ 1
+        path.append(nodes[sibling] if sibling < len(nodes) else 0)
+        index //= 2
+    return path
+
+
+def verify_inclusion(leaf: int, index: int, path: Sequence[int], root: int) -> bool:
+    node = leaf
+    for sibling in path:
+        node = pedersen_hash(node, sibling) if index % 2 == 0 else pedersen_hash(sibling, node)
+        index //= 2
+    return node == root
+
+
+@dataclass
+class BatchCommitment:
+    """Decoded batch program output plus per-decision inclusion data."""
+    root: int
+    risks: List[tuple[int, int]]
+    leaves: List[int]
+    paths: List[List[int]] = field(default_factory=list)
+
+    @classmethod
+    def from_program_output(cls, output: Sequence[int], inputs: Sequence[Sequence[int]]) -> "BatchCommitment":
+        """
+        Rebuild the commitment from cairo-run's public output and check it
+        against the root the program committed to.
+        """
+        n, root = int(output[0]), int(output[1])
+        if n != len(inputs) or len(output) != 2 + 2 * n:
+            raise ValueError(f"Batch output has {len(output)} felts for {len(inputs)} decisions")
+        risks = [(int(output[2 + 2 * i]), int(output[3 + 2 * i])) for i in range(n)]
+        leaves = [decision_leaf(inputs[i], *risks[i]) for i in range(n)]
+        levels = merkle_levels(leaves)
+        if levels[-1][0] != root:
+            raise ValueError("Batch Merkle root does not match program output")
+        return cls(
+            root=root,
+            risks=risks,
+            leaves=leaves,
+            paths=[inclusion_path(levels, i) for i in range(n)],
+        )
+
+    def inclusion(self, index: int) -> dict:
+        """JSON-friendly inclusion proof for decision ``index``."""
+        return {
+            "index": index,
+            "size": len(self.leaves),
+            "root": hex(self.root),
+            "leaf": hex(self.leaves[index]),
+            "path": [hex(x) for x in self.paths[index]],
+            "jediswap_risk": self.risks[index][0],
+            "ekubo_risk": self.risks[index][1],
+        }
+
+
+def parse_program_output(stdout: str) -> List[int]:
+    """Extract felts printed by ``cairo-run --print_output`` (signed repr -> field element)."""
+    lines = stdout.splitlines()
+    try:
+        start = next(i for i, line in enumerate(lines) if line.strip() == "Program output:")
+    except StopIteration:
+        raise ValueError("cairo-run did not print program output") from None
+    values = []
+    for line in lines[start + 1:]:
+        token = line.strip()
+        if not token:
+            break
+        try:
+            values.append(int(token) % CAIRO_PRIME)
+        except ValueError:
+            break
+    return values
@@ -15,7 +15,6 @@ import asyncio
 import json
 import logging
 import os
-import subprocess
 import tempfile
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -27,8 +26,16 @@ import struct
 
 from starknet_py.cairo.felt import encode_shortstring
 
+from app.utils.async_subprocess import run_subprocess
+
 logger = logging.getLogger(__name__)
 
+STONE_PROVER_BINARY = Path(
+    "/opt/obsqra.starknet/stone-prover/build/bazelout/k8-opt/bin/src/starkware/main/cpu/cpu_air_prover"
+)
+STONE_BASE_PARAMS_FILE = Path("/opt/obsqra.starknet/integrity/examples/proofs/cpu_air_params.json")
+STONE_PROVER_CONFIG_FILE = Path("/opt/obsqra.starknet/integrity/examples/proofs/cpu_air_prover_config.json")
+
 
 @dataclass
 class StoneProofResult:
@@ -62,15 +69,9 @@ class StoneProverService:
         """Initialize Stone Prover Service"""
         # Paths
         backend_dir = Path(__file__).parent.parent.parent
-        self.stone_binary = Path(
-            "/opt/obsqra.starknet/stone-prover/build/bazelout/k8-opt/bin/src/starkware/main/cpu/cpu_air_prover"
-        )
-        self.base_params_file = Path(
-            "/opt/obsqra.starknet/integrity/examples/proofs/cpu_air_params.json"
-        )
-        self.prover_config_file = Path(
-            "/opt/obsqra.starknet/integrity/examples/proofs/cpu_air_prover_config.json"
-        )
+        self.stone_binary = STONE_PROVER_BINARY
+        self.base_params_file = STONE_BASE_PARAMS_FILE
+        self.prover_config_file = STONE_PROVER_CONFIG_FILE
         
         # Validate binary exists
         if not self.stone_binary.exists():
@@ -234,12 +235,11 @@ class StoneProverService:
             logger.info(f"Running Stone prover...")
             logger.debug(f"Command: {' '.join(cmd[-6:])}")
             
-            # Run prover
-            result = subprocess.run(
+            # Run prover (async so the event loop keeps serving other requests)
+            result = await run_subprocess(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds
+                timeout=timeout_seconds,
+                check=False,
             )
             
             elapsed_ms = (time.time() - start_time) * 1000
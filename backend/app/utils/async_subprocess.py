@@ -0,0 +1,157 @@
+"""Non-blocking subprocess helpers for the proof pipeline.
+
+Proof generation shells out to cairo-run / cairo1-run / cpu_air_prover /
+proof_serializer. Running those with ``subprocess.run`` inside an ``async def``
+blocks the uvicorn event loop for the full prover runtime, so every other
+request waits behind a single proof. These helpers run the binaries through
+``asyncio.create_subprocess_exec`` (per-stage timeout, child killed on
+cancellation) and gate whole proofs behind a bounded limiter so a burst of
+requests is rejected early instead of piling up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import subprocess
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence, Union
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ProverBusyError(RuntimeError):
+    """Raised when the proof limiter's wait queue is full (backpressure)."""
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    """Kill a child process and reap it so no zombie is left behind."""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        return
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=5)
+    except asyncio.TimeoutError:  # pragma: no cover - kernel did not reap in time
+        logger.warning("Subprocess %s did not exit after SIGKILL", proc.pid)
+
+
+async def run_subprocess(
+    cmd: Sequence[str],
+    *,
+    timeout: Optional[float] = None,
+    input: Optional[Union[bytes, str]] = None,
+    cwd: Optional[str] = None,
+    text: bool = True,
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    Async equivalent of ``subprocess.run(cmd, capture_output=True, ...)``.
+
+    Mirrors the stdlib error contract so existing callers keep working:
+    ``subprocess.TimeoutExpired`` on timeout and ``subprocess.CalledProcessError``
+    on a non-zero exit when ``check`` is set. If the awaiting task is cancelled
+    (client disconnect, shutdown) the child process is killed before the
+    cancellation propagates.
+    """
+    cmd = [str(part) for part in cmd]
+    if isinstance(input, str):
+        input = input.encode()
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout=timeout)
+    except asyncio.TimeoutError:
+        await _terminate(proc)
+        logger.error("Subprocess timed out after %ss: %s", timeout, os.path.basename(cmd[0]))
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except asyncio.CancelledError:
+        await _terminate(proc)
+        logger.warning("Subprocess cancelled: %s", os.path.basename(cmd[0]))
+        raise
+
+    if text:
+        stdout = stdout.decode(errors="replace")
+        stderr = stderr.decode(errors="replace")
+
+    completed = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+    return completed
+
+
+class ProofLimiter:
+    """
+    Bounded admission control for CPU-heavy proof generation.
+
+    At most ``max_concurrent`` proofs run at once; up to ``max_queued`` more
+    may wait for a slot. Anything beyond that fails fast with
+    ``ProverBusyError`` so the API can answer 503 instead of holding the
+    connection open until the client times out.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queued = max(0, int(max_queued))
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._running = 0
+        self._waiting = 0
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self._waiting >= self.max_queued:
+            raise ProverBusyError(
+                f"Prover busy: {self._running} running, {self._waiting} queued "
+                f"(limit {self.max_concurrent}+{self.max_queued})"
+            )
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+        }
+
+
+_proof_limiter: Optional[ProofLimiter] = None
+
+
+def get_proof_limiter() -> ProofLimiter:
+    """Get the process-wide proof limiter (sized from settings)."""
+    global _proof_limiter
+    if _proof_limiter is None:
+        max_concurrent = settings.PROVER_MAX_CONCURRENT or (os.cpu_count() or 1)
+        _proof_limiter = ProofLimiter(max_concurrent, settings.PROVER_MAX_QUEUED)
+    return _proof_limiter
@@ -0,0 +1,274 @@
+"""Block-aware read-through cache for on-chain view calls.
+
+View results only change when a new block lands, so reads are cached under
+(contract, selector, calldata, block). ``"latest"`` reads are filed under the
+head tracked by one shared ``HeadPoller`` and served from memory until the
+poller sees a newer block, at which point those entries are dropped. Reads
+pinned to an explicit ``block_number`` are immutable and stay cached
+(LRU-bounded). Misses are coalesced into one JSON-RPC batch and concurrent
+identical misses share a single in-flight request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from starknet_py.net.client_models import Call
+from starknet_py.net.full_node_client import FullNodeClient
+
+from app.config import get_settings
+from app.utils.rpc import ContractRead, RpcCallError, batch_call, with_rpc_fallback
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# (contract, selector, calldata, block, pinned)
+CacheKey = Tuple[int, int, Tuple[int, ...], int, bool]
+BlockNumber = Union[int, str]
+
+
+class HeadPoller:
+    """One shared task tracking the chain head for every cache consumer."""
+
+    def __init__(self, interval_sec: float):
+        self.interval_sec = interval_sec
+        self.head: Optional[int] = None
+        self.updated_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[int], None]] = []
+
+    def on_new_block(self, listener: Callable[[int], None]) -> None:
+        self._listeners.append(listener)
+
+    def fresh_head(self) -> Optional[int]:
+        """Head block number, or None if the poller is not running / has gone stale."""
+        if self.head is None or time.monotonic() - self.updated_at > self.interval_sec * 3:
+            return None
+        return self.head
+
+    async def poll_once(self) -> Optional[int]:
+        async def _block_number(client: FullNodeClient, _rpc_url: str) -> int:
+            return await client.get_block_number()
+
+        head, _ = await with_rpc_fallback(_block_number, hedge=True)
+        self.updated_at = time.monotonic()
+        if head != self.head:
+            self.head = head
+            for listener in self._listeners:
+                listener(head)
+        return head
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001 - keep polling; cache bypasses while stale
+                logger.warning("Head poll failed: %s", e)
+            await asyncio.sleep(self.interval_sec)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class BlockReadCache:
+    """LRU of raw view-call results keyed by (contract, selector, calldata, block)."""
+
+    def __init__(self, poller: HeadPoller, max_entries: int):
+        self.poller = poller
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[CacheKey, List[int]]" = OrderedDict()
+        self._latest_keys: Dict[int, set] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._dirty: Dict[int, int] = {}  # contract -> head at last local write
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        poller.on_new_block(self._on_new_block)
+
+    def _on_new_block(self, head: int) -> None:
+        self._dirty = {addr: block for addr, block in self._dirty.items() if block >= head}
+        for block in [b for b in self._latest_keys if b < head]:
+            for key in self._latest_keys.pop(block):
+                self._entries.pop(key, None)
+
+    def _store(self, key: CacheKey, value: List[int], from_latest: bool) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if from_latest:
+            self._latest_keys.setdefault(key[3], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            keys = self._latest_keys.get(evicted[3])
+            if keys:
+                keys.discard(evicted)
+
+    def note_write(self, contract_address: int) -> None:
+        """
+        Record a write to ``contract_address``: its cached entries are dropped and
+        reads bypass the cache until the poller sees a newer head, so callers that
+        waited for acceptance read their own write.
+        """
+        head = self.poller.head if self.poller.head is not None else -1
+        self._dirty[contract_address] = head
+        for key in [k for k in self._entries if k[0] == contract_address and not k[4]]:
+            del self._entries[key]
+
+    def _resolve_block(self, calls: Sequence[Call], block_number: BlockNumber) -> Tuple[Optional[int], bool]:
+        if isinstance(block_number, int):
+            return block_number, False
+        head = self.poller.fresh_head()
+        if block_number != "latest" or head is None:
+            return None, False
+        if any(self._dirty.get(c.to_addr, -1) >= head for c in calls):
+            return None, False
+        return head, True
+
+    async def read(
+        self,
+        calls: Sequence[Call],
+        *,
+        block_number: BlockNumber = "latest",
+        urls: Optional[Sequence[str]] = None,
+        cache_if: Optional[Callable[[int, List[int]], bool]] = None,
+    ) -> List[Union[List[int], RpcCallError]]:
+        """
+        Raw felt results for ``calls`` in input order (errors returned in place).
+
+        ``block_number`` may be "latest" (resolved to the polled head) or an
+        explicit block number pin. Other tags ("pending"), reads made while the
+        head is unknown and reads of contracts with a pending write bypass the
+        cache. ``cache_if(index, result)`` can veto caching of a result (e.g. only
+        cache a fact once it is registered).
+        """
+        block, from_latest = self._resolve_block(calls, block_number)
+        if block is None:
+            self.bypassed += len(calls)
+            return await batch_call(calls, block=block_number, urls=urls, return_exceptions=True)
+
+        keys = [(c.to_addr, c.selector, tuple(int(x) for x in c.calldata), block, not from_latest) for c in calls]
+        results: List[Any] = [None] * len(calls)
+        waits: List[Tuple[int, asyncio.Future]] = []
+        owned: Dict[CacheKey, asyncio.Future] = {}
+        miss_index: List[int] = []
+        for i, key in enumerate(keys):
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                results[i] = self._entries[key]
+                self.hits += 1
+            elif key in self._inflight or key in owned:
+                # Identical read already on the wire: share its result
+                waits.append((i, self._inflight.get(key) or owned[key]))
+                self.hits += 1
+            else:
+                self.misses += 1
+                future = asyncio.get_event_loop().create_future()
+                owned[key] = future
+                self._inflight[key] = future
+                miss_index.append(i)
+
+        if miss_index:
+            try:
+                # "latest" misses still ask for the tip: the poller may be a block behind
+                fetched = await batch_call(
+                    [calls[i] for i in miss_index],
+                    block=block_number,
+                    urls=urls,
+                    return_exceptions=True,
+                )
+            except BaseException as e:
+                for future in owned.values():
+                    if not future.done():
+                        future.set_exception(e)
+                        future.exception()  # consumed here; waiters still see it
+                raise
+            finally:
+                for key in owned:
+                    self._inflight.pop(key, None)
+            for i, value in zip(miss_index, fetched):
+                results[i] = value
+                owned[keys[i]].set_result(value)
+                if not isinstance(value, RpcCallError) and (cache_if is None or cache_if(i, value)):
+                    self._store(keys[i], value, from_latest)
+
+        for i, future in waits:
+            results[i] = await future
+        return results
+
+    async def read_contract(
+        self,
+        reads: Sequence[ContractRead],
+        *,
+        block_number: BlockNumber = "latest",
+        urls: Optional[Sequence[str]] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Cached counterpart of ``batch_contract_calls``: ``contract_read()`` calls
+        in, ABI-decoded results out. ``cache_if`` receives the decoded value.
+        """
+        def _decode(i: int, raw: List[int]) -> Any:
+            return reads[i].decode(raw)
+
+        results = await self.read(
+            [read.call for read in reads],
+            block_number=block_number,
+            urls=urls,
+            cache_if=(lambda i, raw: cache_if(_decode(i, raw))) if cache_if else None,
+        )
+        decoded = []
+        for i, result in enumerate(results):
+            if isinstance(result, RpcCallError):
+                if not return_exceptions:
+                    raise result
+                decoded.append(result)
+            else:
+                decoded.append(_decode(i, result))
+        return decoded
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "head": self.poller.head,
+            "head_age_sec": round(time.monotonic() - self.poller.updated_at, 2) if self.poller.head is not None else None,
+            "entries": len(self._entries),
+            "dirty_contracts": len(self._dirty),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_head_poller: Optional[HeadPoller] = None
+_read_cache: Optional[BlockReadCache] = None
+
+
+def get_head_poller() -> HeadPoller:
+    """Get the shared chain-head poller."""
+    global _head_poller
+    if _head_poller is None:
+        _head_poller = HeadPoller(settings.STARKNET_HEAD_POLL_SEC)
+    return _head_poller
+
+
+def get_read_cache() -> BlockReadCache:
+    """Get the process-wide block-aware read cache."""
+    global _read_cache
+    if _read_cache is None:
+        _read_cache = BlockReadCache(get_head_poller(), settings.STARKNET_READ_CACHE_MAX_ENTRIES)
+    return _read_cache
@@ -0,0 +1,59 @@
+"""
+Keyset (cursor) pagination for history endpoints.
+
+Pages are ordered by ``created_at DESC, id DESC`` and the next page starts
+strictly after the last row returned, so page N costs one index range scan
+instead of skipping N * limit rows. The cursor is opaque to clients: a
+URL-safe base64 of the last row's (created_at, id), returned in the
+``X-Next-Cursor`` response header and passed back as ``?cursor=``.
+Response bodies are unchanged lists.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, desc, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    payload = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, id_column) -> Tuple[datetime, Any]:
+    """(created_at, id) of a cursor; 400 if it was not issued by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), id_column.type.python_type(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, created_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Apply keyset ordering, the cursor position and ``limit + 1`` to a select
+    (or legacy Query). The extra row tells next_page whether there is more.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, id_column)
+        position = or_(
+            created_column < created_at,
+            and_(created_column == created_at, id_column < row_id),
+        )
+        query = query.filter(position)
+    return query.order_by(desc(created_column), desc(id_column)).limit(limit + 1)
+
+
+def next_page(rows: Sequence, limit: int, response: Response) -> List:
+    """Trim the look-ahead row and set the next-page cursor header if there is one."""
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
@@ -1,12 +1,23 @@
-"""RPC helpers with retry + failover."""
+"""RPC helpers with retry + failover, backed by pooled long-lived clients."""
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
+import aiohttp
+import httpx
+from starknet_py.abi.v0 import Abi as AbiV0
+from starknet_py.contract import Contract
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client_models import Call
 from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.serialization import FunctionSerializationAdapter
+from starknet_py.serialization.factory import serializer_for_function, serializer_for_function_v1
 
 from app.config import get_settings
 
@@ -48,8 +59,298 @@ def get_rpc_urls() -> List[str]:
     return deduped
 
 
+class RpcClientRegistry:
+    """
+    Process-wide keep-alive RPC clients, one pooled session per endpoint.
+
+    ``FullNodeClient(node_url=...)`` without a session opens a new aiohttp
+    session (TCP + TLS handshake) per request. The registry hands out one
+    FullNodeClient per URL bound to a persistent, bounded connection pool, plus
+    a shared httpx client for hand-rolled JSON-RPC calls. Closed from the
+    FastAPI lifespan via ``close_rpc_clients()``.
+    """
+
+    def __init__(self, pool_size: int, keepalive_sec: float, timeout_sec: float):
+        self.pool_size = max(1, pool_size)
+        self.keepalive_sec = keepalive_sec
+        self.timeout_sec = timeout_sec
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._clients: Dict[str, FullNodeClient] = {}
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _session(self, url: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(url)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_sec,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_sec),
+            )
+            self._sessions[url] = session
+            self._clients.pop(url, None)
+        return session
+
+    def client(self, url: str) -> FullNodeClient:
+        session = self._session(url)
+        client = self._clients.get(url)
+        if client is None:
+            client = FullNodeClient(node_url=url, session=session)
+            self._clients[url] = client
+        return client
+
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout_sec,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size * 4,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.keepalive_sec,
+                ),
+            )
+        return self._http
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+        self._clients.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+_rpc_registry: Optional[RpcClientRegistry] = None
+
+
+def get_rpc_registry() -> RpcClientRegistry:
+    """Get the process-wide RPC client registry."""
+    global _rpc_registry
+    if _rpc_registry is None:
+        _rpc_registry = RpcClientRegistry(
+            pool_size=settings.STARKNET_RPC_POOL_SIZE,
+            keepalive_sec=settings.STARKNET_RPC_KEEPALIVE_SEC,
+            timeout_sec=settings.STARKNET_RPC_TIMEOUT_SEC,
+        )
+    return _rpc_registry
+
+
+def get_rpc_client(url: Optional[str] = None) -> FullNodeClient:
+    """Pooled FullNodeClient for ``url`` (defaults to the first configured RPC)."""
+    if url is None:
+        urls = get_rpc_urls()
+        url = urls[0] if urls else settings.STARKNET_RPC_URL
+    return get_rpc_registry().client(url)
+
+
+def get_rpc_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive httpx client for raw JSON-RPC POSTs."""
+    return get_rpc_registry().http()
+
+
+async def close_rpc_clients() -> None:
+    """Close all pooled RPC sessions (FastAPI lifespan shutdown)."""
+    global _rpc_registry
+    if _rpc_registry is not None:
+        await _rpc_registry.close()
+        _rpc_registry = None
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class EndpointHealth:
+    """Rolling latency / error window and circuit breaker for one RPC URL."""
+
+    def __init__(self, url: str, window: int):
+        self.url = url
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=max(1, window))
+        self.consecutive_failures = 0
+        self.state = CIRCUIT_CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.total_calls = 0
+        self.total_errors = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self._samples.append((latency, ok))
+        self.total_calls += 1
+        self.probing = False
+        if ok:
+            self.consecutive_failures = 0
+            if self.state != CIRCUIT_CLOSED:
+                logger.info("RPC circuit closed for %s", self.url)
+            self.state = CIRCUIT_CLOSED
+            return
+        self.total_errors += 1
+        self.consecutive_failures += 1
+        if self.state == CIRCUIT_HALF_OPEN or (
+            self.state == CIRCUIT_CLOSED
+            and self.consecutive_failures >= settings.STARKNET_RPC_BREAKER_THRESHOLD
+        ):
+            self.state = CIRCUIT_OPEN
+            self.opened_at = time.monotonic()
+            logger.warning(
+                "RPC circuit opened for %s after %s consecutive failures",
+                self.url,
+                self.consecutive_failures,
+            )
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self.opened_at >= settings.STARKNET_RPC_BREAKER_COOLDOWN_SEC
+
+    def available(self) -> bool:
+        """
+        Closed, or open long enough that a half-open probe may be started.
+        Read-only: routing order and admin stats never change the state.
+        """
+        if self.state == CIRCUIT_OPEN:
+            return self._cooled_down()
+        if self.state == CIRCUIT_HALF_OPEN:
+            return not self.probing
+        return True
+
+    def admit(self) -> bool:
+        """
+        Claim the right to send one call. A cooled-down open circuit moves to
+        half-open and admits exactly one probe until it is recorded or
+        released; other callers are refused meanwhile. An open circuit still
+        in cooldown is admitted only because the caller found nothing better.
+        """
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+        elif self.state == CIRCUIT_OPEN and self._cooled_down():
+            self.state = CIRCUIT_HALF_OPEN
+            self.probing = True
+        return True
+
+    def release(self) -> None:
+        """Abandon an in-flight probe (cancelled call) so the next caller can probe."""
+        if self.probing:
+            self.probing = False
+            self.state = CIRCUIT_OPEN
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def latencies(self) -> List[float]:
+        return sorted(latency for latency, ok in self._samples if ok)
+
+    def score(self) -> float:
+        """Lower is better: median latency inflated by the recent error rate."""
+        p50 = _percentile(self.latencies(), 0.5)
+        # Unmeasured endpoints get a neutral score so they are tried early.
+        base = p50 if p50 is not None else 0.25
+        return base * (1.0 + 4.0 * self.error_rate)
+
+    def stats(self) -> dict:
+        latencies = self.latencies()
+        p50 = _percentile(latencies, 0.5)
+        p99 = _percentile(latencies, 0.99)
+        return {
+            "url": self.url,
+            "state": self.state,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "window": len(self._samples),
+            "probing": self.probing,
+            "consecutive_failures": self.consecutive_failures,
+            "total_calls": self.total_calls,
+            "total_errors": self.total_errors,
+            "score": round(self.score(), 4),
+        }
+
+
+class EndpointScheduler:
+    """Routes each RPC call to the healthiest endpoint; failing ones are breaker-skipped."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._health: Dict[str, EndpointHealth] = {}
+
+    def health(self, url: str) -> EndpointHealth:
+        entry = self._health.get(url)
+        if entry is None:
+            entry = EndpointHealth(url, self.window)
+            self._health[url] = entry
+        return entry
+
+    def ordered(self, urls: Sequence[str]) -> List[str]:
+        """
+        Available endpoints best-first (stable for ties, so configured order
+        still breaks them). If every circuit is open, all URLs are returned
+        rather than failing without trying.
+        """
+        indexed = list(enumerate(urls))
+        available = [(i, u) for i, u in indexed if self.health(u).available()]
+        pool = available or indexed
+        pool.sort(key=lambda item: (self.health(item[1]).score(), item[0]))
+        return [u for _, u in pool]
+
+    def record(self, url: str, latency: float, ok: bool) -> None:
+        self.health(url).record(latency, ok)
+
+    def stats(self) -> List[dict]:
+        return [entry.stats() for entry in self._health.values()]
+
+
+class CircuitOpenError(RuntimeError):
+    """The endpoint's half-open probe is already in flight; try another one."""
+
+    def __init__(self, url: str):
+        self.url = url
+        super().__init__(f"RPC circuit for {url} is half-open with a probe in flight")
+
+
+_scheduler: Optional[EndpointScheduler] = None
+
+
+def get_endpoint_scheduler() -> EndpointScheduler:
+    """Get the process-wide RPC endpoint scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = EndpointScheduler(window=settings.STARKNET_RPC_HEALTH_WINDOW)
+    return _scheduler
+
+
+def get_rpc_health_stats() -> dict:
+    """Per-endpoint health snapshot for the admin endpoint."""
+    scheduler = get_endpoint_scheduler()
+    configured = get_rpc_urls()
+    for url in configured:
+        scheduler.health(url)
+    return {
+        "configured": configured,
+        "routing_order": scheduler.ordered(configured),
+        "endpoints": scheduler.stats(),
+    }
+
+
 def is_retryable_rpc_error(exc: Exception) -> bool:
     """Best-effort detection of transient RPC errors."""
+    if isinstance(exc, CircuitOpenError):
+        return True
     status_code = getattr(exc, "status_code", None)
     if isinstance(status_code, int) and status_code in {502, 503, 504, 429}:
         return True
@@ -90,16 +391,88 @@ def _default_backoff() -> float:
     return max(0.1, float(settings.STARKNET_RPC_RETRY_BACKOFF_SEC))
 
 
+async def _timed_attempt(
+    action: Callable[[FullNodeClient, str], Awaitable[T]],
+    rpc_url: str,
+) -> T:
+    """Run one attempt and feed its latency/outcome into the endpoint scheduler."""
+    scheduler = get_endpoint_scheduler()
+    health = scheduler.health(rpc_url)
+    if not health.admit():
+        raise CircuitOpenError(rpc_url)
+    started = time.monotonic()
+    try:
+        result = await action(get_rpc_client(rpc_url), rpc_url)
+    except asyncio.CancelledError:
+        health.release()
+        raise
+    except Exception as exc:  # noqa: BLE001 - re-raised after recording
+        # Non-retryable errors (reverts, bad calldata) mean the endpoint answered.
+        scheduler.record(rpc_url, time.monotonic() - started, ok=not is_retryable_rpc_error(exc))
+        raise
+    scheduler.record(rpc_url, time.monotonic() - started, ok=True)
+    return result
+
+
+async def _hedged_attempt(
+    action: Callable[[FullNodeClient, str], Awaitable[T]],
+    primary: str,
+    secondary: str,
+) -> Tuple[T, str]:
+    """
+    Start ``primary``; if it has not answered within the hedge delay, also
+    start ``secondary``. The first success wins and the loser is cancelled.
+    """
+    scheduler = get_endpoint_scheduler()
+    p99 = _percentile(scheduler.health(primary).latencies(), 0.99)
+    delay = p99 if p99 is not None else settings.STARKNET_RPC_HEDGE_DELAY_SEC
+    delay = min(delay, settings.STARKNET_RPC_HEDGE_DELAY_SEC)
+
+    first = asyncio.ensure_future(_timed_attempt(action, primary))
+    tasks = {first: primary}
+    try:
+        await asyncio.wait([first], timeout=delay)
+        if first.done():
+            exc = first.exception()
+            if exc is None:
+                return first.result(), primary
+            if not is_retryable_rpc_error(exc):
+                raise exc
+        # Primary is slow (or failed transiently): race the next-best endpoint.
+        tasks[asyncio.ensure_future(_timed_attempt(action, secondary))] = secondary
+        last_exc: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), tasks[task]
+                last_exc = task.exception()
+                if not is_retryable_rpc_error(last_exc):
+                    raise last_exc
+        raise last_exc  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
 async def with_rpc_fallback(
     action: Callable[[FullNodeClient, str], Awaitable[T]],
     *,
     urls: Optional[Sequence[str]] = None,
     retries: Optional[int] = None,
     backoff_sec: Optional[float] = None,
+    hedge: bool = False,
 ) -> Tuple[T, str]:
     """
     Execute an async action against RPC endpoints with retry + failover.
 
+    Endpoints are tried healthiest-first (rolling latency / error rate) and
+    endpoints with an open circuit breaker are skipped. ``hedge=True`` (read
+    calls only - never for invokes) races the next-best endpoint when the best
+    one is slower than its usual p99.
+
     Returns (result, rpc_url_used).
     """
     rpc_urls = list(urls or get_rpc_urls())
@@ -108,13 +481,19 @@ async def with_rpc_fallback(
 
     attempts = retries if retries is not None else _default_retries()
     backoff = backoff_sec if backoff_sec is not None else _default_backoff()
+    scheduler = get_endpoint_scheduler()
+    hedge = hedge and settings.STARKNET_RPC_HEDGE_ENABLED
 
     last_exc: Optional[Exception] = None
     for attempt in range(attempts):
-        for rpc_url in rpc_urls:
-            client = FullNodeClient(node_url=rpc_url)
+        ordered = scheduler.ordered(rpc_urls)
+        index = 0
+        while index < len(ordered):
+            rpc_url = ordered[index]
             try:
-                result = await action(client, rpc_url)
+                if hedge and index + 1 < len(ordered):
+                    return await _hedged_attempt(action, rpc_url, ordered[index + 1])
+                result = await _timed_attempt(action, rpc_url)
                 return result, rpc_url
             except Exception as exc:  # noqa: BLE001 - bubble after retry checks
                 last_exc = exc
@@ -127,6 +506,8 @@ async def with_rpc_fallback(
                     attempts,
                     exc,
                 )
+            # A hedged attempt already consumed the next endpoint.
+            index += 2 if hedge and index + 1 < len(ordered) else 1
 
         if attempt < attempts - 1:
             await asyncio.sleep(backoff * (2 ** attempt))
@@ -134,3 +515,177 @@ async def with_rpc_fallback(
     if last_exc:
         raise last_exc
     raise RuntimeError("RPC failover failed without an exception")
+
+
+class RpcCallError(RuntimeError):
+    """A single entry of a JSON-RPC batch returned an error object."""
+
+    def __init__(self, error: Any):
+        self.error = error
+        message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+        data = error.get("data") if isinstance(error, dict) else None
+        super().__init__(f"RPC error: {message}" + (f" ({data})" if data else ""))
+
+
+BlockId = Union[str, int, dict]
+
+# Endpoints that rejected a batch array; they get per-call requests from then on.
+_batch_unsupported: set[str] = set()
+
+
+def _block_id(block: BlockId) -> Union[str, dict]:
+    if isinstance(block, int):
+        return {"block_number": block}
+    return block
+
+
+def _starknet_call_payload(call: Call, block: BlockId, request_id: int) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "starknet_call",
+        "params": {
+            "request": {
+                "contract_address": hex(call.to_addr),
+                "entry_point_selector": hex(call.selector),
+                "calldata": [hex(int(x)) for x in call.calldata],
+            },
+            "block_id": _block_id(block),
+        },
+    }
+
+
+def _entry_result(entry: dict) -> Union[List[int], RpcCallError]:
+    if "error" in entry:
+        return RpcCallError(entry["error"])
+    return [int(x, 16) if isinstance(x, str) else int(x) for x in entry.get("result", [])]
+
+
+async def _post_single(rpc_url: str, payload: dict) -> Union[List[int], RpcCallError]:
+    response = await get_rpc_http_client().post(rpc_url, json=payload)
+    response.raise_for_status()
+    return _entry_result(response.json())
+
+
+async def _post_batch(rpc_url: str, payloads: List[dict]) -> List[Union[List[int], RpcCallError]]:
+    """
+    One HTTP round trip for all payloads; per-call gather if the endpoint
+    can't batch. An HTTP error or unreadable body on the batch request also
+    falls back to individual calls, whose own errors then drive failover.
+    """
+    if rpc_url not in _batch_unsupported and len(payloads) > 1:
+        try:
+            response = await get_rpc_http_client().post(rpc_url, json=payloads)
+            response.raise_for_status()
+            body = response.json()
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            logger.warning("JSON-RPC batch to %s failed with HTTP %s; using individual calls", rpc_url, status)
+            # Rate limits and server errors are transient; other 4xx mean the batch itself was refused
+            if 400 <= status < 500 and status != 429:
+                _batch_unsupported.add(rpc_url)
+        except ValueError as exc:
+            logger.warning("JSON-RPC batch to %s returned an unreadable body (%s); using individual calls", rpc_url, exc)
+        else:
+            if isinstance(body, list):
+                by_id = {entry.get("id"): entry for entry in body if isinstance(entry, dict)}
+                if all(p["id"] in by_id for p in payloads):
+                    return [_entry_result(by_id[p["id"]]) for p in payloads]
+            logger.info("RPC endpoint %s does not support JSON-RPC batches; using concurrent calls", rpc_url)
+            _batch_unsupported.add(rpc_url)
+    return list(await asyncio.gather(*(_post_single(rpc_url, p) for p in payloads)))
+
+
+async def batch_call(
+    calls: Sequence[Call],
+    *,
+    block: BlockId = "latest",
+    urls: Optional[Sequence[str]] = None,
+    return_exceptions: bool = False,
+) -> List[Union[List[int], RpcCallError]]:
+    """
+    Execute independent ``starknet_call``s in one JSON-RPC batch request.
+
+    Results come back in input order as raw felt lists. Endpoints that do not
+    accept batch arrays are remembered and served with ``asyncio.gather``
+    instead. Chunks of STARKNET_RPC_BATCH_MAX_CALLS are sent concurrently.
+    Transport failures go through ``with_rpc_fallback`` (failover, health
+    scoring); a per-call error is raised as ``RpcCallError`` unless
+    ``return_exceptions`` is set, in which case it is returned in its slot.
+    """
+    if not calls:
+        return []
+    payloads = [_starknet_call_payload(call, block, i) for i, call in enumerate(calls)]
+    chunk = max(1, settings.STARKNET_RPC_BATCH_MAX_CALLS)
+
+    async def _action(_client: FullNodeClient, rpc_url: str):
+        parts = await asyncio.gather(
+            *(_post_batch(rpc_url, payloads[i:i + chunk]) for i in range(0, len(payloads), chunk))
+        )
+        return [result for part in parts for result in part]
+
+    results, _ = await with_rpc_fallback(_action, urls=urls)
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, RpcCallError):
+                raise result
+    return results
+
+
+@dataclass(frozen=True)
+class ContractRead:
+    """A view call plus the ABI serializer that decodes its raw result."""
+    call: Call
+    serializer: FunctionSerializationAdapter
+
+    def decode(self, raw: List[int]) -> Any:
+        return self.serializer.deserialize(raw)
+
+
+def _abi_function(contract: Contract, name: str) -> Any:
+    parsed = contract.data.parsed_abi
+    function = parsed.functions.get(name)
+    # Cairo 1 ABIs keep most entry points inside interfaces
+    for interface in getattr(parsed, "interfaces", {}).values():
+        if function is not None:
+            break
+        function = interface.items.get(name)
+    if function is None:
+        raise ValueError(f"Function {name} not found in contract ABI")
+    return function
+
+
+def contract_read(contract: Contract, name: str, *args, **kwargs) -> ContractRead:
+    """
+    Batchable view call ``contract.name(*args, **kwargs)``. Calldata and
+    results go through starknet_py's public ABI serializers.
+    """
+    function = _abi_function(contract, name)
+    if isinstance(contract.data.parsed_abi, AbiV0):
+        serializer = serializer_for_function(function)
+    else:
+        serializer = serializer_for_function_v1(function)
+    call = Call(
+        to_addr=contract.address,
+        selector=get_selector_from_name(name),
+        calldata=serializer.serialize(*args, **kwargs),
+    )
+    return ContractRead(call=call, serializer=serializer)
+
+
+async def batch_contract_calls(
+    reads: Sequence[ContractRead],
+    *,
+    block: BlockId = "latest",
+    urls: Optional[Sequence[str]] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Batch ``contract_read(...)`` calls and decode each result with its ABI,
+    like ``contract.functions[name].call()`` would.
+    """
+    raw = await batch_call([read.call for read in reads], block=block, urls=urls, return_exceptions=return_exceptions)
+    return [
+        result if isinstance(result, RpcCallError) else read.decode(result)
+        for read, result in zip(reads, raw)
+    ]
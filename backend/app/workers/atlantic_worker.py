@@ -8,8 +8,10 @@ from datetime import datetime
 from typing import Optional
 import asyncio
 
+from sqlalchemy import select
+
 from app.services.atlantic_service import get_atlantic_service
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
 from app.models import ProofJob, ProofStatus
 
 logger = logging.getLogger(__name__)
@@ -34,9 +36,8 @@ async def check_and_update_atlantic_status(query_id: str, proof_job_id, atlantic
 
     status = await atlantic.check_query_status(query_id)
 
-    db = SessionLocal()
-    try:
-        job = db.query(ProofJob).get(proof_job_id)
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ProofJob, proof_job_id)
         if not job:
             logger.warning(f"[Atlantic] Proof job {proof_job_id} not found")
             return None
@@ -55,11 +56,9 @@ async def check_and_update_atlantic_status(query_id: str, proof_job_id, atlantic
         else:
             logger.info(f"[Atlantic] Proof {proof_job_id} status={state}")
 
-        db.commit()
-        db.refresh(job)
+        await db.commit()
+        await db.refresh(job)
         return job
-    finally:
-        db.close()
 
 
 async def poll_pending_atlantic(interval_seconds: int = 300):
@@ -75,13 +74,12 @@ async def poll_pending_atlantic(interval_seconds: int = 300):
     logger.info(f"[Atlantic] Poller started (every {interval_seconds}s)")
     while True:
         try:
-            db = SessionLocal()
-            pending = db.query(ProofJob).filter(
-                ProofJob.l1_settlement_enabled.is_(True),
-                ProofJob.atlantic_query_id.isnot(None),
-                ProofJob.l1_verified_at.is_(None)
-            ).all()
-            db.close()
+            async with AsyncSessionLocal() as db:
+                pending = (await db.execute(select(ProofJob.id, ProofJob.atlantic_query_id).where(
+                    ProofJob.l1_settlement_enabled.is_(True),
+                    ProofJob.atlantic_query_id.isnot(None),
+                    ProofJob.l1_verified_at.is_(None)
+                ))).all()
 
             if pending:
                 logger.info(f"[Atlantic] Polling {len(pending)} pending queries")
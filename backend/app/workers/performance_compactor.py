@@ -0,0 +1,148 @@
+"""
+Performance rollup compactor.
+
+Periodically aggregates executed rebalances (proof_jobs with a tx_hash) into
+``performance_rollups``: one row per closed hour, and one per closed day
+summed from its hours. Every closed hour gets a row, empty or not, so the
+newest hourly row marks how far the rollups reach; PerformanceService reads
+raw rows only beyond that point.
+
+Each pass also re-aggregates the last PERFORMANCE_ROLLUP_RECOMPUTE_HOURS
+closed hours (and their days), picking up jobs that were verified or got
+their tx_hash after their hour closed. Buckets are replaced in a single
+transaction, so a pass is idempotent and readers never see half a bucket.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import PerformanceRollup, ProofJob
+from app.services.performance_service import (
+    GRANULARITIES,
+    ROLLUP_FIELDS,
+    add_sums,
+    as_datetime,
+    bucket_expr,
+    empty_sums,
+    executed_aggregates,
+    floor_bucket,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def compact_performance_rollups(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Roll up closed hours/days not compacted yet plus the recompute window.
+
+    Returns the number of hour and day buckets written.
+    """
+    current_hour = floor_bucket(now or datetime.utcnow(), "hour")
+    latest = db.query(func.max(PerformanceRollup.bucket_start)).filter(
+        PerformanceRollup.granularity == "hour"
+    ).scalar()
+    if latest is None:
+        first = db.query(func.min(ProofJob.created_at)).filter(ProofJob.tx_hash.isnot(None)).scalar()
+        if first is None:
+            return {"hours": 0, "days": 0}
+        start = floor_bucket(first, "hour")
+    else:
+        recompute_from = current_hour - timedelta(hours=settings.PERFORMANCE_ROLLUP_RECOMPUTE_HOURS)
+        start = min(as_datetime(latest) + GRANULARITIES["hour"], recompute_from)
+    if start >= current_hour:
+        return {"hours": 0, "days": 0}
+
+    dialect = db.get_bind().dialect.name
+    table = PerformanceRollup.__table__
+
+    # Hours: GROUP BY over the raw rows of [start, current_hour)
+    hour = bucket_expr(ProofJob.created_at, "hour", dialect).label("bucket")
+    rows = db.query(hour, *executed_aggregates()).filter(
+        ProofJob.created_at >= start,
+        ProofJob.created_at < current_hour,
+        ProofJob.tx_hash.isnot(None),
+    ).group_by(hour).all()
+    by_hour = {as_datetime(row.bucket): row for row in rows}
+    hours = _replace_buckets(db, "hour", start, current_hour, by_hour)
+
+    # Days: closed days touched by this pass, summed from their hourly rows
+    day_lo, day_hi = floor_bucket(start, "day"), floor_bucket(current_hour, "day")
+    days = 0
+    if day_lo < day_hi:
+        day = bucket_expr(table.c.bucket_start, "day", dialect).label("bucket")
+        rows = db.execute(
+            select(day, *(func.sum(table.c[field]).label(field) for field in ROLLUP_FIELDS))
+            .where(
+                table.c.granularity == "hour",
+                table.c.bucket_start >= day_lo,
+                table.c.bucket_start < day_hi,
+            )
+            .group_by(day)
+        ).all()
+        by_day = {as_datetime(row.bucket): row for row in rows}
+        days = _replace_buckets(db, "day", day_lo, day_hi, by_day)
+
+    db.commit()
+    return {"hours": hours, "days": days}
+
+
+def _replace_buckets(db: Session, granularity: str, start: datetime, end: datetime, sums_by_bucket: Dict) -> int:
+    """Replace every ``granularity`` bucket in [start, end) (missing ones as zero rows)."""
+    table = PerformanceRollup.__table__
+    computed_at = datetime.utcnow()
+    rows = []
+    bucket_start = start
+    while bucket_start < end:
+        sums = empty_sums()
+        if bucket_start in sums_by_bucket:
+            add_sums(sums, sums_by_bucket[bucket_start])
+        rows.append({"granularity": granularity, "bucket_start": bucket_start, "computed_at": computed_at, **sums})
+        bucket_start += GRANULARITIES[granularity]
+
+    db.execute(delete(table).where(
+        table.c.granularity == granularity,
+        table.c.bucket_start >= start,
+        table.c.bucket_start < end,
+    ))
+    db.execute(table.insert(), rows)
+    return len(rows)
+
+
+async def _compact_once() -> Dict[str, int]:
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(compact_performance_rollups)
+
+
+async def run_performance_compactor(interval_seconds: float):
+    """Compact performance rollups every ``interval_seconds``."""
+    while True:
+        try:
+            written = await _compact_once()
+            if written["hours"]:
+                logger.info(
+                    "[Performance] Compacted %s hourly and %s daily rollups", written["hours"], written["days"]
+                )
+        except Exception as e:
+            # Concurrent passes from other workers can collide on a bucket; the next pass repairs it
+            logger.error(f"[Performance] Compactor error: {e}", exc_info=True)
+
+        await asyncio.sleep(interval_seconds)
+
+
+def start_performance_compactor() -> Optional[asyncio.Task]:
+    """
+    Kick off the rollup compactor in the background.
+    No-op if PERFORMANCE_COMPACTOR_INTERVAL_SEC <= 0.
+    """
+    interval = settings.PERFORMANCE_COMPACTOR_INTERVAL_SEC
+    if interval <= 0:
+        return None
+    loop = asyncio.get_event_loop()
+    return loop.create_task(run_performance_compactor(interval_seconds=interval))
@@ -0,0 +1,423 @@
+"""
+Durable Stone prover job queue.
+
+Proof requests are persisted as ProofJob rows (status=GENERATING, stage=queued)
+and picked up by a pool of in-process prover workers, so HTTP handlers can
+return a job id immediately instead of holding the connection open for the
+full Stone + Integrity round trip. The ProofJob table *is* the queue: jobs
+survive restarts, and rows whose worker stopped heart-beating are re-queued.
+While a worker holds jobs it refreshes their heartbeat_at every
+PROVER_JOB_HEARTBEAT_SEC (including during the long Stone and Integrity
+registration stages); every pool sweeps for stale jobs at startup and then
+every PROVER_JOB_RECOVERY_INTERVAL_SEC, so a worker that dies mid-job is
+recovered by any surviving process without waiting for a restart.
+
+State machine (status / stage):
+    GENERATING/queued -> GENERATING/tracing -> GENERATING/proving
+    -> GENERATED/serializing -> VERIFYING/registering -> VERIFIED/done
+    orchestrate jobs continue: VERIFIED/executing -> SUBMITTED -> .../done
+    any stage -> FAILED (or TIMEOUT when a prover stage timed out)
+
+Proof-only jobs waiting together are proven as one batch (PROVER_BATCH_MAX_SIZE):
+one Stone run and one Integrity fact, with a Merkle inclusion path per job.
+Only the cairo0 risk program supports batching, so with
+INTEGRITY_MEMORY_VERIFICATION=cairo1 jobs are claimed and proven one at a time.
+"""
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import ProofJob, ProofStatus, ProofJobAcceptedResponse
+from app.services.risk_batch import decision_inputs
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_KIND_PROOF = "proof"  # /proofs/generate: prove + register only
+JOB_KIND_ORCHESTRATE = "orchestrate"  # /risk-engine/orchestrate-allocation: prove + execute
+
+STAGE_QUEUED = "queued"
+STAGE_DONE = "done"
+
+# Status a job carries while in a given pipeline stage
+_STAGE_STATUS = {
+    STAGE_QUEUED: ProofStatus.GENERATING,
+    "tracing": ProofStatus.GENERATING,
+    "proving": ProofStatus.GENERATING,
+    "serializing": ProofStatus.GENERATED,
+    "registering": ProofStatus.VERIFYING,
+}
+
+_ACTIVE_STATUSES = (ProofStatus.GENERATING, ProofStatus.GENERATED, ProofStatus.VERIFYING)
+
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _get_wakeup() -> asyncio.Event:
+    global _wakeup
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    return _wakeup
+
+
+async def enqueue_proof_job(db: AsyncSession, kind: str, request_payload: dict) -> ProofJob:
+    """
+    Persist a queued ProofJob and wake an idle worker.
+
+    ``request_payload`` is the JSON form of the OrchestrationRequest; it is kept
+    under ``metrics["job"]`` so the worker can rebuild the request after a restart.
+    """
+    proof_job = ProofJob(
+        proof_hash="pending",
+        status=ProofStatus.GENERATING,
+        stage=STAGE_QUEUED,
+        attempts=0,
+        proof_source="stone_prover",
+        network=settings.STARKNET_NETWORK,
+        metrics={
+            "jediswap": request_payload.get("jediswap_metrics"),
+            "ekubo": request_payload.get("ekubo_metrics"),
+            "job": {"kind": kind, "request": request_payload},
+        },
+    )
+    db.add(proof_job)
+    await db.commit()
+    await db.refresh(proof_job)
+    logger.info("[Prover] Queued %s job %s", kind, proof_job.id)
+    _get_wakeup().set()
+    return proof_job
+
+
+async def queue_position(db: AsyncSession, proof_job: ProofJob) -> Optional[int]:
+    """1-based position among queued jobs, or None once a worker has claimed it."""
+    if proof_job.status != ProofStatus.GENERATING or proof_job.stage != STAGE_QUEUED:
+        return None
+    ahead = await db.scalar(select(func.count()).select_from(ProofJob).where(
+        ProofJob.status == ProofStatus.GENERATING,
+        ProofJob.stage == STAGE_QUEUED,
+        ProofJob.created_at < proof_job.created_at,
+    ))
+    return ahead + 1
+
+
+async def accepted_response(proof_job: ProofJob, db: Optional[AsyncSession] = None) -> ProofJobAcceptedResponse:
+    """Build the 202 body returned for a freshly queued job."""
+    return ProofJobAcceptedResponse(
+        proof_job_id=str(proof_job.id),
+        status=proof_job.status,
+        stage=proof_job.stage,
+        queue_position=await queue_position(db, proof_job) if db is not None else None,
+        status_url=f"/api/v1/verification/verification-status/{proof_job.id}",
+        message="Proof job queued. Poll status_url for progress.",
+    )
+
+
+def _batch_size() -> int:
+    """Jobs to claim at once; the cairo1 risk program cannot be batched."""
+    if settings.INTEGRITY_MEMORY_VERIFICATION == "cairo1":
+        return 1
+    return settings.PROVER_BATCH_MAX_SIZE
+
+
+def _job_kind(job: ProofJob) -> str:
+    return ((job.metrics or {}).get("job") or {}).get("kind", JOB_KIND_PROOF)
+
+
+async def _claim_next_jobs(worker_id: str, max_batch: int = 1) -> list[str]:
+    """
+    Atomically move the oldest queued job to the tracing stage and return its id.
+
+    When the oldest job is a proof-only job and ``max_batch`` > 1, further
+    queued proof-only jobs are claimed with it (up to ``max_batch``) so they
+    share one batched Stone proof. Orchestrate jobs are never batched: each
+    on-chain execution needs the fact for its own metrics.
+    """
+    async with AsyncSessionLocal() as db:
+        candidates = (await db.execute(
+            select(ProofJob)
+            .where(ProofJob.status == ProofStatus.GENERATING, ProofJob.stage == STAGE_QUEUED)
+            .order_by(ProofJob.created_at)
+            .limit(max(1, max_batch) * 4)
+            .with_for_update(skip_locked=True)
+        )).scalars().all()
+        if not candidates:
+            await db.rollback()
+            return []
+        claimed = [candidates[0]]
+        if max_batch > 1 and _job_kind(candidates[0]) == JOB_KIND_PROOF:
+            claimed += [j for j in candidates[1:] if _job_kind(j) == JOB_KIND_PROOF][: max_batch - 1]
+        now = datetime.utcnow()
+        for job in claimed:
+            job.stage = "tracing"
+            job.worker_id = worker_id
+            job.attempts = (job.attempts or 0) + 1
+            job.started_at = now
+            job.heartbeat_at = now
+        await db.commit()
+        return [str(job.id) for job in claimed]
+
+
+async def requeue_stale_jobs() -> int:
+    """
+    Return jobs orphaned by a crashed/restarted worker to the queue.
+
+    A job is stale when it is mid-pipeline and its heartbeat is older than
+    PROVER_JOB_STALE_SEC; live workers refresh it every PROVER_JOB_HEARTBEAT_SEC
+    (see _heartbeat). Jobs past PROVER_JOB_MAX_ATTEMPTS are failed instead.
+    Called periodically by every ProverWorkerPool.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.PROVER_JOB_STALE_SEC)
+    async with AsyncSessionLocal() as db:
+        stale = (await db.execute(select(ProofJob).where(
+            ProofJob.status.in_(_ACTIVE_STATUSES),
+            ProofJob.stage.isnot(None),
+            ProofJob.stage != STAGE_QUEUED,
+            ProofJob.heartbeat_at < cutoff,
+        ))).scalars().all()
+        for job in stale:
+            if (job.attempts or 0) >= settings.PROVER_JOB_MAX_ATTEMPTS:
+                job.status = ProofStatus.FAILED
+                job.stage = STAGE_DONE
+                job.error = f"Prover worker lost {job.attempts} times; giving up"
+            else:
+                job.status = ProofStatus.GENERATING
+                job.stage = STAGE_QUEUED
+                job.worker_id = None
+        await db.commit()
+        if stale:
+            logger.warning("[Prover] Re-queued/failed %s stale proof jobs", len(stale))
+        return len(stale)
+
+
+async def _heartbeat(job_ids: list[uuid.UUID], worker_id: str) -> None:
+    """
+    Refresh heartbeat_at of jobs this worker still owns until cancelled.
+
+    Pipeline stages such as the Stone run and Integrity registration can
+    take many minutes without a stage change, so progress() alone would let
+    a live job look stale. Uses its own session: the pipeline's session is
+    busy for the whole job.
+    """
+    while True:
+        await asyncio.sleep(settings.PROVER_JOB_HEARTBEAT_SEC)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(ProofJob)
+                    .where(
+                        ProofJob.id.in_(job_ids),
+                        ProofJob.worker_id == worker_id,
+                        ProofJob.stage.notin_((STAGE_QUEUED, STAGE_DONE)),
+                    )
+                    .values(heartbeat_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception as e:  # noqa: BLE001 - retried on the next beat
+            logger.warning("[Prover] %s heartbeat failed: %s", worker_id, e)
+
+
+async def _process_jobs(job_ids: list[str], worker_id: str) -> None:
+    """
+    Run claimed jobs through the proof pipeline, recording progress on the rows.
+    A single job runs the regular pipeline; several proof jobs share one batched proof.
+    """
+    # Imported lazily: the route module imports this worker for enqueueing.
+    from app.api.routes.risk_engine import (
+        OrchestrationRequest,
+        _create_batch_proof_jobs,
+        _create_proof_job,
+        _run_orchestration,
+    )
+
+    async with AsyncSessionLocal() as db:
+        jobs = [job for job in [await db.get(ProofJob, uuid.UUID(job_id)) for job_id in job_ids] if job]
+        if not jobs:
+            logger.warning("[Prover] Claimed jobs %s disappeared", job_ids)
+            return
+
+        async def progress(stage: str) -> None:
+            now = datetime.utcnow()
+            for job in jobs:
+                job.stage = stage
+                if stage in _STAGE_STATUS:
+                    job.status = _STAGE_STATUS[stage]
+                job.heartbeat_at = now
+            await db.commit()
+
+        jobs, requests = await _validated_requests(db, jobs, OrchestrationRequest)
+        if not jobs:
+            return
+
+        label = ",".join(str(job.id) for job in jobs)
+        heartbeat = asyncio.create_task(_heartbeat([job.id for job in jobs], worker_id))
+        try:
+            if len(jobs) > 1:
+                await _create_batch_proof_jobs(requests, db, jobs, progress=progress)
+            elif _job_kind(jobs[0]) == JOB_KIND_ORCHESTRATE:
+                await _run_orchestration(requests[0], db, proof_job=jobs[0], progress=progress)
+            else:
+                await _create_proof_job(requests[0], db, proof_job=jobs[0], progress=progress)
+            now = datetime.utcnow()
+            for job in jobs:
+                job.stage = STAGE_DONE
+                job.heartbeat_at = now
+            await db.commit()
+            logger.info("[Prover] %s finished job(s) %s (%s)", worker_id, label, jobs[0].status)
+        except HTTPException as e:
+            if e.status_code == 503:
+                # Limiter saturated by inline (wait=true) requests: put the jobs back.
+                for job in jobs:
+                    job.status = ProofStatus.GENERATING
+                    job.stage = STAGE_QUEUED
+                    job.attempts = max(0, (job.attempts or 1) - 1)
+                await db.commit()
+                await asyncio.sleep(settings.PROVER_JOB_POLL_INTERVAL_SEC)
+                return
+            await _mark_failed(db, jobs, ProofStatus.FAILED, str(e.detail))
+        except subprocess.TimeoutExpired as e:
+            await _mark_failed(db, jobs, ProofStatus.TIMEOUT, f"Prover stage timed out: {e}")
+        except asyncio.CancelledError:
+            # Shutdown: proving stages are safe to redo, an on-chain execution is not.
+            await _rollback(db, jobs)
+            interrupted = []
+            for job in jobs:
+                if job.status in _ACTIVE_STATUSES:
+                    job.status = ProofStatus.GENERATING
+                    job.stage = STAGE_QUEUED
+                    job.worker_id = None
+                else:
+                    interrupted.append(job)
+            await db.commit()
+            if interrupted:
+                await _mark_failed(db, interrupted, ProofStatus.FAILED, "Interrupted by shutdown during execution")
+            raise
+        except Exception as e:  # noqa: BLE001 - worker must survive any job failure
+            logger.error("[Prover] Job(s) %s failed: %s", label, e, exc_info=True)
+            await _mark_failed(db, jobs, ProofStatus.FAILED, str(e))
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+
+async def _validated_requests(db: AsyncSession, jobs: list[ProofJob], request_cls) -> tuple[list[ProofJob], list]:
+    """
+    Parse and range-check each job's stored request up front.
+
+    Jobs with an invalid request are failed on their own and dropped, so one
+    bad decision cannot fail the batch it was claimed with.
+    """
+    valid, requests, now = [], [], datetime.utcnow()
+    for job in jobs:
+        try:
+            request = request_cls(**((job.metrics or {}).get("job") or {}).get("request", {}))
+            decision_inputs(request.jediswap_metrics.dict(), request.ekubo_metrics.dict())
+        except (TypeError, ValueError) as e:  # pydantic's ValidationError is a ValueError
+            logger.warning("[Prover] Rejecting job %s: invalid request: %s", job.id, e)
+            job.status = ProofStatus.FAILED
+            job.stage = STAGE_DONE
+            job.error = f"Invalid proof request: {e}"[:2000]
+            job.heartbeat_at = now
+            continue
+        valid.append(job)
+        requests.append(request)
+    if len(valid) < len(jobs):
+        await db.commit()
+    return valid, requests
+
+
+async def _rollback(db: AsyncSession, jobs: list[ProofJob]) -> None:
+    """Roll back and reload ``jobs``: expired attributes cannot be lazy-loaded under asyncio."""
+    await db.rollback()
+    for job in jobs:
+        await db.refresh(job)
+
+
+async def _mark_failed(db: AsyncSession, jobs: list[ProofJob], status: ProofStatus, error: str) -> None:
+    try:
+        await _rollback(db, jobs)
+        now = datetime.utcnow()
+        for job in jobs:
+            job.status = status
+            job.stage = STAGE_DONE
+            job.error = error[:2000]
+            job.heartbeat_at = now
+        await db.commit()
+    except Exception as e:  # noqa: BLE001
+        logger.error("[Prover] Could not record failure for jobs %s: %s", [job.id for job in jobs], e)
+
+
+class ProverWorkerPool:
+    """Fixed-size pool of asyncio prover workers draining the ProofJob queue."""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def _worker(self, index: int) -> None:
+        worker_id = f"{self._prefix}:{index}"
+        wakeup = _get_wakeup()
+        while not self._stopping:
+            try:
+                job_ids = await _claim_next_jobs(worker_id, _batch_size())
+            except Exception as e:  # noqa: BLE001 - DB hiccup; back off and retry
+                logger.warning("[Prover] %s could not claim job: %s", worker_id, e)
+                job_ids = []
+            if job_ids:
+                await _process_jobs(job_ids, worker_id)
+                continue
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=settings.PROVER_JOB_POLL_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _recover_stale_jobs(self) -> None:
+        """Re-queue stale jobs now and then every PROVER_JOB_RECOVERY_INTERVAL_SEC."""
+        while not self._stopping:
+            try:
+                await requeue_stale_jobs()
+            except Exception as e:  # noqa: BLE001 - DB may be unavailable in dev
+                logger.warning("[Prover] Stale job recovery skipped: %s", e)
+            await asyncio.sleep(settings.PROVER_JOB_RECOVERY_INTERVAL_SEC)
+
+    def start(self) -> None:
+        loop = asyncio.get_event_loop()
+        # Recovery only touches claimed jobs, so workers can start draining the queue meanwhile
+        self._tasks = [loop.create_task(self._recover_stale_jobs())]
+        self._tasks += [loop.create_task(self._worker(i)) for i in range(self.size)]
+        logger.info("[Prover] Worker pool started (%s workers)", self.size)
+
+    async def stop(self) -> None:
+        """Cancel workers; in-flight jobs are picked up again after restart."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("[Prover] Worker pool stopped")
+
+
+def start_prover_workers() -> Optional[ProverWorkerPool]:
+    """
+    Start the prover worker pool (PROVER_WORKERS, 0 = one per CPU core).
+    Returns None when disabled via PROVER_WORKERS < 0.
+    """
+    if settings.PROVER_WORKERS < 0:
+        return None
+    pool = ProverWorkerPool(settings.PROVER_WORKERS or (os.cpu_count() or 1))
+    pool.start()
+    return pool
@@ -8,15 +8,28 @@ import logging
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
 from app.models import ProofJob, ProofStatus
 from app.services.sharp_service import get_sharp_service
 
 logger = logging.getLogger(__name__)
 
 
+async def _update_job(job_id: UUID, **fields) -> bool:
+    """
+    Set ``fields`` on a proof job using a short-lived session, so no
+    connection is held while waiting on SHARP. Returns False if it is gone.
+    """
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ProofJob, UUID(str(job_id)))
+        if not job:
+            return False
+        for field, value in fields.items():
+            setattr(job, field, value)
+        await db.commit()
+        return True
+
+
 async def submit_proof_to_sharp(
     job_id: UUID,
     proof_data: bytes,
@@ -34,11 +47,11 @@ async def submit_proof_to_sharp(
         proof_hash: Hash of proof
     """
     sharp_service = get_sharp_service()
-    db = SessionLocal()
     
     try:
         # Update status: submitting to SHARP
-        job = db.query(ProofJob).filter(ProofJob.id == job_id).first()
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ProofJob, UUID(str(job_id)))
         if not job:
             logger.error(f"Proof job {job_id} not found")
             return
@@ -55,12 +68,8 @@ async def submit_proof_to_sharp(
             )
             
             # Update with SHARP job ID (don't change main status)
-            job.sharp_job_id = sharp_result.job_id
             # Keep status as SUBMITTED (on-chain success), SHARP verification is separate
-            if job.status == ProofStatus.SUBMITTED:
-                # Only update if still in submitted state (on-chain succeeded)
-                pass  # Keep SUBMITTED status
-            db.commit()
+            await _update_job(job_id, sharp_job_id=sharp_result.job_id)
         except Exception as e:
             logger.warning(f"SHARP submission failed for {job_id} (non-critical, on-chain tx succeeded): {e}")
             # Don't change status - on-chain execution already succeeded
@@ -75,14 +84,7 @@ async def submit_proof_to_sharp(
         logger.error(f"SHARP submission failed for {job_id}: {e}", exc_info=True)
         
         # Update job with error
-        job = db.query(ProofJob).filter(ProofJob.id == job_id).first()
-        if job:
-            job.status = ProofStatus.FAILED
-            job.error = str(e)
-            db.commit()
-    
-    finally:
-        db.close()
+        await _update_job(job_id, status=ProofStatus.FAILED, error=str(e))
 
 
 async def monitor_sharp_verification(
@@ -99,72 +101,67 @@ async def monitor_sharp_verification(
         sharp_job_id: SHARP job ID
     """
     sharp_service = get_sharp_service()
-    db = SessionLocal()
     
     max_wait = 3600  # 1 hour
     poll_interval = 30  # 30 seconds
     elapsed = 0
     
-    try:
-        logger.info(f"Monitoring SHARP verification for {job_id}...")
-        
-        while elapsed < max_wait:
-            try:
-                # Check SHARP status
-                status = await sharp_service.check_status(sharp_job_id)
+    logger.info(f"Monitoring SHARP verification for {job_id}...")
+    
+    while elapsed < max_wait:
+        try:
+            # Check SHARP status
+            status = await sharp_service.check_status(sharp_job_id)
+            
+            if status.state == "VERIFIED":
+                # Success!
+                await _update_job(
+                    job_id,
+                    status=ProofStatus.VERIFIED,
+                    fact_hash=status.fact_hash,
+                    verified_at=datetime.utcnow(),
+                )
                 
-                if status.state == "VERIFIED":
-                    # Success!
-                    job = db.query(ProofJob).filter(ProofJob.id == job_id).first()
-                    if job:
-                        job.status = ProofStatus.VERIFIED
-                        job.fact_hash = status.fact_hash
-                        job.verified_at = datetime.utcnow()
-                        db.commit()
-                    
-                    logger.info(f"Proof {job_id} verified on SHARP! Fact: {status.fact_hash}")
-                    
-                    # TODO: Trigger webhook/notification
-                    await notify_verification_complete(job_id, status.fact_hash)
-                    
-                    return
+                logger.info(f"Proof {job_id} verified on SHARP! Fact: {status.fact_hash}")
                 
-                elif status.state == "FAILED":
-                    # Verification failed
-                    job = db.query(ProofJob).filter(ProofJob.id == job_id).first()
-                    if job:
-                        job.status = ProofStatus.FAILED
-                        job.error = status.error or "SHARP verification failed"
-                        db.commit()
-                    
-                    logger.error(f"SHARP verification failed for {job_id}: {status.error}")
-                    return
+                # TODO: Trigger webhook/notification
+                await notify_verification_complete(job_id, status.fact_hash)
                 
-                # Still processing, wait and retry
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
+                return
+            
+            elif status.state == "FAILED":
+                # Verification failed
+                await _update_job(
+                    job_id,
+                    status=ProofStatus.FAILED,
+                    error=status.error or "SHARP verification failed",
+                )
                 
-                if elapsed % 300 == 0:  # Log every 5 minutes
-                    logger.info(
-                        f"Still waiting for SHARP verification: {job_id} "
-                        f"({elapsed}s elapsed, {max_wait - elapsed}s remaining)"
-                    )
+                logger.error(f"SHARP verification failed for {job_id}: {status.error}")
+                return
             
-            except Exception as e:
-                logger.error(f"Error checking SHARP status: {e}")
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
+            # Still processing, wait and retry
+            await asyncio.sleep(poll_interval)
+            elapsed += poll_interval
+            
+            if elapsed % 300 == 0:  # Log every 5 minutes
+                logger.info(
+                    f"Still waiting for SHARP verification: {job_id} "
+                    f"({elapsed}s elapsed, {max_wait - elapsed}s remaining)"
+                )
         
-        # Timeout
-        logger.error(f"SHARP verification timeout for {job_id}")
-        job = db.query(ProofJob).filter(ProofJob.id == job_id).first()
-        if job:
-            job.status = ProofStatus.TIMEOUT
-            job.error = f"SHARP verification timeout after {max_wait}s"
-            db.commit()
+        except Exception as e:
+            logger.error(f"Error checking SHARP status: {e}")
+            await asyncio.sleep(poll_interval)
+            elapsed += poll_interval
     
-    finally:
-        db.close()
+    # Timeout
+    logger.error(f"SHARP verification timeout for {job_id}")
+    await _update_job(
+        job_id,
+        status=ProofStatus.TIMEOUT,
+        error=f"SHARP verification timeout after {max_wait}s",
+    )
 
 
 async def notify_verification_complete(
@@ -3,6 +3,7 @@ Obsqra Backend - Verifiable AI Infrastructure for DeFi
 FastAPI + PostgreSQL + ML Models
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -10,10 +11,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.config import settings
-from app.database import init_db
+from app.db.session import close_db, init_db
 from app.api import router as api_router
 from app.ml.scheduler import start_ml_scheduler
 from app.workers.atlantic_worker import start_atlantic_poller
+from app.workers.prover_worker import start_prover_workers
+from app.workers.performance_compactor import start_performance_compactor
+from app.services.cairo_compile_cache import get_cairo_compile_cache
+from app.utils.block_cache import get_head_poller
+from app.utils.rpc import close_rpc_clients
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -39,11 +45,40 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Atlantic poller started")
     else:
         logger.info("ℹ️ Atlantic poller not started (no API key configured)")
+
+    # Start Stone prover worker pool (drains queued ProofJobs)
+    prover_pool = start_prover_workers()
+    if prover_pool:
+        logger.info("✅ Prover worker pool started (%s workers)", prover_pool.size)
+    else:
+        logger.info("ℹ️ Prover worker pool disabled (PROVER_WORKERS < 0)")
+
+    # Hourly/daily performance rollups for /analytics/performance/real
+    compactor_task = start_performance_compactor()
+    if compactor_task:
+        logger.info("✅ Performance rollup compactor started")
+
+    # Compile proof programs ahead of the first proof request
+    compile_warm_task = asyncio.create_task(get_cairo_compile_cache().warm())
+
+    # Shared chain-head poller; view-call cache bypasses itself while it is off
+    head_poller = get_head_poller()
+    if settings.STARKNET_READ_CACHE_ENABLED:
+        head_poller.start()
+        logger.info("✅ Head poller started (every %ss)", settings.STARKNET_HEAD_POLL_SEC)
     
     yield
     
     # Cleanup on shutdown
     logger.info("🛑 Shutting down Obsqra Backend...")
+    compile_warm_task.cancel()
+    if compactor_task:
+        compactor_task.cancel()
+    await head_poller.stop()
+    if prover_pool:
+        await prover_pool.stop()
+    await close_rpc_clients()
+    await close_db()
 
 
 # Create FastAPI app
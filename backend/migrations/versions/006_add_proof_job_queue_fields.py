@@ -0,0 +1,32 @@
+"""Add prover queue fields to proof_jobs
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('proof_jobs', sa.Column('stage', sa.String(), nullable=True))
+    op.add_column('proof_jobs', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('proof_jobs', sa.Column('worker_id', sa.String(), nullable=True))
+    op.add_column('proof_jobs', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('proof_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_proof_jobs_stage', 'proof_jobs', ['stage'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proof_jobs_stage', table_name='proof_jobs')
+    op.drop_column('proof_jobs', 'heartbeat_at')
+    op.drop_column('proof_jobs', 'started_at')
+    op.drop_column('proof_jobs', 'worker_id')
+    op.drop_column('proof_jobs', 'attempts')
+    op.drop_column('proof_jobs', 'stage')
@@ -0,0 +1,58 @@
+"""Move proof_jobs.proof_data into the content-addressed proof blob store
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 50
+
+
+def upgrade() -> None:
+    from app.services.proof_blob_store import get_proof_blob_store
+
+    op.add_column('proof_jobs', sa.Column('proof_blob_key', sa.String(), nullable=True))
+    op.add_column('proof_jobs', sa.Column('proof_size_bytes', sa.Integer(), nullable=True))
+    op.create_index('ix_proof_jobs_proof_blob_key', 'proof_jobs', ['proof_blob_key'])
+
+    # Copy existing blobs out of the table a few rows at a time
+    bind = op.get_bind()
+    store = get_proof_blob_store()
+    while True:
+        rows = bind.execute(sa.text(
+            "SELECT id, proof_data FROM proof_jobs WHERE proof_data IS NOT NULL LIMIT :limit"
+        ), {"limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            data = bytes(row.proof_data)
+            bind.execute(sa.text(
+                "UPDATE proof_jobs SET proof_blob_key = :key, proof_size_bytes = :size, proof_data = NULL "
+                "WHERE id = :id"
+            ), {"key": store.put(data), "size": len(data), "id": row.id})
+
+
+def downgrade() -> None:
+    from app.services.proof_blob_store import get_proof_blob_store
+
+    bind = op.get_bind()
+    store = get_proof_blob_store()
+    rows = bind.execute(sa.text(
+        "SELECT id, proof_blob_key FROM proof_jobs WHERE proof_blob_key IS NOT NULL"
+    )).fetchall()
+    for row in rows:
+        if store.exists(row.proof_blob_key):
+            bind.execute(sa.text("UPDATE proof_jobs SET proof_data = :data WHERE id = :id"),
+                         {"data": store.get(row.proof_blob_key), "id": row.id})
+
+    op.drop_index('ix_proof_jobs_proof_blob_key', table_name='proof_jobs')
+    op.drop_column('proof_jobs', 'proof_size_bytes')
+    op.drop_column('proof_jobs', 'proof_blob_key')
@@ -0,0 +1,45 @@
+"""Add proof_job_summary rollup table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from app.services.proof_summary import rebuild_proof_summary
+
+    op.create_table(
+        'proof_job_summary',
+        sa.Column('network', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('job_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('l2_verified_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('l1_verified_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('generation_time_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('generation_time_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('generation_time_min', sa.Float(), nullable=True),
+        sa.Column('generation_time_max', sa.Float(), nullable=True),
+        sa.Column('proof_size_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('proof_size_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('proof_size_min', sa.BigInteger(), nullable=True),
+        sa.Column('proof_size_max', sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint('network', 'status'),
+    )
+    # "latest job" lookup on the summary endpoint
+    op.create_index('ix_proof_jobs_created_at', 'proof_jobs', ['created_at'])
+
+    rebuild_proof_summary(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proof_jobs_created_at', table_name='proof_jobs')
+    op.drop_table('proof_job_summary')
@@ -0,0 +1,35 @@
+"""Add performance_rollups (hourly/daily executed-rebalance aggregates)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by app/workers/performance_compactor.py on its first pass
+    op.create_table(
+        'performance_rollups',
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('rebalance_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('verified_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('jediswap_pct_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('ekubo_pct_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('jediswap_risk_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('ekubo_risk_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('performance_rollups')
@@ -0,0 +1,45 @@
+"""Add composite (filter, created_at, id) indexes for keyset-paginated history endpoints
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Each index matches a "WHERE <col> = ? ORDER BY created_at DESC, id DESC" page query
+INDEXES = [
+    ('ix_proof_jobs_status_created_at', 'proof_jobs', ['status', 'created_at', 'id']),
+    ('ix_proof_jobs_network_created_at', 'proof_jobs', ['network', 'created_at', 'id']),
+    ('ix_risk_history_user_id_created_at', 'risk_history', ['user_id', 'created_at', 'id']),
+    ('ix_allocation_history_user_id_created_at', 'allocation_history', ['user_id', 'created_at', 'id']),
+    ('ix_transactions_user_id_created_at', 'transactions', ['user_id', 'created_at', 'id']),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set:
+    if not inspector.has_table(table):
+        return set()
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    # The user tables are created from the models (init_db's create_all), which
+    # may already have built these indexes from __table_args__
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector.has_table(table) and name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,159 @@
+"""
+Keyset pagination tests: cursors round-trip, malformed cursors are rejected
+with a 400, and paging through rows that share a created_at returns every
+row exactly once in (created_at DESC, id DESC) order.
+
+Run with: python -m pytest tests/test_pagination.py
+"""
+import base64
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models import ProofJob, RiskHistory
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    next_page,
+)
+
+T0 = datetime(2026, 3, 1, 12, 0, 0, 123456)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    RiskHistory.__table__.create(engine)
+    ProofJob.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _b64(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "row_id, id_column",
+    [
+        (42, RiskHistory.id),
+        (uuid.UUID("9b2f6c1e-0a4d-4f0e-8c3b-5d7e9f1a2b3c"), ProofJob.id),
+    ],
+)
+def test_cursor_round_trip(row_id, id_column):
+    cursor = encode_cursor(T0, row_id)
+    assert "=" not in cursor  # padding stripped, safe in a query string
+    assert decode_cursor(cursor, id_column) == (T0, row_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        "a",  # not valid base64
+        _b64(b"\xff\xfe"),  # not UTF-8
+        _b64(b"{not json"),
+        _b64(b'"2026-03-01T12:00:00"'),  # not a pair
+        _b64(b'["2026-03-01T12:00:00",1,2]'),
+        _b64(b'["yesterday","1"]'),  # bad timestamp
+        _b64(b'[123,"1"]'),
+        _b64(b'["2026-03-01T12:00:00","abc"]'),  # id of the wrong type
+    ],
+)
+def test_malformed_cursor_raises_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, RiskHistory.id)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+def test_malformed_uuid_cursor_raises_400():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor(T0, "not-a-uuid"), ProofJob.id)
+    assert exc_info.value.status_code == 400
+
+
+def test_keyset_page_rejects_malformed_cursor(db):
+    with pytest.raises(HTTPException) as exc_info:
+        keyset_page(select(RiskHistory), RiskHistory.created_at, RiskHistory.id, "garbage", 10)
+    assert exc_info.value.status_code == 400
+
+
+def _pages(db, query, created_column, id_column, limit: int) -> list:
+    """Follow X-Next-Cursor until the last page; returns the pages."""
+    pages, cursor = [], None
+    while True:
+        response = Response()
+        page_query = keyset_page(query, created_column, id_column, cursor, limit)
+        rows = next_page(db.execute(page_query).scalars().all(), limit, response)
+        pages.append(rows)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def _risk(row_id: int, created_at: datetime) -> RiskHistory:
+    return RiskHistory(id=row_id, user_id=1, protocol="ekubo", risk_score=0.5, created_at=created_at)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 7, 20])
+def test_ties_on_created_at_are_broken_by_id(db, limit):
+    # Ten rows share T0, and ties sit at both ends of the range
+    rows = [_risk(i, T0) for i in range(1, 11)]
+    rows += [_risk(i, T0 + timedelta(seconds=1)) for i in (11, 12)]
+    rows += [_risk(i, T0 - timedelta(microseconds=1)) for i in (13, 14, 15)]
+    db.add_all(rows)
+    db.commit()
+
+    pages = _pages(db, select(RiskHistory), RiskHistory.created_at, RiskHistory.id, limit)
+    seen = [row.id for page in pages for row in page]
+
+    assert seen == [12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 15, 14, 13]
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_ties_with_uuid_ids(db):
+    ids = sorted(uuid.uuid4() for _ in range(9))
+    db.add_all(ProofJob(id=row_id, proof_hash=str(row_id), metrics={}, created_at=T0) for row_id in ids)
+    db.commit()
+
+    pages = _pages(db, select(ProofJob), ProofJob.created_at, ProofJob.id, 4)
+
+    assert [len(page) for page in pages] == [4, 4, 1]
+    assert [row.id for page in pages for row in page] == list(reversed(ids))
+
+
+def test_keyset_page_keeps_filters(db):
+    db.add_all([_risk(i, T0) for i in range(1, 7)])
+    db.add(RiskHistory(id=7, user_id=1, protocol="jediswap", risk_score=0.1, created_at=T0))
+    db.commit()
+
+    query = select(RiskHistory).where(RiskHistory.protocol == "ekubo")
+    pages = _pages(db, query, RiskHistory.created_at, RiskHistory.id, 4)
+
+    assert [row.id for page in pages for row in page] == [6, 5, 4, 3, 2, 1]
+
+
+def test_no_cursor_header_on_last_page(db):
+    db.add_all([_risk(i, T0) for i in range(1, 4)])
+    db.commit()
+
+    response = Response()
+    query = keyset_page(select(RiskHistory), RiskHistory.created_at, RiskHistory.id, None, 3)
+    rows = next_page(db.execute(query).scalars().all(), 3, response)
+
+    assert len(rows) == 3
+    assert NEXT_CURSOR_HEADER not in response.headers
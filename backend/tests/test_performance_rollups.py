@@ -0,0 +1,245 @@
+"""
+Performance rollup tests: windows answered from performance_rollups plus raw
+proof_jobs edges must equal aggregating every raw row, across hour and day
+boundaries, before and after compaction, and for late changes inside the
+recompute window.
+
+Run with: python -m pytest tests/test_performance_rollups.py
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import get_settings
+from app.models import PerformanceRollup, ProofJob, ProofStatus
+from app.services.performance_service import (
+    PerformanceService,
+    add_sums,
+    empty_sums,
+    floor_bucket,
+)
+from app.workers.performance_compactor import compact_performance_rollups
+
+NOW = datetime(2026, 3, 10, 14, 23, 41)
+FIRST_JOB = datetime(2026, 3, 4, 22, 50)
+RECOMPUTE_HOURS = get_settings().PERFORMANCE_ROLLUP_RECOMPUTE_HOURS
+
+# Windows with edges on, just off, and between hour and day boundaries
+WINDOWS = [
+    (datetime(2026, 3, 5, 0, 0), datetime(2026, 3, 9, 0, 0)),  # whole days
+    (datetime(2026, 3, 5, 7, 0), datetime(2026, 3, 8, 19, 0)),  # whole hours, partial days
+    (datetime(2026, 3, 5, 7, 13), datetime(2026, 3, 8, 19, 47)),  # partial hours at both ends
+    (datetime(2026, 3, 6, 23, 59, 59), datetime(2026, 3, 7, 0, 0, 1)),  # straddles midnight
+    (datetime(2026, 3, 7, 10, 5), datetime(2026, 3, 7, 10, 55)),  # inside one hour
+    (datetime(2026, 3, 9, 22, 30), datetime(2026, 3, 10, 14, 23, 41)),  # up to now (open hour)
+    (datetime(2026, 3, 4, 0, 0), datetime(2026, 3, 11, 0, 0)),  # beyond both ends of the data
+]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    ProofJob.__table__.create(engine)
+    PerformanceRollup.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def jobs(session):
+    """A rebalance roughly every 20 minutes from FIRST_JOB until NOW."""
+    rng = random.Random(7)
+    db = session()
+    created_at = FIRST_JOB
+    i = 0
+    while created_at < NOW:
+        db.add(_job(rng, i, created_at))
+        created_at += timedelta(minutes=rng.randint(1, 40), seconds=rng.randint(0, 59))
+        i += 1
+    db.commit()
+    db.close()
+    return i
+
+
+def _job(rng: random.Random, i: int, created_at: datetime, **kwargs) -> ProofJob:
+    values = {
+        "proof_hash": f"0x{i:x}",
+        "metrics": {},
+        "created_at": created_at,
+        "tx_hash": f"0xabc{i:x}" if rng.random() < 0.8 else None,
+        "status": rng.choice([ProofStatus.GENERATED, ProofStatus.SUBMITTED, ProofStatus.VERIFIED]),
+        "verified_at": created_at + timedelta(minutes=5) if rng.random() < 0.2 else None,
+        "jediswap_pct": rng.randint(0, 10000),
+        "ekubo_pct": rng.randint(0, 10000),
+        "jediswap_risk": rng.randint(0, 100),
+        "ekubo_risk": rng.choice([None, rng.randint(0, 100)]),
+    }
+    values.update(kwargs)
+    return ProofJob(**values)
+
+
+def _expected(db, start: datetime, end: datetime, granularity: str) -> dict:
+    """Reference sums per bucket, aggregated in Python over every raw row."""
+    buckets = {}
+    for job in db.query(ProofJob).filter(ProofJob.tx_hash.isnot(None)).all():
+        if not start <= job.created_at < end:
+            continue
+        verified = job.status == ProofStatus.VERIFIED or job.verified_at is not None
+        add_sums(buckets.setdefault(floor_bucket(job.created_at, granularity), empty_sums()), {
+            "rebalance_count": 1,
+            "verified_count": int(verified),
+            "jediswap_pct_sum": job.jediswap_pct,
+            "ekubo_pct_sum": job.ekubo_pct,
+            "jediswap_risk_sum": job.jediswap_risk,
+            "ekubo_risk_sum": job.ekubo_risk,
+        })
+    return buckets
+
+
+def _assert_matches_raw(session) -> None:
+    db = session()
+    for start, end in WINDOWS:
+        for granularity in ("hour", "day"):
+            # Fresh service per query: it caches how far the rollups reach
+            assert PerformanceService(db)._bucket_sums(start, end, granularity) == _expected(db, start, end, granularity), (
+                start, end, granularity
+            )
+    db.close()
+
+
+def _all_raw(session, fn):
+    """Evaluate ``fn(service)`` with the rollups removed, then restore them."""
+    db = session()
+    saved = db.query(PerformanceRollup).count()
+    db.query(PerformanceRollup).delete()
+    db.flush()
+    result = fn(PerformanceService(db))
+    db.rollback()
+    assert db.query(PerformanceRollup).count() == saved
+    db.close()
+    return result
+
+
+def test_raw_only_before_first_compaction(session, jobs):
+    _assert_matches_raw(session)
+
+
+def test_first_pass_writes_every_closed_hour_and_day(session, jobs):
+    db = session()
+    written = compact_performance_rollups(db, now=NOW)
+
+    first_hour = floor_bucket(FIRST_JOB, "hour")
+    assert written["hours"] == int((floor_bucket(NOW, "hour") - first_hour) / timedelta(hours=1))
+    assert written["days"] == (floor_bucket(NOW, "day") - floor_bucket(FIRST_JOB, "day")).days
+    latest = max(row.bucket_start for row in db.query(PerformanceRollup).filter_by(granularity="hour"))
+    assert latest == floor_bucket(NOW, "hour") - timedelta(hours=1)
+    db.close()
+
+
+def test_rollups_plus_raw_equal_all_raw(session, jobs):
+    compact_performance_rollups(session(), now=NOW)
+    _assert_matches_raw(session)
+
+
+def test_partially_compacted_tail_is_read_raw(session, jobs):
+    # Rollups reach 2026-03-08 05:00; everything after comes from raw rows
+    compact_performance_rollups(session(), now=datetime(2026, 3, 8, 5, 30))
+    _assert_matches_raw(session)
+
+
+def test_day_rollups_equal_sum_of_hour_rollups(session, jobs):
+    db = session()
+    compact_performance_rollups(db, now=NOW)
+    hours = {}
+    for row in db.query(PerformanceRollup).filter_by(granularity="hour"):
+        add_sums(hours.setdefault(floor_bucket(row.bucket_start, "day"), empty_sums()), row)
+    for row in db.query(PerformanceRollup).filter_by(granularity="day"):
+        assert add_sums(empty_sums(), row) == hours[row.bucket_start]
+    db.close()
+
+
+def test_incremental_passes_across_day_boundaries(session, jobs):
+    for now in (datetime(2026, 3, 6, 23, 59), datetime(2026, 3, 7, 0, 1), datetime(2026, 3, 8, 12, 0), NOW):
+        compact_performance_rollups(session(), now=now)
+        _assert_matches_raw(session)
+
+    incremental = {
+        (row.granularity, row.bucket_start): add_sums(empty_sums(), row)
+        for row in session().query(PerformanceRollup)
+    }
+    db = session()
+    db.query(PerformanceRollup).delete()
+    db.commit()
+    compact_performance_rollups(session(), now=NOW)
+    single = {
+        (row.granularity, row.bucket_start): add_sums(empty_sums(), row)
+        for row in session().query(PerformanceRollup)
+    }
+    assert incremental == single
+
+
+def test_repeated_pass_is_idempotent(session, jobs):
+    compact_performance_rollups(session(), now=NOW)
+    before = {(row.granularity, row.bucket_start): add_sums(empty_sums(), row) for row in session().query(PerformanceRollup)}
+    compact_performance_rollups(session(), now=NOW)
+    after = {(row.granularity, row.bucket_start): add_sums(empty_sums(), row) for row in session().query(PerformanceRollup)}
+    assert before == after
+
+
+def test_late_changes_inside_recompute_window(session, jobs):
+    compact_performance_rollups(session(), now=NOW)
+
+    # Changes to closed hours still inside the recompute window: a late
+    # verification, a late tx_hash and a backfilled job just after midnight
+    db = session()
+    window_start = floor_bucket(NOW, "hour") - timedelta(hours=RECOMPUTE_HOURS)
+    recent = db.query(ProofJob).filter(
+        ProofJob.created_at >= window_start + timedelta(hours=1),
+        ProofJob.created_at < floor_bucket(NOW, "hour"),
+    ).order_by(ProofJob.created_at).all()
+    unverified = next(job for job in recent if job.tx_hash and job.status != ProofStatus.VERIFIED and not job.verified_at)
+    unverified.status = ProofStatus.VERIFIED
+    unexecuted = next(job for job in recent if job.tx_hash is None)
+    unexecuted.tx_hash = "0xlate"
+    db.add(_job(random.Random(1), 100_000, datetime(2026, 3, 9, 0, 0, 30), tx_hash="0xbackfill"))
+    db.commit()
+
+    # The stale rollups disagree with the raw rows until the next pass
+    day = (datetime(2026, 3, 9), datetime(2026, 3, 10))
+    assert PerformanceService(db)._bucket_sums(*day, "day") != _expected(db, *day, "day")
+    db.close()
+
+    # Same hour: nothing new to roll up, but the window is re-aggregated
+    compact_performance_rollups(session(), now=NOW + timedelta(minutes=10))
+    _assert_matches_raw(session)
+
+
+def test_portfolio_performance_matches_all_raw(session, jobs):
+    compact_performance_rollups(session(), now=NOW)
+    for start, end in WINDOWS:
+        with_rollups = PerformanceService(session()).calculate_portfolio_performance(start=start, end=end)
+        all_raw = _all_raw(session, lambda service: service.calculate_portfolio_performance(start=start, end=end))
+        assert with_rollups == all_raw, (start, end)
+
+
+@pytest.mark.parametrize("resolution", ["hour", "day"])
+def test_timeline_matches_all_raw(session, jobs, resolution):
+    compact_performance_rollups(session(), now=NOW)
+    for start, end in WINDOWS:
+        kwargs = {"start": start, "end": end, "resolution": resolution, "max_points": 50}
+        with_rollups = PerformanceService(session()).get_performance_timeline(**kwargs)
+        all_raw = _all_raw(session, lambda service: service.get_performance_timeline(**kwargs))
+        assert with_rollups == all_raw, (start, end)
@@ -0,0 +1,113 @@
+"""
+Proof blob store and proof download range tests: blobs are addressed by the
+SHA-256 of their content, and /analytics/proof/{id}/download serves single
+``Range: bytes=`` requests from them.
+
+Run with: python -m pytest tests/test_proof_blob_store.py
+"""
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.routes.analytics import _parse_range
+from app.services.proof_blob_store import ProofBlobStore
+
+PROOF = bytes(range(256)) * 1000  # 256 KB, spans several read chunks
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProofBlobStore(root=tmp_path / "proof_blobs", level=3)
+
+
+def test_put_returns_content_digest(store):
+    key = store.put(PROOF)
+    assert key == hashlib.sha256(PROOF).hexdigest()
+    assert store.exists(key)
+    assert store.path(key) == store.root / key[:2] / key[2:4] / f"{key}.zst"
+
+
+def test_get_by_digest_round_trips(store):
+    key = store.put(PROOF)
+    assert store.get(key) == PROOF
+    assert store.size(key) == len(PROOF)
+
+
+def test_blob_is_stored_compressed(store):
+    key = store.put(PROOF)
+    assert store.path(key).stat().st_size < len(PROOF)
+
+
+def test_identical_proofs_are_deduplicated(store):
+    key = store.put(PROOF)
+    mtime = store.path(key).stat().st_mtime_ns
+    assert store.put(bytes(PROOF)) == key
+    assert store.path(key).stat().st_mtime_ns == mtime
+    assert len(list(store.root.rglob("*.zst"))) == 1
+
+
+def test_distinct_proofs_get_distinct_keys(store):
+    other = PROOF + b"\x00"
+    assert store.put(PROOF) != store.put(other)
+    assert len(list(store.root.rglob("*.zst"))) == 2
+
+
+def test_iter_range_is_inclusive(store):
+    key = store.put(PROOF)
+    assert b"".join(store.iter_range(key, 100, 199)) == PROOF[100:200]
+    assert b"".join(store.iter_range(key, 70_000, None, chunk_size=4096)) == PROOF[70_000:]
+
+
+def test_missing_blob(store):
+    missing = hashlib.sha256(b"missing").hexdigest()
+    assert not store.exists(missing)
+    assert store.size(missing) is None
+    with pytest.raises(FileNotFoundError):
+        store.get(missing)
+
+
+def test_delete(store):
+    key = store.put(PROOF)
+    store.delete(key)
+    assert not store.exists(key)
+    store.delete(key)  # deleting twice is fine
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),  # open-ended
+        ("bytes=-100", (900, 999)),  # suffix: the last 100 bytes
+        ("bytes=-5000", (0, 999)),  # suffix longer than the blob
+        ("bytes=900-5000", (900, 999)),  # end clamped to the blob
+        ("bytes=999-999", (999, 999)),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "", "items=0-10", "bytes=0-10,20-30", "bytes=a-b"],
+)
+def test_parse_range_serves_whole_body(header):
+    assert _parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["bytes=1000-", "bytes=5000-6000", "bytes=500-100"],
+)
+def test_unsatisfiable_range_returns_416(header):
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_range(header, 1000)
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers["Content-Range"] == "bytes */1000"
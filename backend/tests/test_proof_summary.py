@@ -0,0 +1,237 @@
+"""
+proof_job_summary listener tests: every ProofJob insert, update, status
+change and delete flushed through an AppSession must leave the rollup equal
+to one rebuilt from proof_jobs.
+
+Run with: python -m pytest tests/test_proof_summary.py
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import AppSession
+from app.models import ProofJob, ProofJobSummary, ProofStatus
+from app.services.proof_summary import _COUNTERS, rebuild_proof_summary
+
+COLUMNS = ("network", "status") + _COUNTERS + (
+    "generation_time_min",
+    "generation_time_max",
+    "proof_size_min",
+    "proof_size_max",
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    ProofJob.__table__.create(engine)
+    ProofJobSummary.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    # Same session class and commit behaviour as AsyncSessionLocal
+    session = sessionmaker(bind=engine, class_=AppSession, autoflush=False, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+def _rollup(db) -> dict:
+    """Non-empty summary rows keyed by (network, status)."""
+    rows = {}
+    for row in db.query(ProofJobSummary).all():
+        values = {column: getattr(row, column) for column in COLUMNS}
+        if values["job_count"]:
+            rows[(row.network, row.status)] = values
+    return rows
+
+
+def _counters(rows: dict) -> dict:
+    return {key: {name: values[name] for name in _COUNTERS} for key, values in rows.items()}
+
+
+def _assert_matches_rebuild(db, engine) -> None:
+    incremental = _rollup(db)
+    with engine.begin() as connection:
+        rebuild_proof_summary(connection)
+    # Min/max only widen incrementally, so compare the exact counters
+    assert _counters(incremental) == _counters(_rollup(db))
+
+
+def _job(proof_hash: str, **kwargs) -> ProofJob:
+    kwargs.setdefault("metrics", {})
+    return ProofJob(proof_hash=proof_hash, **kwargs)
+
+
+def test_insert_uses_column_defaults(db, engine):
+    db.add(_job("a"))
+    db.commit()
+
+    rows = _rollup(db)
+    assert list(rows) == [("sepolia", "generating")]
+    assert rows[("sepolia", "generating")]["job_count"] == 1
+    assert rows[("sepolia", "generating")]["generation_time_count"] == 0
+    _assert_matches_rebuild(db, engine)
+
+
+def test_insert_counts_metrics_and_verification(db, engine):
+    db.add_all([
+        _job(
+            "a",
+            status=ProofStatus.VERIFIED,
+            metrics={"proof_generation_time_seconds": 3.5},
+            proof_size_bytes=100,
+            l2_verified_at=datetime(2026, 1, 1),
+        ),
+        _job("b", status=ProofStatus.VERIFIED, metrics={"proof_generation_time_seconds": 1.5, "proof_data_size_bytes": 40}),
+        _job("c", network="mainnet", l1_verified_at=datetime(2026, 1, 2)),
+    ])
+    db.commit()
+
+    verified = _rollup(db)[("sepolia", "verified")]
+    assert verified["job_count"] == 2
+    assert verified["l2_verified_count"] == 1
+    assert verified["generation_time_count"] == 2
+    assert verified["generation_time_sum"] == pytest.approx(5.0)
+    assert (verified["generation_time_min"], verified["generation_time_max"]) == (1.5, 3.5)
+    assert verified["proof_size_sum"] == 140
+    assert (verified["proof_size_min"], verified["proof_size_max"]) == (40, 100)
+    assert _rollup(db)[("mainnet", "generating")]["l1_verified_count"] == 1
+    _assert_matches_rebuild(db, engine)
+
+
+def test_update_within_a_bucket(db, engine):
+    job = _job("a", metrics={"proof_generation_time_seconds": 2.0})
+    db.add(job)
+    db.commit()
+
+    job.metrics = {"proof_generation_time_seconds": 5.0}
+    job.proof_size_bytes = 64
+    db.commit()
+
+    row = _rollup(db)[("sepolia", "generating")]
+    assert row["job_count"] == 1
+    assert row["generation_time_sum"] == pytest.approx(5.0)
+    assert row["proof_size_count"] == 1
+    _assert_matches_rebuild(db, engine)
+
+
+def test_untracked_update_leaves_summary_alone(db, engine):
+    job = _job("a")
+    db.add(job)
+    db.commit()
+    before = _rollup(db)
+
+    job.worker_id = "worker-1"
+    job.attempts = 1
+    db.commit()
+
+    assert _rollup(db) == before
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        [ProofStatus.VERIFIED],
+        [ProofStatus.FAILED],
+        [ProofStatus.SUBMITTED, ProofStatus.VERIFIED],
+        [ProofStatus.VERIFIED, ProofStatus.FAILED, ProofStatus.GENERATING],
+    ],
+)
+def test_status_changes_move_the_job_between_buckets(db, engine, path):
+    job = _job("a", metrics={"proof_generation_time_seconds": 1.0})
+    db.add_all([job, _job("b")])
+    db.commit()
+
+    for status in path:
+        job.status = status
+        db.commit()
+        rows = _rollup(db)
+        assert rows[("sepolia", status.value)]["job_count"] == (2 if status == ProofStatus.GENERATING else 1)
+        assert sum(row["job_count"] for row in rows.values()) == 2
+        _assert_matches_rebuild(db, engine)
+
+
+def test_status_and_network_change_in_one_flush(db, engine):
+    job = _job("a")
+    db.add(job)
+    db.commit()
+
+    job.status = ProofStatus.VERIFIED
+    job.network = "mainnet"
+    job.l2_verified_at = datetime(2026, 1, 1)
+    db.commit()
+
+    rows = _rollup(db)
+    assert list(rows) == [("mainnet", "verified")]
+    assert rows[("mainnet", "verified")]["l2_verified_count"] == 1
+    _assert_matches_rebuild(db, engine)
+
+
+def test_update_after_expiry_decrements_the_old_bucket(engine):
+    # Default expire_on_commit=True: the old status must still be loaded on assignment
+    db = sessionmaker(bind=engine, class_=AppSession)()
+    job = _job("a")
+    db.add(job)
+    db.commit()
+
+    job.status = ProofStatus.VERIFIED
+    db.commit()
+
+    assert list(_rollup(db)) == [("sepolia", "verified")]
+    _assert_matches_rebuild(db, engine)
+    db.close()
+
+
+def test_delete(db, engine):
+    a = _job("a", status=ProofStatus.VERIFIED, metrics={"proof_generation_time_seconds": 3.0})
+    b = _job("b", status=ProofStatus.VERIFIED, metrics={"proof_generation_time_seconds": 1.0})
+    db.add_all([a, b])
+    db.commit()
+
+    db.delete(a)
+    db.commit()
+
+    row = _rollup(db)[("sepolia", "verified")]
+    assert row["job_count"] == 1
+    assert row["generation_time_sum"] == pytest.approx(1.0)
+    _assert_matches_rebuild(db, engine)
+
+    db.delete(b)
+    db.commit()
+    assert _rollup(db) == {}
+
+
+def test_insert_and_update_in_one_transaction(db, engine):
+    job = _job("a")
+    db.add(job)
+    db.flush()
+    job.status = ProofStatus.SUBMITTED
+    db.flush()
+    db.commit()
+
+    assert list(_rollup(db)) == [("sepolia", "submitted")]
+    _assert_matches_rebuild(db, engine)
+
+
+def test_rollback_discards_summary_deltas(db, engine):
+    db.add(_job("a"))
+    db.commit()
+    before = _rollup(db)
+
+    db.add(_job("b", network="mainnet"))
+    db.flush()
+    assert ("mainnet", "generating") in _rollup(db)
+    db.rollback()
+
+    assert _rollup(db) == before
+    _assert_matches_rebuild(db, engine)
@@ -0,0 +1,135 @@
+"""
+Batch commitment tests: the Merkle helpers must agree with each other and with
+the hashing done by verification/risk_batch_cairo0.cairo.
+
+Run with: python -m pytest tests/test_risk_batch.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from starknet_py.hash.utils import pedersen_hash
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.risk_batch import (
+    CAIRO_PRIME,
+    BatchCommitment,
+    decision_inputs,
+    decision_leaf,
+    inclusion_path,
+    merkle_levels,
+    parse_program_output,
+    verify_inclusion,
+)
+
+JEDI = {"utilization": 6500, "volatility": 3500, "liquidity": 1, "audit_score": 98, "age_days": 800}
+EKUBO = {"utilization": 5000, "volatility": 2500, "liquidity": 2, "audit_score": 95, "age_days": 400}
+
+
+def _inputs(k: int) -> list[list[int]]:
+    return [decision_inputs({**JEDI, "utilization": 100 * i}, EKUBO) for i in range(k)]
+
+
+def _output(inputs: list[list[int]], risks: list[tuple[int, int]]) -> list[int]:
+    leaves = [decision_leaf(inputs[i], *risks[i]) for i in range(len(inputs))]
+    root = merkle_levels(leaves)[-1][0]
+    return [len(inputs), root] + [r for pair in risks for r in pair]
+
+
+@pytest.mark.parametrize("k", range(1, 10))
+def test_every_path_verifies_against_root(k):
+    leaves = [decision_leaf(row, 20 + i, 30 + i) for i, row in enumerate(_inputs(k))]
+    levels = merkle_levels(leaves)
+    root = levels[-1][0]
+    for index, leaf in enumerate(leaves):
+        assert verify_inclusion(leaf, index, inclusion_path(levels, index), root)
+
+
+def test_path_rejects_wrong_leaf_and_index():
+    leaves = [decision_leaf(row, 20, 30 + i) for i, row in enumerate(_inputs(5))]
+    levels = merkle_levels(leaves)
+    root = levels[-1][0]
+    path = inclusion_path(levels, 2)
+    assert not verify_inclusion(leaves[3], 2, path, root)
+    assert not verify_inclusion(leaves[2], 3, path, root)
+
+
+def test_odd_last_node_is_hashed_with_zero():
+    a, b, c = 11, 22, 33
+    levels = merkle_levels([a, b, c])
+    assert [len(level) for level in levels] == [3, 2, 1]
+    assert levels[-1][0] == pedersen_hash(pedersen_hash(a, b), pedersen_hash(c, 0))
+    assert inclusion_path(levels, 2) == [0, pedersen_hash(a, b)]
+
+
+def test_single_decision_root_is_its_leaf():
+    inputs = _inputs(1)
+    commitment = BatchCommitment.from_program_output(_output(inputs, [(25, 31)]), inputs)
+    assert commitment.root == commitment.leaves[0]
+    assert commitment.paths == [[]]
+    assert verify_inclusion(commitment.leaves[0], 0, [], commitment.root)
+
+
+def test_leaf_chains_inputs_then_risks():
+    inputs = list(range(10))
+    acc = 0
+    for value in inputs + [40, 50]:
+        acc = pedersen_hash(acc, value)
+    assert decision_leaf(inputs, 40, 50) == acc
+
+
+def test_commitment_from_program_output():
+    inputs = _inputs(3)
+    risks = [(20, 30), (21, 31), (22, 32)]
+    commitment = BatchCommitment.from_program_output(_output(inputs, risks), inputs)
+    assert commitment.risks == risks
+    proof = commitment.inclusion(2)
+    assert proof["index"] == 2 and proof["size"] == 3
+    assert proof["jediswap_risk"] == 22 and proof["ekubo_risk"] == 32
+    assert verify_inclusion(
+        int(proof["leaf"], 16), 2, [int(x, 16) for x in proof["path"]], int(proof["root"], 16)
+    )
+
+
+def test_commitment_rejects_mismatched_output():
+    inputs = _inputs(2)
+    output = _output(inputs, [(20, 30), (21, 31)])
+    with pytest.raises(ValueError):
+        BatchCommitment.from_program_output(output, inputs[:1])
+    output[1] += 1
+    with pytest.raises(ValueError):
+        BatchCommitment.from_program_output(output, inputs)
+
+
+def test_empty_tree_is_rejected():
+    with pytest.raises(ValueError):
+        merkle_levels([])
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"utilization": 10001},
+        {"liquidity": 4},
+        {"audit_score": -1},
+        {"volatility": "100"},
+        {"age_days": True},
+        {"age_days": None},
+    ],
+)
+def test_decision_inputs_reject_bad_metrics(override):
+    with pytest.raises(ValueError):
+        decision_inputs({**JEDI, **override}, EKUBO)
+
+
+def test_decision_inputs_order():
+    assert decision_inputs(JEDI, EKUBO) == [6500, 3500, 1, 98, 800, 5000, 2500, 2, 95, 400]
+
+
+def test_parse_program_output_maps_negatives_to_field():
+    stdout = "Running...\nProgram output:\n  2\n  -1\n  7\n\nNumber of steps: 10\n"
+    assert parse_program_output(stdout) == [2, CAIRO_PRIME - 1, 7]
+    with pytest.raises(ValueError):
+        parse_program_output("no output here")
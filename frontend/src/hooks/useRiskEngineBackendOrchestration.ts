@@ -371,7 +371,7 @@ export function useRiskEngineBackendOrchestration(): UseRiskEngineBackendOrchest
 
       // Call the same endpoint but with a GET to fetch latest decision
       // For MVP, we can use a simple POST with empty metrics to trigger a read
-      const response = await fetch(`${backendUrl}/api/v1/risk-engine/orchestrate-allocation`, {
+      const response = await fetch(`${backendUrl}/api/v1/risk-engine/orchestrate-allocation?wait=true`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -0,0 +1,199 @@
+%builtins output pedersen range_check bitwise
+
+// Batched risk scoring: K allocation decisions (JediSwap/Ekubo metric pairs)
+// in one execution, so one Stone proof / one Integrity fact covers all K.
+//
+// Output layout:
+//   [0] n_decisions
+//   [1] merkle_root   (Pedersen Merkle root over the decision leaves)
+//   [2 + 2*i]     jedi_risk_i
+//   [2 + 2*i + 1] ekubo_risk_i
+//
+// leaf_i = H(...H(H(0, in_0), in_1)..., in_9), jedi_risk_i), ekubo_risk_i)
+// Each Merkle level hashes pairs left to right; an odd last node is hashed
+// with 0. backend/app/services/risk_batch.py mirrors this to build inclusion
+// paths. calculate_risk_score is kept identical to risk_example_cairo0.cairo.
+
+from starkware.cairo.common.alloc import alloc
+from starkware.cairo.common.cairo_builtins import HashBuiltin
+from starkware.cairo.common.hash import hash2
+from starkware.cairo.common.math import assert_not_zero, unsigned_div_rem
+from starkware.cairo.common.math_cmp import is_le
+
+const N_INPUTS = 10;
+
+func div_floor{range_check_ptr}(numerator: felt, denominator: felt) -> (res: felt) {
+    let (q, _) = unsigned_div_rem(numerator, denominator);
+    return (res=q);
+}
+
+func calculate_risk_score{range_check_ptr}(
+    utilization: felt,
+    volatility: felt,
+    liquidity: felt,
+    audit_score: felt,
+    age_days: felt,
+) -> (risk: felt) {
+    alloc_locals;
+
+    // utilization_risk = utilization * 25 / 10000
+    let util_prod = utilization * 25;
+    let (util_risk) = div_floor(util_prod, 10000);
+
+    // volatility_risk = volatility * 40 / 10000
+    let vol_prod = volatility * 40;
+    let (vol_risk) = div_floor(vol_prod, 10000);
+
+    // liquidity_risk mapping
+    local liquidity_risk;
+    if (liquidity == 0) {
+        assert liquidity_risk = 0;
+    } else {
+        if (liquidity == 1) {
+            assert liquidity_risk = 5;
+        } else {
+            if (liquidity == 2) {
+                assert liquidity_risk = 15;
+            } else {
+                assert liquidity_risk = 30;
+            }
+        }
+    }
+
+    // audit_risk = (100 - audit_score) * 3 / 10
+    let audit_diff = 100 - audit_score;
+    let audit_prod = audit_diff * 3;
+    let (audit_risk) = div_floor(audit_prod, 10);
+
+    // age_risk = max(0, (730 - age_days) * 10 / 730)
+    let age_is_le = is_le(age_days, 729);
+    local range_check_ptr = range_check_ptr;
+    let age_capped = age_is_le * age_days + (1 - age_is_le) * 730;
+    let diff = 730 - age_capped;
+    let prod = diff * 10;
+    let (age_risk) = div_floor(prod, 730);
+
+    let total = util_risk + vol_risk + liquidity_risk + audit_risk + age_risk;
+
+    local total_is_lt_5 = is_le(total, 4);
+    local range_check_ptr = range_check_ptr;
+    if (total_is_lt_5 == 1) {
+        return (risk=5);
+    }
+    local total_ge_96 = is_le(96, total);
+    local range_check_ptr = range_check_ptr;
+    if (total_ge_96 == 1) {
+        return (risk=95);
+    }
+    return (risk=total);
+}
+
+func fold_hash{pedersen_ptr: HashBuiltin*}(acc: felt, values: felt*, n: felt) -> (res: felt) {
+    if (n == 0) {
+        return (res=acc);
+    }
+    let (h) = hash2{hash_ptr=pedersen_ptr}(acc, values[0]);
+    return fold_hash(acc=h, values=values + 1, n=n - 1);
+}
+
+func decision_leaf{pedersen_ptr: HashBuiltin*}(
+    inputs: felt*, jedi_risk: felt, ekubo_risk: felt
+) -> (leaf: felt) {
+    let (h) = fold_hash(acc=0, values=inputs, n=N_INPUTS);
+    let (h) = hash2{hash_ptr=pedersen_ptr}(h, jedi_risk);
+    let (h) = hash2{hash_ptr=pedersen_ptr}(h, ekubo_risk);
+    return (leaf=h);
+}
+
+func score_decisions{output_ptr: felt*, pedersen_ptr: HashBuiltin*, range_check_ptr}(
+    inputs: felt*, n: felt, leaves: felt*
+) {
+    alloc_locals;
+    if (n == 0) {
+        return ();
+    }
+
+    let (local jedi_risk) = calculate_risk_score(
+        utilization=inputs[0],
+        volatility=inputs[1],
+        liquidity=inputs[2],
+        audit_score=inputs[3],
+        age_days=inputs[4],
+    );
+    let (local ekubo_risk) = calculate_risk_score(
+        utilization=inputs[5],
+        volatility=inputs[6],
+        liquidity=inputs[7],
+        audit_score=inputs[8],
+        age_days=inputs[9],
+    );
+    local range_check_ptr = range_check_ptr;
+
+    assert output_ptr[0] = jedi_risk;
+    assert output_ptr[1] = ekubo_risk;
+    let output_ptr = output_ptr + 2;
+
+    let (leaf) = decision_leaf(inputs=inputs, jedi_risk=jedi_risk, ekubo_risk=ekubo_risk);
+    assert leaves[0] = leaf;
+
+    return score_decisions(inputs=inputs + N_INPUTS, n=n - 1, leaves=leaves + 1);
+}
+
+func hash_level{pedersen_ptr: HashBuiltin*}(nodes: felt*, n: felt, out: felt*) -> (n_out: felt) {
+    if (n == 0) {
+        return (n_out=0);
+    }
+    if (n == 1) {
+        let (h) = hash2{hash_ptr=pedersen_ptr}(nodes[0], 0);
+        assert out[0] = h;
+        return (n_out=1);
+    }
+    let (h) = hash2{hash_ptr=pedersen_ptr}(nodes[0], nodes[1]);
+    assert out[0] = h;
+    let (rest) = hash_level(nodes=nodes + 2, n=n - 2, out=out + 1);
+    return (n_out=rest + 1);
+}
+
+func merkle_root{pedersen_ptr: HashBuiltin*}(nodes: felt*, n: felt) -> (root: felt) {
+    alloc_locals;
+    if (n == 1) {
+        return (root=nodes[0]);
+    }
+    let (local parents: felt*) = alloc();
+    let (n_parents) = hash_level(nodes=nodes, n=n, out=parents);
+    return merkle_root(nodes=parents, n=n_parents);
+}
+
+func main{
+    output_ptr: felt*,
+    pedersen_ptr: HashBuiltin*,
+    range_check_ptr,
+    bitwise_ptr: felt*,
+}() {
+    alloc_locals;
+
+    local n_decisions;
+    let (local inputs: felt*) = alloc();
+    %{
+        decisions = program_input['decisions']
+        ids.n_decisions = len(decisions)
+        for i, decision in enumerate(decisions):
+            assert len(decision) == ids.N_INPUTS
+            for j, value in enumerate(decision):
+                memory[ids.inputs + i * ids.N_INPUTS + j] = value
+    %}
+    assert_not_zero(n_decisions);
+
+    let header = output_ptr;
+    let (local leaves: felt*) = alloc();
+    let output_ptr = output_ptr + 2;
+    score_decisions(inputs=inputs, n=n_decisions, leaves=leaves);
+    local output_ptr: felt* = output_ptr;
+    local range_check_ptr = range_check_ptr;
+
+    let (root) = merkle_root(nodes=leaves, n=n_decisions);
+    assert header[0] = n_decisions;
+    assert header[1] = root;
+
+    return ();
+}
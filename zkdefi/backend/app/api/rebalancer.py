@@ -3,6 +3,7 @@ Agent Rebalancer API endpoints.
 
 Endpoints:
 - /api/v1/zkdefi/rebalancer/analyze - Analyze portfolio
+- /api/v1/zkdefi/rebalancer/screen - Batch risk screening (no proofs)
 - /api/v1/zkdefi/rebalancer/propose - Create rebalancing proposal
 - /api/v1/zkdefi/rebalancer/check - Run zkML gate checks
 - /api/v1/zkdefi/rebalancer/prepare - Prepare execution
@@ -12,6 +13,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.services.agent_rebalancer import get_rebalancer
+from app.services.snark_prover_pool import ProverBusyError
 
 router = APIRouter()
 
@@ -24,6 +26,12 @@ class AnalyzeRequest(BaseModel):
     positions: dict[str, int]  # protocol_id (as string) -> amount
 
 
+class ScreenRequest(BaseModel):
+    """Request to screen many portfolios."""
+    portfolios: dict[str, dict[str, int]]  # user_address -> protocol_id (as string) -> amount
+    threshold: int = 30
+
+
 class ProposeRequest(BaseModel):
     """Request to propose rebalancing."""
     user_address: str
@@ -31,6 +39,9 @@ class ProposeRequest(BaseModel):
     to_protocol: int
     amount: int
     reason: str = "Risk optimization"
+    # Optional: lets the zkML gate proofs start in the background right away
+    portfolio_features: list[int] | None = None
+    pool_id: str | None = None
 
 
 class CheckZkmlRequest(BaseModel):
@@ -70,6 +81,26 @@ async def analyze_portfolio(data: AnalyzeRequest):
             positions=positions
         )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/screen")
+async def screen_portfolios(data: ScreenRequest):
+    """
+    Score many portfolios with the batch risk model (no proofs).
+    
+    Returns the users whose risk score exceeds the threshold.
+    """
+    try:
+        rebalancer = get_rebalancer()
+        portfolios = {
+            user: {int(k): v for k, v in positions.items()}
+            for user, positions in data.portfolios.items()
+        }
+        return rebalancer.screen_portfolios(portfolios, threshold=data.threshold)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -79,7 +110,8 @@ async def propose_rebalance(data: ProposeRequest):
     """
     Create a rebalancing proposal.
     
-    The proposal must pass zkML checks before execution.
+    The proposal must pass zkML checks before execution. Its gate proofs
+    are pre-proven in the background when portfolio features are known.
     """
     try:
         rebalancer = get_rebalancer()
@@ -88,7 +120,9 @@ async def propose_rebalance(data: ProposeRequest):
             from_protocol=data.from_protocol,
             to_protocol=data.to_protocol,
             amount=data.amount,
-            reason=data.reason
+            reason=data.reason,
+            portfolio_features=data.portfolio_features,
+            pool_id=data.pool_id
         )
         return proposal.to_dict()
     except Exception as e:
@@ -110,6 +144,8 @@ async def check_zkml_gates(data: CheckZkmlRequest):
             pool_id=data.pool_id
         )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -154,7 +190,7 @@ async def execute_rebalance(data: ExecuteRequest):
 async def get_proposal(proposal_id: str):
     """Get proposal by ID."""
     rebalancer = get_rebalancer()
-    proposal = rebalancer.get_proposal(proposal_id)
+    proposal = await rebalancer.get_proposal(proposal_id)
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
     return proposal
@@ -164,7 +200,7 @@ async def get_proposal(proposal_id: str):
 async def get_user_proposals(user_address: str):
     """Get all proposals for a user."""
     rebalancer = get_rebalancer()
-    proposals = rebalancer.get_user_proposals(user_address)
+    proposals = await rebalancer.get_user_proposals(user_address)
     return {
         "user_address": user_address,
         "proposals": proposals,
@@ -8,6 +8,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
+from app.services.relay_scheduler import NULLIFIERS, RELAYS, RelayClaimError, claim_relay, get_relay_scheduler
+from app.services.state_store import get_state_store
+
 router = APIRouter(prefix="/relayer", tags=["relayer"])
 
 
@@ -18,6 +21,7 @@ class RelayRequest(BaseModel):
     amount_wei: int
     recipient: str
     proof_hash: str
+    proof_calldata: list[str] = []  # used when the scheduler executes the relay
 
 
 class RelayRequestResponse(BaseModel):
@@ -35,15 +39,10 @@ class RelayExecutionRequest(BaseModel):
     proof_calldata: list[str]
 
 
-# In-memory relay queue (replace with DB in production)
-_relay_queue: dict[int, dict] = {}
-_next_request_id = 1
-
-
-def get_user_tier(address: str) -> int:
+async def get_user_tier(address: str) -> int:
     """Get user tier (simplified - in production, call ReputationRegistry)."""
     from app.api.reputation import get_user_data
-    user = get_user_data(address)
+    user = await get_user_data(address)
     return user.get("tier", 0)
 
 
@@ -68,9 +67,8 @@ def get_tier_fee(tier: int) -> int:
 @router.post("/request", response_model=RelayRequestResponse)
 async def create_relay_request(request: RelayRequest):
     """Create a new relay request."""
-    global _next_request_id
-    
-    tier = get_user_tier(request.requester)
+    store = get_state_store()
+    tier = await get_user_tier(request.requester)
     
     if tier == 0:
         raise HTTPException(
@@ -83,23 +81,40 @@ async def create_relay_request(request: RelayRequest):
     request_time = int(time.time())
     ready_time = request_time + delay
     
-    request_id = _next_request_id
-    _next_request_id += 1
-    
-    _relay_queue[request_id] = {
-        "request_id": request_id,
-        "requester": request.requester,
-        "nullifier": request.nullifier,
-        "commitment": request.commitment,
-        "amount_wei": request.amount_wei,
-        "recipient": request.recipient,
-        "proof_hash": request.proof_hash,
-        "request_time": request_time,
-        "ready_time": ready_time,
-        "fee_bps": fee_bps,
-        "executed": False,
-        "cancelled": False,
-    }
+    request_id = await store.next_id(RELAYS)
+    
+    # Reserve the nullifier first: a nullifier can back only one live request
+    def _reserve(entry: dict | None) -> dict:
+        if entry is not None and not entry.get("released"):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Nullifier already used by relay request {entry['request_id']}"
+            )
+        return {"request_id": request_id}
+    
+    await store.update(NULLIFIERS, request.nullifier, _reserve)
+    
+    try:
+        await store.put(RELAYS, str(request_id), {
+            "request_id": request_id,
+            "requester": request.requester,
+            "nullifier": request.nullifier,
+            "commitment": request.commitment,
+            "amount_wei": request.amount_wei,
+            "recipient": request.recipient,
+            "proof_hash": request.proof_hash,
+            "proof_calldata": request.proof_calldata,
+            "request_time": request_time,
+            "ready_time": ready_time,
+            "fee_bps": fee_bps,
+            "executed": False,
+            "cancelled": False,
+        }, owner=request.requester)
+    except Exception:
+        # No request was stored, so the nullifier must not stay reserved
+        await store.delete(NULLIFIERS, request.nullifier)
+        raise
+    get_relay_scheduler().schedule(request_id, ready_time)
     
     return RelayRequestResponse(
         request_id=request_id,
@@ -115,11 +130,10 @@ async def create_relay_request(request: RelayRequest):
 @router.get("/request/{request_id}", response_model=RelayRequestResponse)
 async def get_relay_request(request_id: int):
     """Get details of a relay request."""
-    if request_id not in _relay_queue:
+    req = await get_state_store().get(RELAYS, str(request_id))
+    if req is None:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    req = _relay_queue[request_id]
-    
     status = "pending"
     if req["executed"]:
         status = "executed"
@@ -139,12 +153,21 @@ async def get_relay_request(request_id: int):
     )
 
 
+@router.get("/nullifier/{nullifier}", response_model=RelayRequestResponse)
+async def get_relay_by_nullifier(nullifier: str):
+    """Get the relay request spending a nullifier."""
+    entry = await get_state_store().get(NULLIFIERS, nullifier)
+    if entry is None or entry.get("released"):
+        raise HTTPException(status_code=404, detail="No relay request for this nullifier")
+    return await get_relay_request(entry["request_id"])
+
+
 @router.get("/pending/{address}")
 async def get_pending_relays(address: str):
     """Get all pending relay requests for an address."""
     pending = []
-    for req in _relay_queue.values():
-        if req["requester"] == address and not req["executed"] and not req["cancelled"]:
+    for req in await get_state_store().list_by_owner(RELAYS, address):
+        if not req["executed"] and not req["cancelled"]:
             status = "pending"
             if int(time.time()) >= req["ready_time"]:
                 status = "ready"
@@ -164,19 +187,32 @@ async def get_pending_relays(address: str):
 @router.post("/cancel/{request_id}")
 async def cancel_relay_request(request_id: int, requester: str):
     """Cancel a pending relay request."""
-    if request_id not in _relay_queue:
-        raise HTTPException(status_code=404, detail="Request not found")
+    def _cancel(req: dict | None) -> dict:
+        if req is None:
+            raise HTTPException(status_code=404, detail="Request not found")
+        
+        if req["requester"] != requester:
+            raise HTTPException(status_code=403, detail="Not the request owner")
+        
+        if req["executed"]:
+            raise HTTPException(status_code=400, detail="Request already executed")
+        
+        if req["cancelled"]:
+            raise HTTPException(status_code=400, detail="Request already cancelled")
+        
+        return {**req, "cancelled": True}
     
-    req = _relay_queue[request_id]
+    store = get_state_store()
+    req = await store.update(RELAYS, str(request_id), _cancel)
     
-    if req["requester"] != requester:
-        raise HTTPException(status_code=403, detail="Not the request owner")
+    # The nullifier was never spent, so it may back a new request. Released
+    # atomically, and only while the reservation is still this request's.
+    def _unreserve(entry: dict | None) -> dict | None:
+        if entry is not None and entry["request_id"] == request_id:
+            return {**entry, "released": True}
+        return None
     
-    if req["executed"]:
-        raise HTTPException(status_code=400, detail="Request already executed")
-    
-    req["cancelled"] = True
-    _relay_queue[request_id] = req
+    await store.update(NULLIFIERS, req["nullifier"], _unreserve)
     
     return {"status": "cancelled", "request_id": request_id}
 
@@ -184,31 +220,16 @@ async def cancel_relay_request(request_id: int, requester: str):
 @router.post("/execute")
 async def execute_relay(request: RelayExecutionRequest):
     """Execute a ready relay request (called by relayer)."""
-    if request.request_id not in _relay_queue:
-        raise HTTPException(status_code=404, detail="Request not found")
-    
-    req = _relay_queue[request.request_id]
-    
-    if req["executed"]:
-        raise HTTPException(status_code=400, detail="Already executed")
-    
-    if req["cancelled"]:
-        raise HTTPException(status_code=400, detail="Request cancelled")
-    
-    if int(time.time()) < req["ready_time"]:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Delay not passed. Ready at {req['ready_time']}"
-        )
-    
     # In production, this would:
     # 1. Verify the relayer is registered
     # 2. Execute the withdrawal through ConfidentialTransfer contract
     # 3. Collect the fee
     
-    req["executed"] = True
-    req["execution_time"] = int(time.time())
-    _relay_queue[request.request_id] = req
+    # Same atomic claim as the scheduler, so a request is relayed once
+    try:
+        req = await claim_relay(request.request_id)
+    except RelayClaimError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
     fee = (req["amount_wei"] * req["fee_bps"]) // 10000
     amount_after_fee = req["amount_wei"] - fee
@@ -225,15 +246,16 @@ async def execute_relay(request: RelayExecutionRequest):
 @router.get("/stats")
 async def get_relayer_stats():
     """Get relayer statistics."""
-    total = len(_relay_queue)
-    executed = sum(1 for r in _relay_queue.values() if r["executed"])
-    pending = sum(1 for r in _relay_queue.values() if not r["executed"] and not r["cancelled"])
-    cancelled = sum(1 for r in _relay_queue.values() if r["cancelled"])
+    relays = await get_state_store().scan(RELAYS)
+    total = len(relays)
+    executed = sum(1 for r in relays if r["executed"])
+    pending = sum(1 for r in relays if not r["executed"] and not r["cancelled"])
+    cancelled = sum(1 for r in relays if r["cancelled"])
     
-    total_volume = sum(r["amount_wei"] for r in _relay_queue.values() if r["executed"])
+    total_volume = sum(r["amount_wei"] for r in relays if r["executed"])
     total_fees = sum(
         (r["amount_wei"] * r["fee_bps"]) // 10000
-        for r in _relay_queue.values()
+        for r in relays
         if r["executed"]
     )
     
@@ -244,4 +266,5 @@ async def get_relayer_stats():
         "cancelled": cancelled,
         "total_volume_wei": total_volume,
         "total_fees_wei": total_fees,
+        "scheduler": get_relay_scheduler().stats(),
     }
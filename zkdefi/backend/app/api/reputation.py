@@ -5,7 +5,9 @@ Manages user reputation tiers and proof requirements.
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Callable, Optional
+
+from app.services.state_store import get_state_store
 
 router = APIRouter(prefix="/reputation", tags=["reputation"])
 
@@ -78,22 +80,31 @@ TIER_INFO = {
     ),
 }
 
-# In-memory user data (replace with DB in production)
-_user_data: dict[str, dict] = {}
+# User data lives in the shared state store (one record per address)
+USERS = "reputation_users"
+
+
+def _new_user_data() -> dict:
+    return {
+        "tier": 0,
+        "transaction_count": 0,
+        "total_volume": 0,
+        "first_interaction": 0,
+        "successful_txns": 0,
+        "collateral": 0,
+    }
+
 
+async def get_user_data(address: str) -> dict:
+    """Get user data (defaults for unknown addresses)."""
+    return await get_state_store().get(USERS, address) or _new_user_data()
 
-def get_user_data(address: str) -> dict:
-    """Get or create user data."""
-    if address not in _user_data:
-        _user_data[address] = {
-            "tier": 0,
-            "transaction_count": 0,
-            "total_volume": 0,
-            "first_interaction": 0,
-            "successful_txns": 0,
-            "collateral": 0,
-        }
-    return _user_data[address]
+
+async def update_user_data(address: str, fn: Callable[[dict], dict]) -> dict:
+    """Atomically apply ``fn`` to the user's data and store the result."""
+    return await get_state_store().update(
+        USERS, address, lambda user: fn(dict(user or _new_user_data())), owner=address
+    )
 
 
 @router.get("/tiers", response_model=list[TierInfo])
@@ -115,7 +126,7 @@ async def get_user_reputation(address: str):
     """Get reputation info for a specific user."""
     import time
     
-    user = get_user_data(address)
+    user = await get_user_data(address)
     tier = user.get("tier", 0)
     tier_name = TIER_INFO[tier].tier_name
     
@@ -176,18 +187,18 @@ async def record_transaction(address: str, volume_wei: int, success: bool = True
     """Record a transaction for reputation tracking."""
     import time
     
-    user = get_user_data(address)
-    
-    user["transaction_count"] = user.get("transaction_count", 0) + 1
-    user["total_volume"] = user.get("total_volume", 0) + volume_wei
-    
-    if success:
-        user["successful_txns"] = user.get("successful_txns", 0) + 1
-    
-    if user.get("first_interaction", 0) == 0:
-        user["first_interaction"] = int(time.time())
+    def _record(user: dict) -> dict:
+        user["transaction_count"] = user.get("transaction_count", 0) + 1
+        user["total_volume"] = user.get("total_volume", 0) + volume_wei
+        
+        if success:
+            user["successful_txns"] = user.get("successful_txns", 0) + 1
+        
+        if user.get("first_interaction", 0) == 0:
+            user["first_interaction"] = int(time.time())
+        return user
     
-    _user_data[address] = user
+    await update_user_data(address, _record)
     
     return {"status": "recorded", "address": address}
 
@@ -195,9 +206,11 @@ async def record_transaction(address: str, volume_wei: int, success: bool = True
 @router.post("/stake-collateral")
 async def stake_collateral(address: str, amount_wei: int):
     """Record collateral stake."""
-    user = get_user_data(address)
-    user["collateral"] = user.get("collateral", 0) + amount_wei
-    _user_data[address] = user
+    def _stake(user: dict) -> dict:
+        user["collateral"] = user.get("collateral", 0) + amount_wei
+        return user
+    
+    user = await update_user_data(address, _stake)
     
     return {
         "status": "staked",
@@ -209,20 +222,22 @@ async def stake_collateral(address: str, amount_wei: int):
 @router.post("/upgrade-tier")
 async def upgrade_tier(request: TierUpgradeRequest):
     """Request a tier upgrade (requires proof verification)."""
-    user = get_user_data(request.address)
-    current_tier = user.get("tier", 0)
-    
-    if request.target_tier <= current_tier:
-        raise HTTPException(status_code=400, detail="Cannot downgrade via this endpoint")
-    
-    if request.target_tier > current_tier + 1:
-        raise HTTPException(status_code=400, detail="Can only upgrade one tier at a time")
-    
-    # In production, verify upgrade_proof_hash in Integrity
-    # For now, just check requirements are met
+    def _upgrade(user: dict) -> dict:
+        current_tier = user.get("tier", 0)
+        
+        if request.target_tier <= current_tier:
+            raise HTTPException(status_code=400, detail="Cannot downgrade via this endpoint")
+        
+        if request.target_tier > current_tier + 1:
+            raise HTTPException(status_code=400, detail="Can only upgrade one tier at a time")
+        
+        # In production, verify upgrade_proof_hash in Integrity
+        # For now, just check requirements are met
+        
+        user["tier"] = request.target_tier
+        return user
     
-    user["tier"] = request.target_tier
-    _user_data[request.address] = user
+    await update_user_data(request.address, _upgrade)
     
     return {
         "status": "upgraded",
@@ -235,10 +250,15 @@ async def upgrade_tier(request: TierUpgradeRequest):
 @router.post("/opt-strict")
 async def opt_into_strict(address: str):
     """User opts into Strict tier for maximum trustlessness."""
-    user = get_user_data(address)
-    old_tier = user.get("tier", 0)
-    user["tier"] = 0
-    _user_data[address] = user
+    old_tiers = []
+    
+    def _opt_strict(user: dict) -> dict:
+        old_tiers.append(user.get("tier", 0))
+        user["tier"] = 0
+        return user
+    
+    await update_user_data(address, _opt_strict)
+    old_tier = old_tiers[-1]
     
     return {
         "status": "downgraded",
@@ -4,6 +4,10 @@ zkdefi agent API: proof-gated deposit/withdraw, disclosure, positions.
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from functools import partial
+
+from app.services.rpc_clients import read_cache_stats
+from app.services.snark_prover_pool import ProverBusyError, run_proof_job
 from app.services.zkdefi_agent_service import ZkdefiAgentService
 
 router = APIRouter()
@@ -172,13 +176,25 @@ async def get_constraints(user_address: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/read_cache/stats")
+async def read_cache_stats_endpoint():
+    """Block-aware starknet_call cache: per-endpoint head, entries, hit/miss counters."""
+    return read_cache_stats()
+
+
 @router.post("/private_deposit")
 async def private_deposit(data: PrivateDepositRequest):
     """Generate private deposit proof: commitment + proof_calldata for ConfidentialTransfer.private_deposit."""
     try:
         svc = get_service()
-        result = svc.generate_private_deposit_proof(amount=data.amount, nonce=data.nonce)
+        # Groth16 proving runs off the event loop, bounded per circuit
+        result = await run_proof_job(
+            "PrivateDeposit",
+            partial(svc.generate_private_deposit_proof, amount=data.amount, nonce=data.nonce),
+        )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -202,13 +218,19 @@ async def private_withdraw(data: PrivateWithdrawRequest):
     """Generate private withdrawal proof: nullifier + proof_calldata for ConfidentialTransfer.private_withdraw."""
     try:
         svc = get_service()
-        result = svc.generate_private_withdraw_proof(
-            commitment=data.commitment,
-            amount=data.amount,
-            nonce=data.nonce,
-            user_address=data.user_address,
+        result = await run_proof_job(
+            "PrivateWithdraw",
+            partial(
+                svc.generate_private_withdraw_proof,
+                commitment=data.commitment,
+                amount=data.amount,
+                nonce=data.nonce,
+                user_address=data.user_address,
+            ),
         )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
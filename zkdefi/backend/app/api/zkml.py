@@ -3,12 +3,18 @@ zkML API endpoints for privacy-preserving ML proofs.
 
 Endpoints:
 - /api/v1/zkdefi/zkml/risk_score - Generate risk score proof
+- /api/v1/zkdefi/zkml/risk_score/batch - Stream risk score proofs for many users
 - /api/v1/zkdefi/zkml/anomaly - Generate anomaly detection proof
 - /api/v1/zkdefi/zkml/combined - Generate both proofs for rebalancing
 """
+import json
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
+from app.services.proof_pipeline import cancelled_stage, get_proof_pipeline, run_proof_stages
+from app.services.snark_prover_pool import ProverBusyError, SnarkjsError, queue_stats
 from app.services.zkml_risk_service import get_risk_service
 from app.services.zkml_anomaly_service import get_anomaly_service
 
@@ -25,6 +31,11 @@ class RiskScoreRequest(BaseModel):
     commitment_hash: str | None = None
 
 
+class BatchRiskScoreRequest(BaseModel):
+    """Request for risk score proofs for many users."""
+    items: list[RiskScoreRequest] = Field(..., min_length=1, max_length=1000)
+
+
 class AnomalyDetectionRequest(BaseModel):
     """Request for anomaly detection proof generation."""
     user_address: str
@@ -73,10 +84,31 @@ async def generate_risk_score_proof(data: RiskScoreRequest):
             commitment_hash=data.commitment_hash
         )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except SnarkjsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/risk_score/batch")
+async def generate_risk_score_proofs(data: BatchRiskScoreRequest):
+    """
+    Generate risk score proofs for many users in one call.
+    
+    Streams newline-delimited JSON, one line per proof in completion order.
+    Each line carries the request ``index``; failed items carry ``error``.
+    """
+    service = get_risk_service()
+    
+    async def _lines():
+        async for result in service.generate_risk_proofs([item.model_dump() for item in data.items]):
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/anomaly")
 async def generate_anomaly_proof(data: AnomalyDetectionRequest):
     """
@@ -100,6 +132,10 @@ async def generate_anomaly_proof(data: AnomalyDetectionRequest):
             commitment_hash=data.commitment_hash
         )
         return result
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except SnarkjsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -113,7 +149,9 @@ async def generate_combined_proofs(data: CombinedZkmlRequest):
     1. Risk score proof (portfolio risk <= threshold)
     2. Anomaly detection proof (pool is safe)
     
-    Both must pass for rebalancing to proceed.
+    Both must pass for rebalancing to proceed. The proofs run concurrently;
+    if either gate fails the other proof is cancelled and listed under
+    ``cancelled_stages``. ``timings_ms`` reports per-stage wall time.
     """
     try:
         risk_service = get_risk_service()
@@ -125,28 +163,37 @@ async def generate_combined_proofs(data: CombinedZkmlRequest):
             f"{data.user_address}{data.pool_id}{data.portfolio_features}".encode()
         ).hexdigest()[:32]
         
-        # Generate both proofs
-        risk_result = await risk_service.generate_risk_proof(
-            user_address=data.user_address,
-            portfolio_features=data.portfolio_features,
-            threshold=data.risk_threshold,
-            commitment_hash=shared_commitment
-        )
-        
-        anomaly_result = await anomaly_service.analyze_pool_safety(
-            pool_id=data.pool_id,
-            user_address=data.user_address,
-            tvl_volatility=data.tvl_volatility,
-            liquidity_concentration=data.liquidity_concentration,
-            price_impact_score=data.price_impact_score,
-            deployer_age_days=data.deployer_age_days,
-            volume_anomaly=data.volume_anomaly,
-            contract_risk_score=data.contract_risk_score,
-            commitment_hash=shared_commitment
+        # Generate both proofs concurrently; a failed gate cancels the other
+        stages = await run_proof_stages(
+            {
+                "risk": risk_service.generate_risk_proof(
+                    user_address=data.user_address,
+                    portfolio_features=data.portfolio_features,
+                    threshold=data.risk_threshold,
+                    commitment_hash=shared_commitment
+                ),
+                "anomaly": anomaly_service.analyze_pool_safety(
+                    pool_id=data.pool_id,
+                    user_address=data.user_address,
+                    tvl_volatility=data.tvl_volatility,
+                    liquidity_concentration=data.liquidity_concentration,
+                    price_impact_score=data.price_impact_score,
+                    deployer_age_days=data.deployer_age_days,
+                    volume_anomaly=data.volume_anomaly,
+                    contract_risk_score=data.contract_risk_score,
+                    commitment_hash=shared_commitment
+                ),
+            },
+            gates={
+                "risk": lambda proof: proof["is_compliant"],
+                "anomaly": lambda proof: proof["is_safe"],
+            },
         )
+        risk_result = stages.results.get("risk") or cancelled_stage("risk_score", stages.failed_gate)
+        anomaly_result = stages.results.get("anomaly") or cancelled_stage("anomaly_detection", stages.failed_gate)
         
         # Combined result
-        can_proceed = risk_result["is_compliant"] and anomaly_result["is_safe"]
+        can_proceed = bool(risk_result.get("is_compliant")) and bool(anomaly_result.get("is_safe"))
         
         return {
             "can_proceed": can_proceed,
@@ -156,8 +203,14 @@ async def generate_combined_proofs(data: CombinedZkmlRequest):
             "combined_calldata": {
                 "risk_calldata": risk_result["proof_calldata"],
                 "anomaly_calldata": anomaly_result["proof_calldata"]
-            }
+            },
+            "timings_ms": stages.timings_ms,
+            "cancelled_stages": stages.cancelled,
         }
+    except ProverBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except SnarkjsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -174,5 +227,7 @@ async def get_zkml_status():
         "risk_score_circuit_ready": risk_service.circuits_ready,
         "anomaly_detection_circuit_ready": anomaly_service.circuits_ready,
         "proof_system": "groth16",
-        "verifier": "garaga"
+        "verifier": "garaga",
+        "prover_queue": queue_stats(),
+        "proof_cache": get_proof_pipeline().cache_stats(),
     }
@@ -2,7 +2,9 @@
 zkde.fi backend - FastAPI app (port 8003).
 zkde.fi by Obsqra Labs. Calls obsqra.fi proving API as external black box.
 """
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -21,11 +23,63 @@ from app.api.rebalancer import router as rebalancer_router
 from app.api.oracle import router as oracle_router
 from app.api.reputation import router as reputation_router
 from app.api.relayer import router as relayer_router
+from app.services.garaga_formatter import get_garaga_formatter
+from app.services.proof_result_cache import PROOF_CACHE_PURGE_INTERVAL_SEC, get_proof_result_cache
+from app.services.relay_scheduler import get_relay_scheduler
+from app.services.groth16_prover import PRIVATE_DEPOSIT_VK, PRIVATE_WITHDRAW_VK
+from app.services.rpc_clients import close_clients, start_head_poller, stop_head_pollers
+from app.services.snark_prover_pool import close_pools, warm_pools
+from app.services.state_store import close_state_store
+from app.services.zkdefi_agent_service import STARKNET_RPC_URL
+
+
+async def _warm_garaga(garaga) -> None:
+    """Load garaga and the verification keys before the first private deposit/withdraw."""
+    try:
+        await asyncio.to_thread(garaga.warm, [PRIVATE_DEPOSIT_VK, PRIVATE_WITHDRAW_VK])
+    except Exception as e:
+        print(f"[garaga] warm-up failed ({garaga.mode}): {e}")
+
+
+async def _purge_proof_cache(proof_cache) -> None:
+    """Drop expired cached proofs from both tiers, now and every PROOF_CACHE_PURGE_INTERVAL_SEC."""
+    while True:
+        try:
+            await asyncio.to_thread(proof_cache.purge_expired)
+        except Exception as e:
+            print(f"[proof_cache] purge failed: {e}")
+        await asyncio.sleep(PROOF_CACHE_PURGE_INTERVAL_SEC)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the head poller and relay scheduler, warm provers/garaga and purge expired cached proofs periodically; close pooled clients, workers and the state store on shutdown."""
+    start_head_poller(STARKNET_RPC_URL)
+    garaga = get_garaga_formatter()
+    warm_task = asyncio.create_task(_warm_garaga(garaga))
+    prover_warm_task = asyncio.create_task(asyncio.to_thread(warm_pools))
+    proof_cache = get_proof_result_cache()
+    purge_task = asyncio.create_task(_purge_proof_cache(proof_cache))
+    relay_scheduler = get_relay_scheduler()
+    await relay_scheduler.start()
+    yield
+    await relay_scheduler.stop()
+    warm_task.cancel()
+    prover_warm_task.cancel()
+    purge_task.cancel()
+    await stop_head_pollers()
+    await close_clients()
+    await asyncio.to_thread(garaga.close)
+    await asyncio.to_thread(close_pools)
+    proof_cache.close()
+    await close_state_store()
+
 
 app = FastAPI(
     title="zkde.fi by Obsqra Labs API",
     description="zkde.fi — Proof-gated yield and selective disclosure on Starknet. Uses Obsqra Labs proving API (obsqra.fi). Open source; live at zkde.fi.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -9,6 +9,7 @@ Autonomous agent rebalancing gated by zkML proofs.
 """
 import os
 import asyncio
+import time
 from typing import Any
 from datetime import datetime
 from enum import Enum
@@ -16,9 +17,18 @@ from enum import Enum
 from app.services.zkml_risk_service import get_risk_service
 from app.services.zkml_anomaly_service import get_anomaly_service
 from app.services.session_key_service import get_session_service
+from app.services.state_store import get_state_store
 from app.services.zkdefi_agent_service import ZkdefiAgentService
 
 STARKNET_RPC_URL = os.getenv("STARKNET_RPC_URL", "https://starknet-sepolia.public.blastapi.io")
+# Prove zkML gates in the background as soon as a proposal exists
+SPECULATIVE_PROOFS = os.getenv("REBALANCER_SPECULATIVE_PROOFS", "true").lower() in ("1", "true", "yes")
+# Speculative proofs nobody consumed within this window are cancelled and dropped
+SPECULATION_TTL_SEC = float(os.getenv("REBALANCER_SPECULATION_TTL_SEC", "600"))
+RISK_THRESHOLD = 30  # Default risk threshold
+
+PROPOSALS = "rebalance_proposals"
+LATEST_FEATURES = "rebalancer_features"
 
 
 class RebalanceStatus(str, Enum):
@@ -43,7 +53,8 @@ class RebalanceProposal:
         from_protocol: int,
         to_protocol: int,
         amount: int,
-        reason: str
+        reason: str,
+        pool_id: str | None = None
     ):
         self.proposal_id = proposal_id
         self.user_address = user_address
@@ -51,6 +62,8 @@ class RebalanceProposal:
         self.to_protocol = to_protocol
         self.amount = amount
         self.reason = reason
+        # Pool whose anomaly gate is proven for this proposal
+        self.pool_id = pool_id or f"pool_{to_protocol}"
         self.status = RebalanceStatus.PENDING
         self.created_at = datetime.utcnow().isoformat()
         
@@ -61,6 +74,18 @@ class RebalanceProposal:
         self.commitment_hash = None
         self.tx_hash = None
         self.error = None
+        
+        # Speculative zkML proofs: (inputs key, background task)
+        self.speculation: tuple[str, asyncio.Task] | None = None
+    
+    @property
+    def speculation_state(self) -> str | None:
+        if self.speculation is None:
+            return None
+        task = self.speculation[1]
+        if not task.done():
+            return "proving"
+        return "failed" if task.cancelled() or task.exception() else "ready"
     
     def to_dict(self) -> dict:
         return {
@@ -70,14 +95,40 @@ class RebalanceProposal:
             "to_protocol": self.to_protocol,
             "amount": self.amount,
             "reason": self.reason,
+            "pool_id": self.pool_id,
             "status": self.status.value,
             "created_at": self.created_at,
             "risk_proof": self.risk_proof,
             "anomaly_proof": self.anomaly_proof,
             "commitment_hash": self.commitment_hash,
             "tx_hash": self.tx_hash,
-            "error": self.error
+            "error": self.error,
+            "speculative_proofs": self.speculation_state
         }
+    
+    def to_record(self) -> dict:
+        """Persistent form (speculation tasks stay in the worker that started them)."""
+        record = self.to_dict()
+        del record["speculative_proofs"]
+        record["execution_proof_hash"] = self.execution_proof_hash
+        return record
+    
+    @classmethod
+    def from_record(cls, record: dict) -> "RebalanceProposal":
+        proposal = cls(
+            proposal_id=record["proposal_id"],
+            user_address=record["user_address"],
+            from_protocol=record["from_protocol"],
+            to_protocol=record["to_protocol"],
+            amount=record["amount"],
+            reason=record["reason"],
+            pool_id=record.get("pool_id")
+        )
+        proposal.status = RebalanceStatus(record["status"])
+        proposal.created_at = record["created_at"]
+        for field in ("risk_proof", "anomaly_proof", "execution_proof_hash", "commitment_hash", "tx_hash", "error"):
+            setattr(proposal, field, record.get(field))
+        return proposal
 
 
 class AgentRebalancer:
@@ -91,9 +142,13 @@ class AgentRebalancer:
         self.session_service = get_session_service()
         self.agent_service = ZkdefiAgentService()
         
-        # Track proposals
-        self._proposals: dict[str, RebalanceProposal] = {}
-        self._user_proposals: dict[str, list[str]] = {}
+        # Proposals and the latest portfolio features per user (from
+        # analyze_portfolio) are shared across workers
+        self._store = get_state_store()
+        
+        # Speculative proof tasks of this worker, by proposal ID, and when each expires
+        self._speculations: dict[str, tuple[str, asyncio.Task]] = {}
+        self._speculation_expiry: dict[str, float] = {}
     
     async def analyze_portfolio(
         self,
@@ -116,12 +171,20 @@ class AgentRebalancer:
         risk_result = await self.risk_service.generate_risk_proof(
             user_address=user_address,
             portfolio_features=portfolio_features,
-            threshold=30  # Default risk threshold
+            threshold=RISK_THRESHOLD
         )
         
         # Determine if rebalancing is recommended
         should_rebalance = not risk_result["is_compliant"]
         
+        # Open proposals get their gate proofs (re)made for the new features
+        await self._store.put(LATEST_FEATURES, user_address, {"features": portfolio_features}, owner=user_address)
+        if should_rebalance:
+            for record in await self._store.list_by_owner(PROPOSALS, user_address):
+                if record["status"] == RebalanceStatus.PENDING.value:
+                    proposal = self._attach(RebalanceProposal.from_record(record))
+                    self._speculate(proposal, portfolio_features, proposal.pool_id)
+        
         return {
             "user_address": user_address,
             "total_value": total_value,
@@ -133,18 +196,48 @@ class AgentRebalancer:
             "risk_proof": risk_result
         }
     
+    def screen_portfolios(
+        self,
+        portfolios: dict[str, dict[int, int]],  # user_address -> positions
+        threshold: int = 30
+    ) -> dict[str, Any]:
+        """
+        Score many portfolios at once without generating proofs.
+        
+        Uses the batch risk model; users flagged here can then go through
+        ``analyze_portfolio`` / ``check_zkml_gates`` for proven results.
+        """
+        users = list(portfolios)
+        features = [
+            self._extract_portfolio_features(positions, sum(positions.values()))
+            for positions in portfolios.values()
+        ]
+        scores = self.risk_service.model.compute_risk_scores(features) if users else []
+        
+        flagged = [user for user, score in zip(users, scores) if score > threshold]
+        return {
+            "screened": len(users),
+            "threshold": threshold,
+            "should_rebalance": flagged,
+            "compliant_count": len(users) - len(flagged)
+        }
+    
     async def propose_rebalance(
         self,
         user_address: str,
         from_protocol: int,
         to_protocol: int,
         amount: int,
-        reason: str = "Risk optimization"
+        reason: str = "Risk optimization",
+        portfolio_features: list[int] | None = None,
+        pool_id: str | None = None
     ) -> RebalanceProposal:
         """
         Create a rebalancing proposal.
         
-        The proposal must pass zkML checks before execution.
+        The proposal must pass zkML checks before execution. When portfolio
+        features are known (passed in, or from the user's last analysis), the
+        zkML gate proofs start in the background at low priority.
         """
         import hashlib
         
@@ -158,14 +251,17 @@ class AgentRebalancer:
             from_protocol=from_protocol,
             to_protocol=to_protocol,
             amount=amount,
-            reason=reason
+            reason=reason,
+            pool_id=pool_id
         )
         
-        self._proposals[proposal_id] = proposal
+        await self._save(proposal)
         
-        if user_address not in self._user_proposals:
-            self._user_proposals[user_address] = []
-        self._user_proposals[user_address].append(proposal_id)
+        if portfolio_features is None:
+            latest = await self._store.get(LATEST_FEATURES, user_address)
+            portfolio_features = latest["features"] if latest else None
+        if portfolio_features is not None:
+            self._speculate(proposal, portfolio_features, proposal.pool_id)
         
         return proposal
     
@@ -180,39 +276,45 @@ class AgentRebalancer:
         
         Both risk score and anomaly detection must pass.
         """
-        proposal = self._proposals.get(proposal_id)
+        proposal = await self._load(proposal_id)
         if not proposal:
             raise ValueError(f"Proposal {proposal_id} not found")
         
         proposal.status = RebalanceStatus.ZKML_CHECKING
+        await self._save(proposal)
         
-        # Derive pool_id if not provided
+        # Default to the pool the proposal (and its speculation) was made for
         if pool_id is None:
-            pool_id = f"pool_{proposal.to_protocol}"
-        
-        # Generate commitment for both proofs
-        import hashlib
-        commitment_hash = "0x" + hashlib.sha256(
-            f"{proposal.user_address}{proposal_id}{portfolio_features}".encode()
-        ).hexdigest()[:32]
+            pool_id = proposal.pool_id
         
+        commitment_hash = self._gate_commitment(proposal, portfolio_features)
         proposal.commitment_hash = commitment_hash
         
-        # Run risk model
-        risk_result = await self.risk_service.generate_risk_proof(
-            user_address=proposal.user_address,
-            portfolio_features=portfolio_features,
-            threshold=30,
-            commitment_hash=commitment_hash
-        )
+        # Use speculative proofs if they were made for exactly these inputs
+        risk_result = anomaly_result = None
+        speculative_hit = False
+        inputs_key = self._gate_inputs_key(portfolio_features, pool_id)
+        if proposal.speculation is not None:
+            key, task = proposal.speculation
+            proposal.speculation = None
+            self._forget_speculation(proposal_id)
+            if key == inputs_key:
+                try:
+                    risk_result, anomaly_result = await asyncio.shield(task)
+                    speculative_hit = True
+                except asyncio.CancelledError:
+                    if not task.cancelled():
+                        raise
+                except Exception:
+                    pass  # prove again below
+            else:
+                task.cancel()
+        
+        if not speculative_hit:
+            risk_result, anomaly_result = await self._prove_gates(
+                proposal, portfolio_features, pool_id, commitment_hash
+            )
         proposal.risk_proof = risk_result
-        
-        # Run anomaly detection
-        anomaly_result = await self.anomaly_service.analyze_pool_safety(
-            pool_id=pool_id,
-            user_address=proposal.user_address,
-            commitment_hash=commitment_hash
-        )
         proposal.anomaly_proof = anomaly_result
         
         # Check if both passed
@@ -228,6 +330,7 @@ class AgentRebalancer:
             if not anomaly_result["is_safe"]:
                 reasons.append("Pool anomaly detected")
             proposal.error = "; ".join(reasons)
+        await self._save(proposal)
         
         return {
             "proposal_id": proposal_id,
@@ -236,7 +339,8 @@ class AgentRebalancer:
             "anomaly_passed": anomaly_result["is_safe"],
             "risk_proof": risk_result,
             "anomaly_proof": anomaly_result,
-            "commitment_hash": commitment_hash
+            "commitment_hash": commitment_hash,
+            "speculative_hit": speculative_hit
         }
     
     async def prepare_execution(
@@ -249,7 +353,7 @@ class AgentRebalancer:
         
         Validates session key and generates execution proofs.
         """
-        proposal = self._proposals.get(proposal_id)
+        proposal = await self._load(proposal_id)
         if not proposal:
             raise ValueError(f"Proposal {proposal_id} not found")
         
@@ -257,6 +361,7 @@ class AgentRebalancer:
             raise ValueError(f"Proposal must pass zkML checks first. Status: {proposal.status}")
         
         proposal.status = RebalanceStatus.GENERATING_PROOFS
+        await self._save(proposal)
         
         # Validate session key
         session_valid = await self.session_service.validate_session(
@@ -268,6 +373,7 @@ class AgentRebalancer:
         if not session_valid["is_valid"]:
             proposal.status = RebalanceStatus.FAILED
             proposal.error = f"Session validation failed: {session_valid.get('reason', 'Unknown')}"
+            await self._save(proposal)
             raise ValueError(proposal.error)
         
         # Generate execution proof via obsqra.fi
@@ -279,6 +385,7 @@ class AgentRebalancer:
         
         proposal.execution_proof_hash = execution_proof_hash
         proposal.status = RebalanceStatus.READY_TO_EXECUTE
+        await self._save(proposal)
         
         return {
             "proposal_id": proposal_id,
@@ -300,14 +407,21 @@ class AgentRebalancer:
         
         Requires valid session key and all proofs.
         """
-        proposal = self._proposals.get(proposal_id)
-        if not proposal:
-            raise ValueError(f"Proposal {proposal_id} not found")
-        
-        if proposal.status != RebalanceStatus.READY_TO_EXECUTE:
-            raise ValueError(f"Proposal not ready. Status: {proposal.status}")
+        def _claim(record: dict | None) -> dict:
+            if record is None:
+                raise ValueError(f"Proposal {proposal_id} not found")
+            
+            status = RebalanceStatus(record["status"])
+            if status != RebalanceStatus.READY_TO_EXECUTE:
+                raise ValueError(f"Proposal not ready. Status: {status}")
+            
+            return {**record, "status": RebalanceStatus.EXECUTING.value}
         
-        proposal.status = RebalanceStatus.EXECUTING
+        # Claimed atomically so two workers cannot execute the same proposal
+        proposal = self._attach(RebalanceProposal.from_record(
+            await self._store.update(PROPOSALS, proposal_id, _claim)
+        ))
+        self._drop_speculation(proposal_id)
         
         try:
             # In real implementation:
@@ -323,6 +437,7 @@ class AgentRebalancer:
             
             proposal.tx_hash = tx_hash
             proposal.status = RebalanceStatus.COMPLETED
+            await self._save(proposal)
             
             return {
                 "proposal_id": proposal_id,
@@ -341,17 +456,119 @@ class AgentRebalancer:
         except Exception as e:
             proposal.status = RebalanceStatus.FAILED
             proposal.error = str(e)
+            await self._save(proposal)
             raise
     
-    def get_proposal(self, proposal_id: str) -> dict[str, Any] | None:
+    async def get_proposal(self, proposal_id: str) -> dict[str, Any] | None:
         """Get proposal by ID."""
-        proposal = self._proposals.get(proposal_id)
+        proposal = await self._load(proposal_id)
         return proposal.to_dict() if proposal else None
     
-    def get_user_proposals(self, user_address: str) -> list[dict[str, Any]]:
+    async def get_user_proposals(self, user_address: str) -> list[dict[str, Any]]:
         """Get all proposals for a user."""
-        proposal_ids = self._user_proposals.get(user_address, [])
-        return [self._proposals[pid].to_dict() for pid in proposal_ids if pid in self._proposals]
+        records = await self._store.list_by_owner(PROPOSALS, user_address)
+        return [self._attach(RebalanceProposal.from_record(record)).to_dict() for record in records]
+    
+    def _forget_speculation(self, proposal_id: str) -> tuple[str, asyncio.Task] | None:
+        self._speculation_expiry.pop(proposal_id, None)
+        return self._speculations.pop(proposal_id, None)
+    
+    def _drop_speculation(self, proposal_id: str) -> None:
+        """Cancel and forget the proposal's speculative proofs, if this worker has any."""
+        speculation = self._forget_speculation(proposal_id)
+        if speculation is not None:
+            speculation[1].cancel()
+    
+    def _prune_speculations(self) -> None:
+        """Drop speculations that were never consumed within SPECULATION_TTL_SEC."""
+        now = time.monotonic()
+        for proposal_id in [pid for pid, expires in self._speculation_expiry.items() if expires <= now]:
+            self._drop_speculation(proposal_id)
+    
+    def _attach(self, proposal: RebalanceProposal) -> RebalanceProposal:
+        """Reconnect a stored proposal to this worker's speculative proofs."""
+        self._prune_speculations()
+        proposal.speculation = self._speculations.get(proposal.proposal_id)
+        return proposal
+    
+    async def _load(self, proposal_id: str) -> RebalanceProposal | None:
+        record = await self._store.get(PROPOSALS, proposal_id)
+        return self._attach(RebalanceProposal.from_record(record)) if record else None
+    
+    async def _save(self, proposal: RebalanceProposal) -> None:
+        await self._store.put(PROPOSALS, proposal.proposal_id, proposal.to_record(), owner=proposal.user_address)
+    
+    def _gate_commitment(self, proposal: RebalanceProposal, portfolio_features: list[int]) -> str:
+        """Commitment shared by the risk and anomaly proofs of a proposal."""
+        import hashlib
+        return "0x" + hashlib.sha256(
+            f"{proposal.user_address}{proposal.proposal_id}{portfolio_features}".encode()
+        ).hexdigest()[:32]
+    
+    def _gate_inputs_key(self, portfolio_features: list[int], pool_id: str) -> str:
+        return f"{list(portfolio_features)}|{pool_id}"
+    
+    async def _prove_gates(
+        self,
+        proposal: RebalanceProposal,
+        portfolio_features: list[int],
+        pool_id: str,
+        commitment_hash: str,
+        low_priority: bool = False
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Risk and anomaly proofs for a proposal, proven concurrently."""
+        risk_result, anomaly_result = await asyncio.gather(
+            self.risk_service.generate_risk_proof(
+                user_address=proposal.user_address,
+                portfolio_features=portfolio_features,
+                threshold=RISK_THRESHOLD,
+                commitment_hash=commitment_hash,
+                low_priority=low_priority
+            ),
+            self.anomaly_service.analyze_pool_safety(
+                pool_id=pool_id,
+                user_address=proposal.user_address,
+                commitment_hash=commitment_hash,
+                low_priority=low_priority
+            ),
+        )
+        return risk_result, anomaly_result
+    
+    def _speculate(
+        self,
+        proposal: RebalanceProposal,
+        portfolio_features: list[int],
+        pool_id: str | None = None
+    ) -> None:
+        """
+        Start proving the proposal's zkML gates in the background at low
+        priority. Proofs for stale inputs are cancelled and discarded.
+        """
+        if not SPECULATIVE_PROOFS:
+            return
+        self._prune_speculations()
+        proposal.speculation = self._speculations.get(proposal.proposal_id)
+        if pool_id is None:
+            pool_id = proposal.pool_id
+        inputs_key = self._gate_inputs_key(portfolio_features, pool_id)
+        if proposal.speculation is not None:
+            key, task = proposal.speculation
+            if key == inputs_key and not (task.done() and (task.cancelled() or task.exception())):
+                return
+            task.cancel()
+        
+        task = asyncio.create_task(self._prove_gates(
+            proposal,
+            list(portfolio_features),
+            pool_id,
+            self._gate_commitment(proposal, portfolio_features),
+            low_priority=True
+        ))
+        # Failures (e.g. ProverBusyError) just mean check_zkml_gates proves normally
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        proposal.speculation = (inputs_key, task)
+        self._speculations[proposal.proposal_id] = proposal.speculation
+        self._speculation_expiry[proposal.proposal_id] = time.monotonic() + SPECULATION_TTL_SEC
     
     def _extract_portfolio_features(
         self,
@@ -8,8 +8,12 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Any
 
+from app.services.state_store import get_state_store
 from app.services.zkdefi_agent_service import ZkdefiAgentService
 
+PROFILES = "compliance_profiles"
+LATEST_PROFILES = "compliance_latest"  # key: "<user>:<profile_type>" -> {"profile_id": ...}
+
 
 class ComplianceService:
     """
@@ -27,10 +31,8 @@ class ComplianceService:
     def __init__(self):
         self.agent_service = ZkdefiAgentService()
         
-        # In-memory profile tracking
-        self._profiles: dict[str, dict] = {}
-        self._user_profiles: dict[str, list[str]] = {}
-        self._user_profile_by_type: dict[str, dict[str, str]] = {}
+        # Profiles shared across workers, indexed by user
+        self._store = get_state_store()
     
     async def register_profile(
         self,
@@ -71,17 +73,12 @@ class ComplianceService:
             "on_chain": False
         }
         
-        # Store locally
-        self._profiles[profile_id] = profile
-        
-        if user_address not in self._user_profiles:
-            self._user_profiles[user_address] = []
-        self._user_profiles[user_address].append(profile_id)
+        await self._store.put(PROFILES, profile_id, profile, owner=user_address)
         
         # Update latest profile of type
-        if user_address not in self._user_profile_by_type:
-            self._user_profile_by_type[user_address] = {}
-        self._user_profile_by_type[user_address][profile_type] = profile_id
+        await self._store.put(
+            LATEST_PROFILES, f"{user_address}:{profile_type}", {"profile_id": profile_id}, owner=user_address
+        )
         
         return profile
     
@@ -93,9 +90,12 @@ class ComplianceService:
         """
         Confirm profile was registered on-chain.
         """
-        if profile_id in self._profiles:
-            self._profiles[profile_id]["on_chain"] = True
-            self._profiles[profile_id]["tx_hash"] = tx_hash
+        def _confirm(profile: dict | None) -> dict | None:
+            if profile is None:
+                return None
+            return {**profile, "on_chain": True, "tx_hash": tx_hash}
+        
+        await self._store.update(PROFILES, profile_id, _confirm)
         
         return {
             "profile_id": profile_id,
@@ -111,16 +111,16 @@ class ComplianceService:
         """
         Revoke a compliance profile.
         """
-        if profile_id not in self._profiles:
-            raise ValueError("Profile not found")
+        def _revoke(profile: dict | None) -> dict | None:
+            if profile is None:
+                raise ValueError("Profile not found")
+            
+            if profile["user"] != user_address:
+                raise ValueError("Not profile owner")
+            
+            return {**profile, "is_active": False, "revoked_at": datetime.utcnow().isoformat()}
         
-        profile = self._profiles[profile_id]
-        
-        if profile["user"] != user_address:
-            raise ValueError("Not profile owner")
-        
-        profile["is_active"] = False
-        profile["revoked_at"] = datetime.utcnow().isoformat()
+        await self._store.update(PROFILES, profile_id, _revoke)
         
         return {
             "profile_id": profile_id,
@@ -129,12 +129,11 @@ class ComplianceService:
     
     async def get_profile(self, profile_id: str) -> dict[str, Any] | None:
         """Get profile by ID."""
-        return self._profiles.get(profile_id)
+        return await self._store.get(PROFILES, profile_id)
     
     async def get_user_profiles(self, user_address: str) -> list[dict[str, Any]]:
         """Get all profiles for a user."""
-        profile_ids = self._user_profiles.get(user_address, [])
-        profiles = [self._profiles[pid] for pid in profile_ids if pid in self._profiles]
+        profiles = await self._store.list_by_owner(PROFILES, user_address)
         
         # Check expiry
         now = datetime.utcnow()
@@ -153,14 +152,14 @@ class ComplianceService:
         """
         Check if user has a valid profile of the given type.
         """
-        if user_address not in self._user_profile_by_type:
-            return {"has_valid": False, "reason": "No profiles"}
-        
-        if profile_type not in self._user_profile_by_type[user_address]:
+        latest = await self._store.get(LATEST_PROFILES, f"{user_address}:{profile_type}")
+        if latest is None:
+            if not await self._store.list_by_owner(LATEST_PROFILES, user_address):
+                return {"has_valid": False, "reason": "No profiles"}
             return {"has_valid": False, "reason": f"No {profile_type} profile"}
         
-        profile_id = self._user_profile_by_type[user_address][profile_type]
-        profile = self._profiles.get(profile_id)
+        profile_id = latest["profile_id"]
+        profile = await self._store.get(PROFILES, profile_id)
         
         if not profile:
             return {"has_valid": False, "reason": "Profile not found"}
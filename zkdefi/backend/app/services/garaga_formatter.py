@@ -1,15 +1,153 @@
 """
-Garaga proof formatter using Docker with Python 3.10.
+Garaga proof formatter backed by a warm, long-lived worker.
 Generates full_proof_with_hints format required by Garaga verifier.
+
+Formatting used to start a fresh python:3.10 Docker container per proof and
+``pip install garaga`` inside it. Now garaga is imported once and the
+verification keys parsed once:
+
+- in-process, when the backend interpreter itself has garaga installed, or
+- in a sidecar (``GARAGA_PYTHON app/services/garaga_worker.py``) speaking
+  JSON lines over stdin/stdout, for deployments where garaga lives in a
+  separate Python 3.10 environment.
+
+GARAGA_MODE selects ``auto`` (default: in-process if importable, else
+sidecar), ``inprocess`` or ``sidecar``. Nothing is downloaded at request time.
 """
+import itertools
 import json
+import os
 import subprocess
-import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
+from .pipe_reader import PipeLineReader
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 CIRCUITS_DIR = PROJECT_ROOT / "circuits" / "build"
+WORKER_SCRIPT = Path(__file__).with_name("garaga_worker.py")
+
+GARAGA_MODE = os.getenv("GARAGA_MODE", "auto").lower()
+GARAGA_PYTHON = os.getenv("GARAGA_PYTHON", "python3.10")
+GARAGA_TIMEOUT_SEC = float(os.getenv("GARAGA_TIMEOUT_SEC", "60"))
+
+
+class GaragaError(Exception):
+    """Garaga could not format a proof (worker unavailable, timed out or rejected the input)."""
+
+
+def _garaga_importable() -> bool:
+    try:
+        import garaga  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class GaragaFormatter:
+    """One warm garaga instance shared by every proof request (thread-safe)."""
+
+    def __init__(self, mode: str = GARAGA_MODE, python: str = GARAGA_PYTHON, timeout: float = GARAGA_TIMEOUT_SEC):
+        if mode == "auto":
+            mode = "inprocess" if _garaga_importable() else "sidecar"
+        self.mode = mode
+        self.python = python
+        self.timeout = timeout
+        self._proc: subprocess.Popen | None = None
+        self._stdout: PipeLineReader | None = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _ensure_worker(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                [self.python, str(WORKER_SCRIPT)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+            self._stdout = PipeLineReader(self._proc.stdout, name="garaga-worker-stdout")
+        return self._proc
+
+    def _request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            request_id = next(self._ids)
+            try:
+                proc = self._ensure_worker()
+                proc.stdin.write(json.dumps({**payload, "id": request_id}) + "\n")
+                proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                raise GaragaError(f"Garaga worker unavailable ({self.python}): {e}")
+            line = self._stdout.readline(self.timeout)
+            if not line:
+                # Timed out or died mid-request: never reuse a worker in an unknown state
+                self._kill()
+                raise GaragaError(f"Garaga worker gave no response within {self.timeout}s")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                self._kill()
+                raise GaragaError(f"Garaga worker sent an unreadable response: {line[:200]!r}")
+            if response.get("id") != request_id:
+                self._kill()
+                raise GaragaError("Garaga worker response out of sequence")
+            if "error" in response:
+                raise GaragaError(response["error"])
+            return response
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+            self._stdout = None
+
+    def calldata(self, proof_json: dict, public_json: list, vk_path: Path) -> list[int]:
+        if self.mode == "inprocess":
+            from .garaga_worker import format_calldata
+
+            with self._lock:
+                return format_calldata(str(vk_path), proof_json, public_json)
+        response = self._request({"op": "calldata", "vk": str(Path(vk_path).resolve()), "proof": proof_json, "public": public_json})
+        return [int(v) for v in response["calldata"]]
+
+    def warm(self, vk_paths: list[Path]) -> None:
+        """Import garaga and parse the verification keys ahead of the first proof."""
+        for vk_path in vk_paths:
+            if not Path(vk_path).exists():
+                continue
+            if self.mode == "inprocess":
+                from .garaga_worker import _load_vk
+
+                with self._lock:
+                    _load_vk(str(vk_path))
+            else:
+                self._request({"op": "load_vk", "vk": str(Path(vk_path).resolve())})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.stdin.close()
+                try:
+                    self._proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
+            self._proc = None
+            self._stdout = None
+
+
+_formatter: GaragaFormatter | None = None
+
+
+def get_garaga_formatter() -> GaragaFormatter:
+    global _formatter
+    if _formatter is None:
+        _formatter = GaragaFormatter()
+    return _formatter
 
 
 def format_proof_for_garaga(
@@ -18,82 +156,17 @@ def format_proof_for_garaga(
     vk_path: Path,
 ) -> list[str]:
     """
-    Use garaga CLI in Docker (Python 3.10) to format proof with MSM hints.
-    
+    Format a snarkjs proof with MSM hints using the warm garaga worker.
+
     Args:
         proof_json: snarkjs proof.json content
         public_json: snarkjs public.json content
         vk_path: Path to verification_key.json
-    
+
     Returns:
         List of felt252 hex strings ready for Garaga verification
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        
-        # Write proof and public inputs
-        proof_file = tmp_path / "proof.json"
-        public_file = tmp_path / "public.json"
-        
-        with open(proof_file, 'w') as f:
-            json.dump(proof_json, f)
-        with open(public_file, 'w') as f:
-            json.dump(public_json, f)
-        
-        # Run garaga CLI in Docker container with Python 3.10
-        docker_cmd = [
-            "docker", "run", "--rm",
-            "-v", f"{tmp_path}:/work",
-            "-v", f"{vk_path.parent}:/circuits",
-            "-w", "/work",
-            "python:3.10-slim",
-            "bash", "-c",
-            f"""
-            pip install -q garaga && \
-            garaga calldata \
-                --system groth16 \
-                --vk /circuits/{vk_path.name} \
-                --proof proof.json \
-                --public-inputs public.json \
-                --format starkli \
-                > garaga_calldata.txt
-            """
-        ]
-        
-        result = subprocess.run(
-            docker_cmd,
-            capture_output=True,
-            text=True,
-            timeout=180,
-        )
-        
-        if result.returncode != 0:
-            raise Exception(f"Garaga Docker formatting failed: {result.stderr}")
-        
-        # Read the formatted calldata
-        calldata_file = tmp_path / "garaga_calldata.txt"
-        if not calldata_file.exists():
-            raise Exception("Garaga did not generate calldata file")
-        
-        with open(calldata_file) as f:
-            content = f.read().strip()
-        
-        # Garaga --format starkli returns: length followed by space-separated decimal values
-        # Example: "1949 13319788039342200419402383041 13831044747143748575809708628 ..."
-        try:
-            values = content.split()
-            if not values:
-                raise ValueError("Empty calldata")
-            
-            # First value is the length, rest are the actual calldata as decimals
-            length = int(values[0])
-            decimals = [int(v) for v in values[1:]]
-            
-            if len(decimals) != length:
-                raise ValueError(f"Length mismatch: expected {length}, got {len(decimals)}")
-            
-            # Convert to hex
-            calldata_hex = [hex(v) for v in decimals]
-            return calldata_hex
-        except Exception as e:
-            raise Exception(f"Failed to parse garaga starkli output: {e}\nContent: {content[:200]}")
+    values = get_garaga_formatter().calldata(proof_json, public_json, vk_path)
+    if not values:
+        raise GaragaError("Garaga returned empty calldata")
+    return [hex(v) for v in values]
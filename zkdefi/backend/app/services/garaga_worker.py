@@ -0,0 +1,92 @@
+"""
+Warm Garaga calldata worker.
+
+Garaga (Python 3.10) turns a snarkjs Groth16 proof into the
+full_proof_with_hints calldata the on-chain Garaga verifier expects.
+This module is both the in-process implementation and a standalone sidecar:
+
+    python3.10 app/services/garaga_worker.py
+
+reads one JSON request per line on stdin and writes one JSON response per
+line on stdout, so garaga is imported and each verification key parsed
+only once per process:
+
+    {"id": 1, "op": "calldata", "vk": "/abs/vk.json", "proof": {...}, "public": [...]}
+    -> {"id": 1, "calldata": [<int>, ...]}
+    {"id": 2, "op": "load_vk", "vk": "/abs/vk.json"}
+    -> {"id": 2, "ok": true}
+    errors -> {"id": n, "error": "..."}
+
+Deliberately imports nothing from ``app`` so it runs under any interpreter
+that has garaga installed (no network needed at request time).
+"""
+import json
+import os
+import sys
+import tempfile
+
+_vk_cache = {}
+
+
+def _load_vk(vk_path):
+    from garaga.starknet.groth16_contract_generator.parsing_utils import Groth16VerifyingKey
+
+    mtime = os.path.getmtime(vk_path)
+    cached = _vk_cache.get(vk_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, Groth16VerifyingKey.from_json(vk_path))
+        _vk_cache[vk_path] = cached
+    return cached[1]
+
+
+def format_calldata(vk_path, proof_json, public_json):
+    """Garaga groth16 calldata for a snarkjs proof, without the length prefix."""
+    from garaga.starknet.groth16_contract_generator.calldata import groth16_calldata_from_vk_and_proof
+    from garaga.starknet.groth16_contract_generator.parsing_utils import Groth16Proof
+
+    vk = _load_vk(str(vk_path))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        proof_file = os.path.join(tmpdir, "proof.json")
+        public_file = os.path.join(tmpdir, "public.json")
+        with open(proof_file, "w") as f:
+            json.dump(proof_json, f)
+        with open(public_file, "w") as f:
+            json.dump(public_json, f)
+        proof = Groth16Proof.from_json(proof_file, public_file)
+    values = [int(v) for v in groth16_calldata_from_vk_and_proof(vk, proof)]
+    # Same shape as `garaga calldata --format starkli`: length followed by the values
+    if values and values[0] == len(values) - 1:
+        values = values[1:]
+    return values
+
+
+def _handle(request):
+    op = request.get("op", "calldata")
+    if op == "load_vk":
+        _load_vk(request["vk"])
+        return {"ok": True}
+    if op == "calldata":
+        return {"calldata": format_calldata(request["vk"], request["proof"], request["public"])}
+    if op == "ping":
+        return {"ok": True}
+    raise ValueError(f"unknown op: {op}")
+
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = _handle(request)
+        except Exception as e:  # keep serving; the caller gets the error for this request only
+            response = {"error": f"{type(e).__name__}: {e}"}
+        response["id"] = request_id
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
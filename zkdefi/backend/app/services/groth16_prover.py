@@ -1,15 +1,17 @@
 """
 Groth16 proof generation for private deposits/withdrawals.
-Uses snarkjs to generate proofs from Circom circuits.
-Uses Docker + garaga CLI (Python 3.10) to format proofs for Garaga verifier.
+Uses warm snarkjs prover daemons (see snark_prover_pool) to generate proofs from Circom circuits.
+Uses a warm garaga worker (see garaga_formatter) to format proofs for Garaga verifier.
 """
 import json
 import os
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import Any
 
+from .garaga_formatter import format_proof_for_garaga
+from .snark_prover_pool import prove
+
 # Circuit paths - go from services/ -> app/ -> backend/ -> zkdefi (project root)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 CIRCUITS_DIR = PROJECT_ROOT / "circuits" / "build"
@@ -58,76 +60,35 @@ class Groth16Prover:
                 f"Circuit files not found. WASM: {PRIVATE_DEPOSIT_WASM.exists()}, ZKEY: {PRIVATE_DEPOSIT_ZKEY.exists()}"
             )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Prepare input
-            input_data = {
-                "amount": str(amount),
-                "nonce": str(nonce),
-                "balance": str(balance),
-            }
-            input_file = Path(tmpdir) / "input.json"
-            with open(input_file, "w") as f:
-                json.dump(input_data, f)
-
-            # Generate witness
-            witness_file = Path(tmpdir) / "witness.wtns"
-            subprocess.run(
-                [
-                    "node",
-                    str(CIRCUITS_DIR / "PrivateDeposit_js" / "generate_witness.js"),
-                    str(PRIVATE_DEPOSIT_WASM),
-                    str(input_file),
-                    str(witness_file),
-                ],
-                check=True,
-                capture_output=True,
+        input_data = {
+            "amount": str(amount),
+            "nonce": str(nonce),
+            "balance": str(balance),
+        }
+        # Witness + proof on a warm daemon (WASM and zkey already resident)
+        result = prove("PrivateDeposit", input_data)
+        proof = result["proof"]
+        public = result["public_signals"]
+
+        # Format proof with MSM hints (warm garaga worker, VKs already loaded)
+        try:
+            proof_calldata = format_proof_for_garaga(
+                proof_json=proof,
+                public_json=public,
+                vk_path=PRIVATE_DEPOSIT_VK,
             )
+        except Exception as e:
+            raise Exception(f"Garaga formatting failed: {str(e)}")
 
-            # Generate proof
-            proof_file = Path(tmpdir) / "proof.json"
-            public_file = Path(tmpdir) / "public.json"
-            subprocess.run(
-                [
-                    "npx",
-                    "snarkjs",
-                    "groth16",
-                    "prove",
-                    str(PRIVATE_DEPOSIT_ZKEY),
-                    str(witness_file),
-                    str(proof_file),
-                    str(public_file),
-                ],
-                check=True,
-                capture_output=True,
-            )
+        # Calculate commitment (from circuit public outputs)
+        commitment = (amount * 0x10000 + nonce) % (2**252)
 
-            # Read proof and public signals
-            with open(proof_file) as f:
-                proof = json.load(f)
-            with open(public_file) as f:
-                public = json.load(f)
-
-            # Use garaga CLI via Docker to format proof with MSM hints
-            from .garaga_formatter import format_proof_for_garaga
-            
-            try:
-                proof_calldata = format_proof_for_garaga(
-                    proof_json=proof,
-                    public_json=public,
-                    vk_path=PRIVATE_DEPOSIT_VK,
-                )
-            except Exception as e:
-                raise Exception(f"Garaga formatting failed: {str(e)}")
-
-            # Calculate commitment (from circuit public outputs)
-            commitment = (amount * 0x10000 + nonce) % (2**252)
-
-            return {
-                "commitment": hex(commitment),
-                "amount_public": amount,
-                "nonce": nonce,
-                "proof_calldata": proof_calldata,
-            }
+        return {
+            "commitment": hex(commitment),
+            "amount_public": amount,
+            "nonce": nonce,
+            "proof_calldata": proof_calldata,
+        }
 
     @staticmethod
     def generate_private_withdraw_proof(
@@ -146,84 +107,43 @@ class Groth16Prover:
                 f"Circuit files not found. WASM: {PRIVATE_WITHDRAW_WASM.exists()}, ZKEY: {PRIVATE_WITHDRAW_ZKEY.exists()}"
             )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            commitment_int = int(commitment, 16) if isinstance(commitment, str) else commitment
-
-            # Prepare input
-            input_data = {
-                "amount": str(amount),
-                "nonce": str(nonce),
-                "balance": str(balance),
-                "user_secret": str(user_secret),
-                "commitment_public": str(commitment_int),
-            }
-            input_file = Path(tmpdir) / "input.json"
-            with open(input_file, "w") as f:
-                json.dump(input_data, f)
-
-            # Generate witness
-            witness_file = Path(tmpdir) / "witness.wtns"
-            subprocess.run(
-                [
-                    "node",
-                    str(CIRCUITS_DIR / "PrivateWithdraw_js" / "generate_witness.js"),
-                    str(PRIVATE_WITHDRAW_WASM),
-                    str(input_file),
-                    str(witness_file),
-                ],
-                check=True,
-                capture_output=True,
-            )
-
-            # Generate proof
-            proof_file = Path(tmpdir) / "proof.json"
-            public_file = Path(tmpdir) / "public.json"
-            subprocess.run(
-                [
-                    "npx",
-                    "snarkjs",
-                    "groth16",
-                    "prove",
-                    str(PRIVATE_WITHDRAW_ZKEY),
-                    str(witness_file),
-                    str(proof_file),
-                    str(public_file),
-                ],
-                check=True,
-                capture_output=True,
+        commitment_int = int(commitment, 16) if isinstance(commitment, str) else commitment
+
+        input_data = {
+            "amount": str(amount),
+            "nonce": str(nonce),
+            "balance": str(balance),
+            "user_secret": str(user_secret),
+            "commitment_public": str(commitment_int),
+        }
+        # Witness + proof on a warm daemon (WASM and zkey already resident)
+        result = prove("PrivateWithdraw", input_data)
+        proof = result["proof"]
+        public = result["public_signals"]
+
+        # Format proof with MSM hints (warm garaga worker, VKs already loaded)
+        try:
+            proof_calldata = format_proof_for_garaga(
+                proof_json=proof,
+                public_json=public,
+                vk_path=PRIVATE_WITHDRAW_VK,
             )
-
-            # Read proof and public signals
-            with open(proof_file) as f:
-                proof = json.load(f)
-            with open(public_file) as f:
-                public = json.load(f)
-
-            # Use garaga CLI via Docker to format proof with MSM hints
-            from .garaga_formatter import format_proof_for_garaga
-            
-            try:
-                proof_calldata = format_proof_for_garaga(
-                    proof_json=proof,
-                    public_json=public,
-                    vk_path=PRIVATE_WITHDRAW_VK,
-                )
-            except Exception as e:
-                raise Exception(f"Garaga formatting failed: {str(e)}")
-
-            # Generate nullifier
-            import hashlib
-
-            # Use Starknet prime, not 2^252
-            STARKNET_PRIME = 0x800000000000011000000000000000000000000000000000000000000000001
-            nullifier_input = f"{commitment_int}:{nonce}:{user_secret}".encode()
-            nullifier_hash = hashlib.sha256(nullifier_input).hexdigest()
-            nullifier = int(nullifier_hash, 16) % STARKNET_PRIME
-
-            return {
-                "nullifier": hex(nullifier),
-                "commitment": hex(commitment_int),
-                "amount_public": amount,
-                "nonce": nonce,
-                "proof_calldata": proof_calldata,
-            }
+        except Exception as e:
+            raise Exception(f"Garaga formatting failed: {str(e)}")
+
+        # Generate nullifier
+        import hashlib
+
+        # Use Starknet prime, not 2^252
+        STARKNET_PRIME = 0x800000000000011000000000000000000000000000000000000000000000001
+        nullifier_input = f"{commitment_int}:{nonce}:{user_secret}".encode()
+        nullifier_hash = hashlib.sha256(nullifier_input).hexdigest()
+        nullifier = int(nullifier_hash, 16) % STARKNET_PRIME
+
+        return {
+            "nullifier": hex(nullifier),
+            "commitment": hex(commitment_int),
+            "amount_public": amount,
+            "nonce": nonce,
+            "proof_calldata": proof_calldata,
+        }
@@ -10,10 +10,14 @@ import secrets
 from datetime import datetime
 from typing import Any
 
+from app.services.state_store import get_state_store
+
 
 # Default chain ID for Starknet Sepolia
 CHAIN_ID = os.getenv("STARKNET_CHAIN_ID", "0x534e5f5345504f4c4941")  # SN_SEPOLIA
 
+COMMITMENTS = "intent_commitments"
+
 
 class IntentService:
     """
@@ -23,9 +27,8 @@ class IntentService:
     def __init__(self, chain_id: str | None = None):
         self.chain_id = chain_id or CHAIN_ID
         
-        # In-memory commitment tracking
-        self._commitments: dict[str, dict] = {}
-        self._user_commitments: dict[str, list[str]] = {}
+        # Commitments shared across workers, indexed by user
+        self._store = get_state_store()
     
     async def create_commitment(
         self,
@@ -67,12 +70,7 @@ class IntentService:
             "on_chain": False
         }
         
-        # Store locally
-        self._commitments[commitment] = record
-        
-        if user_address not in self._user_commitments:
-            self._user_commitments[user_address] = []
-        self._user_commitments[user_address].append(commitment)
+        await self._store.put(COMMITMENTS, commitment, record, owner=user_address)
         
         return record
     
@@ -84,9 +82,12 @@ class IntentService:
         """
         Confirm commitment was submitted on-chain.
         """
-        if commitment in self._commitments:
-            self._commitments[commitment]["on_chain"] = True
-            self._commitments[commitment]["tx_hash"] = tx_hash
+        def _submit(record: dict | None) -> dict | None:
+            if record is None:
+                return None
+            return {**record, "on_chain": True, "tx_hash": tx_hash}
+        
+        await self._store.update(COMMITMENTS, commitment, _submit)
         
         return {
             "commitment": commitment,
@@ -102,24 +103,31 @@ class IntentService:
         """
         Mark commitment as used (for replay prevention).
         """
-        if commitment not in self._commitments:
+        # Check-and-set in one transaction so two workers cannot both use it
+        outcome: dict[str, Any] = {}
+        
+        def _use(record: dict | None) -> dict | None:
+            if record is None:
+                outcome["reason"] = "Commitment not found"
+                return None
+            if record["used"]:
+                outcome["reason"] = "Commitment already used"
+                return None
             return {
-                "success": False,
-                "reason": "Commitment not found"
+                **record,
+                "used": True,
+                "action_hash": action_hash,
+                "used_at": datetime.utcnow().isoformat()
             }
         
-        record = self._commitments[commitment]
+        await self._store.update(COMMITMENTS, commitment, _use)
         
-        if record["used"]:
+        if "reason" in outcome:
             return {
                 "success": False,
-                "reason": "Commitment already used"
+                "reason": outcome["reason"]
             }
         
-        record["used"] = True
-        record["action_hash"] = action_hash
-        record["used_at"] = datetime.utcnow().isoformat()
-        
         return {
             "success": True,
             "commitment": commitment,
@@ -134,14 +142,13 @@ class IntentService:
         """
         Check if commitment is valid and unused.
         """
-        if commitment not in self._commitments:
+        record = await self._store.get(COMMITMENTS, commitment)
+        if record is None:
             return {
                 "is_valid": False,
                 "reason": "Commitment not found"
             }
         
-        record = self._commitments[commitment]
-        
         if record["used"]:
             return {
                 "is_valid": False,
@@ -160,12 +167,11 @@ class IntentService:
     
     async def get_commitment(self, commitment: str) -> dict[str, Any] | None:
         """Get commitment record."""
-        return self._commitments.get(commitment)
+        return await self._store.get(COMMITMENTS, commitment)
     
     async def get_user_commitments(self, user_address: str) -> list[dict[str, Any]]:
         """Get all commitments for a user."""
-        commitment_ids = self._user_commitments.get(user_address, [])
-        return [self._commitments[cid] for cid in commitment_ids if cid in self._commitments]
+        return await self._store.list_by_owner(COMMITMENTS, user_address)
 
 
 # Singleton instance
@@ -0,0 +1,40 @@
+"""
+Line reader with a timeout for a worker subprocess's stdout.
+
+``select`` on a buffered text pipe is unreliable: lines already pulled into
+Python's buffer are invisible to it, and ``readline`` can block past the
+deadline on a partial line. A daemon thread reads complete lines into a
+queue instead, and callers wait on the queue with a timeout.
+"""
+import queue
+import threading
+from typing import IO
+
+
+class PipeLineReader:
+    """Pumps ``stream`` line by line on a daemon thread until EOF."""
+
+    def __init__(self, stream: IO[str], name: str):
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._pump, args=(stream,), name=name, daemon=True)
+        self._thread.start()
+
+    def _pump(self, stream: IO[str]) -> None:
+        try:
+            for line in stream:
+                self._lines.put(line)
+        except (OSError, ValueError):
+            pass  # pipe closed under us (process killed)
+        finally:
+            self._lines.put(None)
+
+    def readline(self, timeout: float) -> str:
+        """Next complete line, or "" on EOF or if none arrives within ``timeout`` seconds."""
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            return ""
+        if line is None:
+            self._lines.put(None)  # keep reporting EOF
+            return ""
+        return line
@@ -7,17 +7,87 @@ Coordinates proof generation for both:
 
 Handles caching, optimization, and proof formatting.
 """
+import asyncio
 import hashlib
 import os
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from app.services.zkml_risk_service import get_risk_service
-from app.services.zkml_anomaly_service import get_anomaly_service
+from app.services.proof_result_cache import get_proof_result_cache
+from app.services.zkml_risk_service import RiskScoreModel, get_risk_service
+from app.services.zkml_anomaly_service import AnomalyDetectionModel, get_anomaly_service
 
 OBSQRA_PROVER_URL = os.getenv("OBSQRA_PROVER_URL", "https://starknet.obsqra.fi/api/prover")
 
 
+@dataclass
+class StageResults:
+    """Outcome of ``run_proof_stages``: results of finished stages plus timing."""
+    results: dict[str, Any]
+    timings_ms: dict[str, float]
+    cancelled: list[str] = field(default_factory=list)
+    failed_gate: str | None = None
+
+
+async def run_proof_stages(
+    stages: dict[str, Awaitable[dict[str, Any]]],
+    gates: dict[str, Callable[[dict[str, Any]], bool]] | None = None,
+) -> StageResults:
+    """
+    Run independent proof stages concurrently.
+
+    ``gates`` maps a stage name to a pass/fail check on its result. As soon as
+    a gated stage fails, every stage still in flight is cancelled (its proof
+    can no longer change the outcome). If a stage raises, the others are
+    cancelled and the error propagates. End-to-end latency is therefore the
+    slowest needed stage, not the sum; per-stage wall time is reported.
+    """
+    gates = gates or {}
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def _timed(name: str, stage: Awaitable[dict[str, Any]]) -> dict[str, Any]:
+        t0 = time.perf_counter()
+        try:
+            return await stage
+        finally:
+            timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+    tasks = {asyncio.ensure_future(_timed(name, stage)): name for name, stage in stages.items()}
+    results: dict[str, Any] = {}
+    failed_gate = None
+    try:
+        pending = set(tasks)
+        while pending and failed_gate is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                results[name] = task.result()
+                gate = gates.get(name)
+                if gate is not None and failed_gate is None and not gate(results[name]):
+                    failed_gate = name
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    cancelled = [name for name in tasks.values() if name not in results]
+    return StageResults(results=results, timings_ms=timings, cancelled=cancelled, failed_gate=failed_gate)
+
+
+def cancelled_stage(proof_type: str, failed_gate: str | None) -> dict[str, Any]:
+    """Placeholder for a stage cancelled because another gate already failed."""
+    return {
+        "proof_type": proof_type,
+        "cancelled": True,
+        "reason": f"{failed_gate} gate failed" if failed_gate else "cancelled",
+        "proof_calldata": [],
+    }
+
+
 class ProofPipeline:
     """
     Unified proof generation pipeline.
@@ -27,9 +97,9 @@ class ProofPipeline:
         self.risk_service = get_risk_service()
         self.anomaly_service = get_anomaly_service()
         
-        # Proof cache
-        self._cache: dict[str, dict] = {}
-        self._cache_ttl_seconds = 300  # 5 minutes
+        # Proof cache (bounded LRU + TTL, persisted in SQLite)
+        self._cache = get_proof_result_cache()
+        self._model_fingerprint = self._compute_model_fingerprint()
     
     async def generate_rebalancing_proofs(
         self,
@@ -51,36 +121,48 @@ class ProofPipeline:
             user_address, portfolio_features, pool_id
         )
         
-        # Check cache
-        cache_key = f"rebalance_{commitment_hash}"
+        # Check cache. The commitment above is salted with the current time, so
+        # results are keyed by a commitment over the inputs and the model instead.
+        cache_key = self._cache_key(
+            "rebalance", user_address, portfolio_features, pool_id, risk_threshold, constraints
+        )
         cached = self._get_cached(cache_key)
         if cached:
             return cached
         
-        # Generate zkML proofs (Garaga)
-        risk_proof = await self.risk_service.generate_risk_proof(
-            user_address=user_address,
-            portfolio_features=portfolio_features,
-            threshold=risk_threshold,
-            commitment_hash=commitment_hash
-        )
-        
-        anomaly_proof = await self.anomaly_service.analyze_pool_safety(
-            pool_id=pool_id,
-            user_address=user_address,
-            commitment_hash=commitment_hash
-        )
-        
-        # Generate execution proof (Integrity)
-        execution_proof = await self._generate_execution_proof(
-            user_address=user_address,
-            constraints=constraints or {},
-            commitment_hash=commitment_hash
+        # zkML proofs (Garaga) and the execution proof (Integrity) only share the
+        # commitment, so they run concurrently; a failed zkML gate cancels the rest.
+        stages = await run_proof_stages(
+            {
+                "risk": self.risk_service.generate_risk_proof(
+                    user_address=user_address,
+                    portfolio_features=portfolio_features,
+                    threshold=risk_threshold,
+                    commitment_hash=commitment_hash
+                ),
+                "anomaly": self.anomaly_service.analyze_pool_safety(
+                    pool_id=pool_id,
+                    user_address=user_address,
+                    commitment_hash=commitment_hash
+                ),
+                "execution": self._generate_execution_proof(
+                    user_address=user_address,
+                    constraints=constraints or {},
+                    commitment_hash=commitment_hash
+                ),
+            },
+            gates={
+                "risk": lambda proof: proof["is_compliant"],
+                "anomaly": lambda proof: proof["is_safe"],
+            },
         )
+        risk_proof = stages.results.get("risk") or cancelled_stage("risk_score", stages.failed_gate)
+        anomaly_proof = stages.results.get("anomaly") or cancelled_stage("anomaly_detection", stages.failed_gate)
+        execution_proof = stages.results.get("execution") or cancelled_stage("execution", stages.failed_gate)
         
         # Check if all proofs pass
-        zkml_passed = risk_proof["is_compliant"] and anomaly_proof["is_safe"]
-        execution_passed = execution_proof["is_valid"]
+        zkml_passed = bool(risk_proof.get("is_compliant")) and bool(anomaly_proof.get("is_safe"))
+        execution_passed = bool(execution_proof.get("is_valid"))
         can_execute = zkml_passed and execution_passed
         
         result = {
@@ -94,13 +176,16 @@ class ProofPipeline:
             "can_execute": can_execute,
             "combined_calldata": {
                 "zkml_calldata": risk_proof["proof_calldata"] + anomaly_proof["proof_calldata"],
-                "execution_proof_hash": execution_proof["proof_hash"]
+                "execution_proof_hash": execution_proof.get("proof_hash")
             },
+            "timings_ms": stages.timings_ms,
+            "cancelled_stages": stages.cancelled,
             "generated_at": datetime.utcnow().isoformat()
         }
         
-        # Cache result
-        self._cache_result(cache_key, result)
+        # Cache result (partial results with cancelled stages are not reusable)
+        if not stages.cancelled:
+            self._cache_result(cache_key, result)
         
         return result
     
@@ -211,24 +296,35 @@ class ProofPipeline:
             f"{user_address}{data}{context}{datetime.utcnow().isoformat()}".encode()
         ).hexdigest()[:32]
     
+    @staticmethod
+    def _compute_model_fingerprint() -> str:
+        """Short hash of the zkML model parameters; part of every cache key."""
+        params = (
+            RiskScoreModel.DEFAULT_WEIGHTS,
+            RiskScoreModel.DEFAULT_BIAS,
+            RiskScoreModel.SCALE,
+            AnomalyDetectionModel.DEFAULT_WEIGHTS,
+            AnomalyDetectionModel.DEFAULT_THRESHOLDS,
+            AnomalyDetectionModel.DEFAULT_MAX_ANOMALY_SCORE,
+        )
+        return hashlib.sha256(repr(params).encode()).hexdigest()[:16]
+    
+    def _cache_key(self, kind: str, *inputs: Any) -> str:
+        """``<kind>:<model fingerprint>:<input commitment>``."""
+        input_commitment = hashlib.sha256(repr(inputs).encode()).hexdigest()[:32]
+        return f"{kind}:{self._model_fingerprint}:0x{input_commitment}"
+    
+    def cache_stats(self) -> dict[str, Any]:
+        """Proof cache size and hit-rate metrics."""
+        return {**self._cache.stats(), "model_fingerprint": self._model_fingerprint}
+    
     def _get_cached(self, key: str) -> dict[str, Any] | None:
         """Get cached proof result."""
-        if key not in self._cache:
-            return None
-        
-        cached = self._cache[key]
-        generated_at = datetime.fromisoformat(cached["generated_at"])
-        age = (datetime.utcnow() - generated_at).total_seconds()
-        
-        if age > self._cache_ttl_seconds:
-            del self._cache[key]
-            return None
-        
-        return cached
+        return self._cache.get(key)
     
     def _cache_result(self, key: str, result: dict[str, Any]) -> None:
         """Cache proof result."""
-        self._cache[key] = result
+        self._cache.put(key, result)
 
 
 # Singleton instance
@@ -0,0 +1,214 @@
+"""
+Proof result cache: in-memory LRU in front of a SQLite file.
+
+Proof results are keyed by strings such as ``rebalance:<model>:<commitment>``.
+The memory tier is bounded by PROOF_CACHE_MAX_ENTRIES (least recently used
+entries are dropped first); every entry carries an absolute expiry so both
+tiers honour the same TTL. The SQLite tier (WAL mode) survives restarts and
+is shared by all uvicorn workers on the host. It is capped at
+PROOF_CACHE_MAX_DISK_ENTRIES rows: each ``put`` drops expired rows and then
+the rows closest to expiry beyond the cap. ``purge_expired`` also runs every
+PROOF_CACHE_PURGE_INTERVAL_SEC from the app lifespan.
+
+``invalidate_prefix`` drops every entry whose key starts with a prefix, e.g.
+all proofs made with an outdated model.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+PROOF_CACHE_PATH = os.getenv("PROOF_CACHE_PATH", str(DATA_DIR / "proof_cache.sqlite3"))
+PROOF_CACHE_MAX_ENTRIES = int(os.getenv("PROOF_CACHE_MAX_ENTRIES", "1024"))  # memory tier
+PROOF_CACHE_MAX_DISK_ENTRIES = int(os.getenv("PROOF_CACHE_MAX_DISK_ENTRIES", "16384"))  # SQLite tier
+PROOF_CACHE_TTL_SEC = float(os.getenv("PROOF_CACHE_TTL_SEC", "300"))
+PROOF_CACHE_PURGE_INTERVAL_SEC = float(os.getenv("PROOF_CACHE_PURGE_INTERVAL_SEC", "300"))
+
+# Sorts after any character that can appear in a key, closing a prefix range
+_PREFIX_END = "\U0010ffff"
+
+
+class ProofResultCache:
+    """Bounded LRU + TTL memory cache backed by a SQLite table (thread-safe)."""
+
+    def __init__(
+        self,
+        path: str | Path | None = PROOF_CACHE_PATH,
+        max_entries: int = PROOF_CACHE_MAX_ENTRIES,
+        ttl_sec: float = PROOF_CACHE_TTL_SEC,
+        max_disk_entries: int = PROOF_CACHE_MAX_DISK_ENTRIES,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.ttl_sec = ttl_sec
+        self._memory: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.expirations = 0
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(path), timeout=5, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS proof_results ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_proof_results_expires ON proof_results(expires_at)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                # Memory tier still works; results just do not outlive the process
+                print(f"[proof_cache] disk tier disabled ({path}): {e}")
+                self._db = None
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+                if self._db is None:
+                    self.expirations += 1
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM proof_results WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and row[1] <= now:
+                        self._db.execute("DELETE FROM proof_results WHERE key = ?", (key,))
+                        self._db.commit()
+                        self.expirations += 1
+                        row = None
+                except sqlite3.Error as e:
+                    print(f"[proof_cache] read failed: {e}")
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.disk_hits += 1
+            return value
+
+    def put(self, key: str, value: dict[str, Any], ttl_sec: float | None = None) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl_sec if ttl_sec is None else ttl_sec)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO proof_results (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at),
+                    )
+                    cur = self._db.execute("DELETE FROM proof_results WHERE expires_at <= ?", (now,))
+                    self.expirations += max(cur.rowcount, 0)
+                    # Over the cap: keep the rows that stay valid longest
+                    cur = self._db.execute(
+                        "DELETE FROM proof_results WHERE key IN ("
+                        "SELECT key FROM proof_results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,),
+                    )
+                    self.disk_evictions += max(cur.rowcount, 0)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"[proof_cache] write failed: {e}")
+
+    def _remember(self, key: str, expires_at: float, value: dict[str, Any]) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with ``prefix``; returns the disk rows removed."""
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+            if self._db is None:
+                return 0
+            try:
+                cur = self._db.execute(
+                    "DELETE FROM proof_results WHERE key >= ? AND key < ?", (prefix, prefix + _PREFIX_END)
+                )
+                self._db.commit()
+                return cur.rowcount
+            except sqlite3.Error as e:
+                print(f"[proof_cache] invalidate failed: {e}")
+                return 0
+
+    def purge_expired(self) -> int:
+        """Remove expired rows from both tiers; returns the disk rows removed."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires_at, _) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+                self.expirations += 1
+            if self._db is None:
+                return 0
+            try:
+                cur = self._db.execute("DELETE FROM proof_results WHERE expires_at <= ?", (now,))
+                self._db.commit()
+                return cur.rowcount
+            except sqlite3.Error as e:
+                print(f"[proof_cache] purge failed: {e}")
+                return 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_entries = None
+            if self._db is not None:
+                try:
+                    disk_entries = self._db.execute("SELECT COUNT(*) FROM proof_results").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "max_disk_entries": self.max_disk_entries,
+                "ttl_sec": self.ttl_sec,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "expirations": self.expirations,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_cache: ProofResultCache | None = None
+
+
+def get_proof_result_cache() -> ProofResultCache:
+    """Get or create the proof result cache singleton."""
+    global _cache
+    if _cache is None:
+        _cache = ProofResultCache()
+    return _cache
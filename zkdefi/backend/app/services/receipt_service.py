@@ -8,8 +8,11 @@ import hashlib
 from datetime import datetime
 from typing import Any
 
+from app.services.state_store import get_state_store
 from app.services.zkdefi_agent_service import ZkdefiAgentService
 
+RECEIPTS = "receipts"
+
 
 class ReceiptService:
     """
@@ -19,9 +22,8 @@ class ReceiptService:
     def __init__(self):
         self.agent_service = ZkdefiAgentService()
         
-        # In-memory receipt tracking
-        self._receipts: dict[str, dict] = {}
-        self._user_receipts: dict[str, list[str]] = {}
+        # Receipts shared across workers, indexed by user
+        self._store = get_state_store()
     
     async def create_receipt(
         self,
@@ -56,12 +58,7 @@ class ReceiptService:
             "on_chain": False
         }
         
-        # Store locally
-        self._receipts[receipt_id] = receipt
-        
-        if user_address not in self._user_receipts:
-            self._user_receipts[user_address] = []
-        self._user_receipts[user_address].append(receipt_id)
+        await self._store.put(RECEIPTS, receipt_id, receipt, owner=user_address)
         
         return receipt
     
@@ -73,9 +70,12 @@ class ReceiptService:
         """
         Confirm receipt was submitted on-chain.
         """
-        if receipt_id in self._receipts:
-            self._receipts[receipt_id]["on_chain"] = True
-            self._receipts[receipt_id]["tx_hash"] = tx_hash
+        def _confirm(receipt: dict | None) -> dict | None:
+            if receipt is None:
+                return None
+            return {**receipt, "on_chain": True, "tx_hash": tx_hash}
+        
+        await self._store.update(RECEIPTS, receipt_id, _confirm)
         
         return {
             "receipt_id": receipt_id,
@@ -85,12 +85,11 @@ class ReceiptService:
     
     async def get_receipt(self, receipt_id: str) -> dict[str, Any] | None:
         """Get receipt by ID."""
-        return self._receipts.get(receipt_id)
+        return await self._store.get(RECEIPTS, receipt_id)
     
     async def get_user_receipts(self, user_address: str) -> list[dict[str, Any]]:
         """Get all receipts for a user."""
-        receipt_ids = self._user_receipts.get(user_address, [])
-        return [self._receipts[rid] for rid in receipt_ids if rid in self._receipts]
+        return await self._store.list_by_owner(RECEIPTS, user_address)
     
     async def generate_constraints_hash(
         self,
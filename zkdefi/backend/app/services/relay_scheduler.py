@@ -0,0 +1,279 @@
+"""
+Relay Scheduler
+
+Executes relay requests once their tier delay has passed. Pending requests
+sit in a min-heap keyed by ready_time; the dispatcher sleeps until the
+earliest one is due (or a new request arrives), then pops every ready
+request and submits them as one multicall transaction of up to
+RELAY_BATCH_SIZE ``execute_relay`` calls.
+
+Cancelled requests are not removed from the heap; they are dropped when
+popped (the atomic claim in the state store fails). ``claim_relay`` is the
+only path that marks a request executed -- POST /relayer/execute uses it
+too -- so several workers, each running a dispatcher, and manual
+executions never relay a request twice.
+
+The multicall is signed by the relayer account (RELAYER_ACCOUNT_ADDRESS /
+RELAYER_PRIVATE_KEY). The scheduler is off unless RELAY_SCHEDULER_ENABLED
+is set.
+"""
+import asyncio
+import hashlib
+import heapq
+import os
+import time
+from collections import deque
+from typing import Any
+
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import Call
+from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+from app.services.rpc_clients import get_full_node_client
+from app.services.state_store import get_state_store
+
+STARKNET_RPC_URL = os.getenv("STARKNET_RPC_URL", "https://starknet-sepolia.public.blastapi.io")
+STARKNET_CHAIN_ID = os.getenv("STARKNET_CHAIN_ID", "0x534e5f5345504f4c4941")  # SN_SEPOLIA
+RELAYER_ADDRESS = os.getenv("RELAYER_ADDRESS", "")
+RELAYER_ACCOUNT_ADDRESS = os.getenv("RELAYER_ACCOUNT_ADDRESS", "")
+RELAYER_PRIVATE_KEY = os.getenv("RELAYER_PRIVATE_KEY", "")
+RELAY_SCHEDULER_ENABLED = os.getenv("RELAY_SCHEDULER_ENABLED", "false").lower() in ("1", "true", "yes")
+RELAY_BATCH_SIZE = int(os.getenv("RELAY_BATCH_SIZE", "20"))  # execute_relay calls per multicall
+RELAY_RETRY_DELAY_SEC = int(os.getenv("RELAY_RETRY_DELAY_SEC", "30"))
+
+# Relay requests keyed by request ID (owner = requester), and a nullifier
+# index pointing at the request that spends each nullifier ("released" once
+# that request is cancelled)
+RELAYS = "relay_requests"
+NULLIFIERS = "relay_nullifiers"
+
+LAG_SAMPLES = 1000
+
+
+class RelayClaimError(Exception):
+    """A relay request cannot be claimed; ``status_code`` is the HTTP status to report."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def claim_relay(request_id: int, batch_id: str | None = None) -> dict:
+    """
+    Atomically mark a ready request as executed and return it.
+
+    Raises RelayClaimError if the request is missing, already executed,
+    cancelled, or still inside its tier delay.
+    """
+    def _mark(req: dict | None) -> dict:
+        if req is None:
+            raise RelayClaimError(404, "Request not found")
+        if req["executed"]:
+            raise RelayClaimError(400, "Already executed")
+        if req["cancelled"]:
+            raise RelayClaimError(400, "Request cancelled")
+        if int(time.time()) < req["ready_time"]:
+            raise RelayClaimError(400, f"Delay not passed. Ready at {req['ready_time']}")
+        claimed = {**req, "executed": True, "execution_time": int(time.time())}
+        if batch_id is not None:
+            claimed["batch_id"] = batch_id
+        return claimed
+
+    return await get_state_store().update(RELAYS, str(request_id), _mark)
+
+
+def _felt(value: str) -> int:
+    return int(value, 16) if value.lower().startswith("0x") else int(value)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class RelayScheduler:
+    """
+    Time-ordered dispatcher for ready relay requests.
+    """
+
+    def __init__(self, batch_size: int = RELAY_BATCH_SIZE):
+        self.batch_size = max(1, batch_size)
+        self._store = get_state_store()
+
+        # (ready_time, request_id); _queued avoids pushing a request twice
+        self._heap: list[tuple[int, int]] = []
+        self._queued: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._account: Account | None = None
+
+        # Queue-lag metrics (seconds between ready_time and execution)
+        self._lags: deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._dispatched = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._last_batch_at: float | None = None
+
+    def schedule(self, request_id: int, ready_time: int) -> None:
+        """Queue a request for execution at ``ready_time``."""
+        if not RELAY_SCHEDULER_ENABLED or request_id in self._queued:
+            return
+        heapq.heappush(self._heap, (ready_time, request_id))
+        self._queued.add(request_id)
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """Load pending requests from the store and start dispatching."""
+        if not RELAY_SCHEDULER_ENABLED or (self._task is not None and not self._task.done()):
+            return
+        for req in await self._store.scan(RELAYS):
+            if not req["executed"] and not req["cancelled"]:
+                self.schedule(req["request_id"], req["ready_time"])
+        self._task = asyncio.create_task(self._run())
+        print(f"[relay_scheduler] Started with {len(self._heap)} pending relays")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                # Woken early when a request with an earlier ready_time arrives
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            batch = []
+            while self._heap and self._heap[0][0] <= now and len(batch) < self.batch_size:
+                ready_time, request_id = heapq.heappop(self._heap)
+                self._queued.discard(request_id)
+                batch.append(request_id)
+
+            try:
+                await self._dispatch(batch)
+            except Exception as e:
+                print(f"[relay_scheduler] Batch of {len(batch)} relays failed: {e}")
+
+    async def _claim(self, request_id: int, batch_id: str) -> dict | None:
+        """Claim a request for ``batch_id``; None if it was cancelled or claimed elsewhere."""
+        try:
+            return await claim_relay(request_id, batch_id)
+        except RelayClaimError:
+            return None
+
+    async def _dispatch(self, request_ids: list[int]) -> None:
+        batch_id = "0x" + hashlib.sha256(f"{request_ids}{time.time()}".encode()).hexdigest()[:16]
+        claimed = [req for req in [await self._claim(rid, batch_id) for rid in request_ids] if req]
+        if not claimed:
+            return
+
+        try:
+            calls = [
+                Call(
+                    to_addr=int(RELAYER_ADDRESS, 16),
+                    selector=get_selector_from_name("execute_relay"),
+                    calldata=[req["request_id"], len(req.get("proof_calldata", []))]
+                    + [_felt(v) for v in req.get("proof_calldata", [])],
+                )
+                for req in claimed
+            ]
+            tx_hash = await self._submit_multicall(calls)
+        except Exception:
+            # Release the claims and retry later
+            self._failed_batches += 1
+            for req in claimed:
+                await self._store.update(RELAYS, str(req["request_id"]), self._release(batch_id))
+                self.schedule(req["request_id"], int(time.time()) + RELAY_RETRY_DELAY_SEC)
+            raise
+
+        for req in claimed:
+            await self._store.update(RELAYS, str(req["request_id"]), lambda r: {**r, "tx_hash": tx_hash})
+            self._lags.append(max(0, req["execution_time"] - req["ready_time"]))
+        self._dispatched += len(claimed)
+        self._batches += 1
+        self._last_batch_at = time.time()
+
+    @staticmethod
+    def _release(batch_id: str):
+        def _unmark(req: dict | None) -> dict | None:
+            if req is None or req.get("batch_id") != batch_id:
+                return None
+            released = {**req, "executed": False}
+            released.pop("execution_time", None)
+            released.pop("batch_id", None)
+            return released
+        return _unmark
+
+    def _get_account(self) -> Account:
+        if self._account is None:
+            if not RELAYER_ADDRESS or not RELAYER_ACCOUNT_ADDRESS or not RELAYER_PRIVATE_KEY:
+                raise RuntimeError(
+                    "Relayer not configured: set RELAYER_ADDRESS, RELAYER_ACCOUNT_ADDRESS and RELAYER_PRIVATE_KEY"
+                )
+            self._account = Account(
+                address=int(RELAYER_ACCOUNT_ADDRESS, 16),
+                client=get_full_node_client(STARKNET_RPC_URL),
+                key_pair=KeyPair.from_private_key(int(RELAYER_PRIVATE_KEY, 16)),
+                chain=int(STARKNET_CHAIN_ID, 16),
+            )
+        return self._account
+
+    async def _submit_multicall(self, calls: list[Call]) -> str:
+        """
+        Sign ``calls`` with the relayer account, send them as one invoke
+        transaction and wait for it to be accepted. Returns the transaction
+        hash reported by the node; raises if the invoke is rejected or reverts.
+        """
+        account = self._get_account()
+        invoke = await account.execute_v3(calls=calls, auto_estimate=True)
+        await account.client.wait_for_tx(invoke.transaction_hash)
+        return hex(invoke.transaction_hash)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and queue-lag metrics."""
+        now = time.time()
+        lags = list(self._lags)
+        oldest_ready = self._heap[0][0] if self._heap and self._heap[0][0] <= now else None
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queued": len(self._heap),
+            "next_ready_time": self._heap[0][0] if self._heap else None,
+            "oldest_ready_lag_sec": round(now - oldest_ready, 3) if oldest_ready is not None else 0,
+            "dispatched": self._dispatched,
+            "batches": self._batches,
+            "failed_batches": self._failed_batches,
+            "avg_batch_size": round(self._dispatched / self._batches, 2) if self._batches else 0,
+            "lag_sec": {
+                "avg": round(sum(lags) / len(lags), 3) if lags else 0,
+                "p50": _percentile(lags, 0.5) if lags else 0,
+                "p95": _percentile(lags, 0.95) if lags else 0,
+                "max": max(lags) if lags else 0,
+            },
+            "last_batch_at": self._last_batch_at,
+        }
+
+
+# Singleton instance
+_scheduler: RelayScheduler | None = None
+
+
+def get_relay_scheduler() -> RelayScheduler:
+    """Get or create the relay scheduler singleton."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RelayScheduler()
+    return _scheduler
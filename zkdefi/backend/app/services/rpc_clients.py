@@ -0,0 +1,211 @@
+"""
+Process-wide keep-alive HTTP/RPC clients.
+
+Opening a fresh httpx.AsyncClient or FullNodeClient per call pays a TCP +
+TLS handshake every time. These shared clients keep bounded, persistent
+connection pools per endpoint and are closed from the app lifespan.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+import aiohttp
+import httpx
+from starknet_py.net.full_node_client import FullNodeClient
+
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "20"))
+RPC_KEEPALIVE_SEC = float(os.getenv("RPC_KEEPALIVE_SEC", "60"))
+RPC_TIMEOUT_SEC = float(os.getenv("RPC_TIMEOUT_SEC", "30"))
+READ_CACHE_ENABLED = os.getenv("READ_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+READ_CACHE_HEAD_POLL_SEC = float(os.getenv("READ_CACHE_HEAD_POLL_SEC", "3"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "5000"))
+
+_http_client: httpx.AsyncClient | None = None
+_sessions: dict[str, aiohttp.ClientSession] = {}
+_full_node_clients: dict[str, FullNodeClient] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared httpx client (JSON-RPC POSTs, obsqra.fi prover API). Pass ``timeout=`` per request to override."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=RPC_TIMEOUT_SEC,
+            limits=httpx.Limits(
+                max_connections=RPC_POOL_SIZE * 4,
+                max_keepalive_connections=RPC_POOL_SIZE,
+                keepalive_expiry=RPC_KEEPALIVE_SEC,
+            ),
+        )
+    return _http_client
+
+
+def get_full_node_client(rpc_url: str) -> FullNodeClient:
+    """FullNodeClient for ``rpc_url`` bound to a persistent aiohttp session."""
+    session = _sessions.get(rpc_url)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=RPC_POOL_SIZE,
+                limit_per_host=RPC_POOL_SIZE,
+                keepalive_timeout=RPC_KEEPALIVE_SEC,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT_SEC),
+        )
+        _sessions[rpc_url] = session
+        _full_node_clients.pop(rpc_url, None)
+    client = _full_node_clients.get(rpc_url)
+    if client is None:
+        client = FullNodeClient(node_url=rpc_url, session=session)
+        _full_node_clients[rpc_url] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close every pooled client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    for session in _sessions.values():
+        if not session.closed:
+            await session.close()
+    _sessions.clear()
+    _full_node_clients.clear()
+
+
+_batch_unsupported: set[str] = set()
+
+
+async def post_json_rpc_batch(rpc_url: str, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Send independent JSON-RPC requests in one batch round trip.
+
+    Returns one response object per payload, in input order. Endpoints that
+    reject batch arrays are remembered and served with concurrent single
+    requests (asyncio.gather) instead.
+    """
+    if not payloads:
+        return []
+    payloads = [{**p, "id": i} for i, p in enumerate(payloads)]
+    client = get_http_client()
+    if rpc_url not in _batch_unsupported and len(payloads) > 1:
+        response = await client.post(rpc_url, json=payloads)
+        body = response.json()
+        if isinstance(body, list):
+            by_id = {entry.get("id"): entry for entry in body if isinstance(entry, dict)}
+            if all(p["id"] in by_id for p in payloads):
+                return [by_id[p["id"]] for p in payloads]
+        _batch_unsupported.add(rpc_url)
+
+    async def _single(payload: dict[str, Any]) -> dict[str, Any]:
+        response = await client.post(rpc_url, json=payload)
+        return response.json()
+
+    return list(await asyncio.gather(*(_single(p) for p in payloads)))
+
+
+# --- Block-aware starknet_call cache -------------------------------------
+# View results only change when a block lands. "latest" calls are cached per
+# (rpc_url, contract, selector, calldata) under the head seen by one shared
+# poller and dropped when it advances; explicit {"block_number": n} calls are
+# immutable and stay until LRU eviction. While the head is unknown or stale
+# every call goes to the node.
+
+_head: dict[str, int] = {}
+_head_seen_at: dict[str, float] = {}
+_head_tasks: dict[str, asyncio.Task] = {}
+_read_cache: OrderedDict[tuple, tuple[int | None, dict[str, Any]]] = OrderedDict()
+_read_stats = {"hits": 0, "misses": 0, "bypassed": 0}
+
+
+async def _poll_head(rpc_url: str) -> None:
+    payload = {"jsonrpc": "2.0", "method": "starknet_blockNumber", "params": [], "id": 1}
+    while True:
+        try:
+            response = await get_http_client().post(rpc_url, json=payload)
+            head = int(response.json()["result"])
+            _head_seen_at[rpc_url] = time.monotonic()
+            if head != _head.get(rpc_url):
+                _head[rpc_url] = head
+                for key in [k for k, (block, _) in _read_cache.items() if k[0] == rpc_url and block is not None and block < head]:
+                    del _read_cache[key]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[rpc_clients] head poll failed for {rpc_url}: {e}")
+        await asyncio.sleep(READ_CACHE_HEAD_POLL_SEC)
+
+
+def start_head_poller(rpc_url: str) -> None:
+    """Start (once) the shared head poller for ``rpc_url`` (called from the app lifespan)."""
+    if READ_CACHE_ENABLED and (rpc_url not in _head_tasks or _head_tasks[rpc_url].done()):
+        _head_tasks[rpc_url] = asyncio.get_event_loop().create_task(_poll_head(rpc_url))
+
+
+async def stop_head_pollers() -> None:
+    for task in _head_tasks.values():
+        task.cancel()
+    await asyncio.gather(*_head_tasks.values(), return_exceptions=True)
+    _head_tasks.clear()
+
+
+def _fresh_head(rpc_url: str) -> int | None:
+    if time.monotonic() - _head_seen_at.get(rpc_url, 0.0) > READ_CACHE_HEAD_POLL_SEC * 3:
+        return None
+    return _head.get(rpc_url)
+
+
+async def cached_starknet_call(rpc_url: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    POST one ``starknet_call`` payload, serving repeats from memory until the
+    next block. Error responses are never cached.
+    """
+    params = payload["params"]
+    request = params["request"]
+    block_id = params.get("block_id", "latest")
+    if isinstance(block_id, dict) and "block_number" in block_id:
+        head, pinned = int(block_id["block_number"]), True
+    else:
+        head, pinned = (_fresh_head(rpc_url) if block_id == "latest" else None), False
+    if head is None:
+        _read_stats["bypassed"] += 1
+        response = await get_http_client().post(rpc_url, json=payload)
+        return response.json()
+
+    key = (
+        rpc_url,
+        int(request["contract_address"], 16),
+        int(request["entry_point_selector"], 16),
+        tuple(int(x, 16) for x in request.get("calldata", [])),
+        head if pinned else None,
+    )
+    entry = _read_cache.get(key)
+    if entry is not None and (pinned or entry[0] == head):
+        _read_cache.move_to_end(key)
+        _read_stats["hits"] += 1
+        return entry[1]
+
+    _read_stats["misses"] += 1
+    response = await get_http_client().post(rpc_url, json=payload)
+    result = response.json()
+    if "error" not in result:
+        _read_cache[key] = (None if pinned else head, result)
+        _read_cache.move_to_end(key)
+        while len(_read_cache) > READ_CACHE_MAX_ENTRIES:
+            _read_cache.popitem(last=False)
+    return result
+
+
+def read_cache_stats() -> dict[str, Any]:
+    lookups = _read_stats["hits"] + _read_stats["misses"]
+    return {
+        "heads": dict(_head),
+        "entries": len(_read_cache),
+        "max_entries": READ_CACHE_MAX_ENTRIES,
+        **_read_stats,
+        "hit_rate": round(_read_stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
@@ -12,9 +12,13 @@ from datetime import datetime, timedelta
 from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.contract import Contract
 
+from app.services.state_store import get_state_store
+
 STARKNET_RPC_URL = os.getenv("STARKNET_RPC_URL", "https://starknet-sepolia.public.blastapi.io")
 SESSION_KEY_MANAGER_ADDRESS = os.getenv("SESSION_KEY_MANAGER_ADDRESS", "")
 
+SESSIONS = "session_keys"
+
 
 class SessionKeyService:
     """
@@ -29,8 +33,8 @@ class SessionKeyService:
         self.rpc_url = rpc_url or STARKNET_RPC_URL
         self.manager_address = manager_address or SESSION_KEY_MANAGER_ADDRESS
         
-        # In-memory session tracking (for development)
-        self._sessions: dict[str, dict] = {}
+        # Session tracking shared across workers, indexed by owner
+        self._store = get_state_store()
     
     async def generate_session_request(
         self,
@@ -69,8 +73,9 @@ class SessionKeyService:
             "duration_seconds": duration_seconds
         }
         
-        # Store session locally (for development tracking)
-        self._sessions[session_id] = {
+        # Store session (for development tracking)
+        await self._store.put(SESSIONS, session_id, {
+            "session_id": session_id,
             "owner": owner_address,
             "session_key": session_key_address,
             "max_position": max_position,
@@ -82,7 +87,7 @@ class SessionKeyService:
             "expires_at": (datetime.utcnow() + timedelta(hours=duration_hours)).isoformat(),
             "is_active": True,
             "pending_grant": True  # Not yet on-chain
-        }
+        }, owner=owner_address)
         
         return {
             "session_id": session_id,
@@ -106,9 +111,12 @@ class SessionKeyService:
         """
         Confirm that a session was granted on-chain.
         """
-        if session_id in self._sessions:
-            self._sessions[session_id]["pending_grant"] = False
-            self._sessions[session_id]["tx_hash"] = tx_hash
+        def _confirm(session: dict | None) -> dict | None:
+            if session is None:
+                return None
+            return {**session, "pending_grant": False, "tx_hash": tx_hash}
+        
+        await self._store.update(SESSIONS, session_id, _confirm)
         
         return {
             "session_id": session_id,
@@ -124,13 +132,17 @@ class SessionKeyService:
         """
         Generate revocation calldata.
         """
-        # Verify ownership
-        if session_id in self._sessions:
-            if self._sessions[session_id]["owner"] != owner_address:
+        def _revoke(session: dict | None) -> dict | None:
+            if session is None:
+                return None
+            # Verify ownership
+            if session["owner"] != owner_address:
                 raise ValueError("Not session owner")
             
             # Mark as pending revocation
-            self._sessions[session_id]["pending_revoke"] = True
+            return {**session, "pending_revoke": True}
+        
+        await self._store.update(SESSIONS, session_id, _revoke)
         
         return {
             "session_id": session_id,
@@ -149,10 +161,12 @@ class SessionKeyService:
         """
         Confirm that a session was revoked on-chain.
         """
-        if session_id in self._sessions:
-            self._sessions[session_id]["is_active"] = False
-            self._sessions[session_id]["pending_revoke"] = False
-            self._sessions[session_id]["revoke_tx_hash"] = tx_hash
+        def _revoked(session: dict | None) -> dict | None:
+            if session is None:
+                return None
+            return {**session, "is_active": False, "pending_revoke": False, "revoke_tx_hash": tx_hash}
+        
+        await self._store.update(SESSIONS, session_id, _revoked)
         
         return {
             "session_id": session_id,
@@ -168,25 +182,24 @@ class SessionKeyService:
         List all sessions for a user.
         """
         sessions = []
-        for session_id, session in self._sessions.items():
-            if session["owner"] == owner_address:
-                # Check if expired
-                expires_at = datetime.fromisoformat(session["expires_at"])
-                is_expired = datetime.utcnow() > expires_at
-                
-                sessions.append({
-                    "session_id": session_id,
-                    "session_key": session["session_key"],
-                    "max_position": session["max_position"],
-                    "allowed_protocols": session["allowed_protocols"],
-                    "duration_hours": session["duration_hours"],
-                    "created_at": session["created_at"],
-                    "expires_at": session["expires_at"],
-                    "is_active": session["is_active"] and not is_expired,
-                    "is_expired": is_expired,
-                    "pending_grant": session.get("pending_grant", False),
-                    "pending_revoke": session.get("pending_revoke", False)
-                })
+        for session in await self._store.list_by_owner(SESSIONS, owner_address):
+            # Check if expired
+            expires_at = datetime.fromisoformat(session["expires_at"])
+            is_expired = datetime.utcnow() > expires_at
+            
+            sessions.append({
+                "session_id": session["session_id"],
+                "session_key": session["session_key"],
+                "max_position": session["max_position"],
+                "allowed_protocols": session["allowed_protocols"],
+                "duration_hours": session["duration_hours"],
+                "created_at": session["created_at"],
+                "expires_at": session["expires_at"],
+                "is_active": session["is_active"] and not is_expired,
+                "is_expired": is_expired,
+                "pending_grant": session.get("pending_grant", False),
+                "pending_revoke": session.get("pending_revoke", False)
+            })
         
         return sessions
     
@@ -199,14 +212,13 @@ class SessionKeyService:
         """
         Validate if an action is allowed under a session.
         """
-        if session_id not in self._sessions:
+        session = await self._store.get(SESSIONS, session_id)
+        if session is None:
             return {
                 "is_valid": False,
                 "reason": "Session not found"
             }
         
-        session = self._sessions[session_id]
-        
         # Check if active
         if not session["is_active"]:
             return {
@@ -0,0 +1,381 @@
+"""
+Pool of long-running Node Groth16 provers, one pool per circuit.
+
+Each proof used to spawn ``node generate_witness.js`` and then
+``npx snarkjs groth16 prove``, reloading the circuit WASM and the large
+``*_final.zkey`` from disk (plus npx resolution) every time. A daemon
+(``circuits/prover_daemon.js``) keeps the witness calculator and zkey
+resident and takes JSON jobs over a pipe, so a proof costs only witness
+generation and the MSMs.
+
+SNARK_DAEMON_WORKERS daemons are started lazily per circuit (each holds its
+zkey in memory). A daemon that errors at the protocol level, dies or times
+out is killed and replaced on the next job.
+
+Async callers go through ``prove_async`` / ``run_proof_job``: the blocking
+work runs on a bounded thread executor, at most as many jobs per circuit as
+it has daemons (capping resident zkey memory), with up to SNARK_MAX_QUEUED
+more waiting. Beyond that ``ProverBusyError`` is raised immediately so the
+API can answer 429 instead of stalling the event loop. Low-priority
+(speculative) jobs wait behind every interactive one.
+"""
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from .pipe_reader import PipeLineReader
+
+# Circuit paths - go from services/ -> app/ -> backend/ -> zkdefi (project root)
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+CIRCUITS_DIR = PROJECT_ROOT / "circuits" / "build"
+DAEMON_SCRIPT = PROJECT_ROOT / "circuits" / "prover_daemon.js"
+
+SNARK_DAEMON_NODE = os.getenv("SNARK_DAEMON_NODE", "node")
+SNARK_DAEMON_WORKERS = int(os.getenv("SNARK_DAEMON_WORKERS", "1"))  # per circuit; SNARK_DAEMON_WORKERS_<CIRCUIT> overrides
+SNARK_MAX_QUEUED = int(os.getenv("SNARK_MAX_QUEUED", "8"))  # per circuit, beyond the running jobs
+SNARK_DAEMON_START_TIMEOUT_SEC = float(os.getenv("SNARK_DAEMON_START_TIMEOUT_SEC", "120"))
+SNARK_PROVE_TIMEOUT_SEC = float(os.getenv("SNARK_PROVE_TIMEOUT_SEC", "120"))
+
+# circuit name -> (circom output dir, zkey); the wasm/witness calculator live in <name>_js/
+CIRCUITS: dict[str, Path] = {
+    "PrivateDeposit": CIRCUITS_DIR / "PrivateDeposit_final.zkey",
+    "PrivateWithdraw": CIRCUITS_DIR / "PrivateWithdraw_final.zkey",
+    "RiskScore": CIRCUITS_DIR / "RiskScore_final.zkey",
+    "AnomalyDetector": CIRCUITS_DIR / "AnomalyDetector_final.zkey",
+}
+
+
+def circuit_workers(circuit: str) -> int:
+    """Daemons (= concurrent proofs) allowed for ``circuit``."""
+    return max(1, int(os.getenv(f"SNARK_DAEMON_WORKERS_{circuit.upper()}", SNARK_DAEMON_WORKERS)))
+
+
+class ProverDaemonError(Exception):
+    """The prover daemon could not be started or stopped answering."""
+
+
+class SnarkjsError(Exception):
+    """snarkjs rejected this job's input (witness or prove failed); the daemon is still healthy."""
+
+
+class ProverBusyError(Exception):
+    """The circuit's proving queue is full; retry later."""
+
+    def __init__(self, circuit: str, queued: int):
+        super().__init__(f"{circuit} prover busy ({queued} proofs queued); retry later")
+        self.circuit = circuit
+        self.queued = queued
+
+
+class ProverDaemon:
+    """One ``prover_daemon.js`` process with its circuit loaded."""
+
+    def __init__(self, circuit: str, zkey: Path):
+        js_dir = CIRCUITS_DIR / f"{circuit}_js"
+        cmd = [
+            SNARK_DAEMON_NODE,
+            str(DAEMON_SCRIPT),
+            str(js_dir / "witness_calculator.js"),
+            str(js_dir / f"{circuit}.wasm"),
+            str(zkey),
+        ]
+        try:
+            self.proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            raise ProverDaemonError(f"Could not start {circuit} prover daemon: {e}")
+        self.circuit = circuit
+        self._next_id = 0
+        self._stdout = PipeLineReader(self.proc.stdout, name=f"{circuit}-prover-stdout")
+        ready = self._read(SNARK_DAEMON_START_TIMEOUT_SEC)
+        if not ready.get("ready"):
+            self.kill()
+            raise ProverDaemonError(f"{circuit} prover daemon failed to load: {ready}")
+
+    def _read(self, timeout: float) -> dict[str, Any]:
+        line = self._stdout.readline(timeout)
+        if not line:
+            self.kill()
+            raise ProverDaemonError(f"{self.circuit} prover daemon gave no response within {timeout}s")
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            self.kill()
+            raise ProverDaemonError(f"{self.circuit} prover daemon sent an unreadable response: {line[:200]!r}")
+
+    def prove(self, witness_input: dict, timeout: float = SNARK_PROVE_TIMEOUT_SEC) -> dict[str, Any]:
+        self._next_id += 1
+        try:
+            self.proc.stdin.write(json.dumps({"id": self._next_id, "input": witness_input}) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise ProverDaemonError(f"{self.circuit} prover daemon is gone: {e}")
+        response = self._read(timeout)
+        if response.get("id") != self._next_id:
+            self.kill()
+            raise ProverDaemonError(f"{self.circuit} prover daemon response out of sequence")
+        if "error" in response:
+            # Bad input for this job only; the daemon itself is still healthy
+            raise SnarkjsError(f"snarkjs error: {response['error']}")
+        return {"proof": response["proof"], "public_signals": response["public"]}
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def kill(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+
+    def close(self) -> None:
+        if self.alive:
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.kill()
+
+
+class CircuitProverPool:
+    """Up to ``size`` warm daemons for one circuit; ``prove`` blocks until one is free."""
+
+    def __init__(self, circuit: str, zkey: Path, size: int):
+        self.circuit = circuit
+        self.zkey = zkey
+        self.size = max(1, size)
+        self._idle: queue.Queue[ProverDaemon | None] = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(None)  # slot without a started daemon yet
+        self._all: list[ProverDaemon] = []
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> ProverDaemon:
+        daemon = ProverDaemon(self.circuit, self.zkey)
+        with self._lock:
+            self._all = [d for d in self._all if d.alive] + [daemon]
+        return daemon
+
+    def prove(self, witness_input: dict) -> dict[str, Any]:
+        """Returns {"proof": ..., "public_signals": [...]} like a snarkjs prove run."""
+        daemon = self._idle.get()
+        try:
+            if daemon is None or not daemon.alive:
+                daemon = self._spawn()
+            return daemon.prove(witness_input)
+        except ProverDaemonError:
+            daemon = None
+            raise
+        finally:
+            self._idle.put(daemon if daemon is not None and daemon.alive else None)
+
+    def warm(self) -> None:
+        """Start one daemon so the first proof does not pay for loading the zkey."""
+        daemon = self._idle.get()
+        try:
+            if daemon is None or not daemon.alive:
+                daemon = self._spawn()
+        finally:
+            self._idle.put(daemon if daemon is not None and daemon.alive else None)
+
+    def close(self) -> None:
+        with self._lock:
+            for daemon in self._all:
+                daemon.close()
+            self._all = []
+
+
+_pools: dict[str, CircuitProverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def circuit_ready(circuit: str) -> bool:
+    zkey = CIRCUITS[circuit]
+    js_dir = CIRCUITS_DIR / f"{circuit}_js"
+    return zkey.exists() and (js_dir / f"{circuit}.wasm").exists() and (js_dir / "witness_calculator.js").exists()
+
+
+def get_prover_pool(circuit: str) -> CircuitProverPool:
+    with _pools_lock:
+        pool = _pools.get(circuit)
+        if pool is None:
+            pool = _pools[circuit] = CircuitProverPool(circuit, CIRCUITS[circuit], circuit_workers(circuit))
+        return pool
+
+
+def prove(circuit: str, witness_input: dict) -> dict[str, Any]:
+    """Groth16-prove ``witness_input`` on a warm daemon for ``circuit`` (blocking)."""
+    return get_prover_pool(circuit).prove(witness_input)
+
+
+def warm_pools() -> None:
+    """Start a daemon for every built circuit. Never raises."""
+    for circuit in CIRCUITS:
+        if not circuit_ready(circuit):
+            continue
+        try:
+            get_prover_pool(circuit).warm()
+        except Exception as e:
+            print(f"[snark_prover_pool] {circuit} daemon not warmed: {e}")
+
+
+def close_pools() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+class CircuitLimiter:
+    """
+    Per-circuit admission control in front of the executor.
+
+    Free slots go to waiting interactive jobs first; low-priority (speculative)
+    jobs only get a slot nobody else is waiting for.
+    """
+
+    def __init__(self, circuit: str, limit: int, max_queued: int):
+        self.circuit = circuit
+        self.limit = limit
+        self.max_queued = max_queued
+        self._free = limit
+        self._waiters: deque[asyncio.Future] = deque()
+        self._low_waiters: deque[asyncio.Future] = deque()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters) + len(self._low_waiters)
+
+    async def _acquire(self, low_priority: bool) -> None:
+        if self._free > 0 and not self._waiters and not (low_priority and self._low_waiters):
+            self._free -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._low_waiters if low_priority else self._waiters
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self._release()  # the slot was already handed to us
+            raise
+
+    def _release(self) -> None:
+        for waiters in (self._waiters, self._low_waiters):
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)  # hand the slot over directly
+                    return
+        self._free += 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, low_priority: bool = False) -> Any:
+        # Interactive jobs only queue behind other interactive jobs
+        waiting = self.queued if low_priority else len(self._waiters)
+        if self.running >= self.limit and waiting >= self.max_queued:
+            self.rejected += 1
+            raise ProverBusyError(self.circuit, self.queued)
+        await self._acquire(low_priority)
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        try:
+            job = _get_executor().submit(fn, *args)
+        except BaseException:
+            self.running -= 1
+            self._release()
+            raise
+        # The slot follows the executor thread, not the awaiting task: a cancelled
+        # caller must not hand its slot on while its proof is still running.
+        job.add_done_callback(lambda done: self._finish_threadsafe(loop, done))
+        return await asyncio.wrap_future(job)
+
+    def _finish_threadsafe(self, loop: asyncio.AbstractEventLoop, job: Future) -> None:
+        try:
+            loop.call_soon_threadsafe(self._finish, job)
+        except RuntimeError:
+            pass  # loop already closed (shutdown)
+
+    def _finish(self, job: Future) -> None:
+        self.running -= 1
+        if not job.cancelled():
+            if job.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "running": self.running,
+            "queued": len(self._waiters),
+            "queued_low_priority": len(self._low_waiters),
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+_executor: ThreadPoolExecutor | None = None
+_limiters: dict[str, CircuitLimiter] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=sum(circuit_workers(c) for c in CIRCUITS),
+            thread_name_prefix="groth16",
+        )
+    return _executor
+
+
+def _get_limiter(circuit: str) -> CircuitLimiter:
+    limiter = _limiters.get(circuit)
+    if limiter is None:
+        limiter = _limiters[circuit] = CircuitLimiter(circuit, circuit_workers(circuit), SNARK_MAX_QUEUED)
+    return limiter
+
+
+async def run_proof_job(circuit: str, fn: Callable[..., Any], *args: Any, low_priority: bool = False) -> Any:
+    """
+    Run blocking proving work ``fn(*args)`` for ``circuit`` off the event loop,
+    within the circuit's concurrency limit. Raises ProverBusyError when full.
+    ``low_priority`` jobs yield every free slot to waiting interactive jobs.
+    """
+    return await _get_limiter(circuit).run(fn, *args, low_priority=low_priority)
+
+
+async def prove_async(circuit: str, witness_input: dict, low_priority: bool = False) -> dict[str, Any]:
+    """Non-blocking ``prove``: bounded per circuit, fast ProverBusyError when saturated."""
+    return await run_proof_job(circuit, prove, circuit, witness_input, low_priority=low_priority)
+
+
+def queue_stats() -> dict[str, Any]:
+    """Per-circuit running/queued/rejected counts for the proving executor."""
+    return {circuit: _get_limiter(circuit).stats() for circuit in CIRCUITS}
@@ -4,15 +4,20 @@ Hybrid approach:
 - obsqra.fi proving API for execution proofs (proof-gated deposits/withdrawals)
 - Groth16 (snarkjs) for privacy proofs (private deposits/withdrawals)
 """
+import asyncio
 import os
 from typing import Any
 
-import httpx
-from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.models import StarknetChainId
 from starknet_py.contract import Contract
 
 from app.services.groth16_prover import Groth16Prover
+from app.services.rpc_clients import (
+    cached_starknet_call,
+    get_full_node_client,
+    get_http_client,
+    post_json_rpc_batch,
+)
 
 OBSQRA_PROVER_API_URL = os.getenv("OBSQRA_PROVER_API_URL", "https://starknet.obsqra.fi/api/v1")
 OBSQRA_API_KEY = os.getenv("OBSQRA_API_KEY", "")
@@ -52,10 +57,9 @@ class ZkdefiAgentService:
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(url, json=data, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().post(url, json=data, headers=headers, timeout=300.0)
+        response.raise_for_status()
+        return response.json()
 
     async def deposit_with_constraints(
         self,
@@ -78,7 +82,7 @@ class ZkdefiAgentService:
         # Call obsqra.fi Stone prover to generate STARK proof
         # This registers the proof with Integrity and returns fact_hash
         try:
-            proof_result = await self._call_prover_api("proofs/generate", {
+            proof_result = await self._call_prover_api("proofs/generate?wait=true", {
                 "jediswap_metrics": {
                     "utilization": 7000,
                     "volatility": 3000,
@@ -145,7 +149,7 @@ class ZkdefiAgentService:
         
         # Call obsqra.fi Stone prover to generate STARK proof for withdrawal
         try:
-            proof_result = await self._call_prover_api("proofs/generate", {
+            proof_result = await self._call_prover_api("proofs/generate?wait=true", {
                 "jediswap_metrics": {
                     "utilization": 7000,
                     "volatility": 3000,
@@ -215,6 +219,50 @@ class ZkdefiAgentService:
             "result": result,
         }
 
+    def _position_payload(self, user_address: str, protocol_id: int) -> dict[str, Any]:
+        """starknet_call payload for ProofGatedYieldAgent.get_position(user, protocol_id)."""
+        pid = protocol_id if 0 <= protocol_id <= 255 else 0
+        user_int = int(user_address, 16)
+        contract_int = int(self.agent_address, 16)
+        
+        # get_position selector (starknet.get_selector_from_name("get_position"))
+        selector = 0x3b3d893679cec4ffbfdc6a8c56ac55b38ce6cc583d9341af90e623172da5570
+        
+        return {
+            "jsonrpc": "2.0",
+            "method": "starknet_call",
+            "params": {
+                "request": {
+                    "contract_address": hex(contract_int),
+                    "entry_point_selector": hex(selector),
+                    "calldata": [hex(user_int), hex(pid)]
+                },
+                "block_id": "latest"
+            },
+            "id": 1
+        }
+
+    def _parse_position(self, result: dict[str, Any], user_address: str, protocol_id: int) -> dict[str, Any]:
+        if "error" in result:
+            return {"position": "0", "error": result["error"].get("message", str(result["error"]))}
+        
+        # Parse u256 result (low, high)
+        data = result.get("result", [])
+        if len(data) >= 2:
+            low = int(data[0], 16) if isinstance(data[0], str) else int(data[0])
+            high = int(data[1], 16) if isinstance(data[1], str) else int(data[1])
+            position_value = low + (high << 128)
+        elif len(data) == 1:
+            position_value = int(data[0], 16) if isinstance(data[0], str) else int(data[0])
+        else:
+            position_value = 0
+        
+        return {
+            "user_address": user_address,
+            "protocol_id": protocol_id,
+            "position": str(position_value),
+        }
+
     async def get_user_position(self, user_address: str, protocol_id: int = 0) -> dict[str, Any]:
         """
         Query on-chain position for user and protocol via ProofGatedYieldAgent.
@@ -223,54 +271,28 @@ class ZkdefiAgentService:
         if not self.agent_address:
             return {"position": "0", "error": "PROOF_GATED_AGENT_ADDRESS not set"}
         try:
-            # Use direct RPC call to avoid starknet-py version incompatibility
-            pid = protocol_id if 0 <= protocol_id <= 255 else 0
-            user_int = int(user_address, 16)
-            contract_int = int(self.agent_address, 16)
-            
-            # get_position selector (starknet.get_selector_from_name("get_position"))
-            selector = 0x3b3d893679cec4ffbfdc6a8c56ac55b38ce6cc583d9341af90e623172da5570
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "starknet_call",
-                "params": {
-                    "request": {
-                        "contract_address": hex(contract_int),
-                        "entry_point_selector": hex(selector),
-                        "calldata": [hex(user_int), hex(pid)]
-                    },
-                    "block_id": "latest"
-                },
-                "id": 1
-            }
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.rpc_url, json=payload)
-                result = response.json()
-            
-            if "error" in result:
-                return {"position": "0", "error": result["error"].get("message", str(result["error"]))}
-            
-            # Parse u256 result (low, high)
-            data = result.get("result", [])
-            if len(data) >= 2:
-                low = int(data[0], 16) if isinstance(data[0], str) else int(data[0])
-                high = int(data[1], 16) if isinstance(data[1], str) else int(data[1])
-                position_value = low + (high << 128)
-            elif len(data) == 1:
-                position_value = int(data[0], 16) if isinstance(data[0], str) else int(data[0])
-            else:
-                position_value = 0
-            
-            return {
-                "user_address": user_address,
-                "protocol_id": protocol_id,
-                "position": str(position_value),
-            }
+            payload = self._position_payload(user_address, protocol_id)
+            result = await cached_starknet_call(self.rpc_url, payload)
+            return self._parse_position(result, user_address, protocol_id)
         except Exception as e:
             return {"position": "0", "error": str(e)}
 
+    async def get_user_positions(self, user_address: str, protocol_ids: list[int]) -> list[dict[str, Any]]:
+        """Query several protocol positions in one JSON-RPC batch round trip."""
+        if not self.agent_address:
+            return [{"position": "0", "error": "PROOF_GATED_AGENT_ADDRESS not set"} for _ in protocol_ids]
+        try:
+            responses = await post_json_rpc_batch(
+                self.rpc_url,
+                [self._position_payload(user_address, pid) for pid in protocol_ids],
+            )
+            return [
+                self._parse_position(result, user_address, pid)
+                for pid, result in zip(protocol_ids, responses)
+            ]
+        except Exception as e:
+            return [{"position": "0", "error": str(e)} for _ in protocol_ids]
+
     def _u256_to_int(self, val: Any) -> int:
         """Normalize Cairo u256 (low/high or single int) to Python int."""
         if val is None:
@@ -308,9 +330,8 @@ class ZkdefiAgentService:
                 "id": 1
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.rpc_url, json=payload)
-                result = response.json()
+            # Constraints change rarely; repeat reads are served from memory until the next block
+            result = await cached_starknet_call(self.rpc_url, payload)
             
             if "error" in result:
                 return {"max_position": 0, "max_daily_yield_bps": 0, "min_withdraw_delay_seconds": 0, 
@@ -378,7 +399,7 @@ class ZkdefiAgentService:
         if not self.confidential_transfer_address:
             return []
         try:
-            client = FullNodeClient(node_url=self.rpc_url)
+            client = get_full_node_client(self.rpc_url)
             contract = await Contract.from_address(
                 address=int(self.confidential_transfer_address, 16),
                 provider=client,
@@ -552,25 +573,26 @@ class ZkdefiAgentService:
         public_positions_count = 0
         private_commitments_count = 0
         
-        # Query public positions from ProofGatedYieldAgent
-        for protocol_id in range(3):  # pools, ekubo, jediswap
-            try:
-                position = await self.get_user_position(user_address, protocol_id)
-                pos_value = int(position.get("position", "0"))
+        # Public positions (pools, ekubo, jediswap) in one batch, concurrently with private commitments
+        positions, commitments = await asyncio.gather(
+            self.get_user_positions(user_address, [0, 1, 2]),
+            self.get_user_commitments(user_address),
+            return_exceptions=True,
+        )
+        if not isinstance(positions, BaseException):
+            for position in positions:
+                try:
+                    pos_value = int(position.get("position", "0"))
+                except (TypeError, ValueError):
+                    continue
                 if pos_value > 0:
                     total_value += pos_value
                     public_positions_count += 1
-            except:
-                pass
         
-        # Query private commitments
-        try:
-            commitments = await self.get_user_commitments(user_address)
+        if not isinstance(commitments, BaseException):
             for c in commitments:
                 total_value += int(c.get("balance", "0"))
                 private_commitments_count += 1
-        except:
-            pass
         
         return {
             "user_address": user_address,
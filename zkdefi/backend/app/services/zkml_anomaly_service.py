@@ -6,20 +6,20 @@ Proves anomaly_flag == 0 (safe) WITHOUT revealing analysis details.
 
 Uses Groth16 (snarkjs) → Garaga-compatible proof format.
 """
-import json
 import os
-import subprocess
-import tempfile
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from .snark_prover_pool import prove_async
+
 # Circuit paths
 # Circuit paths - go from services/ -> app/ -> backend/ -> zkdefi (project root)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 CIRCUITS_DIR = PROJECT_ROOT / "circuits" / "build"
 ANOMALY_WASM = CIRCUITS_DIR / "AnomalyDetector_js" / "AnomalyDetector.wasm"
 ANOMALY_ZKEY = CIRCUITS_DIR / "AnomalyDetector_final.zkey"
-ANOMALY_WITNESS_GEN = CIRCUITS_DIR / "AnomalyDetector_js" / "generate_witness.js"
 
 
 class AnomalyDetectionModel:
@@ -95,6 +95,45 @@ class AnomalyDetectionModel:
         is_safe = total_penalty < max_anomaly_score
         return is_safe, total_penalty
     
+    @classmethod
+    def analyze_pools(
+        cls,
+        risk_factors: "np.ndarray | list[list[int]]",
+        weights: list[int] | None = None,
+        thresholds: list[int] | None = None,
+        max_anomaly_score: int = 30
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Batch ``analyze_pool`` over an (N x 6) integer matrix whose columns
+        follow the ``analyze_pool`` argument order.
+        Returns (is_safe bool array, anomaly_score int array).
+        """
+        if weights is None:
+            weights = cls.DEFAULT_WEIGHTS
+        if thresholds is None:
+            thresholds = cls.DEFAULT_THRESHOLDS
+        
+        factors = np.asarray(risk_factors)
+        if factors.ndim == 1 and factors.size == 0:
+            factors = factors.reshape(0, len(thresholds)).astype(np.int64)
+        if factors.ndim != 2 or factors.shape[1] != len(thresholds):
+            raise ValueError(f"Expected an (N x {len(thresholds)}) matrix")
+        if factors.dtype.kind not in "iub" and factors.dtype != object:
+            raise ValueError(f"Risk factors must be integers, got {factors.dtype}")
+        
+        if factors.dtype == np.uint64 or factors.dtype == object:
+            factors = factors.astype(object)
+            limits = np.asarray(thresholds, dtype=object)
+        else:
+            factors = factors.astype(np.int64)
+            limits = np.asarray(thresholds, dtype=np.int64)
+        # deployer_age_days (column 3): lower is riskier
+        tripped = factors > limits
+        tripped[:, 3] = factors[:, 3] < limits[3]
+        
+        penalties = tripped.astype(np.int64) @ np.asarray(weights, dtype=np.int64)
+        return penalties < max_anomaly_score, penalties
+    
     @classmethod
     def generate_witness_input(
         cls,
@@ -165,7 +204,8 @@ class ZkmlAnomalyService:
         deployer_age_days: int | None = None,
         volume_anomaly: int | None = None,
         contract_risk_score: int | None = None,
-        commitment_hash: str | None = None
+        commitment_hash: str | None = None,
+        low_priority: bool = False
     ) -> dict[str, Any]:
         """
         Analyze pool safety and generate proof.
@@ -213,7 +253,7 @@ class ZkmlAnomalyService:
         )
         
         # Generate proof using snarkjs
-        proof_data = await self._generate_groth16_proof(witness_input)
+        proof_data = await self._generate_groth16_proof(witness_input, low_priority=low_priority)
         
         # Format for Garaga
         proof_calldata = self._format_for_garaga(proof_data)
@@ -293,48 +333,12 @@ class ZkmlAnomalyService:
             "simulated": True
         }
     
-    async def _generate_groth16_proof(self, witness_input: dict) -> dict[str, Any]:
+    async def _generate_groth16_proof(self, witness_input: dict, low_priority: bool = False) -> dict[str, Any]:
         """
-        Generate Groth16 proof using snarkjs.
+        Generate Groth16 proof on a warm snarkjs daemon (WASM and zkey stay loaded),
+        off the event loop. Raises ProverBusyError when the circuit's queue is full.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.json"
-            witness_path = Path(tmpdir) / "witness.wtns"
-            proof_path = Path(tmpdir) / "proof.json"
-            public_path = Path(tmpdir) / "public.json"
-            
-            # Write input
-            with open(input_path, "w") as f:
-                json.dump(witness_input, f)
-            
-            # Generate witness
-            witness_gen = ANOMALY_WITNESS_GEN
-            subprocess.run([
-                "node", str(witness_gen),
-                str(ANOMALY_WASM),
-                str(input_path),
-                str(witness_path)
-            ], check=True, capture_output=True)
-            
-            # Generate proof
-            subprocess.run([
-                "snarkjs", "groth16", "prove",
-                str(ANOMALY_ZKEY),
-                str(witness_path),
-                str(proof_path),
-                str(public_path)
-            ], check=True, capture_output=True)
-            
-            # Read proof
-            with open(proof_path) as f:
-                proof = json.load(f)
-            with open(public_path) as f:
-                public_signals = json.load(f)
-            
-            return {
-                "proof": proof,
-                "public_signals": public_signals
-            }
+        return await prove_async("AnomalyDetector", witness_input, low_priority=low_priority)
     
     def _format_for_garaga(self, proof_data: dict) -> list[str]:
         """
@@ -6,19 +6,21 @@ Proves risk_score <= threshold WITHOUT revealing the actual score.
 
 Uses Groth16 (snarkjs) → Garaga-compatible proof format.
 """
-import json
+import asyncio
+import hashlib
 import os
-import subprocess
-import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
+
+import numpy as np
+
+from .snark_prover_pool import circuit_workers, prove_async
 
 # Circuit paths - go from services/ -> app/ -> backend/ -> zkdefi (project root)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 CIRCUITS_DIR = PROJECT_ROOT / "circuits" / "build"
 RISK_WASM = CIRCUITS_DIR / "RiskScore_js" / "RiskScore.wasm"
 RISK_ZKEY = CIRCUITS_DIR / "RiskScore_final.zkey"
-RISK_WITNESS_GEN = CIRCUITS_DIR / "RiskScore_js" / "generate_witness.js"
 
 
 class RiskScoreModel:
@@ -73,6 +75,37 @@ class RiskScoreModel:
         
         return max(0, min(scale, score))
     
+    @classmethod
+    def compute_risk_scores(
+        cls,
+        portfolio_features: "np.ndarray | list[list[int]]",
+        weights: list[int] | None = None,
+        bias: int = 0,
+        scale: int = 100
+    ) -> np.ndarray:
+        """
+        Batch ``compute_risk_score`` over an (N x features) integer matrix.
+        Returns N scores, identical to the scalar version row by row.
+        """
+        if weights is None:
+            weights = cls.DEFAULT_WEIGHTS
+        
+        features = _as_int_matrix(portfolio_features, len(weights), scale, weights, bias)
+        if features.shape[1] != len(weights):
+            raise ValueError(f"Expected {len(weights)} features, got {features.shape[1]}")
+        
+        w = np.asarray(weights, dtype=features.dtype)
+        weighted_sum = features @ w + bias
+        
+        # Normalize to scale (floor division, like the scalar model)
+        max_possible = sum(100 * abs(w) for w in weights) + abs(bias)
+        if max_possible > 0:
+            scores = (weighted_sum * scale) // max_possible
+        else:
+            scores = np.zeros(features.shape[0], dtype=features.dtype)
+        
+        return np.clip(scores, 0, scale).astype(np.int64)
+    
     @classmethod
     def generate_witness_input(
         cls,
@@ -82,15 +115,18 @@ class RiskScoreModel:
         commitment_hash: str,
         weights: list[int] | None = None,
         bias: int = 0,
-        scale: int = 100
+        scale: int = 100,
+        actual_score: int | None = None
     ) -> dict[str, Any]:
         """
         Generate witness input for the RiskScore circuit.
+        Pass ``actual_score`` when it was already computed (e.g. in a batch).
         """
         if weights is None:
             weights = cls.DEFAULT_WEIGHTS
         
-        actual_score = cls.compute_risk_score(portfolio_features, weights, bias, scale)
+        if actual_score is None:
+            actual_score = cls.compute_risk_score(portfolio_features, weights, bias, scale)
         
         return {
             "portfolio_features": [str(f) for f in portfolio_features],
@@ -104,6 +140,32 @@ class RiskScoreModel:
         }
 
 
+def _as_int_matrix(
+    rows: "np.ndarray | list[list[int]]",
+    n_features: int,
+    scale: int,
+    weights: list[int],
+    bias: int
+) -> np.ndarray:
+    """
+    2-D integer matrix for batch scoring. Falls back to Python ints (object
+    dtype) when ``sum(feature * weight) * scale`` could overflow int64, so
+    results never diverge from the scalar arithmetic.
+    """
+    matrix = np.asarray(rows)
+    if matrix.ndim == 1 and matrix.size == 0:
+        matrix = matrix.reshape(0, n_features).astype(np.int64)
+    if matrix.ndim != 2:
+        raise ValueError("Expected an (N x features) matrix")
+    if matrix.dtype.kind not in "iub" and matrix.dtype != object:
+        raise ValueError(f"Features must be integers, got {matrix.dtype}")
+    largest = max(abs(int(matrix.max())), abs(int(matrix.min()))) if matrix.size else 0
+    bound = (largest * sum(abs(w) for w in weights) + abs(bias)) * max(1, abs(scale))
+    if bound >= 2**62:
+        return matrix.astype(object)
+    return matrix.astype(np.int64)
+
+
 class ZkmlRiskService:
     """
     Service for generating privacy-preserving risk score proofs.
@@ -122,7 +184,8 @@ class ZkmlRiskService:
         user_address: str,
         portfolio_features: list[int],
         threshold: int,
-        commitment_hash: str | None = None
+        commitment_hash: str | None = None,
+        low_priority: bool = False
     ) -> dict[str, Any]:
         """
         Generate Groth16 proof that risk_score <= threshold.
@@ -160,7 +223,7 @@ class ZkmlRiskService:
         )
         
         # Generate proof using snarkjs
-        proof_data = await self._generate_groth16_proof(witness_input)
+        proof_data = await self._generate_groth16_proof(witness_input, low_priority=low_priority)
         
         # Format for Garaga
         proof_calldata = self._format_for_garaga(proof_data)
@@ -174,6 +237,90 @@ class ZkmlRiskService:
             "public_signals": proof_data.get("public_signals", [])
         }
     
+    async def generate_risk_proofs(
+        self,
+        requests: list[dict[str, Any]]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Batch ``generate_risk_proof`` for many users.
+        
+        ``requests`` items carry user_address, portfolio_features, threshold
+        and optionally commitment_hash. Scores and witnesses are computed in one
+        vectorized pass; proofs then run on the warm RiskScore daemons, at most
+        one per daemon at a time so a large batch never floods the shared
+        proving queue. Results are yielded as each proof finishes, tagged with
+        the request ``index``; a failed item yields an ``error`` instead.
+        """
+        n_features = len(self.model.DEFAULT_WEIGHTS)
+        valid = [i for i, r in enumerate(requests) if len(r["portfolio_features"]) == n_features]
+        scores = self.model.compute_risk_scores([requests[i]["portfolio_features"] for i in valid])
+        score_by_index = dict(zip(valid, (int(s) for s in scores)))
+        
+        async def _prove(index: int) -> dict[str, Any]:
+            request = requests[index]
+            user_address = request["user_address"]
+            tag = {"index": index, "user_address": user_address}
+            if index not in score_by_index:
+                return {**tag, "error": f"Expected {n_features} features, got {len(request['portfolio_features'])}"}
+            
+            threshold = request["threshold"]
+            commitment_hash = request.get("commitment_hash") or "0x" + hashlib.sha256(
+                f"{user_address}{threshold}{request['portfolio_features']}".encode()
+            ).hexdigest()[:32]
+            actual_score = score_by_index[index]
+            is_compliant = actual_score <= threshold
+            
+            if not self.circuits_ready:
+                return {**tag, **self._generate_simulated_proof(
+                    user_address=user_address,
+                    threshold=threshold,
+                    is_compliant=is_compliant,
+                    commitment_hash=commitment_hash
+                )}
+            
+            witness_input = self.model.generate_witness_input(
+                portfolio_features=request["portfolio_features"],
+                threshold=threshold,
+                user_address=user_address,
+                commitment_hash=commitment_hash,
+                actual_score=actual_score
+            )
+            try:
+                proof_data = await self._generate_groth16_proof(witness_input)
+            except Exception as e:
+                return {**tag, "error": str(e)}
+            
+            return {
+                **tag,
+                "proof_type": "risk_score",
+                "is_compliant": is_compliant,
+                "threshold": threshold,
+                "commitment_hash": commitment_hash,
+                "proof_calldata": self._format_for_garaga(proof_data),
+                "public_signals": proof_data.get("public_signals", [])
+            }
+        
+        pending = iter(range(len(requests)))
+        running: set[asyncio.Future] = set()
+        
+        def _start_next() -> None:
+            index = next(pending, None)
+            if index is not None:
+                running.add(asyncio.ensure_future(_prove(index)))
+        
+        for _ in range(circuit_workers("RiskScore")):
+            _start_next()
+        try:
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    _start_next()
+                    yield task.result()
+        finally:
+            # Client went away mid-stream: stop proving for it
+            for task in running:
+                task.cancel()
+    
     def _generate_simulated_proof(
         self,
         user_address: str,
@@ -212,48 +359,12 @@ class ZkmlRiskService:
             "simulated": True
         }
     
-    async def _generate_groth16_proof(self, witness_input: dict) -> dict[str, Any]:
+    async def _generate_groth16_proof(self, witness_input: dict, low_priority: bool = False) -> dict[str, Any]:
         """
-        Generate Groth16 proof using snarkjs.
+        Generate Groth16 proof on a warm snarkjs daemon (WASM and zkey stay loaded),
+        off the event loop. Raises ProverBusyError when the circuit's queue is full.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.json"
-            witness_path = Path(tmpdir) / "witness.wtns"
-            proof_path = Path(tmpdir) / "proof.json"
-            public_path = Path(tmpdir) / "public.json"
-            
-            # Write input
-            with open(input_path, "w") as f:
-                json.dump(witness_input, f)
-            
-            # Generate witness
-            witness_gen = RISK_WITNESS_GEN
-            subprocess.run([
-                "node", str(witness_gen),
-                str(RISK_WASM),
-                str(input_path),
-                str(witness_path)
-            ], check=True, capture_output=True)
-            
-            # Generate proof
-            subprocess.run([
-                "snarkjs", "groth16", "prove",
-                str(RISK_ZKEY),
-                str(witness_path),
-                str(proof_path),
-                str(public_path)
-            ], check=True, capture_output=True)
-            
-            # Read proof
-            with open(proof_path) as f:
-                proof = json.load(f)
-            with open(public_path) as f:
-                public_signals = json.load(f)
-            
-            return {
-                "proof": proof,
-                "public_signals": public_signals
-            }
+        return await prove_async("RiskScore", witness_input, low_priority=low_priority)
     
     def _format_for_garaga(self, proof_data: dict) -> list[str]:
         """
@@ -0,0 +1,55 @@
+#!/usr/bin/env node
+/*
+ * Long-running Groth16 prover for one circuit.
+ *
+ *   node prover_daemon.js <witness_calculator.js> <circuit.wasm> <circuit_final.zkey>
+ *
+ * The witness calculator (compiled WASM instance) and the zkey bytes are
+ * loaded once and kept in memory. Jobs arrive as JSON lines on stdin and
+ * results leave as JSON lines on stdout, in order:
+ *
+ *   {"id": 1, "input": {...}}  ->  {"id": 1, "proof": {...}, "public": [...]}
+ *                              ->  {"id": 1, "error": "..."}
+ *
+ * A {"ready": true} line is written once everything is loaded.
+ */
+const fs = require("fs");
+const readline = require("readline");
+const snarkjs = require("snarkjs");
+
+async function main() {
+  const [wcPath, wasmPath, zkeyPath] = process.argv.slice(2);
+  if (!wcPath || !wasmPath || !zkeyPath) {
+    console.error("usage: prover_daemon.js <witness_calculator.js> <circuit.wasm> <circuit_final.zkey>");
+    process.exit(2);
+  }
+
+  const buildWitnessCalculator = require(wcPath);
+  const witnessCalculator = await buildWitnessCalculator(fs.readFileSync(wasmPath));
+  const zkey = { type: "mem", data: new Uint8Array(fs.readFileSync(zkeyPath)) };
+
+  const write = (obj) => process.stdout.write(JSON.stringify(obj) + "\n");
+  write({ ready: true });
+
+  // Jobs are proven one at a time; the Python side runs one daemon per slot.
+  const rl = readline.createInterface({ input: process.stdin, terminal: false });
+  for await (const line of rl) {
+    if (!line.trim()) continue;
+    let id = null;
+    try {
+      const job = JSON.parse(line);
+      id = job.id;
+      const wtns = await witnessCalculator.calculateWTNSBin(job.input, 0);
+      const { proof, publicSignals } = await snarkjs.groth16.prove(zkey, { type: "mem", data: wtns });
+      write({ id, proof, public: publicSignals });
+    } catch (err) {
+      write({ id, error: String((err && err.message) || err) });
+    }
+  }
+  process.exit(0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
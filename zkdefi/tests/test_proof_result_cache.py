@@ -0,0 +1,93 @@
+"""
+ProofResultCache: hits, misses, TTL expiry and size eviction in both tiers.
+
+Run with: python -m pytest tests/test_proof_result_cache.py
+"""
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.proof_result_cache import ProofResultCache
+
+
+def _cache(tmp_path: Path, **kwargs) -> ProofResultCache:
+    return ProofResultCache(path=tmp_path / "proof_cache.sqlite3", **kwargs)
+
+
+def test_miss_then_memory_hit(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get("rebalance:m:0x1") is None
+    cache.put("rebalance:m:0x1", {"ok": True})
+    assert cache.get("rebalance:m:0x1") == {"ok": True}
+    stats = cache.stats()
+    assert (stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (1, 1, 0)
+
+
+def test_disk_hit_survives_restart(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("k", {"calldata": [1, 2, 3]})
+    cache.close()
+    reopened = _cache(tmp_path)
+    assert reopened.get("k") == {"calldata": [1, 2, 3]}
+    assert reopened.stats()["disk_hits"] == 1
+    # Promoted to memory on the way out
+    assert reopened.get("k") == {"calldata": [1, 2, 3]}
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_expired_entry_is_a_miss_in_both_tiers(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("k", {"v": 1}, ttl_sec=-1)
+    assert cache.get("k") is None
+    cache.close()
+    assert _cache(tmp_path).get("k") is None
+
+
+def test_put_drops_expired_rows(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("old", {"v": 1}, ttl_sec=-1)
+    cache.put("new", {"v": 2})
+    assert cache.stats()["disk_entries"] == 1
+
+
+def test_purge_expired(tmp_path):
+    cache = _cache(tmp_path, max_disk_entries=10)
+    cache._db.execute("INSERT INTO proof_results VALUES ('stale', '{}', 0)")
+    cache._db.commit()
+    assert cache.purge_expired() == 1
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = ProofResultCache(path=None, max_entries=2)
+    cache.put("a", {"v": "a"})
+    cache.put("b", {"v": "b"})
+    cache.get("a")
+    cache.put("c", {"v": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"} and cache.get("c") == {"v": "c"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_is_capped_closest_expiry_first(tmp_path):
+    cache = _cache(tmp_path, max_entries=1, max_disk_entries=3)
+    for i, ttl in enumerate([50, 10, 40, 30, 20]):
+        cache.put(f"k{i}", {"i": i}, ttl_sec=ttl)
+    stats = cache.stats()
+    assert stats["disk_entries"] == 3
+    assert stats["disk_evictions"] == 2
+    cache.close()
+    reopened = _cache(tmp_path)
+    assert [i for i in range(5) if reopened.get(f"k{i}") is not None] == [0, 2, 3]
+
+
+def test_invalidate_prefix(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("rebalance:old:0x1", {"v": 1})
+    cache.put("rebalance:old:0x2", {"v": 2})
+    cache.put("rebalance:new:0x1", {"v": 3})
+    assert cache.invalidate_prefix("rebalance:old:") == 2
+    assert cache.get("rebalance:old:0x1") is None
+    assert cache.get("rebalance:new:0x1") == {"v": 3}
@@ -0,0 +1,77 @@
+"""
+Parity tests: batch zkML scoring must match the scalar models row by row.
+
+Run with: python -m pytest tests/test_zkml_batch_scoring.py
+"""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.zkml_anomaly_service import AnomalyDetectionModel
+from app.services.zkml_risk_service import RiskScoreModel
+
+
+def _random_rows(rng: random.Random, n: int, width: int, low: int, high: int) -> list[list[int]]:
+    return [[rng.randint(low, high) for _ in range(width)] for _ in range(n)]
+
+
+def test_risk_scores_match_scalar():
+    rng = random.Random(7)
+    rows = _random_rows(rng, 2000, 8, -50, 400)
+    rows += [[0] * 8, [100] * 8, [-100] * 8]
+    batch = RiskScoreModel.compute_risk_scores(np.array(rows))
+    assert batch.tolist() == [RiskScoreModel.compute_risk_score(r) for r in rows]
+
+
+def test_risk_scores_custom_model_match_scalar():
+    rng = random.Random(11)
+    weights = [3, -7, 12, 0, 5, -1, 9, 4]
+    rows = _random_rows(rng, 500, 8, -1000, 1000)
+    batch = RiskScoreModel.compute_risk_scores(rows, weights=weights, bias=-37, scale=1000)
+    expected = [RiskScoreModel.compute_risk_score(r, weights, -37, 1000) for r in rows]
+    assert batch.tolist() == expected
+
+
+def test_risk_scores_large_values_do_not_overflow():
+    rows = [[2**60, 1, 2, 3, 4, 5, 6, 2**59], [-(2**61)] + [7] * 7]
+    batch = RiskScoreModel.compute_risk_scores(rows)
+    assert [int(s) for s in batch] == [RiskScoreModel.compute_risk_score(r) for r in rows]
+
+
+def test_risk_scores_reject_wrong_width():
+    try:
+        RiskScoreModel.compute_risk_scores([[1, 2, 3]])
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_anomaly_flags_match_scalar():
+    rng = random.Random(3)
+    thresholds = AnomalyDetectionModel.DEFAULT_THRESHOLDS
+    # Values straddling each threshold, including equality
+    rows = [[rng.choice([t - 1, t, t + 1, rng.randint(0, 1000)]) for t in thresholds] for _ in range(2000)]
+    is_safe, scores = AnomalyDetectionModel.analyze_pools(np.array(rows))
+    expected = [AnomalyDetectionModel.analyze_pool(*r) for r in rows]
+    assert list(zip(is_safe.tolist(), scores.tolist())) == expected
+
+
+def test_anomaly_custom_model_match_scalar():
+    rng = random.Random(5)
+    weights = [1, 2, 3, 4, 5, 6]
+    thresholds = [10, 20, 30, 40, 50, 60]
+    rows = _random_rows(rng, 500, 6, 0, 80)
+    is_safe, scores = AnomalyDetectionModel.analyze_pools(rows, weights, thresholds, max_anomaly_score=9)
+    expected = [AnomalyDetectionModel.analyze_pool(*r, weights, thresholds, 9) for r in rows]
+    assert list(zip(is_safe.tolist(), scores.tolist())) == expected
+
+
+def test_empty_batches():
+    assert RiskScoreModel.compute_risk_scores([]).tolist() == []
+    is_safe, scores = AnomalyDetectionModel.analyze_pools([])
+    assert is_safe.tolist() == [] and scores.tolist() == []